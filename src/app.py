@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from src.core.middleware.request_context import RequestSpanMiddleware
 from starlette.middleware import Middleware
@@ -5,6 +6,10 @@ from src.routes.chat_completion import chat_router
 from src.routes.db_routes import db_router
 from contextlib import asynccontextmanager
 from src.clients import LifespanClients
+from src.core.cache.platform import PlatformCache
+from src.core.tools.registry import warm_up_tools, log_import_report
+from src.core.base._execution import ToolExecutor, EventLoopLagMonitor
+from src.core.cache.user_profile import UserProfileService
 from src.routes.chat_completion_external import chat_router_external
 from src.routes.db_routes_external import db_router_external
 
@@ -20,9 +25,28 @@ async def lifespan(app: FastAPI):
 
     # Instantiate LifespanServices.
     lifespan_clients = LifespanClients.get_instance()
+
+    # Evict in-process platform cache entries invalidated by other workers
+    platform_cache = PlatformCache.get_instance()
+    platform_cache.start_invalidation_listener()
+
+    # Import the tools configured in TOOL_WARMUP, the others are imported on first use
+    warm_up_tools()
+    log_import_report()
+
+    # Log in to the databases of SQL_ENGINE_WARMUP before the first question
+    await asyncio.to_thread(lifespan_clients.sql_engines.warm_up)
+
+    # Report the tools that block the event loop
+    loop_lag_monitor = EventLoopLagMonitor.get_instance()
+    loop_lag_monitor.start()
     yield 
 
     # Gracefully shutdown the services when the app is shutting down.
+    platform_cache.stop_invalidation_listener()
+    loop_lag_monitor.stop()
+    ToolExecutor.get_instance().shutdown()
+    UserProfileService.get_instance().shutdown()
     await lifespan_clients.shutdown()
 
 
@@ -1,11 +1,12 @@
 from .lifespan import LifespanClients
 from .metrics_api import MetricsApiClient
-from .mongo import MongoDBClient
+from .mongo import AsyncMongoDBClient, MongoDBClient
 from .redis import MockRedisClient
 from .synapse import SynapseClient
 from .constants import scopes
 
 __all__ = [
+    "AsyncMongoDBClient",
     "LifespanClients",
     "MetricsApiClient",
     "MongoDBClient",
@@ -1,11 +1,14 @@
 from .ai_foundry_agent import AzureAIFoundryAgentClient
+from .ai_search import AzureAISearchClient
 from .openai import AzureOpenAIClient
 from .blob import AzureBlobStorageClient
-from .token_generator import openai_token_provider
+from .token_generator import openai_token_provider, openai_async_token_provider
 
 __all__ = [
     "AzureAIFoundryAgentClient",
+    "AzureAISearchClient",
     "AzureOpenAIClient",
     "AzureBlobStorageClient",
-    "openai_token_provider"
+    "openai_token_provider",
+    "openai_async_token_provider"
 ]
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+AzureAISearchClient for pooled HTTP access to Azure AI Search.
+
+This module provides a singleton AzureAISearchClient that keeps one keep-alive connection pool per
+search endpoint for the lifetime of the worker, instead of opening a new session (TCP + TLS handshake)
+for every search request.
+
+Concurrency is bounded by a global limiter shared by all searches of the worker and by one limiter
+per index. The client reports connection reuse and the time requests spend queued on the limiters.
+
+Environment Variables:
+- AZURE_SEARCH_MAX_CONNECTIONS: Maximum number of pooled connections per search endpoint (default: 100).
+- AZURE_SEARCH_MAX_CONCURRENCY: Maximum number of concurrent searches per worker (default: 50).
+- AZURE_SEARCH_KEEPALIVE_SECONDS: How long idle connections are kept open (default: 60).
+- AZURE_SEARCH_TIMEOUT_SECONDS: Total timeout of a search request (default: 30).
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import aiohttp
+import requests
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AzureAISearchPoolMetrics:
+    """Counters describing how the search connection pool is used."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    queue_wait_seconds_total: float = 0.0
+    queue_wait_seconds_max: float = 0.0
+    unpooled_requests: int = 0
+
+    def record_queue_wait(self, seconds: float) -> None:
+        self.requests += 1
+        self.queue_wait_seconds_total += seconds
+        self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters together with derived reuse and queue-wait figures."""
+        metrics = asdict(self)
+        connections = self.connections_created + self.connections_reused
+        metrics["connection_reuse_ratio"] = self.connections_reused / connections if connections else 0.0
+        metrics["queue_wait_seconds_avg"] = self.queue_wait_seconds_total / self.requests if self.requests else 0.0
+        return metrics
+
+
+class AzureAISearchClient:
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of AzureAISearchClient.
+        """
+        if cls._instance is None:
+            cls._instance = AzureAISearchClient()
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initialize the AzureAISearchClient with pool and limiter settings from environment variables.
+        The asynchronous pools are created lazily on the event loop of the first search.
+        """
+        if hasattr(self, "_initialized") and self._initialized:
+            logger.info("AzureAISearchClient is already initialized.")
+            return
+
+        self.max_connections = int(os.getenv("AZURE_SEARCH_MAX_CONNECTIONS", "100"))
+        self.max_concurrency = int(os.getenv("AZURE_SEARCH_MAX_CONCURRENCY", "50"))
+        self.keepalive_timeout = float(os.getenv("AZURE_SEARCH_KEEPALIVE_SECONDS", "60"))
+        self.request_timeout = float(os.getenv("AZURE_SEARCH_TIMEOUT_SECONDS", "30"))
+        self.metrics = AzureAISearchPoolMetrics()
+
+        # Asynchronous pools and limiters are bound to the event loop they were created on
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._global_limiter: Optional[asyncio.Semaphore] = None
+        self._index_limiters: Dict[str, asyncio.Semaphore] = {}
+
+        # Synchronous keep-alive pool for the threadpool code paths
+        self._sync_session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_connections)
+        self._sync_session.mount("https://", adapter)
+        self._sync_session.mount("http://", adapter)
+
+        logger.info("AzureAISearchClient initialized successfully.")
+        self._initialized = True
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        """Return the scheme and host of the URL, which identifies its connection pool."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _is_pool_loop(self) -> bool:
+        """Bind the pools to the running event loop on first use and check the current loop is that loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = loop
+            self._sessions = {}
+            self._global_limiter = asyncio.Semaphore(self.max_concurrency)
+            self._index_limiters = {}
+        return self._loop is loop
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        async def on_connection_create_end(session, trace_config_ctx, params):
+            self.metrics.connections_created += 1
+
+        async def on_connection_reuseconn(session, trace_config_ctx, params):
+            self.metrics.connections_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _get_session(self, url: str) -> aiohttp.ClientSession:
+        """Get the pooled session of the URL's search endpoint, creating it on first use."""
+        endpoint = self._endpoint(url)
+        session = self._sessions.get(endpoint)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                trace_configs=[self._create_trace_config()],
+            )
+            self._sessions[endpoint] = session
+            logger.info(f"Created Azure AI Search connection pool for {endpoint}.")
+        return session
+
+    def _get_index_limiter(self, index_name: str, max_concurrency_per_index: int) -> asyncio.Semaphore:
+        """Get the limiter of the index. The limit is fixed by the first search against the index."""
+        limiter = self._index_limiters.get(index_name)
+        if limiter is None:
+            limiter = asyncio.Semaphore(max_concurrency_per_index)
+            self._index_limiters[index_name] = limiter
+        return limiter
+
+    @staticmethod
+    async def _post(session: aiohttp.ClientSession, url: str, headers: Dict[str, str], payload: Dict) -> Tuple[int, Any]:
+        async with session.post(url, headers=headers, data=json.dumps(payload)) as response:
+            return response.status, await response.json()
+
+    async def apost(
+        self,
+        url: str,
+        index_name: str,
+        headers: Dict[str, str],
+        payload: Dict,
+        max_concurrency_per_index: int = 5,
+    ) -> Tuple[int, Any]:
+        """
+        Send a search request through the pooled session of the endpoint.
+
+        Args:
+            url (str): The search URL.
+            index_name (str): The index being searched, used for per-index concurrency limiting.
+            headers (Dict[str, str]): The request headers.
+            payload (Dict): The search request body.
+            max_concurrency_per_index (int): Maximum number of concurrent searches against the index.
+
+        Returns:
+            Tuple[int, Any]: The HTTP status and the decoded JSON response.
+        """
+        if not self._is_pool_loop():
+            # The pool cannot be shared with another event loop (e.g. asyncio.run in a worker thread)
+            self.metrics.unpooled_requests += 1
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.request_timeout)) as session:
+                return await self._post(session, url, headers, payload)
+
+        queued_at = time.perf_counter()
+        # Wait on the index first, so searches queued on a busy index do not hold global slots
+        async with self._get_index_limiter(index_name, max_concurrency_per_index), self._global_limiter:
+            self.metrics.record_queue_wait(time.perf_counter() - queued_at)
+            return await self._post(self._get_session(url), url, headers, payload)
+
+    def post(self, url: str, headers: Dict[str, str], payload: Dict) -> requests.Response:
+        """
+        Send a search request synchronously through the keep-alive pool.
+
+        Args:
+            url (str): The search URL.
+            headers (Dict[str, str]): The request headers.
+            payload (Dict): The search request body.
+
+        Returns:
+            requests.Response: The response.
+        """
+        return self._sync_session.post(url, headers=headers, data=json.dumps(payload), timeout=self.request_timeout)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Return connection reuse and queue-wait metrics of the pool.
+        """
+        return self.metrics.snapshot()
+
+    async def shutdown(self):
+        """
+        Close all pooled sessions.
+        """
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions = {}
+        self._sync_session.close()
+        logger.info(f"AzureAISearchClient shutdown completed. Pool metrics: {self.get_metrics()}")
@@ -2,7 +2,7 @@ import os
 import logging
 from dotenv import load_dotenv
 from openai import AzureOpenAI, AsyncAzureOpenAI
-from src.clients.azure.token_generator import openai_token_provider
+from src.clients.azure.token_generator import openai_token_provider, openai_async_token_provider
 
 load_dotenv(override=True)
 
@@ -43,7 +43,7 @@ class AzureOpenAIClient:
             self.async_azure_use_region_client = AsyncAzureOpenAI(
                 api_version=api_version,
                 azure_endpoint=endpoint_use,
-                azure_ad_token_provider=openai_token_provider,
+                azure_ad_token_provider=openai_async_token_provider,
             )   
             logger.info("Azure OpenAI USE async client initialized successfully.")
 
@@ -58,7 +58,7 @@ class AzureOpenAIClient:
             self.async_azure_use2_region_client = AsyncAzureOpenAI(
                 azure_endpoint=endpoint_use2,
                 api_version=api_version,
-                azure_ad_token_provider=openai_token_provider,
+                azure_ad_token_provider=openai_async_token_provider,
             )
             logger.info("Azure OpenAI USE2 async client initialized successfully.")
 
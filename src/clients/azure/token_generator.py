@@ -1,5 +1,6 @@
 from azure.identity import DefaultAzureCredential
 import os
+import asyncio
 import logging
 from dotenv import load_dotenv
 from src.clients.constants import scopes
@@ -29,5 +30,21 @@ def make_token_provider(scope: str):
     return _get_token
 
 
+def make_async_token_provider(scope: str):
+    """
+    Async counterpart of make_token_provider for async clients. It shares the cache key of the
+    sync provider, and the token is only fetched (in a worker thread) on a cache miss, so the
+    event loop is never blocked.
+    """
+    @cache_platform(f"azure_ad_token:{scope}", ttl=3600)
+    async def _aget_token() -> str:
+        credential = DefaultAzureCredential()
+        token_obj = await asyncio.to_thread(credential.get_token, scopes[scope])
+        return token_obj.token
+
+    return _aget_token
+
+
 # Pre-scoped token providers, imported directly by clients
-openai_token_provider = make_token_provider("openai")
\ No newline at end of file
+openai_token_provider = make_token_provider("openai")
+openai_async_token_provider = make_async_token_provider("openai")
\ No newline at end of file
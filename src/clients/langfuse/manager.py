@@ -1,10 +1,14 @@
-import logging
 import os
-from typing import Optional
-from langfuse.client import Langfuse
+import copy
+import random
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
 from langfuse.callback import CallbackHandler as LangFuseCallbackHandler
 from langchain.callbacks import StdOutCallbackHandler
 from src.clients.langfuse.utils import TraceSanitizer
+from src.clients.langfuse.prompt_store import PromptStore
 
 from dotenv import load_dotenv
 
@@ -21,8 +25,6 @@ class LangfuseManager:
         host: str,
         logger: logging.Logger,
         use_redaction: bool = False,
-        user_email: Optional[str] = None,
-        callback_kwargs: Optional[dict] = None,
     ):
         # If already initialized, do not reinitialize
         if hasattr(self, '_initialized') and self._initialized:
@@ -33,37 +35,42 @@ class LangfuseManager:
         self.public_key = public_key
         self.secret_key = secret_key
         self.host = host
-        self.user_email = user_email
-        self.callback_kwargs = callback_kwargs
         self.is_initialized = False
 
-        # Initialize the Langfuse client
-        self.client = Langfuse(
-            public_key=self.public_key,
-            secret_key=self.secret_key,
-            host=self.host,
-        )
-
-        if self.client:
-            self.is_initialized = True
+        # Fraction of the requests traced, see `create_callback_handler`
+        self.sample_rate = float(os.getenv("LANGFUSE_TRACE_SAMPLE_RATE", "1.0"))
 
         trace_sanitizer = TraceSanitizer()
 
-        # Create the LangFuse callback handler
+        # Create the LangFuse callback handler. Its client, and the background thread sending its events,
+        # is shared by the prompts and by the per-request handlers.
         self._callback = LangFuseCallbackHandler(
             public_key=self.public_key,
             secret_key=self.secret_key,
             host=self.host,
             mask=trace_sanitizer.mask if use_redaction else None,
         )
-        self._initialized = True
+        self.client = self._callback.langfuse
 
+        if self.client:
+            self.is_initialized = True
 
+        # Prompts are served from memory and refreshed in the background
+        snapshot_dir = os.getenv("LANGFUSE_PROMPT_SNAPSHOT_DIR")
+        self.prompt_store = PromptStore(
+            client=self.client,
+            logger=self.logger,
+            snapshot_path=os.path.join(snapshot_dir, f"{type(self).__name__}.json") if snapshot_dir else None,
+        )
+        self._initialized = True
 
     def get_prompt(self, prompt_name: str, fallback_prompt: str, label: str = None) -> str:
         """
         Get prompt from Langfuse with fallback support. 
         Returns fallback prompt directly when environment is Local.
+
+        Prompts are served from the prompt store, which fetches them in the background on first use and refreshes them.
+        The fallback prompt is returned until the prompt is fetched.
         """
         tool_environment = os.getenv("TOOL_ENVIRONMENT", "").lower()
         
@@ -71,19 +78,23 @@ class LangfuseManager:
             self.logger.info(f"Local environment detected, using fallback prompt for: {prompt_name}")
             return fallback_prompt
         
-        try:
-            if label is None:
-                label = os.getenv("LANGFUSE_PROMPT_LABEL", "dev")
-            
-            prompt_response = self.client.get_prompt(
-                name=prompt_name, 
-                label=label, 
-                fallback=fallback_prompt
-            )
-            return prompt_response.prompt
-        except Exception as e:
-            self.logger.warning(f"Failed to get prompt {prompt_name} from Langfuse, using fallback: {e}")
-            return fallback_prompt
+        if label is None:
+            label = os.getenv("LANGFUSE_PROMPT_LABEL", "dev")
+
+        return self.prompt_store.get(prompt_name, fallback_prompt, label)
+
+    def preload_prompts(self, prompt_names: List[str], label: str = None) -> None:
+        """
+        Fetch prompts in the background, so their first use is served from the prompt store.
+        Nothing is fetched when environment is Local.
+        """
+        if os.getenv("TOOL_ENVIRONMENT", "").lower() == "local":
+            return
+
+        if label is None:
+            label = os.getenv("LANGFUSE_PROMPT_LABEL", "dev")
+
+        self.prompt_store.preload((prompt_name, label) for prompt_name in prompt_names)
 
     @classmethod
     def get_instance(
@@ -105,21 +116,53 @@ class LangfuseManager:
 
     @property
     def callback_handler(self):
+        """
+        The handler shared by the worker, without user or tags. Requests use `create_callback_handler`.
+        """
         if self.is_initialized:
             return self._callback
         else:
             return StdOutCallbackHandler()
 
-    def set_user_email(self, user_email: str):
-        self.user_email = user_email
-        if hasattr(self, '_callback'):
-            self._callback.user_id = self.user_email
+    def create_callback_handler(
+        self,
+        user_email: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        sample_rate: Optional[float] = None,
+    ) -> BaseCallbackHandler:
+        """
+        Create the callback handler of a request.
 
-    def set_callback_kwargs(self, callback_kwargs: dict):
-        self.callback_kwargs = callback_kwargs
-        use_masker = "tags" in self.callback_kwargs and "Enterprise LamBot" in self.callback_kwargs.get("tags", [])
-        trace_sanitizer = TraceSanitizer()
+        The handler is a view of the shared handler: it has its own user, tags, metadata and run state,
+        and sends its events through the shared Langfuse client, so creating it opens no connection and
+        starts no thread.
+
+        Args:
+            user_email (str, optional): The user of the traces.
+            tags (List[str], optional): The tags of the traces.
+            metadata (Dict[str, Any], optional): The metadata of the traces.
+            sample_rate (float, optional): Probability that the request is traced. Defaults to LANGFUSE_TRACE_SAMPLE_RATE.
+
+        Returns:
+            BaseCallbackHandler: The handler of the request, a handler doing nothing if the request is not sampled.
+        """
+        if not self.is_initialized:
+            return StdOutCallbackHandler()
 
-        if hasattr(self, '_callback'):
-            self._callback.mask = trace_sanitizer.mask if use_masker else None
-            self._callback.tags = self.callback_kwargs.get("tags", [])
\ No newline at end of file
+        sample_rate = self.sample_rate if sample_rate is None else sample_rate
+        if sample_rate < 1 and random.random() >= sample_rate:
+            return BaseCallbackHandler()
+
+        handler = copy.copy(self._callback)
+        # Run state of the request, the client and its task manager stay shared
+        handler.runs = {}
+        handler.prompt_to_parent_run_map = {}
+        handler.trace_updates = defaultdict(dict)
+        handler.updated_completion_start_time_memo = set()
+        handler.trace = None
+        handler.root_span = None
+        handler.user_id = user_email
+        handler.tags = list(tags or [])
+        handler.metadata = metadata
+        return handler
@@ -0,0 +1,300 @@
+"""
+In-memory store of the Langfuse prompts of a worker.
+
+Prompts are read on hot paths (tool descriptions and instructions on every tool run, follow-up
+questions, deep research nodes). The store keeps the text of every (name, label) referenced so far in
+a dict, so reads take no lock and make no call into the Langfuse SDK. A background thread refetches
+all referenced prompts on an interval; a failed refetch keeps the previous text.
+
+The first read of a prompt returns the fallback prompt of the caller and wakes the background thread
+to fetch the prompt, so no request waits on Langfuse. Prompts known at startup can be preloaded so
+their first read already finds them. A prompt that cannot be fetched keeps its fallback until the next
+successful refresh. Prompts never fetched (e.g. not created in Langfuse) are retried with an exponential
+backoff, up to once an hour, and are not counted as refresh failures or stale prompts.
+
+The store can be persisted to a JSON snapshot, written after every refresh and on shutdown and loaded
+on startup, so a recycled worker serves the prompts of its predecessor from its first request and
+refreshes them in the background.
+
+Environment Variables:
+- LANGFUSE_PROMPT_REFRESH_SECONDS: Interval between two refreshes of all prompts (default: 60).
+- LANGFUSE_PROMPT_SNAPSHOT_DIR: Directory of the prompt snapshots, one file per manager (default: no snapshot).
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from langfuse.client import Langfuse
+
+_PromptKey = Tuple[str, str]
+
+# Longest wait between two fetches of a prompt that was never fetched
+_MAX_FALLBACK_RETRY_SECONDS = 3600
+
+
+class PromptStore:
+
+    def __init__(
+        self,
+        client: Langfuse,
+        logger: logging.Logger,
+        refresh_interval: Optional[float] = None,
+        snapshot_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            client (Langfuse): The client to fetch prompts with.
+            logger (logging.Logger): The logger of the owning manager.
+            refresh_interval (float, optional): Seconds between two refreshes. Defaults to LANGFUSE_PROMPT_REFRESH_SECONDS.
+            snapshot_path (str, optional): The JSON file to load and persist the prompts. Defaults to no snapshot.
+        """
+        self.client = client
+        self.logger = logger
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(os.getenv("LANGFUSE_PROMPT_REFRESH_SECONDS", "60"))
+        self.snapshot_path = snapshot_path
+
+        # Read without lock: entries are only ever replaced, never mutated
+        self._prompts: Dict[_PromptKey, str] = {}
+        # Wall-clock time each prompt was last fetched from Langfuse, None for a fallback prompt
+        self._fetched_at: Dict[_PromptKey, Optional[float]] = {}
+        # Backoff of the prompts never fetched: monotonic time of the next fetch and current delay
+        self._retry_at: Dict[_PromptKey, float] = {}
+        self._retry_delay: Dict[_PromptKey, float] = {}
+        # Prompts to fetch before the next refresh: first reads and preloaded prompts
+        self._pending: Set[_PromptKey] = set()
+        self._snapshot_loaded = False
+        self._refresh_failures = 0
+
+        # Serializes the additions of new prompts and the snapshot writes, never held during a fetch
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if self.snapshot_path:
+            self.load_snapshot()
+
+    def get(self, prompt_name: str, fallback_prompt: str, label: str) -> str:
+        """
+        Get the text of a prompt. On first use, the fallback prompt is returned and the prompt is
+        fetched in the background.
+
+        Args:
+            prompt_name (str): The name of the prompt.
+            fallback_prompt (str): The prompt to use while Langfuse is unreachable.
+            label (str): The label of the prompt.
+
+        Returns:
+            str: The prompt.
+        """
+        prompt = self._prompts.get((prompt_name, label))
+        if prompt is not None:
+            return prompt
+        return self._add(prompt_name, fallback_prompt, label)
+
+    def _add(self, prompt_name: str, fallback_prompt: str, label: str) -> str:
+        key = (prompt_name, label)
+        with self._lock:
+            if key in self._prompts:
+                return self._prompts[key]
+            self._prompts[key] = fallback_prompt
+            self._fetched_at[key] = None
+            self._pending.add(key)
+        self._wake.set()
+        self.start()
+        return fallback_prompt
+
+    def preload(self, keys: Iterable[_PromptKey]) -> None:
+        """
+        Fetch prompts in the background before their first use. Prompts already in the store are skipped.
+
+        Args:
+            keys (Iterable[Tuple[str, str]]): The name and label of each prompt.
+        """
+        with self._lock:
+            self._pending.update(key for key in keys if key not in self._prompts)
+        self._wake.set()
+
+    def fetch_pending(self) -> None:
+        """
+        Fetch the prompts read or preloaded since the last call. A prompt that cannot be fetched keeps
+        its fallback and is retried with a backoff; a preloaded prompt is left to its first read.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        for key in pending:
+            prompt = self._fetch(key)
+            if prompt is not None:
+                self._store(key, prompt)
+            elif key in self._prompts:
+                self._back_off(key)
+
+    def _fetch(self, key: _PromptKey, log_level: int = logging.WARNING) -> Optional[str]:
+        """
+        Fetch a prompt from Langfuse, bypassing the prompt cache of the SDK. Returns None on failure.
+        """
+        prompt_name, label = key
+        try:
+            return self.client.get_prompt(name=prompt_name, label=label, cache_ttl_seconds=0).prompt
+        except Exception as e:
+            self.logger.log(log_level, f"Failed to get prompt {prompt_name} ({label}) from Langfuse: {e}")
+            return None
+
+    def _store(self, key: _PromptKey, prompt: str) -> None:
+        self._prompts[key] = prompt
+        self._fetched_at[key] = time.time()
+        self._retry_at.pop(key, None)
+        self._retry_delay.pop(key, None)
+
+    def _back_off(self, key: _PromptKey) -> None:
+        delay = min(max(2 * self._retry_delay.get(key, 0.0), self.refresh_interval), _MAX_FALLBACK_RETRY_SECONDS)
+        self._retry_delay[key] = delay
+        self._retry_at[key] = time.monotonic() + delay
+
+    def refresh(self) -> None:
+        """
+        Refetch every prompt of the store. Prompts that cannot be fetched keep their current text.
+        Prompts never fetched are only refetched once their backoff has elapsed.
+        """
+        now = time.monotonic()
+        for key in list(self._prompts):
+            if self._fetched_at.get(key) is None:
+                if self._retry_at.get(key, 0.0) > now:
+                    continue
+                prompt = self._fetch(key, log_level=logging.DEBUG)
+                if prompt is None:
+                    self._back_off(key)
+                    continue
+            else:
+                prompt = self._fetch(key)
+                if prompt is None:
+                    self._refresh_failures += 1
+                    continue
+            self._store(key, prompt)
+        self.save_snapshot()
+
+    def start(self) -> None:
+        """
+        Start fetching and refreshing the prompts in the background, once. The prompts are only
+        refreshed with a positive refresh interval.
+        """
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="langfuse-prompt-refresh", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background refresh and persist the snapshot.
+        """
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout=5)
+            self._thread = None
+        self.save_snapshot()
+        self.logger.info(f"Langfuse prompt store statistics: {self.get_stats()}")
+
+    def _run(self) -> None:
+        refresh = self.refresh_interval > 0
+        # Prompts loaded from a snapshot are refreshed right away
+        if refresh and self._snapshot_loaded:
+            self._refresh_safely()
+        next_refresh = time.monotonic() + self.refresh_interval
+        while not self._stop.is_set():
+            self._fetch_pending_safely()
+            timeout = max(next_refresh - time.monotonic(), 0.0) if refresh else None
+            if self._wake.wait(timeout):
+                self._wake.clear()
+                continue
+            self._refresh_safely()
+            next_refresh = time.monotonic() + self.refresh_interval
+
+    def _fetch_pending_safely(self) -> None:
+        try:
+            self.fetch_pending()
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch the new Langfuse prompts: {e}")
+
+    def _refresh_safely(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            self.logger.warning(f"Failed to refresh the Langfuse prompts: {e}")
+        stats = self.get_stats()
+        if stats["max_staleness_seconds"] > 3 * self.refresh_interval:
+            self.logger.warning(f"Langfuse prompts are stale: {stats}")
+
+    def get_staleness(self) -> Dict[str, float]:
+        """
+        Return the seconds since each prompt was last fetched from Langfuse. Prompts never fetched are left out.
+        """
+        now = time.time()
+        return {
+            f"{prompt_name}:{label}": now - fetched_at
+            for (prompt_name, label), fetched_at in list(self._fetched_at.items())
+            if fetched_at is not None
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the number of prompts and fallbacks, the refresh failures and the staleness of the oldest fetched prompt.
+        """
+        staleness = self.get_staleness()
+        fallbacks = sum(1 for fetched_at in list(self._fetched_at.values()) if fetched_at is None)
+        return {
+            "prompts": len(staleness) + fallbacks,
+            "fallbacks": fallbacks,
+            "refresh_failures": self._refresh_failures,
+            "max_staleness_seconds": max(staleness.values(), default=0.0),
+        }
+
+    def load_snapshot(self) -> None:
+        """
+        Load the prompts persisted by a previous worker. A missing or unreadable snapshot is ignored.
+        """
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                entries = json.load(f)["prompts"]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring the Langfuse prompt snapshot {self.snapshot_path}: {e}")
+            return
+        for entry in entries:
+            key = (entry["name"], entry["label"])
+            self._prompts[key] = entry["prompt"]
+            self._fetched_at[key] = entry["fetched_at"]
+        self._snapshot_loaded = bool(entries)
+        self.logger.info(f"Loaded {len(entries)} Langfuse prompts from {self.snapshot_path}")
+
+    def save_snapshot(self) -> None:
+        """
+        Persist the prompts fetched from Langfuse. Fallback prompts are not persisted.
+        """
+        if not self.snapshot_path:
+            return
+        entries = [
+            {"name": prompt_name, "label": label, "prompt": self._prompts[(prompt_name, label)], "fetched_at": fetched_at}
+            for (prompt_name, label), fetched_at in list(self._fetched_at.items())
+            if fetched_at is not None
+        ]
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.snapshot_path) or "."
+                os.makedirs(directory, exist_ok=True)
+                # Replace the snapshot atomically, other workers may be loading it
+                with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8") as f:
+                    json.dump({"prompts": entries}, f)
+                os.replace(f.name, self.snapshot_path)
+            except OSError as e:
+                self.logger.warning(f"Failed to write the Langfuse prompt snapshot {self.snapshot_path}: {e}")
@@ -2,9 +2,9 @@ import warnings
 from typing import Dict, List, Any
 from langchain_core.messages.ai import AIMessageChunk, AIMessage
 from langchain_core.messages.system import SystemMessage
+from langchain_core.messages.base import BaseMessage
 from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.agents import AgentFinish
-from copy import deepcopy
 
 class TraceSanitizer:
     """
@@ -25,6 +25,30 @@ class TraceSanitizer:
         """
         self.mask_string = mask_string
 
+    def _mask_message(self, message: BaseMessage) -> BaseMessage:
+        """
+        Returns a copy of a message with masked content, sharing its other fields.
+
+        Args:
+            message (BaseMessage): The message to be masked.
+
+        Returns:
+            BaseMessage: The masked copy of the message.
+        """
+        return message.model_copy(update={"content": self.mask_string})
+
+    def _mask_ai_messages(self, messages: List[Any]) -> List[Any]:
+        """
+        Returns a copy of a list of messages with the content of the AI messages masked.
+
+        Args:
+            messages (List[Any]): The messages to be masked.
+
+        Returns:
+            List[Any]: The list with masked copies of the AI messages and the other messages unchanged.
+        """
+        return [self._mask_message(message) if isinstance(message, AIMessage) else message for message in messages]
+
     def _mask_dict(self, data: Dict) -> Dict:
         """
         Masks sensitive data in a dictionary.
@@ -33,8 +57,9 @@ class TraceSanitizer:
             data (Dict): The dictionary containing data to be masked.
 
         Returns:
-            Dict: The dictionary with masked data.
+            Dict: A shallow copy of the dictionary with masked data.
         """
+        data = dict(data)
         if "input" in data:
             data["input"] = self.mask_string
         if "output" in data:
@@ -42,9 +67,7 @@ class TraceSanitizer:
         if "role" in data and data["role"] != "system":
             data["content"] = self.mask_string
         if "messages" in data:
-            for message in data["messages"]:
-                if isinstance(message, AIMessage):
-                    message.content = self.mask_string
+            data["messages"] = self._mask_ai_messages(data["messages"])
         return data
 
     def _mask_ai_message_chunk(self, data: AIMessageChunk) -> AIMessageChunk:
@@ -55,10 +78,9 @@ class TraceSanitizer:
             data (AIMessageChunk): The AIMessageChunk containing data to be masked.
 
         Returns:
-            AIMessageChunk: The AIMessageChunk with masked data.
+            AIMessageChunk: A copy of the AIMessageChunk with masked data.
         """
-        data.content = self.mask_string
-        return data
+        return self._mask_message(data)
 
     def _mask_agent_finish(self, data: AgentFinish) -> AgentFinish:
         """
@@ -68,16 +90,14 @@ class TraceSanitizer:
             data (AgentFinish): The AgentFinish containing data to be masked.
 
         Returns:
-            AgentFinish: The AgentFinish with masked data.
-        """
-        data.log = self.mask_string
-        if "output" in data.return_values:
-            data.return_values["output"] = self.mask_string
-        if "messages" in data.return_values:
-            for message in data.return_values["messages"]:
-                if isinstance(message, AIMessage):
-                    message.content = self.mask_string
-        return data
+            AgentFinish: A copy of the AgentFinish with masked data.
+        """
+        return_values = dict(data.return_values)
+        if "output" in return_values:
+            return_values["output"] = self.mask_string
+        if "messages" in return_values:
+            return_values["messages"] = self._mask_ai_messages(return_values["messages"])
+        return data.model_copy(update={"log": self.mask_string, "return_values": return_values})
 
     def _mask_chat_prompt_value(self, data: ChatPromptValue) -> ChatPromptValue:
         """
@@ -87,12 +107,12 @@ class TraceSanitizer:
             data (ChatPromptValue): The ChatPromptValue containing data to be masked.
 
         Returns:
-            ChatPromptValue: The ChatPromptValue with masked data.
+            ChatPromptValue: A copy of the ChatPromptValue with masked data.
         """
-        for message in data.messages:
-            if not isinstance(message, SystemMessage):
-                message.content = self.mask_string
-        return data
+        return data.model_copy(update={"messages": [
+            message if isinstance(message, SystemMessage) else self._mask_message(message)
+            for message in data.messages
+        ]})
 
     def _mask_list(self, data: List[Dict]) -> List[Dict]:
         """
@@ -102,17 +122,22 @@ class TraceSanitizer:
             data (List[Dict]): The list containing dictionaries with data to be masked.
 
         Returns:
-            List[Dict]: The list with masked data.
+            List[Dict]: A copy of the list with masked data.
         """
+        masked = []
         for message_dict in data:
             if "role" in message_dict and message_dict["role"] != "system":
-                message_dict["content"] = self.mask_string
-        return data
+                message_dict = {**message_dict, "content": self.mask_string}
+            masked.append(message_dict)
+        return masked
 
     def mask(self, data: Any) -> Any:
         """
         Masks sensitive data in various data structures.
 
+        The data is not modified: masking is copy-on-write, only the containers of the masked fields
+        are copied and the other fields, e.g. system prompts, are shared with the original.
+
         Args:
             data (Any): The data to be masked.
 
@@ -122,17 +147,16 @@ class TraceSanitizer:
         Raises:
             UserWarning: If the data type is not supported.
         """
-        _data = deepcopy(data)
-        if isinstance(_data, Dict):
-            return self._mask_dict(_data)
-        elif isinstance(_data, AIMessageChunk):
-            return self._mask_ai_message_chunk(_data)
-        elif isinstance(_data, AgentFinish):
-            return self._mask_agent_finish(_data)
-        elif isinstance(_data, ChatPromptValue):
-            return self._mask_chat_prompt_value(_data)
-        elif isinstance(_data, List):
-            return self._mask_list(_data)
+        if isinstance(data, Dict):
+            return self._mask_dict(data)
+        elif isinstance(data, AIMessageChunk):
+            return self._mask_ai_message_chunk(data)
+        elif isinstance(data, AgentFinish):
+            return self._mask_agent_finish(data)
+        elif isinstance(data, ChatPromptValue):
+            return self._mask_chat_prompt_value(data)
+        elif isinstance(data, List):
+            return self._mask_list(data)
         else:
-            warnings.warn(f"Alert!! Unknown data type: {type(_data)}. Known types are Dict, AIMessageChunk, AgentFinish, ChatPromptValue, or list. Data will not be masked.", UserWarning)
-            return _data
+            warnings.warn(f"Alert!! Unknown data type: {type(data)}. Known types are Dict, AIMessageChunk, AgentFinish, ChatPromptValue, or list. Data will not be masked.", UserWarning)
+            return data
@@ -1,15 +1,19 @@
 import os
+import asyncio
 import logging
 from dotenv import load_dotenv
-from src.clients.mongo import MongoDBClient
+from src.clients.mongo import AsyncMongoDBClient, MongoDBClient
 from src.clients.synapse import SynapseClient
+from src.clients.sql_engine import SQLEngineRegistry
 from src.clients.azure.openai import AzureOpenAIClient
 from azure.storage.blob import BlobServiceClient
-from src.clients.redis import RedisClient
+from src.clients.redis import RedisClient, AsyncRedisClient
 from src.clients.langfuse.manager import LangfuseManager
 from src.clients.langfuse.manager_sensitive import LangfuseManagerSensitive
 from src.clients.langfuse.manager_redacted import LangfuseManagerRedacted
 from src.clients.azure.ai_foundry_agent import AzureAIFoundryAgentClient
+from src.clients.azure.ai_search import AzureAISearchClient
+from src.clients.telemetry import TelemetryShipper
 
 load_dotenv(override=True)
 
@@ -20,6 +24,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prompts of the core bots, agents and tools, fetched at startup instead of on their first use
+_CORE_PROMPTS = ["GENERIC_SUGGESTED_FOLLOWUP_QUESTIONS_PROMPT"]
+_CORE_LABELED_PROMPTS = [
+    "RESEARCH_DELEGATOR_SYSTEM_MESSAGE",
+    "REFINER_SYSTEM_MESSAGE",
+    "RESEARCHER_SYSTEM_MESSAGE",
+    "REVIEWER_SYSTEM_MESSAGE",
+    "CODE_INTERPRETER_TOOL_DESCRIPTION_PROMPT",
+    "CODE_INTERPRETER_TOOL_INSTRUCTION_PROMPT",
+    "CODE_INTERPRETER_ASSISTANT_SYSTEM_MESSAGE",
+    "FISHBONE_DIAGRAM_TOOL_DESCRIPTION_PROMPT",
+]
+
 class LifespanClients:
     _instance = None
 
@@ -39,19 +56,37 @@ class LifespanClients:
         logger.info("Initializing LifespanServices.")
 
         self.mongo_db = MongoDBClient.get_instance()
+        # Pooled non-blocking MongoDB client for the async request path
+        self.mongo_db_async = AsyncMongoDBClient.get_instance()
         self.langfuse_manager = LangfuseManager.get_instance()
         self.langfuse_manager_sensitive = LangfuseManagerSensitive.get_instance()
         self.langfuse_manager_redacted = LangfuseManagerRedacted.get_instance()
+        self.langfuse_manager.preload_prompts(_CORE_PROMPTS)
+        # Read with LANGFUSE_LABEL by the agents and tools
+        self.langfuse_manager.preload_prompts(_CORE_LABELED_PROMPTS, label=os.getenv("LANGFUSE_LABEL", "dev"))
+        # Fetch the preloaded prompts and refresh those loaded from the snapshots of previous workers
+        for langfuse_manager in self._langfuse_managers():
+            langfuse_manager.prompt_store.start()
 
         self.synapse = SynapseClient.get_instance()
+        # Pooled SQLAlchemy engines of the text-to-SQL tools, per connection profile
+        self.sql_engines = SQLEngineRegistry.get_instance()
         self.azure_openai = AzureOpenAIClient()
         self.redis = RedisClient.get_instance()        
+        # Pooled non-blocking Redis client for the async request path
+        self.redis_async = AsyncRedisClient.get_instance()
         
         # SPN-based keyless authentication for Azure Blob Storage
         self.blob_service = BlobServiceClient.from_connection_string(os.getenv("AZURE_BLOB_STORAGE_CONNECTION_STRING"))
         self.container = self.blob_service.get_container_client(container=os.getenv("AZURE_BLOB_STORAGE_CONTAINER_NAME", "lambots"))
         
         self.azure_ai_foundry_agent = AzureAIFoundryAgentClient.get_instance()
+
+        # Pooled HTTP client shared by all Azure AI Search retrievers
+        self.azure_ai_search = AzureAISearchClient.get_instance()
+
+        # Batched shipper of the trace and exception logs of the metrics API
+        self.telemetry = TelemetryShipper.get_instance()
         
         logger.info("LifespanServices instantiated successfully.")
         self._initialized = True
@@ -65,16 +100,27 @@ class LifespanClients:
             cls._instance = LifespanClients()
         return cls._instance
 
+    def _langfuse_managers(self) -> list:
+        return [self.langfuse_manager, self.langfuse_manager_sensitive, self.langfuse_manager_redacted]
+
     async def shutdown(self) -> None:
         """
         Shut down the services gracefully.
         """
         logger.info("Shutting down LifespanServices.")
         self.mongo_db.shutdown()
+        await self.mongo_db_async.shutdown()
         self.synapse.shutdown()
+        self.sql_engines.shutdown()
         self.azure_openai.shutdown()
         self.redis.shutdown()
+        await self.redis_async.shutdown()
         self.blob_service.close()
         self.container.close()
         self.azure_ai_foundry_agent.shutdown()
+        await self.azure_ai_search.shutdown()
+        for langfuse_manager in self._langfuse_managers():
+            langfuse_manager.prompt_store.stop()
+        # Send the queued logs within the telemetry shutdown timeout
+        await asyncio.to_thread(self.telemetry.shutdown)
         logger.info("LifespanServices shut down.")
\ No newline at end of file
@@ -1,7 +1,7 @@
 import os
 
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 load_dotenv()
 
 
@@ -37,3 +37,51 @@ class MongoDBClient:
         if self._client:
             self._client.close()
             self._client = None
+
+
+class AsyncMongoDBClient:
+    """
+    Asynchronous counterpart of MongoDBClient for the request path running on the event loop.
+
+    Backed by the asyncio driver of PyMongo, so queries never block the loop or hold a threadpool slot.
+    The client is bound to the event loop it is first used on, i.e. the loop of the application.
+
+    Environment Variables:
+    - MONGO_MAX_POOL_SIZE: Maximum number of connections per server (default: 100).
+    - MONGO_MIN_POOL_SIZE: Number of connections kept open per server (default: 10).
+    - MONGO_MAX_IDLE_TIME_MS: Time after which an idle connection is closed (default: 300000).
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of AsyncMongoDBClient."""
+        if cls._instance is None:
+            cls._instance = AsyncMongoDBClient(
+                mongodb_url=os.getenv("MONGO_DB_ENDPOINT"),
+                mongodb_name=os.getenv("MONGODB_DB_NAME"),
+            )
+        return cls._instance
+
+    def __init__(self, mongodb_url: str, mongodb_name: str) -> None:
+        """
+        Initializes the AsyncMongoClient with a connection pool sized from environment variables.
+        Connections are opened lazily on first use.
+        """
+        self._client = AsyncMongoClient(
+            mongodb_url,
+            maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+            minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+            maxIdleTimeMS=int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+        )
+
+        self.database = self._client[mongodb_name]
+
+    async def shutdown(self):
+        """
+        Shuts down the MongoDB client by closing its connection pool.
+        """
+        if self._client:
+            await self._client.close()
+            self._client = None
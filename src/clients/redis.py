@@ -1,7 +1,9 @@
 """
 RedisClient for managing Redis connections and operations.
 
-This module provides a singleton RedisClient class that connects to a Redis server.
+This module provides a singleton RedisClient class that connects to a Redis server, and a singleton
+AsyncRedisClient backed by `redis.asyncio` for the async request path, so cache lookups do not block
+the event loop.
 
 It uses environment variables to configure the connection parameters, including host, port, and password.
 If Redis is disabled or unavailable, a mock client is used instead.
@@ -12,15 +14,19 @@ Environment Variables:
 - REDIS_INSTANCE_SECRET: The password for the Redis server (if required).
 - REDIS_TLS_ENABLED: Whether to use TLS (default: True). This is optional.
 - REDIS_DISABLED: Whether to disable Redis (default: False). This is optional
+- REDIS_MAX_CONNECTIONS: Maximum number of pooled connections of the async client (default: 50). This is optional
 
 Note: We have an abstraction here for get and set. If we decide to use lists or sets in the future, we can add those methods here as well.
 
 """
 
 import os
+import time
 import redis
+import redis.asyncio
 import json
 import logging
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -36,7 +42,7 @@ class MockRedisClient:
         self.reason = reason
         logger.error(f"Using MockRedisClient: {reason}")
         
-    def set_with_expiry(self, key, value, expiry_seconds=3600):
+    def set_with_expiry(self, key, value, expiry_seconds=3600, tags=None):
         logger.info(f"Mock Redis: Would set key '{key}' and value '{value}' (expiry: {expiry_seconds}s) - {self.reason}")
         return True
 
@@ -51,11 +57,114 @@ class MockRedisClient:
     def get(self, key):
         logger.info(f"Mock Redis: Would get key '{key}' - {self.reason}")
         return None
+
+    def get_many(self, keys):
+        logger.info(f"Mock Redis: Would get keys {keys} - {self.reason}")
+        return [None] * len(keys)
+
+    def set_many_with_expiry(self, mapping, expiry_seconds=3600, tags=None):
+        logger.info(f"Mock Redis: Would set keys {list(mapping)} (expiry: {expiry_seconds}s) - {self.reason}")
+        return True
+
+    def delete_many(self, keys):
+        logger.info(f"Mock Redis: Would delete keys {keys} - {self.reason}")
+        return len(keys)
+
+    def delete_tagged(self, tags, batch_size=500):
+        logger.info(f"Mock Redis: Would delete keys tagged {tags} - {self.reason}")
+        return 0
+
+    def delete_matching(self, pattern, batch_size=500):
+        logger.info(f"Mock Redis: Would delete keys matching '{pattern}' - {self.reason}")
+        return 0
+
+    def get_with_ttl(self, key):
+        logger.info(f"Mock Redis: Would get key '{key}' with its TTL - {self.reason}")
+        return None, None
+
+    def publish(self, channel, message):
+        logger.info(f"Mock Redis: Would publish to channel '{channel}' - {self.reason}")
+        return 0
+
+    def subscribe(self, channel, handler):
+        logger.info(f"Mock Redis: Would subscribe to channel '{channel}' - {self.reason}")
+        return None
         
     def shutdown(self):
         logger.info("Mock Redis: Shutdown called - no action needed")
         return True
 
+def _get_connection_params() -> Optional[Dict[str, Any]]:
+    """
+    Build the Redis connection parameters from environment variables.
+
+    Returns:
+        dict: The connection parameters, or None if Redis is disabled.
+
+    Raises:
+        ValueError: If the host or port is missing.
+    """
+    # Check if Redis is explicitly disabled
+    redis_disabled = os.getenv("REDIS_DISABLED", "False").lower() in ("true", "1", "t", "yes")
+    if redis_disabled:
+        return None
+
+    # Get Redis connection details from environment variables
+    redis_host = os.getenv("REDIS_INSTANCE_HOSTNAME")
+    redis_port = os.getenv("REDIS_INSTANCE_PORT")
+    redis_password = os.getenv("REDIS_INSTANCE_SECRET")
+
+    # Check if TLS should be enabled (default to True if not specified)
+    redis_tls_enabled = os.getenv("REDIS_TLS_ENABLED", "True").lower() in ("true", "1", "t", "yes")
+
+    # Validate essential environment variables
+    if not all([redis_host, redis_port]):
+        raise ValueError("Redis host and port environment variables must be provided.")
+
+    # Create Redis client with or without password
+    connection_params = {
+        "host": redis_host,
+        "port": int(redis_port),
+        "decode_responses": True
+    }
+
+    # Add password if provided
+    if redis_password:
+        connection_params["password"] = redis_password
+        # Username is required when using password authentication with Azure Redis
+        connection_params["username"] = "default"
+
+    # Add SSL/TLS if enabled
+    if redis_tls_enabled:
+        connection_params["ssl"] = True
+
+    return connection_params
+
+
+# Tag sets are sorted sets of keys scored by their expiry time. Every write prunes the expired members,
+# so a tag set only grows with live keys, and only ever extends the TTL of the set, so it outlives
+# the keys it tracks. Plain commands only, so it runs on Redis 6.
+_TAG_KEY_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+if redis.call('TTL', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+"""
+
+
+def _tag_key_args(key: str, tags: List[str], expiry_seconds: int):
+    """Yield the tag set and the script arguments that add the key to it, one tag set per script call."""
+    now = time.time()
+    for tag in tags:
+        yield tag, [now, now + expiry_seconds, expiry_seconds, key]
+
+
+def _batched(items: List[str], batch_size: int):
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
 class RedisClient:
     _instance = None
     _last_error = None
@@ -78,45 +187,18 @@ class RedisClient:
         if hasattr(self, '_initialized') and self._initialized:
             return
         
-        # Check if Redis is explicitly disabled
-        redis_disabled = os.getenv("REDIS_DISABLED", "False").lower() in ("true", "1", "t", "yes")
-        if redis_disabled:
-            self._use_mock_client("Redis is disabled via REDIS_DISABLED env var. Set to 'False' to enable Redis.")
+        try:
+            connection_params = _get_connection_params()
+        except ValueError as e:
+            self._use_mock_client(str(e))
             return
-            
-        # Get Redis connection details from environment variables
-        redis_host = os.getenv("REDIS_INSTANCE_HOSTNAME")
-        redis_port = os.getenv("REDIS_INSTANCE_PORT")
-        redis_password = os.getenv("REDIS_INSTANCE_SECRET")
-        
-        # Check if TLS should be enabled (default to True if not specified)
-        redis_tls_enabled = os.getenv("REDIS_TLS_ENABLED", "True").lower() in ("true", "1", "t", "yes")
-        
-        # Validate essential environment variables
-        if not all([redis_host, redis_port]):
-            error_msg = "Redis host and port environment variables must be provided."
-            self._use_mock_client(error_msg)
+        if connection_params is None:
+            self._use_mock_client("Redis is disabled via REDIS_DISABLED env var. Set to 'False' to enable Redis.")
             return
-        
+
         try:
-            # Create Redis client with or without password
-            connection_params = {
-                "host": redis_host,
-                "port": int(redis_port),
-                "decode_responses": True
-            }
-            
-            # Add password if provided
-            if redis_password:
-                connection_params["password"] = redis_password
-                # Username is required when using password authentication with Azure Redis
-                connection_params["username"] = "default"
-                
-            # Add SSL/TLS if enabled
-            if redis_tls_enabled:
-                connection_params["ssl"] = True
-                
             self._redis = redis.Redis(**connection_params)
+            self._tag_key = self._redis.register_script(_TAG_KEY_SCRIPT)
                 
             # Test connection
             self._redis.ping()
@@ -150,7 +232,7 @@ class RedisClient:
             logger.info("RedisClient shutdown completed.")
         return True
 
-    def set_with_expiry(self, key, value, expiry_seconds=3600):
+    def set_with_expiry(self, key, value, expiry_seconds=3600, tags=None):
         """
         Set a value in Redis with an expiration time.
         
@@ -158,16 +240,23 @@ class RedisClient:
             key (str): The key to set
             value (any): The value to set
             expiry_seconds (int): The expiration time in seconds (default: 1 hour)
+            tags (List[str], optional): Tag sets to add the key to, so it can be invalidated with `delete_tagged`
             
         Returns:
             bool: True if successful, False otherwise
         """
         if self._using_mock:
-            return self._mock.set_with_expiry(key, value, expiry_seconds)
+            return self._mock.set_with_expiry(key, value, expiry_seconds, tags)
             
         try:
             serialized_value = json.dumps(value)
-            success = self._redis.setex(key, expiry_seconds, serialized_value)
+            if tags:
+                pipeline = self._redis.pipeline(transaction=False)
+                pipeline.setex(key, expiry_seconds, serialized_value)
+                self._queue_tags(pipeline, key, tags, expiry_seconds)
+                success = pipeline.execute()[0]
+            else:
+                success = self._redis.setex(key, expiry_seconds, serialized_value)
             if success:
                 logger.debug(f"Successfully set Redis key: {key}")
             return success
@@ -240,3 +329,557 @@ class RedisClient:
         except Exception as e:
             logger.warning(f"Failed to get Redis key {key}: {e}")
             return None
+
+    def get_many(self, keys: List[str]) -> List[Any]:
+        """
+        Get several values from Redis in a single pipelined round trip.
+
+        Args:
+            keys (List[str]): The keys to get
+
+        Returns:
+            list: The values in the order of the keys, None for missing keys
+        """
+        if not keys:
+            return []
+        if self._using_mock:
+            return self._mock.get_many(keys)
+
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for key in keys:
+                pipeline.get(key)
+            return [json.loads(result) if result else None for result in pipeline.execute()]
+        except Exception as e:
+            logger.warning(f"Failed to get Redis keys {keys}: {e}")
+            return [None] * len(keys)
+
+    def set_many_with_expiry(self, mapping: Dict[str, Any], expiry_seconds=3600, tags: Optional[Dict[str, List[str]]] = None):
+        """
+        Set several values in Redis with an expiration time in a single pipelined round trip.
+
+        Args:
+            mapping (Dict[str, Any]): The keys and values to set
+            expiry_seconds (int): The expiration time in seconds (default: 1 hour)
+            tags (Dict[str, List[str]], optional): The tag sets to add each key to
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not mapping:
+            return True
+        if self._using_mock:
+            return self._mock.set_many_with_expiry(mapping, expiry_seconds, tags)
+
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipeline.setex(key, expiry_seconds, json.dumps(value))
+            for key, key_tags in (tags or {}).items():
+                self._queue_tags(pipeline, key, key_tags, expiry_seconds)
+            return all(pipeline.execute()[:len(mapping)])
+        except Exception as e:
+            logger.warning(f"Failed to set Redis keys {list(mapping)}: {e}")
+            return False
+
+    def _queue_tags(self, pipeline, key: str, tags: List[str], expiry_seconds: int) -> None:
+        for tag, args in _tag_key_args(key, tags, expiry_seconds):
+            self._tag_key(keys=[tag], args=args, client=pipeline)
+
+    def delete_many(self, keys: List[str], batch_size=500) -> int:
+        """
+        Delete several keys from Redis with UNLINK, which frees memory in the background.
+        Keys are sent in pipelined batches.
+
+        Args:
+            keys (List[str]): The keys to delete
+            batch_size (int): The number of keys per UNLINK command
+
+        Returns:
+            int: The number of deleted keys
+        """
+        if not keys:
+            return 0
+        if self._using_mock:
+            return self._mock.delete_many(keys)
+
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            for batch in _batched(keys, batch_size):
+                pipeline.unlink(*batch)
+            return sum(pipeline.execute())
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis keys {keys}: {e}")
+            return 0
+
+    def delete_tagged(self, tags: List[str], batch_size=500) -> int:
+        """
+        Delete all keys tracked by the given tag sets, and the tag sets themselves.
+
+        Members are popped atomically in batches, so keys tagged during the invalidation are either
+        deleted or remain tracked for the next one. The cost is proportional to the number of tagged
+        keys, not to the size of the keyspace.
+
+        Args:
+            tags (List[str]): The tag sets to invalidate
+            batch_size (int): The number of keys popped and unlinked per round trip
+
+        Returns:
+            int: The number of deleted keys
+        """
+        if self._using_mock:
+            return self._mock.delete_tagged(tags, batch_size)
+
+        deleted = 0
+        try:
+            for tag in tags:
+                while True:
+                    members = self._redis.zpopmin(tag, batch_size)
+                    if not members:
+                        break
+                    deleted += self._redis.unlink(*[member for member, _ in members])
+            return deleted
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis keys tagged {tags}: {e}")
+            return deleted
+
+    def delete_matching(self, pattern: str, batch_size=500) -> int:
+        """
+        Delete all keys matching a pattern, walking the keyspace incrementally with SCAN instead of
+        blocking Redis with KEYS. Matches are unlinked in batches as they are found.
+
+        Args:
+            pattern (str): The pattern to match keys
+            batch_size (int): The SCAN count hint and the number of keys per UNLINK command
+
+        Returns:
+            int: The number of deleted keys
+        """
+        if self._using_mock:
+            return self._mock.delete_matching(pattern, batch_size)
+
+        deleted = 0
+        batch = []
+        try:
+            for key in self._redis.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += self._redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += self._redis.unlink(*batch)
+            return deleted
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis keys matching {pattern}: {e}")
+            return deleted
+
+    def get_with_ttl(self, key):
+        """
+        Get a value from Redis together with its remaining time to live, in a single round trip.
+
+        Args:
+            key (str): The key to get
+
+        Returns:
+            tuple: The value (None if missing) and the remaining TTL in seconds (None if missing or without expiry)
+        """
+        if self._using_mock:
+            return self._mock.get_with_ttl(key)
+
+        try:
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.get(key)
+            pipeline.ttl(key)
+            result, ttl = pipeline.execute()
+            return (json.loads(result) if result else None), (ttl if ttl and ttl > 0 else None)
+        except Exception as e:
+            logger.warning(f"Failed to get Redis key {key}: {e}")
+            return None, None
+
+    def publish(self, channel, message):
+        """
+        Publish a message on a channel.
+
+        Args:
+            channel (str): The channel to publish on
+            message (any): The JSON-serializable message
+
+        Returns:
+            int: The number of subscribers that received the message
+        """
+        if self._using_mock:
+            return self._mock.publish(channel, message)
+
+        try:
+            return self._redis.publish(channel, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Failed to publish to Redis channel {channel}: {e}")
+            return 0
+
+    def subscribe(self, channel, handler):
+        """
+        Subscribe to a channel and handle its messages in a background thread.
+
+        Args:
+            channel (str): The channel to subscribe to
+            handler (Callable): Called with each decoded message
+
+        Returns:
+            The worker thread (stop it with `.stop()`), or None if the subscription failed
+        """
+        if self._using_mock:
+            return self._mock.subscribe(channel, handler)
+
+        def on_message(message):
+            try:
+                handler(json.loads(message["data"]))
+            except Exception as e:
+                logger.warning(f"Failed to handle message on Redis channel {channel}: {e}")
+
+        try:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{channel: on_message})
+            return pubsub.run_in_thread(sleep_time=1, daemon=True)
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to Redis channel {channel}: {e}")
+            return None
+
+
+class AsyncRedisClient:
+    """
+    Asynchronous counterpart of RedisClient for coroutines running on the event loop.
+
+    Connections are taken from a pool shared by all requests of the worker. Like RedisClient, failures
+    are logged and reported as cache misses rather than raised, and a mock client is used if Redis is
+    disabled or not configured.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of AsyncRedisClient.
+        If Redis is disabled or not configured, a mock client will be used.
+        """
+        if cls._instance is None:
+            cls._instance = AsyncRedisClient()
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initialize the AsyncRedisClient with a connection pool configured from environment variables.
+        Connections are opened lazily on first use.
+        """
+        if hasattr(self, '_initialized') and self._initialized:
+            return
+
+        try:
+            connection_params = _get_connection_params()
+        except ValueError as e:
+            self._use_mock_client(str(e))
+            return
+        if connection_params is None:
+            self._use_mock_client("Redis is disabled via REDIS_DISABLED env var. Set to 'False' to enable Redis.")
+            return
+
+        ssl = connection_params.pop("ssl", False)
+        connection_class = redis.asyncio.SSLConnection if ssl else redis.asyncio.Connection
+        self._pool = redis.asyncio.ConnectionPool(
+            connection_class=connection_class,
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            **connection_params,
+        )
+        self._redis = redis.asyncio.Redis(connection_pool=self._pool)
+        self._tag_key = self._redis.register_script(_TAG_KEY_SCRIPT)
+        logger.info("AsyncRedisClient initialized successfully.")
+        self._initialized = True
+        self._using_mock = False
+
+    def _use_mock_client(self, reason):
+        """
+        Set up a mock client with the given reason.
+        """
+        self._mock = MockRedisClient(reason)
+        self._initialized = True
+        self._using_mock = True
+
+    async def shutdown(self):
+        """
+        Close the connection pool if it exists.
+        """
+        if not self._using_mock:
+            await self._redis.aclose()
+            logger.info("AsyncRedisClient shutdown completed.")
+        return True
+
+    async def set_with_expiry(self, key, value, expiry_seconds=3600, tags=None):
+        """
+        Set a value in Redis with an expiration time.
+
+        Args:
+            key (str): The key to set
+            value (any): The value to set
+            expiry_seconds (int): The expiration time in seconds (default: 1 hour)
+            tags (List[str], optional): Tag sets to add the key to, so it can be invalidated with `delete_tagged`
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if self._using_mock:
+            return self._mock.set_with_expiry(key, value, expiry_seconds, tags)
+
+        try:
+            if tags:
+                async with self._redis.pipeline(transaction=False) as pipeline:
+                    pipeline.setex(key, expiry_seconds, json.dumps(value))
+                    await self._queue_tags(pipeline, key, tags, expiry_seconds)
+                    results = await pipeline.execute()
+                return results[0]
+            return await self._redis.setex(key, expiry_seconds, json.dumps(value))
+        except Exception as e:
+            logger.warning(f"Failed to set Redis key {key}: {e}")
+            return False
+
+    async def _queue_tags(self, pipeline, key: str, tags: List[str], expiry_seconds: int) -> None:
+        for tag, args in _tag_key_args(key, tags, expiry_seconds):
+            # Only queues the script on the pipeline, which loads it on execute
+            await self._tag_key(keys=[tag], args=args, client=pipeline)
+
+    async def get(self, key):
+        """
+        Get a value from Redis.
+
+        Args:
+            key (str): The key to get
+
+        Returns:
+            any: The value if successful, None otherwise
+        """
+        if self._using_mock:
+            return self._mock.get(key)
+
+        try:
+            result = await self._redis.get(key)
+            return json.loads(result) if result else None
+        except Exception as e:
+            logger.warning(f"Failed to get Redis key {key}: {e}")
+            return None
+
+    async def delete(self, key):
+        """
+        Delete a key from Redis.
+
+        Args:
+            key (str): The key to delete.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        if self._using_mock:
+            return self._mock.delete(key)
+
+        try:
+            return await self._redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis key {key}: {e}")
+            return False
+
+    async def keys(self, pattern="*"):
+        """
+        Get all keys matching the given pattern from Redis.
+
+        Args:
+            pattern (str): The pattern to match keys (default: "*")
+
+        Returns:
+            list: A list of matching keys, or an empty list if none found
+        """
+        if self._using_mock:
+            return self._mock.keys(pattern)
+
+        try:
+            return await self._redis.keys(pattern)
+        except Exception as e:
+            logger.warning(f"Failed to get Redis keys: {e}")
+            return []
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        """
+        Get several values from Redis in a single pipelined round trip.
+
+        Args:
+            keys (List[str]): The keys to get
+
+        Returns:
+            list: The values in the order of the keys, None for missing keys
+        """
+        if not keys:
+            return []
+        if self._using_mock:
+            return self._mock.get_many(keys)
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.get(key)
+                results = await pipeline.execute()
+            return [json.loads(result) if result else None for result in results]
+        except Exception as e:
+            logger.warning(f"Failed to get Redis keys {keys}: {e}")
+            return [None] * len(keys)
+
+    async def set_many_with_expiry(self, mapping: Dict[str, Any], expiry_seconds=3600, tags: Optional[Dict[str, List[str]]] = None):
+        """
+        Set several values in Redis with an expiration time in a single pipelined round trip.
+
+        Args:
+            mapping (Dict[str, Any]): The keys and values to set
+            expiry_seconds (int): The expiration time in seconds (default: 1 hour)
+            tags (Dict[str, List[str]], optional): The tag sets to add each key to
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not mapping:
+            return True
+        if self._using_mock:
+            return self._mock.set_many_with_expiry(mapping, expiry_seconds, tags)
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for key, value in mapping.items():
+                    pipeline.setex(key, expiry_seconds, json.dumps(value))
+                for key, key_tags in (tags or {}).items():
+                    await self._queue_tags(pipeline, key, key_tags, expiry_seconds)
+                results = await pipeline.execute()
+            return all(results[:len(mapping)])
+        except Exception as e:
+            logger.warning(f"Failed to set Redis keys {list(mapping)}: {e}")
+            return False
+
+    async def delete_many(self, keys: List[str], batch_size=500) -> int:
+        """
+        Delete several keys from Redis with UNLINK in pipelined batches.
+
+        Args:
+            keys (List[str]): The keys to delete
+            batch_size (int): The number of keys per UNLINK command
+
+        Returns:
+            int: The number of deleted keys
+        """
+        if not keys:
+            return 0
+        if self._using_mock:
+            return self._mock.delete_many(keys)
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for batch in _batched(keys, batch_size):
+                    pipeline.unlink(*batch)
+                results = await pipeline.execute()
+            return sum(results)
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis keys {keys}: {e}")
+            return 0
+
+    async def delete_tagged(self, tags: List[str], batch_size=500) -> int:
+        """
+        Delete all keys tracked by the given tag sets, and the tag sets themselves.
+        See `RedisClient.delete_tagged`.
+
+        Args:
+            tags (List[str]): The tag sets to invalidate
+            batch_size (int): The number of keys popped and unlinked per round trip
+
+        Returns:
+            int: The number of deleted keys
+        """
+        if self._using_mock:
+            return self._mock.delete_tagged(tags, batch_size)
+
+        deleted = 0
+        try:
+            for tag in tags:
+                while True:
+                    members = await self._redis.zpopmin(tag, batch_size)
+                    if not members:
+                        break
+                    deleted += await self._redis.unlink(*[member for member, _ in members])
+            return deleted
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis keys tagged {tags}: {e}")
+            return deleted
+
+    async def delete_matching(self, pattern: str, batch_size=500) -> int:
+        """
+        Delete all keys matching a pattern with SCAN and batched UNLINK.
+        See `RedisClient.delete_matching`.
+
+        Args:
+            pattern (str): The pattern to match keys
+            batch_size (int): The SCAN count hint and the number of keys per UNLINK command
+
+        Returns:
+            int: The number of deleted keys
+        """
+        if self._using_mock:
+            return self._mock.delete_matching(pattern, batch_size)
+
+        deleted = 0
+        batch = []
+        try:
+            async for key in self._redis.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += await self._redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self._redis.unlink(*batch)
+            return deleted
+        except Exception as e:
+            logger.warning(f"Failed to delete Redis keys matching {pattern}: {e}")
+            return deleted
+
+    async def get_with_ttl(self, key):
+        """
+        Get a value from Redis together with its remaining time to live, in a single round trip.
+
+        Args:
+            key (str): The key to get
+
+        Returns:
+            tuple: The value (None if missing) and the remaining TTL in seconds (None if missing or without expiry)
+        """
+        if self._using_mock:
+            return self._mock.get_with_ttl(key)
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.get(key)
+                pipeline.ttl(key)
+                result, ttl = await pipeline.execute()
+            return (json.loads(result) if result else None), (ttl if ttl and ttl > 0 else None)
+        except Exception as e:
+            logger.warning(f"Failed to get Redis key {key}: {e}")
+            return None, None
+
+    async def publish(self, channel, message):
+        """
+        Publish a message on a channel.
+
+        Args:
+            channel (str): The channel to publish on
+            message (any): The JSON-serializable message
+
+        Returns:
+            int: The number of subscribers that received the message
+        """
+        if self._using_mock:
+            return self._mock.publish(channel, message)
+
+        try:
+            return await self._redis.publish(channel, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Failed to publish to Redis channel {channel}: {e}")
+            return 0
@@ -0,0 +1,213 @@
+"""
+Per-worker registry of pooled SQLAlchemy engines, keyed by connection profile.
+
+The text-to-SQL tools used to create a new engine, and therefore a new ODBC connection with an AAD
+password login to Synapse, for every question. The registry creates one engine per connection profile
+for the lifetime of the worker, with
+- a bounded connection pool (pool size plus overflow), waiting at most SQL_ENGINE_POOL_TIMEOUT_SECONDS,
+- pre-ping, so connections dropped by Synapse are replaced before a query fails on them,
+- recycling of the connections older than SQL_ENGINE_POOL_RECYCLE_SECONDS,
+- a warm-up of the profiles in SQL_ENGINE_WARMUP at worker start, so the first question does not pay
+  for the login.
+
+The time it takes to acquire a connection from a pool (waiting for a free connection, and logging in
+when a new one is opened) is recorded per profile and reported by `get_stats`. Slow acquisitions are
+logged.
+
+Environment Variables:
+- SQL_ENGINE_POOL_SIZE: Connections kept open per profile (default: 5).
+- SQL_ENGINE_MAX_OVERFLOW: Connections opened beyond the pool size under load (default: 5).
+- SQL_ENGINE_POOL_TIMEOUT_SECONDS: Maximum wait for a connection (default: 30).
+- SQL_ENGINE_POOL_RECYCLE_SECONDS: Age after which a connection is replaced (default: 1800).
+- SQL_ENGINE_WARMUP: Comma-separated profiles connected at worker start (default: none).
+- SQL_ENGINE_SLOW_ACQUIRE_MS: Acquisition time logged as slow (default: 1000).
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import quote_plus
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+logger = logging.getLogger(__name__)
+
+
+def _synapse_connection_url(env_prefix: str) -> str:
+    """Build the pyodbc URL of a Synapse database from the {env_prefix}_SERVER, _DATABASE, _USERNAME and _SECRET variables."""
+    server = os.getenv(f"{env_prefix}_SERVER")
+    database = os.getenv(f"{env_prefix}_DATABASE")
+    username = os.getenv(f"{env_prefix}_USERNAME")
+    password = os.getenv(f"{env_prefix}_SECRET")
+    if not all([server, database, username, password]):
+        raise ValueError(f"{env_prefix} environment variables must be provided.")
+
+    params = (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};UID={username};PWD={password};"
+        "AUTHENTICATION=ActiveDirectoryPassword;Connection Timeout=60"
+    )
+    return f"mssql+pyodbc:///?odbc_connect={quote_plus(params)}&timeout=30"
+
+
+# Connection profiles: name -> URL factory, evaluated when the engine is first created
+PROFILES: Dict[str, Callable[[], str]] = {
+    # Text-to-SQL reader (ETS, NCE): dev for dev, qa for qa, and prod for prod
+    "synapse_reader": lambda: _synapse_connection_url("OPENAI_SYNAPSE_READER"),
+}
+
+
+class AcquireLatency:
+    """Connection acquisition times of a pool."""
+
+    def __init__(self, profile: str, slow_threshold: float, window: int = 1024):
+        self.profile = profile
+        self.slow_threshold = slow_threshold
+        self._recent = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._recent.append(seconds)
+            self._count += 1
+            self._total += seconds
+            self._max = max(self._max, seconds)
+        if seconds >= self.slow_threshold:
+            logger.warning(f"Acquiring a {self.profile} connection took {seconds * 1000:.0f} ms")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, maximum = self._count, self._total, self._max
+        return {
+            "acquires": count,
+            "avg_ms": total / count * 1000 if count else 0.0,
+            "p95_ms": recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000 if recent else 0.0,
+            "max_ms": maximum * 1000,
+        }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a connection, login included."""
+
+    acquire_latency: Optional[AcquireLatency] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.acquire_latency is not None:
+                self.acquire_latency.record(time.perf_counter() - start)
+
+
+class SQLEngineRegistry:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of SQLEngineRegistry.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = SQLEngineRegistry()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self.pool_size = int(os.getenv("SQL_ENGINE_POOL_SIZE", "5"))
+        self.max_overflow = int(os.getenv("SQL_ENGINE_MAX_OVERFLOW", "5"))
+        self.pool_timeout = float(os.getenv("SQL_ENGINE_POOL_TIMEOUT_SECONDS", "30"))
+        self.pool_recycle = int(os.getenv("SQL_ENGINE_POOL_RECYCLE_SECONDS", "1800"))
+        self.slow_acquire = float(os.getenv("SQL_ENGINE_SLOW_ACQUIRE_MS", "1000")) / 1000
+        self._engines: Dict[str, Engine] = {}
+        self._latencies: Dict[str, AcquireLatency] = {}
+        self._lock = threading.Lock()
+        self._initialized = True
+
+    def get_engine(self, profile: str) -> Engine:
+        """
+        Get the engine of a connection profile, created on first use.
+
+        Args:
+            profile (str): The name of the connection profile, a key of PROFILES.
+
+        Returns:
+            Engine: The pooled engine shared by the requests of this worker.
+
+        Raises:
+            KeyError: If the profile is unknown.
+            ValueError: If the environment variables of the profile are missing.
+        """
+        engine = self._engines.get(profile)
+        if engine is not None:
+            return engine
+        with self._lock:
+            if profile not in self._engines:
+                self._engines[profile] = self._create_engine(profile)
+            return self._engines[profile]
+
+    def _create_engine(self, profile: str) -> Engine:
+        latency = AcquireLatency(profile, self.slow_acquire)
+        # The pool class carries the latency of its profile, also for the pools it is recreated as
+        poolclass = type(f"TimedQueuePool[{profile}]", (TimedQueuePool,), {"acquire_latency": latency})
+        engine = create_engine(
+            PROFILES[profile](),
+            poolclass=poolclass,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=True,
+        )
+        self._latencies[profile] = latency
+        logger.info(f"SQL engine created for the {profile} profile.")
+        return engine
+
+    def warm_up(self) -> None:
+        """
+        Open a connection for each profile of SQL_ENGINE_WARMUP. Failures are logged, the profile connects on first use.
+        """
+        profiles = [profile.strip() for profile in os.getenv("SQL_ENGINE_WARMUP", "").split(",") if profile.strip()]
+        for profile in profiles:
+            try:
+                with self.get_engine(profile).connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                logger.info(f"SQL engine of the {profile} profile warmed up.")
+            except Exception as e:
+                logger.warning(f"Failed to warm up the SQL engine of the {profile} profile: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the connection acquisition times and the pool status of each profile.
+        """
+        return {
+            profile: {**self._latencies[profile].get_stats(), "pool": engine.pool.status()}
+            for profile, engine in list(self._engines.items())
+        }
+
+    def shutdown(self) -> None:
+        """
+        Close the pooled connections of every profile.
+        """
+        if self._engines:
+            logger.info(f"SQL engine statistics: {self.get_stats()}")
+        for engine in self._engines.values():
+            engine.dispose()
+        self._engines.clear()
+        logger.info("SQLEngineRegistry shutdown completed.")
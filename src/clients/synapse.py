@@ -1,14 +1,49 @@
+"""
+Pooled client of the Synapse SQL database.
+
+The client used to share one connection and one cursor across the whole worker, so concurrent
+queries (e.g. access control lookups from the threadpool routes) were serialized at best and
+interleaved on the cursor at worst. It now keeps a pool of connections:
+- every query checks out a connection for its own cursor, waiting at most SYNAPSE_POOL_TIMEOUT_SECONDS,
+- connections idle for more than SYNAPSE_HEALTH_CHECK_SECONDS are checked before use,
+- a connection failing with a connection error is discarded and the query is retried once on a new one,
+- queries are cancelled after SYNAPSE_QUERY_TIMEOUT_SECONDS,
+- queries take parameters (`?` placeholders), passed to the driver instead of being formatted into the SQL.
+
+`aexecute_query` runs queries on a dedicated executor sized to the pool, so they do not compete with
+the other blocking work of the event loop.
+
+Environment Variables:
+- OPENAI_SYNAPSE_SERVER, OPENAI_SYNAPSE_DATABASE, OPENAI_SYNAPSE_USERNAME, OPENAI_SYNAPSE_SECRET: Synapse credentials.
+- SYNAPSE_POOL_SIZE: Maximum number of open connections (default: 4).
+- SYNAPSE_POOL_TIMEOUT_SECONDS: Maximum wait for a free connection (default: 30).
+- SYNAPSE_QUERY_TIMEOUT_SECONDS: Maximum run time of a query, 0 for none (default: 60).
+- SYNAPSE_HEALTH_CHECK_SECONDS: Idle time after which a connection is checked before use (default: 300).
+"""
+
 import pyodbc
 import os
+import time
+import asyncio
 import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional, Sequence
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
 logger = logging.getLogger(__name__)
 
+# Errors after which a connection is no longer usable
+_CONNECTION_ERRORS = (pyodbc.OperationalError, pyodbc.InterfaceError)
+
+
 class SynapseClient:
     _instance = None
+    _instance_lock = threading.Lock()
 
     @classmethod
     def get_instance(cls):
@@ -16,12 +51,14 @@ class SynapseClient:
         Retrieve the singleton instance of SynapseClient.
         """
         if cls._instance is None:
-            cls._instance = SynapseClient()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = SynapseClient()
         return cls._instance
 
     def __init__(self):
         """
-        Initialize the SynapseClient with a connection and cursor.
+        Initialize the SynapseClient and open the first connection of its pool.
         """
         if hasattr(self, '_initialized') and self._initialized:
             logger.info("SynapseClient is already initialized.")
@@ -33,16 +70,27 @@ class SynapseClient:
         password = os.getenv("OPENAI_SYNAPSE_SECRET")
         authentication = 'ActiveDirectoryPassword'
         driver = '{ODBC Driver 17 for SQL Server}'
-        
+
         if not all([server, database, username, password]):
             error_msg = "Synapse environment variables must be provided."
             logger.error(error_msg)
             raise ValueError(error_msg)
-        
-        params = f"DRIVER={driver};SERVER={server};DATABASE={database};UID={username};PWD={password};AUTHENTICATION={authentication}"
+
+        self._params = f"DRIVER={driver};SERVER={server};DATABASE={database};UID={username};PWD={password};AUTHENTICATION={authentication}"
+        self.pool_size = int(os.getenv("SYNAPSE_POOL_SIZE", "4"))
+        self.pool_timeout = float(os.getenv("SYNAPSE_POOL_TIMEOUT_SECONDS", "30"))
+        self.query_timeout = int(os.getenv("SYNAPSE_QUERY_TIMEOUT_SECONDS", "60"))
+        self.health_check_interval = float(os.getenv("SYNAPSE_HEALTH_CHECK_SECONDS", "300"))
+
+        # Idle connections with the time they were returned, most recently used last
+        self._idle = deque()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="synapse")
+        self._closed = False
+
         try:
-            self.connection = pyodbc.connect(params)
-            self.cursor = self.connection.cursor()
+            self._idle.append((self._connect(), time.monotonic()))
             logger.info("SynapseClient initialized successfully.")
         except Exception as e:
             logger.error(f"Failed to initialize SynapseClient: {e}")
@@ -50,30 +98,121 @@ class SynapseClient:
 
         self._initialized = True
 
-    def execute_query(self, query):
+    def _connect(self) -> "pyodbc.Connection":
+        connection = pyodbc.connect(self._params)
+        connection.timeout = self.query_timeout
+        return connection
+
+    @staticmethod
+    def _close(connection: "pyodbc.Connection") -> None:
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Failed to close a Synapse connection: {e}")
+
+    def _is_alive(self, connection: "pyodbc.Connection") -> bool:
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1").fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.info(f"Discarding a Synapse connection that failed its health check: {e}")
+            return False
+
+    def _checkout(self) -> "pyodbc.Connection":
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("SynapseClient is shut down.")
+                connection, last_used = self._idle.pop() if self._idle else (None, None)
+            if connection is None:
+                return self._connect()
+            if time.monotonic() - last_used < self.health_check_interval or self._is_alive(connection):
+                return connection
+            self._close(connection)
+
+    def _checkin(self, connection: "pyodbc.Connection") -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._close(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator["pyodbc.Connection"]:
+        """
+        Check out a connection of the pool, returned to the pool on exit or discarded after a connection error.
+
+        Raises:
+            TimeoutError: If no connection is free within the pool timeout.
+        """
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            raise TimeoutError(f"No Synapse connection was free within {self.pool_timeout} seconds.")
+        try:
+            connection = self._checkout()
+            try:
+                yield connection
+            except _CONNECTION_ERRORS:
+                self._close(connection)
+                raise
+            except BaseException:
+                self._checkin(connection)
+                raise
+            else:
+                self._checkin(connection)
+        finally:
+            self._slots.release()
+
+    def execute_query(self, query: str, params: Optional[Sequence[Any]] = None) -> List[tuple]:
         """
         Execute a SQL query and return the results.
 
         Args:
-            query (str): The SQL query to execute.
+            query (str): The SQL query to execute, with `?` placeholders for its parameters.
+            params (Sequence[Any], optional): The values of the placeholders.
 
         Returns:
             List[tuple]: The results of the query.
+
+        Raises:
+            TimeoutError: If no connection is free within the pool timeout.
+            pyodbc.Error: If the query fails, or fails twice on a connection error.
         """
-        try:
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error executing query: {e}")
-            return []
+        for attempt in range(2):
+            try:
+                with self.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        cursor.execute(query, *(params or ()))
+                        return cursor.fetchall()
+                    finally:
+                        cursor.close()
+            except _CONNECTION_ERRORS as e:
+                if attempt:
+                    logger.error(f"Error executing query: {e}")
+                    raise
+                logger.warning(f"Synapse connection error, retrying the query on a new connection: {e}")
+            except Exception as e:
+                logger.error(f"Error executing query: {e}")
+                raise
+
+    async def aexecute_query(self, query: str, params: Optional[Sequence[Any]] = None) -> List[tuple]:
+        """
+        Execute a SQL query on the Synapse executor and return the results. See `execute_query`.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.execute_query, query, params)
 
     def shutdown(self):
         """
-        Close the cursor and connection.
+        Close the idle connections, the checked out connections are closed when they are returned.
         """
-        if self.cursor:
-            self.cursor.close()
-            logger.info("Synapse cursor closed.")
-        if self.connection:
-            self.connection.close()
-            logger.info("Synapse connection closed.")
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._close(connection)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Synapse connections closed.")
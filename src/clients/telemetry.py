@@ -0,0 +1,235 @@
+"""
+Per-worker shipper of the trace and exception logs sent to the metrics API.
+
+Every bot used to create its own MetricsApiClient with a new event loop in a new thread that was never
+stopped, and every log started another worker task and opened a new HTTP session. The shipper is
+owned by the LifespanClients instead:
+- logs are put in a bounded in-memory queue and the request never waits for the metrics API. When
+  the queue is full, new logs are dropped and counted,
+- one background thread sends the queued logs in batches over a shared keep-alive session, as soon
+  as TELEMETRY_BATCH_SIZE logs are queued or TELEMETRY_FLUSH_INTERVAL_SECONDS after the first one,
+- on shutdown, the queued logs are sent for at most TELEMETRY_SHUTDOWN_TIMEOUT_SECONDS.
+
+By default a batch is sent as one POST per log, on the same connection. With TELEMETRY_BATCH_POSTS,
+each batch is sent as one POST of a JSON array per endpoint, for metrics APIs accepting arrays.
+
+Environment Variables:
+- BASE_LOG_URL: Base URL of the metrics API, with a trailing slash. Logs are dropped if it is not set.
+- APPNAME, SUBAPPNAME, APPID: Application fields of every log.
+- TELEMETRY_QUEUE_SIZE: Maximum number of queued logs (default: 10000).
+- TELEMETRY_BATCH_SIZE: Maximum number of logs per batch (default: 100).
+- TELEMETRY_FLUSH_INTERVAL_SECONDS: Maximum time a log waits for its batch to fill (default: 2).
+- TELEMETRY_BATCH_POSTS: Whether a batch is sent as one POST of a JSON array per endpoint (default: false).
+- TELEMETRY_REQUEST_TIMEOUT_SECONDS: Timeout of a POST to the metrics API (default: 10).
+- TELEMETRY_SHUTDOWN_TIMEOUT_SECONDS: Maximum time spent sending the queued logs on shutdown (default: 5).
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+import requests
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+logger = logging.getLogger(__name__)
+
+TRACE_ENDPOINT = "logs"
+EXCEPTION_ENDPOINT = "exceptions"
+
+# Queued on shutdown to wake up the sender thread
+_WAKE_UP = (None, None)
+
+
+class TelemetryShipper:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of TelemetryShipper.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = TelemetryShipper()
+        return cls._instance
+
+    def __init__(self):
+        """
+        Initialize the TelemetryShipper and start its sender thread.
+        """
+        if hasattr(self, "_initialized") and self._initialized:
+            logger.info("TelemetryShipper is already initialized.")
+            return
+
+        self.base_url = os.getenv("BASE_LOG_URL")
+        self.app_fields = {
+            "appName": os.getenv("APPNAME"),
+            "subAppName": os.getenv("SUBAPPNAME"),
+            "appId": os.getenv("APPID"),
+        }
+        self.batch_size = int(os.getenv("TELEMETRY_BATCH_SIZE", "100"))
+        self.flush_interval = float(os.getenv("TELEMETRY_FLUSH_INTERVAL_SECONDS", "2"))
+        self.batch_posts = os.getenv("TELEMETRY_BATCH_POSTS", "false").lower() == "true"
+        self.request_timeout = float(os.getenv("TELEMETRY_REQUEST_TIMEOUT_SECONDS", "10"))
+        self.shutdown_timeout = float(os.getenv("TELEMETRY_SHUTDOWN_TIMEOUT_SECONDS", "5"))
+
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(
+            maxsize=int(os.getenv("TELEMETRY_QUEUE_SIZE", "10000"))
+        )
+        # Keep-alive session of the sender thread
+        self._session = requests.Session()
+        self._stats = {"queued": 0, "dropped": 0, "sent": 0, "failed": 0, "batches": 0}
+        self._stats_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry-shipper", daemon=True)
+        self._thread.start()
+
+        logger.info("TelemetryShipper initialized successfully.")
+        self._initialized = True
+
+    def log_trace(self, feature_name: str, user_email: str, log_message: str, log_level: str) -> bool:
+        """
+        Queue a trace log.
+
+        Args:
+            feature_name (str): The feature the log belongs to.
+            user_email (str): The email of the user of the request.
+            log_message (str): The message.
+            log_level (str): The level of the message, e.g. "Information".
+
+        Returns:
+            bool: Whether the log was queued, False if it was dropped.
+        """
+        return self._enqueue(TRACE_ENDPOINT, {
+            **self.app_fields,
+            "featureName": feature_name,
+            "userName": user_email,
+            "logMessage": log_message,
+            "logLevel": log_level,
+        })
+
+    def log_exception(self, feature_name: str, user_email: str, exception_message: str) -> bool:
+        """
+        Queue an exception log. See `log_trace`.
+        """
+        return self._enqueue(EXCEPTION_ENDPOINT, {
+            **self.app_fields,
+            "featureName": feature_name,
+            "userName": user_email,
+            "exceptionMessage": exception_message,
+        })
+
+    def _enqueue(self, endpoint: str, payload: Dict[str, Any]) -> bool:
+        if not self.base_url or self._stopping.is_set():
+            self._record("dropped")
+            return False
+        try:
+            self._queue.put_nowait((endpoint, payload))
+        except queue.Full:
+            self._record("dropped")
+            return False
+        self._record("queued")
+        return True
+
+    def _run(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            logs = [log for log in batch if log is not _WAKE_UP]
+            try:
+                if logs:
+                    self._send(logs)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _next_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Wait for a log, then for the batch to fill until the flush interval after that log."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            # While stopping, send what is queued without waiting
+            remaining = 0 if self._stopping.is_set() else deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        payloads = defaultdict(list)
+        for endpoint, payload in batch:
+            payloads[endpoint].append(payload)
+        for endpoint, endpoint_payloads in payloads.items():
+            bodies = [endpoint_payloads] if self.batch_posts else endpoint_payloads
+            count = len(endpoint_payloads) if self.batch_posts else 1
+            failed, error = 0, None
+            for body in bodies:
+                try:
+                    response = self._session.post(self.base_url + endpoint, json=body, timeout=self.request_timeout)
+                    response.raise_for_status()
+                    self._record("sent", count)
+                except Exception as e:
+                    failed, error = failed + count, e
+            if failed:
+                self._record("failed", failed)
+                logger.warning(f"Failed to send {failed} telemetry log(s) to '{endpoint}': {error}")
+        self._record("batches")
+
+    def _record(self, outcome: str, count: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += count
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the queued logs are sent.
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds, no limit if not set.
+
+        Returns:
+            bool: Whether the queue was drained within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the queued, dropped, sent and failed log counters, the number of batches and the queue size.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting logs, send the queued logs within the shutdown timeout and close the session.
+        """
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_WAKE_UP)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=self.shutdown_timeout)
+        if self._thread.is_alive():
+            logger.warning(f"TelemetryShipper shut down with {self._queue.qsize()} log(s) not sent.")
+        self._session.close()
+        logger.info(f"TelemetryShipper shut down: {self.get_stats()}")
@@ -10,8 +10,8 @@ from langgraph.graph import START, END, StateGraph, MessagesState
 
 from src.core.base import LamBotGraph
 from src.models.intermediate_step import IntermediateStep
-from src.core.agents.utils import initialize_azure_llm_from_model_name
-from src.core.agents.common.deep_research_v2.utils import get_deep_research_config
+from src.core.agents.utils import get_azure_llm_from_model_name
+from src.core.agents.common.deep_research_v2.utils import get_deep_research_config, get_research_run
 from src.core.agents.common.deep_research_v2.researcher_graph import Researcher
 from src.core.agents.common.deep_research_v2.models import (
     Research,
@@ -27,9 +27,8 @@ from src.core.agents.common.deep_research_v2.prompts import (
 class DeepResearchAgentV2(LamBotGraph):
     def __init__(self):
 
-        # Build the graph
-        self._graph = self.build_graph()
-        self.graph = self._graph.compile()
+        # Build the graph, compiled once per process
+        self.graph = self.get_compiled_graph()
 
     def build_graph(self):
         graph = StateGraph(
@@ -53,7 +52,7 @@ class DeepResearchAgentV2(LamBotGraph):
 
         return graph
 
-    def _research_delegator(self, state: Research, config: RunnableConfig) -> Research:
+    async def _research_delegator(self, state: Research, config: RunnableConfig) -> Research:
         self.dispatch_intermediate_step(
             intermediate_step=IntermediateStep(
                 message="Research plan is being created. Please wait..."
@@ -61,9 +60,11 @@ class DeepResearchAgentV2(LamBotGraph):
         )
         messages = state["messages"]
 
+        run_config = config
         config: DeepResearchLanggraphConfig = get_deep_research_config(config)
+        research_run = get_research_run(config)
 
-        llm = initialize_azure_llm_from_model_name(
+        llm = get_azure_llm_from_model_name(
             config.research_delegator.language_model_name,
             tags=["research-delegator"],
             streaming=False,
@@ -93,9 +94,11 @@ class DeepResearchAgentV2(LamBotGraph):
             SystemMessage(content=f"Please ensure that the number of research topics falls within the allowed range of {min_research_topic} to {max_research_topic}.")
         ]
 
-        research_plan: ResearchPlan = llm_with_structured_output.invoke(
-            input=system_messages + messages
-        )
+        async with research_run.timed("research_delegator"):
+            research_plan: ResearchPlan = await llm_with_structured_output.ainvoke(
+                input=system_messages + messages,
+                config=research_run.track(run_config, "research_delegator"),
+            )
 
         state["plan"] = research_plan
 
@@ -129,9 +132,11 @@ class DeepResearchAgentV2(LamBotGraph):
         )
 
         messages = state["messages"]
+        run_config = config
         config: DeepResearchLanggraphConfig = get_deep_research_config(config)
+        research_run = get_research_run(config)
 
-        llm = initialize_azure_llm_from_model_name(
+        llm = get_azure_llm_from_model_name(
             config.refiner.language_model_name, tags=["lambot-agent-llm"], streaming=True, max_completion_tokens=config.refiner.token_budget
         )
 
@@ -149,8 +154,13 @@ class DeepResearchAgentV2(LamBotGraph):
         system_message = [SystemMessage(content=refiner_system_message)]
         accumulated_research = [AIMessage(content="\n\n\n\n".join([draft.content for draft in draft_sections]))]
 
+        async with research_run.timed("refiner"):
+            final_answer = await llm.ainvoke(
+                input=system_message + messages + accumulated_research,
+                config=research_run.track(run_config, "refiner"),
+            )
+        research_run.log_report()
+
         return {
-            "final_answer": await llm.ainvoke(
-                input=system_message + messages + accumulated_research
-            ),
+            "final_answer": final_answer,
         }
@@ -6,6 +6,7 @@ from langgraph.graph import MessagesState
 from langchain_core.tools import BaseTool
 
 from src.models.deep_research import DeepResearchConfig
+from src.core.agents.common.deep_research_v2.scheduler import ResearchRun
 
 class DeepResearchLanggraphConfig(DeepResearchConfig):
     """The configurable fields for the graph."""
@@ -13,6 +14,12 @@ class DeepResearchLanggraphConfig(DeepResearchConfig):
     tools: Optional[List[BaseTool]] = Field(
         None, description="List of tools available for the deep research graph."
     )
+    research_run: Optional[ResearchRun] = Field(
+        None, description="Scheduler, evidence store and usage of the current research run."
+    )
+
+    class Config:
+        arbitrary_types_allowed = True
 
 class ResearchSection(BaseModel):
     title: str = Field(
@@ -17,7 +17,7 @@ from langchain_core.runnables import RunnableConfig
 
 from src.core.base import LamBotGraph
 from src.models.intermediate_step import IntermediateStep
-from src.core.agents.utils import initialize_azure_llm_from_model_name
+from src.core.agents.utils import get_azure_llm_from_model_name
 from src.core.agents.common.deep_research_v2.models import (
     DeepResearchLanggraphConfig,
     ResearcherScratchpad,
@@ -28,14 +28,13 @@ from src.core.agents.common.deep_research_v2.prompts import (
     RESEARCHER_SYSTEM_MESSAGE,
     REVIEWER_SYSTEM_MESSAGE,
 )
-from src.core.agents.common.deep_research_v2.utils import get_deep_research_config
+from src.core.agents.common.deep_research_v2.utils import get_deep_research_config, get_research_run
 
 class Researcher(LamBotGraph):
     def __init__(self):
 
-        # Build the graph
-        self._graph = self.build_graph()
-        self.graph = self._graph.compile()
+        # Build the graph, compiled once per process
+        self.graph = self.get_compiled_graph()
 
     def build_graph(self):
         graph = StateGraph(ResearcherScratchpad)
@@ -47,14 +46,29 @@ class Researcher(LamBotGraph):
         return graph
     
     async def _researcher(self, scratchpad: ResearcherScratchpad, config: RunnableConfig):
+        run_config = config
         config: DeepResearchLanggraphConfig = get_deep_research_config(config)
+        research_run = get_research_run(config)
+        section = scratchpad.section
+
+        if research_run.budget_exhausted():
+            self.dispatch_intermediate_step(
+                intermediate_step=IntermediateStep(
+                    message=f"Token budget of the research reached. Keeping the current draft for the topic '{section.title}'..."
+                )
+            )
+            if scratchpad.draft is None:
+                scratchpad.draft = DraftSection(
+                    title=section.title,
+                    content=f"The topic '{section.title}' was not researched: the token budget of the research was reached.",
+                )
+            return scratchpad
 
         self.dispatch_intermediate_step(
             intermediate_step=IntermediateStep(
                 message=f"Researcher is generating a draft for the topic '{scratchpad.section.title}'"
             )
         )
-        section = scratchpad.section
 
         if not scratchpad.local_messages:
             scratchpad.local_messages.append(
@@ -93,26 +107,32 @@ class Researcher(LamBotGraph):
         )
 
         # Initialize the model
-        llm = initialize_azure_llm_from_model_name(
+        llm = get_azure_llm_from_model_name(
             config.researcher.language_model_name, tags=["researcher"], streaming=False, max_completion_tokens=config.researcher.token_budget
         )
 
+        # The tools of the run share their results between the researchers and their revisions
+        tools = research_run.tools(config.tools)
+
         _agent = create_tool_calling_agent(
             llm=llm,
-            tools=config.tools,
+            tools=tools,
             prompt=prompt,
         )
 
         agent = AgentExecutor(
             name="Researcher",
             agent=_agent,
-            tools=config.tools,
+            tools=tools,
             verbose=False,
             return_intermediate_steps=True,
             handle_parsing_errors=True,
         )
 
-        section_draft_generated_by_agent = await agent.ainvoke({"messages": prompt})
+        async with research_run.slot(section.title):
+            section_draft_generated_by_agent = await agent.ainvoke(
+                {"messages": prompt}, config=research_run.track(run_config, section.title)
+            )
 
         scratchpad.local_messages.append(
             AIMessage(content=section_draft_generated_by_agent["output"])
@@ -135,10 +155,20 @@ class Researcher(LamBotGraph):
         draft = scratchpad.draft
         acceptance_criteria = section.acceptance_criteria
 
+        run_config = config
         config: DeepResearchLanggraphConfig = get_deep_research_config(config)
+        research_run = get_research_run(config)
+
+        if research_run.budget_exhausted():
+            self.dispatch_intermediate_step(
+                intermediate_step=IntermediateStep(
+                    message=f"Token budget of the research reached. Returning the last draft for the topic '{title}'..."
+                )
+            )
+            return {"draft_sections": [draft]}
 
         # Initialize the model
-        llm = initialize_azure_llm_from_model_name(
+        llm = get_azure_llm_from_model_name(
             config.reviewer.language_model_name, tags=["reviewer"], streaming=False, max_completion_tokens=config.reviewer.token_budget
         )
 
@@ -157,9 +187,10 @@ class Researcher(LamBotGraph):
             SystemMessage(content=f"{reviewer_system_message} \n\n Acceptance Criteria\n{acceptance_criteria}")
         ] + scratchpad.local_messages
 
-        review: Review = await llm_with_structured_output.ainvoke(
-            input=messages
-        )
+        async with research_run.slot(title):
+            review: Review = await llm_with_structured_output.ainvoke(
+                input=messages, config=research_run.track(run_config, title)
+            )
 
         scratchpad.local_messages.append(
             HumanMessage(content=review.feedback)
@@ -0,0 +1,278 @@
+"""
+Scheduling, evidence sharing and usage accounting of a deep research run.
+
+The research delegator fans out one researcher per section of the research plan, and every revision
+asked by a reviewer runs the researcher again. A `ResearchRun` is created per request and passed to
+the graph in the `configurable` of the RunnableConfig. It
+- runs at most `max_concurrent_researchers` research and review steps at the same time,
+- stops the research once the token budget of the run is spent: the researchers and the reviewers
+  check it before each step, and sections keep their last draft,
+- shares the tool results of the run between the researchers and their revisions: identical tool
+  calls are served from the evidence store, and concurrent identical calls wait for the first one.
+  Calls match on their exact arguments, except the query of the retriever tools, which also matches
+  up to casing and whitespace,
+- records the queue time, latency and tokens of each section, reported at the end of the run.
+
+Tool results are only shared within a run, so the access control of the user of the request applies.
+"""
+
+import json
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from langchain_core.tools import BaseTool
+from langchain_core.outputs import LLMResult
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks.manager import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import merge_configs
+
+from src.core.cache.singleflight import SingleFlight
+from src.models.constants import ToolType
+
+logger = logging.getLogger(__name__)
+
+# The argument of the retriever tools matched up to casing and whitespace
+_RETRIEVER_QUERY_FIELD = "query"
+
+
+class EvidenceStore:
+    """Tool results of a research run, keyed by tool and normalized input."""
+
+    def __init__(self):
+        self._results: Dict[str, Any] = {}
+        self._singleflight = SingleFlight()
+        self._in_flight = set()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tool_name: str, tool_input: Union[str, Dict[str, Any]], normalized_fields: Tuple[str, ...] = ()) -> str:
+        """
+        Build the key of a tool call from its exact arguments.
+
+        Args:
+            tool_name (str): The name of the tool.
+            tool_input (Union[str, Dict[str, Any]]): The arguments of the call.
+            normalized_fields (Tuple[str, ...]): String arguments matched up to casing and whitespace.
+
+        Returns:
+            str: The key of the call.
+        """
+        if isinstance(tool_input, dict) and normalized_fields:
+            tool_input = {
+                name: " ".join(value.casefold().split()) if name in normalized_fields and isinstance(value, str) else value
+                for name, value in tool_input.items()
+            }
+        return json.dumps([tool_name, tool_input], sort_keys=True, default=str)
+
+    async def aget_or_run(self, key: str, run) -> Any:
+        """
+        Return the result stored for the key, or run the tool call and store its result.
+
+        Args:
+            key (str): The key of the tool call, see `key`.
+            run (Callable): A function returning the awaitable tool call.
+
+        Returns:
+            Any: The result of the tool call. Failed calls are not stored.
+        """
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+        # Calls waiting for an identical call in flight count as hits
+        if key in self._in_flight:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._in_flight.add(key)
+        try:
+            result = await self._singleflight.ado(key, run)
+        finally:
+            self._in_flight.discard(key)
+        self._results[key] = result
+        return result
+
+
+class EvidenceTool(BaseTool):
+    """Proxy of a tool serving its results from the evidence store of the research run."""
+
+    tool: BaseTool
+    evidence: EvidenceStore
+    normalized_fields: Tuple[str, ...] = ()
+
+    @classmethod
+    def wrap(cls, tool: BaseTool, evidence: EvidenceStore) -> BaseTool:
+        """
+        Wrap a tool with the evidence store. Tools without an argument schema are returned unchanged.
+        The query of the retriever tools is matched up to casing and whitespace.
+        """
+        if tool.args_schema is None:
+            return tool
+        normalized_fields = ()
+        if getattr(tool, "tool_type", None) == ToolType.retriever_tool and _RETRIEVER_QUERY_FIELD in tool.args:
+            normalized_fields = (_RETRIEVER_QUERY_FIELD,)
+        return cls(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            return_direct=tool.return_direct,
+            tool=tool,
+            evidence=evidence,
+            normalized_fields=normalized_fields,
+        )
+
+    def _run(self, *args: Any, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        # The researchers run asynchronously, synchronous calls are not shared
+        tool_input = kwargs or (args[0] if args else {})
+        return self.tool.run(tool_input, callbacks=run_manager.get_child() if run_manager else None)
+
+    async def _arun(self, *args: Any, run_manager: Optional[AsyncCallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        tool_input = kwargs or (args[0] if args else {})
+        callbacks = run_manager.get_child() if run_manager else None
+        return await self.evidence.aget_or_run(
+            self.evidence.key(self.name, tool_input, self.normalized_fields),
+            lambda: self.tool.arun(tool_input, callbacks=callbacks),
+        )
+
+
+class _UsageHandler(BaseCallbackHandler):
+    """Adds the tokens of the LLM calls of a stage to the research run."""
+
+    run_inline = True
+
+    def __init__(self, research_run: "ResearchRun", stage: str):
+        self.research_run = research_run
+        self.stage = stage
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+        if not tokens and response.llm_output:
+            tokens = (response.llm_output.get("token_usage") or {}).get("total_tokens", 0)
+        self.research_run.add_tokens(self.stage, tokens)
+
+
+class ResearchRun:
+    """Scheduler, evidence store and usage of one deep research run."""
+
+    def __init__(self, max_concurrent_researchers: int = 3, token_budget: Optional[int] = None):
+        """
+        Args:
+            max_concurrent_researchers (int): Maximum number of research and review steps running at the same time.
+            token_budget (int, optional): Maximum tokens of the run, no limit if not set.
+        """
+        self.max_concurrent_researchers = max(1, max_concurrent_researchers)
+        self.token_budget = token_budget
+        self.evidence = EvidenceStore()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tools: Optional[List[BaseTool]] = None
+        self._usage: Dict[str, Dict[str, float]] = {}
+        self._lock = Lock()
+        self._started = time.perf_counter()
+
+    @classmethod
+    def from_config(cls, config) -> "ResearchRun":
+        """
+        Create the run of a request from its DeepResearchConfig.
+        """
+        return cls(max_concurrent_researchers=config.max_concurrent_researchers, token_budget=config.token_budget)
+
+    def tools(self, tools: Optional[List[BaseTool]]) -> List[BaseTool]:
+        """
+        Return the tools of the run, sharing their results through the evidence store.
+        """
+        if self._tools is None:
+            self._tools = [EvidenceTool.wrap(tool, self.evidence) for tool in tools or []]
+        return self._tools
+
+    def _stage(self, stage: str) -> Dict[str, float]:
+        return self._usage.setdefault(stage, {"queue_ms": 0.0, "latency_ms": 0.0, "tokens": 0, "steps": 0})
+
+    @asynccontextmanager
+    async def slot(self, stage: str) -> AsyncIterator[None]:
+        """
+        Run a research or review step of a section once fewer than `max_concurrent_researchers` steps run.
+
+        Args:
+            stage (str): The section of the step, under which its queue time and latency are recorded.
+        """
+        # Created on first use, in the event loop of the run
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent_researchers)
+        queued = time.perf_counter()
+        async with self._slots:
+            with self._lock:
+                self._stage(stage)["queue_ms"] += (time.perf_counter() - queued) * 1000
+            async with self.timed(stage):
+                yield
+
+    @asynccontextmanager
+    async def timed(self, stage: str) -> AsyncIterator[None]:
+        """
+        Record the latency of a step under its stage, without waiting for a slot.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                usage = self._stage(stage)
+                usage["latency_ms"] += (time.perf_counter() - started) * 1000
+                usage["steps"] += 1
+
+    def track(self, config: RunnableConfig, stage: str) -> RunnableConfig:
+        """
+        Add the usage accounting of a stage to the RunnableConfig of its LLM calls.
+
+        Args:
+            config (RunnableConfig): The RunnableConfig of the node.
+            stage (str): The section or the step (research delegator, refiner) the tokens are counted for.
+
+        Returns:
+            RunnableConfig: The config to invoke the LLM or the agent with.
+        """
+        return merge_configs(config, {"callbacks": [_UsageHandler(self, stage)]})
+
+    def add_tokens(self, stage: str, tokens: int) -> None:
+        with self._lock:
+            self._stage(stage)["tokens"] += tokens
+
+    @property
+    def tokens(self) -> int:
+        """Tokens spent by the run so far."""
+        with self._lock:
+            return sum(usage["tokens"] for usage in self._usage.values())
+
+    def budget_exhausted(self) -> bool:
+        """Whether the run has spent its token budget."""
+        return self.token_budget is not None and self.tokens >= self.token_budget
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Return the queue time, latency and tokens per stage, the totals and the evidence store counters.
+        """
+        with self._lock:
+            stages = {
+                stage: {**usage, "queue_ms": round(usage["queue_ms"], 1), "latency_ms": round(usage["latency_ms"], 1)}
+                for stage, usage in self._usage.items()
+            }
+        return {
+            "stages": stages,
+            "tokens": sum(usage["tokens"] for usage in stages.values()),
+            "token_budget": self.token_budget,
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000, 1),
+            "evidence": {"hits": self.evidence.hits, "misses": self.evidence.misses},
+        }
+
+    def log_report(self) -> None:
+        """Log the report of the run."""
+        logger.info(f"Deep research run: {json.dumps(self.report())}")
@@ -2,6 +2,7 @@ from langchain_core.runnables import RunnableConfig
 from src.core.agents.common.deep_research_v2.models import (
     DeepResearchLanggraphConfig,
 )
+from src.core.agents.common.deep_research_v2.scheduler import ResearchRun
 
 
 def get_deep_research_config(
@@ -12,3 +13,14 @@ def get_deep_research_config(
     from the generic RunnableConfig dict.
     """
     return DeepResearchLanggraphConfig(**run_config["configurable"])
+
+
+def get_research_run(config: DeepResearchLanggraphConfig) -> ResearchRun:
+    """
+    Return the research run of the request, or a run of the node alone
+    when the graph is invoked without one.
+    """
+    return config.research_run or ResearchRun(
+        max_concurrent_researchers=config.max_concurrent_researchers,
+        token_budget=config.token_budget,
+    )
@@ -1,4 +1,7 @@
 import os
+import json
+import hashlib
+from typing import Any, Dict
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
@@ -7,9 +10,16 @@ from src.models.config import LanguageModelConfig
 from langchain_openai import AzureChatOpenAI
 from src.models.constants import LLMFeature, LanguageModelName
 from src.core.database.lambot import LamBotMongoDB
+from src.core.cache.lru import TTLCache
 
 llm_config_service = LamBotMongoDB.get_instance().language_model_config_db
 
+# LLM clients per model config and options, see get_azure_llm_from_model_name
+_llm_clients = TTLCache(
+    max_entries=int(os.getenv("AGENT_LLM_CACHE_MAX_ENTRIES", "64")),
+    default_ttl=float(os.getenv("AGENT_LLM_CACHE_TTL_SECONDS", "3600")),
+)
+
 
 def initialize_azure_llm_from_model_name(
     model_name: LanguageModelName,
@@ -34,6 +44,43 @@ def initialize_azure_llm_from_model_name(
     )
 
 
+def get_azure_llm_from_model_name(
+    model_name: LanguageModelName,
+    **kwargs
+) -> AzureChatOpenAI:
+    """
+    Gets an AzureChatOpenAI LLM instance for the model name and options, shared by every caller
+    passing the same options.
+
+    Clients keep no request state (callbacks and run names are passed when they are invoked), so a
+    client is created once per model config and options instead of once per call. A change of the
+    model config creates a new client.
+
+    Args:
+        model_name (LanguageModelName): The name of the model to initialize.
+        **kwargs: Additional keyword arguments for initializing the AzureChatOpenAI instance.
+
+    Returns:
+        AzureChatOpenAI: The shared AzureChatOpenAI LLM instance.
+    """
+    llm_config = llm_config_service.fetch_language_model(model_name)
+    if not llm_config:
+        raise ValueError(f"Model config for {model_name} not found.")
+
+    key = _llm_client_key(llm_config, kwargs)
+    llm_instance = _llm_clients.get(key)
+    if llm_instance is None:
+        llm_instance = initialize_azure_llm_from_spec(llm_config=llm_config, **kwargs)
+        _llm_clients.set(key, llm_instance)
+    return llm_instance
+
+
+def _llm_client_key(llm_config: LanguageModelConfig, kwargs: Dict[str, Any]) -> str:
+    # The dump excludes the API key, which is read from the environment with the endpoint
+    payload = json.dumps([llm_config.model_dump(mode="json"), kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def initialize_azure_llm_from_spec(
     llm_config: LanguageModelConfig,
     **kwargs
@@ -26,7 +26,7 @@ class Helper:
 
         if "ultron" in self.name or "cfpa" in self.name:
             self.langfuse_manager = lifespan_clients.langfuse_manager_sensitive
-        elif self.name == "enterprise-lambot":
+        elif self.name == "enterprise-lambot" or display_name == "Enterprise LamBot":
             self.langfuse_manager = lifespan_clients.langfuse_manager_redacted
         elif self.lambot_config and self.lambot_config.personal:
             self.langfuse_manager = lifespan_clients.langfuse_manager_redacted
@@ -34,8 +34,12 @@ class Helper:
         else:
             self.langfuse_manager = lifespan_clients.langfuse_manager      
 
-        self.langfuse_manager.set_user_email(user_email_var.get())
-        self.langfuse_manager.set_callback_kwargs({"tags": tags})
+        # Handler of this request only: concurrent requests do not share its user, tags and metadata
+        self.callback_handler = self.langfuse_manager.create_callback_handler(
+            user_email=user_email_var.get(),
+            tags=tags,
+            sample_rate=self.lambot_config.trace_sample_rate if self.lambot_config else None,
+        )
 
     def _setup_logger(self):
         logger = logging.getLogger(self.name)
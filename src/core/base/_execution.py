@@ -0,0 +1,241 @@
+"""
+Execution of blocking tool work off the event loop, and monitoring of the event loop lag.
+
+Every request of a worker shares one event loop, so a tool that blocks it (a synchronous SDK call,
+an ODBC query, a matplotlib rendering, ...) stalls the streaming of every other conversation. Tools
+declare their `execution_mode` and the LamBotTool base class runs their blocking work in
+- a bounded thread pool for IO-blocking work, with the context variables of the caller, so the
+  access token, the Langfuse callbacks and the custom events of the tool run work as on the loop,
+- a process pool for CPU-bound work, which must be a picklable module-level function without
+  side effects on the tool.
+
+The lag monitor checks the event loop from a watchdog thread. When the loop does not run its
+heartbeat within LOOP_LAG_THRESHOLD_MS, the stack of the loop thread is sampled and the LamBotTool
+running on it, if any, is reported with the blocking line.
+
+Environment Variables:
+- TOOL_THREAD_POOL_SIZE: Maximum number of threads running IO-blocking tool work (default: 32).
+- TOOL_PROCESS_POOL_SIZE: Number of processes running CPU-bound tool work, 0 runs it in the thread pool (default: 2).
+- LOOP_LAG_INTERVAL_MS: Interval of the event loop heartbeat (default: 100).
+- LOOP_LAG_THRESHOLD_MS: Event loop lag reported as a stall (default: 250).
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import functools
+import contextvars
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+load_dotenv(override=True)
+
+logger = logging.getLogger(__name__)
+
+
+class ToolExecutor:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of ToolExecutor.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = ToolExecutor()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self.thread_pool_size = int(os.getenv("TOOL_THREAD_POOL_SIZE", "32"))
+        self.process_pool_size = int(os.getenv("TOOL_PROCESS_POOL_SIZE", "2"))
+        self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_pool_size, thread_name_prefix="lambot-tool")
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        self._initialized = True
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking function in the tool thread pool, with the context variables of the caller.
+
+        Args:
+            func (Callable): The blocking function.
+            *args, **kwargs: The arguments of the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._thread_pool, call)
+
+    async def run_cpu_bound(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a CPU-bound function in the tool process pool.
+
+        The function and its arguments are pickled: it must be defined at module level and must
+        not rely on the request context (no custom events, no access token).
+
+        Args:
+            func (Callable): The CPU-bound function.
+            *args, **kwargs: The arguments of the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        process_pool = self._get_process_pool()
+        if process_pool is None:
+            return await self.run_blocking(func, *args, **kwargs)
+        call = functools.partial(func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(process_pool, call)
+
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.process_pool_size <= 0:
+            return None
+        if self._process_pool is None:
+            with self._process_pool_lock:
+                if self._process_pool is None:
+                    # Forking a worker running threads can copy held locks into the children
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.process_pool_size,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._process_pool
+
+    def shutdown(self) -> None:
+        """
+        Shut down the pools. Pending work is cancelled, the processes finish their running work.
+        """
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+        logger.info("ToolExecutor shutdown completed.")
+
+
+class EventLoopLagMonitor:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of EventLoopLagMonitor.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = EventLoopLagMonitor()
+        return cls._instance
+
+    def __init__(self, interval_ms: Optional[float] = None, threshold_ms: Optional[float] = None):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self.interval = (interval_ms if interval_ms is not None else float(os.getenv("LOOP_LAG_INTERVAL_MS", "100"))) / 1000
+        self.threshold = (threshold_ms if threshold_ms is not None else float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250"))) / 1000
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._reported_beat = None
+        self._stats = {"stalls": 0, "max_lag_ms": 0.0, "stalls_by_tool": {}}
+        self._stats_lock = threading.Lock()
+        self._initialized = True
+
+    def start(self) -> None:
+        """
+        Start monitoring the running event loop.
+        """
+        if self._heartbeat_task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-lag-monitor", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """
+        Stop monitoring the event loop.
+        """
+        self._stop_event.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._last_beat - self.interval
+            with self._stats_lock:
+                self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], lag * 1000)
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            last_beat = self._last_beat
+            lag = time.monotonic() - last_beat - self.interval
+            if lag < self.threshold or self._reported_beat == last_beat:
+                continue
+            # Reported once per stall, from the stack of the loop thread while it is still blocked
+            self._reported_beat = last_beat
+            self.report(lag, sys._current_frames().get(self._loop_thread_id))
+
+    def report(self, lag: float, frame: Any) -> Optional[str]:
+        """
+        Log a stall of the event loop with the tool and the line that were running.
+
+        Args:
+            lag (float): The lag of the event loop in seconds.
+            frame (FrameType): The frame the loop thread was running.
+
+        Returns:
+            str: The name of the tool that stalled the loop, if any.
+        """
+        tool_name = self.find_tool(frame)
+        location = f"{frame.f_code.co_filename}:{frame.f_lineno}" if frame is not None else "unknown"
+        with self._stats_lock:
+            self._stats["stalls"] += 1
+            if tool_name:
+                self._stats["stalls_by_tool"][tool_name] = self._stats["stalls_by_tool"].get(tool_name, 0) + 1
+        logger.warning(
+            f"Event loop blocked for at least {lag * 1000:.0f} ms "
+            f"by {f'tool {tool_name}' if tool_name else 'code outside of tools'} at {location}"
+        )
+        return tool_name
+
+    @staticmethod
+    def find_tool(frame: Any) -> Optional[str]:
+        """
+        Find the innermost LamBotTool method on a stack.
+        """
+        from src.core.base._tool import LamBotTool
+
+        while frame is not None:
+            owner = frame.f_locals.get("self") if "self" in frame.f_code.co_varnames else None
+            if isinstance(owner, LamBotTool):
+                return owner.name
+            frame = frame.f_back
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the number of stalls, per tool, and the maximum lag.
+        """
+        with self._stats_lock:
+            return {**self._stats, "stalls_by_tool": dict(self._stats["stalls_by_tool"])}
@@ -1,12 +1,31 @@
+import threading
 from src.core.base import LamBotEvents
 from src.core.base.utils import get_prompt
 
+_compile_lock = threading.Lock()
+
 class LamBotGraph(LamBotEvents):
     """LamBotGraph class inheriting shared functionality from LamBotEvents."""
 
     def build_graph(self):
         """Build the graph."""
         raise NotImplementedError("Subclasses should implement this method.")
+
+    def get_compiled_graph(self):
+        """Build and compile the graph of this class once per process.
+
+        The nodes must not keep request state on the instance: the request settings are read
+        from the RunnableConfig, so the graph compiled for the first instance serves every request.
+
+        Returns:
+            CompiledStateGraph: The compiled graph shared by the instances of this class.
+        """
+        cls = type(self)
+        if cls.__dict__.get("_compiled_graph") is None:
+            with _compile_lock:
+                if cls.__dict__.get("_compiled_graph") is None:
+                    cls._compiled_graph = self.build_graph().compile()
+        return cls._compiled_graph
     
     @staticmethod
     def _get_prompt(prompt_name: str, fallback_prompt: str, label: str) -> str:
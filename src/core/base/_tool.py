@@ -2,40 +2,113 @@ from langchain_core.tools import BaseTool
 from src.models import ToolType
 from src.core.base import LamBotEvents
 from src.models.tool import ToolArtifact, ToolKwargs
-from src.models.constants import IntakeItem
+from src.models.constants import IntakeItem, ToolExecutionMode
+from src.core.base._execution import ToolExecutor
 from azure.storage.blob import generate_blob_sas, BlobSasPermissions
 from src.clients import LifespanClients
 from langchain_core.callbacks.manager import dispatch_custom_event
 from datetime import datetime, timedelta, timezone
 import uuid
 import os
-import asyncio
+import logging
 import pandas as pd
 from io import BytesIO
 from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 from pydantic import Field
-from typing import List, Optional, Any
+from inspect import signature
+from typing import Callable, List, Optional, Any
 from src.core.base.utils import get_prompt
 
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
+logger = logging.getLogger(__name__)
+
 
 class LamBotTool(BaseTool, LamBotEvents):
-    """LamBotTool that includes an additional parameter called tool_type."""
+    """LamBotTool that includes an additional parameter called tool_type.
+
+    Tools registered in the tool registry are shared prototypes. Request-specific state
+    (conversation history, file attachments, tool keyword arguments, ...) must only be set
+    on the per-request copy returned by `for_request`.
+
+    Tools declare how they run in `execution_mode`, inferred from the tool when not set:
+    - NATIVE_ASYNC: the tool implements `_arun` without blocking the event loop. Declaring it
+      without implementing `_arun` is an error.
+    - IO_BLOCKING (inferred for tools implementing only `_run`): the default `_arun` runs `_run`
+      in the bounded tool thread pool.
+    - CPU_BOUND: a tool instance cannot cross a process boundary, so the tool implements `_arun`
+      and sends its pure computations to the process pool with `run_cpu_bound`. Without `_arun`,
+      `_run` runs in the thread pool like an IO-blocking tool and a warning is logged.
+    """
 
     tool_type: ToolType
     allowed_intakes: Optional[List[IntakeItem]] = Field(
         default=None,
         description="List of allowed intake items for this tool."
     )
+    execution_mode: Optional[ToolExecutionMode] = Field(
+        default=None,
+        description="Whether the tool is native-async, blocks on IO or is CPU-bound. Inferred from `_arun` if not set."
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        implements_arun = type(self)._arun is not LamBotTool._arun
+        if self.execution_mode is None:
+            self.execution_mode = ToolExecutionMode.NATIVE_ASYNC if implements_arun else ToolExecutionMode.IO_BLOCKING
+        elif not implements_arun and self.execution_mode == ToolExecutionMode.NATIVE_ASYNC:
+            raise TypeError(f"{type(self).__name__} is declared native-async but does not implement _arun.")
+        elif not implements_arun and self.execution_mode == ToolExecutionMode.CPU_BOUND:
+            logger.warning(
+                f"{type(self).__name__} is declared CPU-bound but does not implement _arun: "
+                f"its _run runs in the thread pool, not in the process pool."
+            )
         self._conversation_history = None  # Initialize conversation history attribute
         self._file_attachments = None  # Initialize file attachments attribute
         self._tool_kwargs = None  # Initialize tool keyword arguments attribute
-        self._lock = asyncio.Lock()  # Add an asyncio lock for thread-safe updates
+
+    def for_request(self) -> "LamBotTool":
+        """Create a per-request copy of this tool.
+
+        The copy is shallow: configuration such as the tool spec is shared with the prototype
+        and must be treated as read-only, while request-specific attributes assigned on the
+        copy do not leak into the prototype or into concurrent requests.
+
+        Returns:
+            LamBotTool: The per-request tool instance.
+        """
+        return self.model_copy()
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        """Run the synchronous `_run` in the tool thread pool, for IO-blocking tools (see `execution_mode`)."""
+        if kwargs.get("run_manager") and signature(self._run).parameters.get("run_manager"):
+            kwargs["run_manager"] = kwargs["run_manager"].get_sync()
+        return await self.run_blocking(self._run, *args, **kwargs)
+
+    @staticmethod
+    async def run_blocking(func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run blocking IO in the bounded tool thread pool, with the context of the tool run.
+
+        Args:
+            func (Callable): The blocking function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return await ToolExecutor.get_instance().run_blocking(func, *args, **kwargs)
+
+    @staticmethod
+    async def run_cpu_bound(func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a CPU-bound computation in the tool process pool.
+
+        Args:
+            func (Callable): A picklable module-level function, which cannot dispatch events.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return await ToolExecutor.get_instance().run_cpu_bound(func, *args, **kwargs)
 
     @staticmethod
     def dispatch_tool_artifact(tool_artifact: ToolArtifact):
@@ -121,38 +194,34 @@ class LamBotTool(BaseTool, LamBotEvents):
     # Setter for conversation history
     async def set_conversation_history(self, conversation_history: List[dict]):
         """
-        Set the conversation history attribute in a thread-safe manner.
+        Set the conversation history attribute of this per-request tool instance.
         :param conversation_history: List of messages in {role, content} format.
         """
-        async with self._lock:  # Acquire the lock
-            self._conversation_history = conversation_history
+        self._conversation_history = conversation_history
 
     # Getter for conversation history
     async def get_conversation_history(self) -> Optional[List[dict]]:
         """
-        Get the conversation history attribute in a thread-safe manner.
+        Get the conversation history attribute of this per-request tool instance.
         :return: List of messages in {role, content} format.
         """
-        async with self._lock:  # Acquire the lock
-            return self._conversation_history
+        return self._conversation_history
 
     # Setter for file attachments
     async def set_file_attachments(self, file_attachments: List[Any]):
         """
-        Set the file attachments attribute in a thread-safe manner.
+        Set the file attachments attribute of this per-request tool instance.
         :param file_attachments: List of file attachments to be processed by the tool.
         """
-        async with self._lock:  # Acquire the lock
-            self._file_attachments = file_attachments
+        self._file_attachments = file_attachments
 
     # Getter for file attachments
     async def get_file_attachments(self) -> Optional[List[Any]]:
         """
-        Get the file attachments attribute in a thread-safe manner.
+        Get the file attachments attribute of this per-request tool instance.
         :return: List of file attachments to be processed by the tool.
         """
-        async with self._lock:  # Acquire the lock
-            return self._file_attachments
+        return self._file_attachments
         
     # Setter for tool keyword arguments
     def set_tool_kwargs(self, tool_kwargs: Optional[dict[str, Any]]):
@@ -50,7 +50,7 @@ class ExceptionAssistBot(Helper):
         system_message_template = SystemMessage(content=self._system_message)
         exception_message_template = AIMessage(content=exception_str)
 
-        self.langfuse_manager.callback_handler.metadata = {
+        self.callback_handler.metadata = {
             "exception_message": exception_str,
             "lambot_display_name": self.lambot_display_name
         }
@@ -70,7 +70,7 @@ class ExceptionAssistBot(Helper):
             model=small_model_spec.name,
             temperature=0.0,
             streaming=True,
-            callbacks=[self.langfuse_manager.callback_handler]
+            callbacks=[self.callback_handler]
         )
 
     async def stream_response(self, exception_str: str):
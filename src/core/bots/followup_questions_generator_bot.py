@@ -14,13 +14,16 @@ from langchain_core.messages import (
 )
 from src.models.questions import SuggestedQuestions
 from langchain_core.prompts import MessagesPlaceholder
-from typing import List, Dict, Any, Union
+from langchain_core.runnables import Runnable
+from langchain_core.callbacks import BaseCallbackHandler
+from typing import List, Dict, Any, Optional, Union
+import threading
 from langchain_community.callbacks import get_openai_callback
 from src.models.logging import TokenUsageDetails
 from src.clients.langfuse import LangfuseManager
 from src.core.database.lambot import LamBotMongoDB
 from src.models.constants import LanguageModelName
-from src.clients.azure import openai_token_provider
+from src.clients.azure import openai_token_provider, openai_async_token_provider
 
 llm_config_service = LamBotMongoDB.get_instance().language_model_config_db
 
@@ -28,26 +31,32 @@ llm_config_service = LamBotMongoDB.get_instance().language_model_config_db
 class FollowUpQuestionGeneratorBot:
     """
     A bot that generates follow-up questions based on the conversation history.
+
+    The LLM client is built once per worker and small model, the Langfuse callback handler is passed
+    per call, so creating the bot for a request does not look up the model or open a new client.
     """
+    _llms: Dict[str, Runnable] = {}
+    _llms_lock = threading.Lock()
 
-    def __init__(self, lambot_display_name: str, langfuse_manager: LangfuseManager):
+    def __init__(self, lambot_display_name: str, langfuse_manager: LangfuseManager, callback_handler: Optional[BaseCallbackHandler] = None):
         """
         Initialize the FollowUpQuestionGeneratorBot
 
         Args:
             lambot_display_name (str): The name of the LamBot that is generating follow-up questions.
             langfuse_manager (LangfuseManager): The LangfuseManager instance to interact with Langfuse.
+            callback_handler (BaseCallbackHandler, optional): The Langfuse callback handler of the request. Defaults to the shared handler.
         """
 
         self.lambot_display_name = lambot_display_name
         self.langfuse_manager = langfuse_manager
-        self._system_message = self.langfuse_manager.client.get_prompt(
-            name="GENERIC_SUGGESTED_FOLLOWUP_QUESTIONS_PROMPT",
-            label=os.getenv("LANGFUSE_PROMPT_LABEL", "dev"),
-            fallback=GENERIC_SUGGESTED_FOLLOWUP_QUESTIONS_PROMPT
-        ).prompt
+        self.callback_handler = callback_handler or langfuse_manager.callback_handler
+        self._system_message = self.langfuse_manager.get_prompt(
+            prompt_name="GENERIC_SUGGESTED_FOLLOWUP_QUESTIONS_PROMPT",
+            fallback_prompt=GENERIC_SUGGESTED_FOLLOWUP_QUESTIONS_PROMPT,
+        )
 
-        self._configure_llm()
+        self._llm = self.get_llm()
 
     def _prepare_suggested_questions_prompt(
         self,
@@ -78,21 +87,35 @@ class FollowUpQuestionGeneratorBot:
 
         return suggested_questions_prompt
 
-    def _configure_llm(self) -> None:
+    @classmethod
+    def get_llm(cls) -> Runnable:
+        """
+        Get the structured-output LLM of the small model, built on first use and shared by the requests of this worker.
+        """
+        small_model_name = os.getenv("AZURE_SMALL_MODEL_DEPLOYMENT_NAME", LanguageModelName.GPT_4O_MINI)
+        llm = cls._llms.get(small_model_name)
+        if llm is None:
+            with cls._llms_lock:
+                llm = cls._llms.get(small_model_name)
+                if llm is None:
+                    llm = cls._llms[small_model_name] = cls._configure_llm(small_model_name)
+        return llm
+
+    @staticmethod
+    def _configure_llm(small_model_name: str) -> Runnable:
         """Private method to configure and instantiate the LLM."""
 
-        small_model_name = os.getenv("AZURE_SMALL_MODEL_DEPLOYMENT_NAME", LanguageModelName.GPT_4O_MINI)
         small_model_spec = llm_config_service.fetch_language_model(small_model_name)
 
-        self._llm = AzureChatOpenAI(
+        return AzureChatOpenAI(
             azure_ad_token_provider=openai_token_provider,
+            azure_ad_async_token_provider=openai_async_token_provider,
             azure_endpoint=small_model_spec.endpoint,
             api_version=small_model_spec.api_version,
             azure_deployment=small_model_spec.deployment_name,
             model=small_model_spec.name,
             temperature=0.0,
             streaming=False,
-            callbacks=[self.langfuse_manager.callback_handler],
         ).with_structured_output(SuggestedQuestions)
 
     def generate_followup_questions(
@@ -111,12 +134,30 @@ class FollowUpQuestionGeneratorBot:
         """
         prompt = self._prepare_suggested_questions_prompt(messages, agent_executor_output)
         with get_openai_callback() as followup_questions_callback:
-            followup_questions = self._llm.invoke(prompt)
+            followup_questions = self._llm.invoke(prompt, config=self._invoke_config())
+
+        self._set_usage_metadata(followup_questions_callback)
+        return followup_questions.suggested_questions
 
+    async def agenerate_followup_questions(
+        self,
+        messages: List[Dict[str, Any]],
+        agent_executor_output: List[Union[AIMessageChunk, FunctionMessage, AIMessage]],
+    ) -> List[str]:
+        """Asynchronous variant of `generate_followup_questions` that does not block the event loop."""
+        prompt = self._prepare_suggested_questions_prompt(messages, agent_executor_output)
+        with get_openai_callback() as followup_questions_callback:
+            followup_questions = await self._llm.ainvoke(prompt, config=self._invoke_config())
+
+        self._set_usage_metadata(followup_questions_callback)
+        return followup_questions.suggested_questions
+
+    def _invoke_config(self) -> Dict[str, Any]:
+        return {"callbacks": [self.callback_handler]}
+
+    def _set_usage_metadata(self, followup_questions_callback) -> None:
         self.usage_metadata = TokenUsageDetails(
             prompt_tokens=followup_questions_callback.prompt_tokens,
             completion_tokens=followup_questions_callback.completion_tokens,
             total_tokens_used=followup_questions_callback.total_tokens,
         )
-        
-        return followup_questions.suggested_questions
@@ -11,7 +11,7 @@ from src.models.request import MessageFile
 from src.models import ToolType
 from src.core.base import Helper, LamBotTool
 from src.core.utils.query_config_utils import enhance_system_message_with_user_context
-from src.core.utils.ms_graph_utils import get_user_graph_info
+from src.core.cache.user_profile import UserProfileService
 from typing import List, Optional, Dict, Any, Tuple
 from langchain_core.prompts.prompt import PromptTemplate
 from langchain.agents import AgentExecutor, create_tool_calling_agent
@@ -29,10 +29,12 @@ from src.core.bots.utils import create_multiretriever_tool_spec
 from src.models.constants import LLMFeature
 from src.models.config import AzureOpenAIRegion
 from src.core.agents.common import DeepResearchAgentV2
+from src.core.agents.common.deep_research_v2.scheduler import ResearchRun
 from src.clients import LifespanClients
 from src.models.constants import IntakeItem
-from src.clients.azure import openai_token_provider
+from src.clients.azure import openai_token_provider, openai_async_token_provider
 from src.core.database.lambot import LamBotMongoDB
+from src.core.cache.access_control import AccessControlCache
 
 llm_config_service = LamBotMongoDB.get_instance().language_model_config_db
 
@@ -108,7 +110,7 @@ class LamBot(Helper):
                 "Please ensure all selected tools are within the configured tools list of your LamBot."
             )
         
-        self.langfuse_manager.callback_handler.metadata = self._query_config.model_dump()
+        self.callback_handler.metadata = self._query_config.model_dump()
         
     def _update_intake_flags(self, intake_item, value):
         """
@@ -228,6 +230,7 @@ class LamBot(Helper):
         
             self._llm = AzureChatOpenAI(
                 azure_ad_token_provider=openai_token_provider,
+                azure_ad_async_token_provider=openai_async_token_provider,
                 azure_endpoint=llm_config.endpoint,
                 api_version=llm_config.api_version,
                 azure_deployment=llm_config.deployment_name,
@@ -272,10 +275,12 @@ class LamBot(Helper):
         retriever_tools = []
         display_names = []
         for tool_config in selected_tool_configs:
+            # Per-request instance; configuring it does not affect the registered prototype
             tool = get_tool_by_name(tool_config.name)
-            allowed_intakes = tool.allowed_intakes
 
             if tool:
+                allowed_intakes = tool.allowed_intakes
+
                 # Inject SharePoint URLs for CustomSharePointTool
                 if hasattr(tool, 'sharepoint_urls') and self.bot_config.sharepoint_urls:
                     tool.sharepoint_urls = self.bot_config.sharepoint_urls
@@ -341,10 +346,13 @@ class LamBot(Helper):
         else:
             self.logger.info("No retriever tools selected.")
 
-    def _configure_tool_calling_agent(self) -> None:
+        # Resolve the access control of the retriever tools while the agent plans its first step
+        AccessControlCache.get_instance().prefetch(self._tools)
+
+    def _configure_tool_calling_agent(self, user_profile: Optional[Dict[str, Any]] = None) -> None:
         """Private method to configure the agent and agent executor."""
         prompt = self._create_chat_prompt(
-            self._chat_history if self._chat_history else []
+            self._chat_history if self._chat_history else [], user_profile
         )
         self._agent = create_tool_calling_agent(self._llm, self._tools, prompt)
         self._agent_executor = AgentExecutor(
@@ -356,8 +364,13 @@ class LamBot(Helper):
         self._agent = DeepResearchAgentV2()
         self._agent_executor = self._agent.graph
 
-    def _configure_agent(self) -> None:
-        """Private method to configure the agent."""
+    def _configure_agent(self, user_profile: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Private method to configure the agent.
+
+        Args:
+            user_profile (Dict[str, Any], optional): The profile of the current user, see `_create_chat_prompt`.
+        """
         # Check if the LLM is configured
         if not self._llm:
             raise ValueError("LLM is not configured. Please configure the LLM first.")
@@ -369,10 +382,20 @@ class LamBot(Helper):
         if self._query_config.deep_research.enabled:
             self._configure_deep_research_agent()
         else:
-            self._configure_tool_calling_agent()
+            self._configure_tool_calling_agent(user_profile)
+
+    async def _aconfigure_agent(self) -> None:
+        """
+        Asynchronous variant of `_configure_agent`, awaiting the profile of the current user without
+        blocking the event loop.
+        """
+        user_profile = None
+        if not self._query_config.deep_research.enabled:
+            user_profile = await UserProfileService.get_instance().aget_profile()
+        self._configure_agent(user_profile)
 
     def _create_chat_prompt(
-        self, chat_history: Optional[List[Dict[str, Any]]] = None
+        self, chat_history: Optional[List[Dict[str, Any]]] = None, user_profile: Optional[Dict[str, Any]] = None
     ) -> ChatPromptTemplate:
         """
         Creates a chat prompt template by assembling the conversation history,
@@ -386,14 +409,17 @@ class LamBot(Helper):
             chat_history (Optional[List[Dict[str, Any]]]): A list of message dictionaries.
                 Each dictionary should include a "role" (e.g., "user", "assistant", "system")
                 and "content" (text or image data). This parameter is optional.
+            user_profile (Optional[Dict[str, Any]]): The profile of the current user, added to the system
+                message. Defaults to the profile in memory or in the token claims, without waiting for Graph.
 
         Returns:
             ChatPromptTemplate: A prompt template that includes the chat history,
             the current user input, and an agent scratchpad.
         """
         # Enhance system message with current user's context
-        user_info = get_user_graph_info()
-        enhanced_system_message = enhance_system_message_with_user_context(self._query_config.system_message, user_info)
+        if user_profile is None:
+            user_profile = UserProfileService.get_instance().get_profile(timeout=0)
+        enhanced_system_message = enhance_system_message_with_user_context(self._query_config.system_message, user_profile)
         
         system_message_template = SystemMessagePromptTemplate(
             prompt=PromptTemplate(input_variables=[], template=enhanced_system_message)
@@ -436,7 +462,7 @@ class LamBot(Helper):
 
         base_invoke_config = {
             "configurable": {"session_id": "<foo>"},
-            "callbacks": [self.langfuse_manager.callback_handler],
+            "callbacks": [self.callback_handler],
             "run_id": self.metric_api_client.correlation_id
         }
 
@@ -445,6 +471,8 @@ class LamBot(Helper):
             invoke_config = base_invoke_config.copy()
             invoke_config["configurable"] = config.dict()
             invoke_config["configurable"]["tools"] = self._tools
+            # Scheduler, shared tool results and usage of this research run
+            invoke_config["configurable"]["research_run"] = ResearchRun.from_config(config)
             agent_executor_input = {"messages": convert_openai_messages(messages)}
         else:
             invoke_config = base_invoke_config
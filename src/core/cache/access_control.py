@@ -0,0 +1,256 @@
+"""
+Per-worker resolution service of access-control filter values.
+
+Access-controlled retriever tools restrict their search to the values returned by the access-control
+function of their tool spec for the current user (accounts, sharepoint sites, ASM functional locations,
+completed trainings, ...). Those functions call the ASM API, Synapse or Microsoft Graph, and the same
+user runs the same tools on every message of a conversation, so the service
+- caches the values per (function, user parameter) for ACCESS_CONTROL_CACHE_TTL_SECONDS, and users
+  without access (an empty list) for the shorter ACCESS_CONTROL_NEGATIVE_TTL_SECONDS,
+- reads the username and email parameters from the identity cached by the UserProfileService,
+- runs one lookup per key at a time, concurrent requests share its result,
+- resolves off the event loop on the async path: coroutine functions are awaited, blocking functions
+  run in a worker thread,
+- prefetches the values of the access-controlled tools of a LamBot as soon as the LamBot is configured,
+  so the lookups overlap with the first LLM call instead of delaying the first tool run.
+
+Access-control functions are used as they are, tool specs do not change. Functions may be plain
+functions or coroutine functions taking the user parameter and returning a list of strings.
+
+Environment Variables:
+- ACCESS_CONTROL_CACHE_MAX_ENTRIES: Maximum number of cached resolutions per worker (default: 8192).
+- ACCESS_CONTROL_CACHE_TTL_SECONDS: Maximum time the access of a user is kept in memory (default: 300).
+- ACCESS_CONTROL_NEGATIVE_TTL_SECONDS: Maximum time an empty access list is kept in memory (default: 30).
+"""
+
+import os
+import asyncio
+import hashlib
+import inspect
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.core.cache.lru import TTLCache
+from src.core.cache.singleflight import SingleFlight
+from src.core.context.vars import access_token_var
+from src.core.cache.user_profile import UserProfileService
+from src.models.retriever_tool import AccessControl, AccessControlParam
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(value: str) -> str:
+    # Keys hold no access tokens or user names
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+
+
+class AccessControlCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of AccessControlCache.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = AccessControlCache()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self.ttl = float(os.getenv("ACCESS_CONTROL_CACHE_TTL_SECONDS", "300"))
+        self.negative_ttl = float(os.getenv("ACCESS_CONTROL_NEGATIVE_TTL_SECONDS", "30"))
+        self._cache = TTLCache(
+            max_entries=int(os.getenv("ACCESS_CONTROL_CACHE_MAX_ENTRIES", "8192")),
+            default_ttl=self.ttl,
+        )
+        self._singleflight = SingleFlight()
+        # Keeps the prefetch tasks referenced until they are done
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "misses": 0, "prefetches": 0}
+        self._stats_lock = threading.Lock()
+        self._initialized = True
+
+    @staticmethod
+    def build_key(function: Callable, param_value: str) -> str:
+        """
+        Build the cache key of an access-control resolution.
+
+        Args:
+            function (Callable): The access-control function.
+            param_value (str): The user parameter passed to the function.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"{function.__module__}.{function.__qualname__}:{_hash(param_value)}"
+
+    def resolve(self, access_control: AccessControl, access_token: str) -> List[str]:
+        """
+        Get the values the user of an access token has access to.
+
+        Args:
+            access_control (AccessControl): The access control of the tool spec.
+            access_token (str): The access token of the user.
+
+        Returns:
+            List[str]: A copy of the values returned by the access-control function.
+
+        Raises:
+            ValueError: If the user parameter is missing or the function does not return a list.
+        """
+        user_info = None
+        if access_control.param != AccessControlParam.ACCESS_TOKEN:
+            user_info = self._user_info(access_token)
+        param_value = self._param_value(access_control.param, access_token, user_info)
+        function = access_control.function
+        key = self.build_key(function, param_value)
+        access_types = self._cache.get(key)
+        if access_types is not None:
+            self._record("hits")
+            return list(access_types)
+
+        self._record("misses")
+
+        def fetch() -> List[str]:
+            if inspect.iscoroutinefunction(function):
+                # No event loop runs in the threadpool routes and scripts using the sync path
+                return self._store(key, asyncio.run(function(param_value)))
+            return self._store(key, function(param_value))
+
+        return list(self._singleflight.do(key, fetch))
+
+    async def aresolve(self, access_control: AccessControl, access_token: str) -> List[str]:
+        """
+        Asynchronous variant of `resolve` that does not block the event loop.
+        """
+        user_info = None
+        if access_control.param != AccessControlParam.ACCESS_TOKEN:
+            user_info = await self._auser_info(access_token)
+        param_value = self._param_value(access_control.param, access_token, user_info)
+        function = access_control.function
+        key = self.build_key(function, param_value)
+        access_types = self._cache.get(key)
+        if access_types is not None:
+            self._record("hits")
+            return list(access_types)
+
+        self._record("misses")
+
+        async def fetch() -> List[str]:
+            if inspect.iscoroutinefunction(function):
+                return self._store(key, await function(param_value))
+            return self._store(key, await asyncio.to_thread(function, param_value))
+
+        return list(await self._singleflight.ado(key, fetch))
+
+    def prefetch(self, tools: List[Any]) -> Optional[asyncio.Task]:
+        """
+        Resolve the access control of tools in the background, if called from the event loop.
+
+        Tools without access control are skipped, the retriever tools of multi-retriever tools are
+        included. Failures are logged; the tool run resolves again and raises them.
+
+        Args:
+            tools (List[Any]): The tools of a LamBot.
+
+        Returns:
+            asyncio.Task: The prefetch task, or None if there is nothing to prefetch or no running event loop.
+        """
+        access_token = access_token_var.get()
+        access_controls = self._access_controls(tools)
+        if not access_token or not access_controls:
+            return None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        async def run() -> None:
+            results = await asyncio.gather(
+                *[self.aresolve(access_control, access_token) for access_control in access_controls],
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to prefetch access control values: {result}")
+
+        self._record("prefetches")
+        task = loop.create_task(run())
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+        return task
+
+    @staticmethod
+    def _access_controls(tools: List[Any]) -> List[AccessControl]:
+        access_controls = {}
+        for tool in tools:
+            for retriever_tool in [tool, *(getattr(tool, "retriever_tools", None) or [])]:
+                tool_spec = getattr(retriever_tool, "tool_spec", None)
+                access_control = getattr(tool_spec, "access_control", None)
+                if access_control is not None:
+                    access_controls[(access_control.function, access_control.param)] = access_control
+        return list(access_controls.values())
+
+    def _user_info(self, access_token: str) -> Dict[str, Any]:
+        return UserProfileService.get_instance().get_user_info(access_token)
+
+    async def _auser_info(self, access_token: str) -> Dict[str, Any]:
+        return await UserProfileService.get_instance().aget_user_info(access_token)
+
+    @staticmethod
+    def _param_value(param: AccessControlParam, access_token: str, user_info: Optional[Dict[str, Any]]) -> str:
+        """
+        Determine the parameter to pass to the access-control function.
+        """
+        if param == AccessControlParam.ACCESS_TOKEN:
+            param_value = access_token
+        else:
+            param_value = user_info.get(param.value)
+            if param == AccessControlParam.USERNAME and param_value:
+                param_value = param_value.lower()
+
+        if not param_value:
+            raise ValueError(f"Invalid access control parameter specified: {param}")
+        return param_value
+
+    def _store(self, key: str, access_types: Any) -> tuple:
+        if not isinstance(access_types, list):
+            raise ValueError("The access control function must return a list of strings.")
+        self._cache.set(key, tuple(access_types), self.ttl if access_types else self.negative_ttl)
+        return tuple(access_types)
+
+    def invalidate(self) -> None:
+        """
+        Evict the resolutions of every user on this worker, e.g. after an access change.
+        """
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the hit, miss and prefetch counters together with the hit rate.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self._cache)
+        return stats
+
+    def _record(self, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+    def clear(self) -> None:
+        """
+        Clear the cache and the counters of this worker.
+        """
+        self._cache.clear()
+        with self._stats_lock:
+            self._stats = {"hits": 0, "misses": 0, "prefetches": 0}
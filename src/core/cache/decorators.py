@@ -6,22 +6,50 @@ This module provides decorators for caching function results in Redis with diffe
 - cache_platform_with_args: Caches results globally with dynamic keys based on function arguments
 - cache_user: Caches results per user
 
+Platform-level entries are also kept per worker in the PlatformCache (L1) in front of Redis (L2),
+see `src.core.cache.platform`.
+
+The decorators detect coroutine functions. Coroutines are cached through the AsyncRedisClient so a
+lookup never blocks the event loop, while regular functions (e.g. threadpool routes) keep using the
+synchronous RedisClient. Both share the same keys.
+
 It also provides utilities for cache invalidation:
-- invalidate_platform_cache: Invalidate platform-level cache entries
-- invalidate_user_cache: Invalidate user-level cache entries
+- invalidate_platform_cache / ainvalidate_platform_cache: Invalidate platform-level cache entries
+- invalidate_user_cache / ainvalidate_user_cache: Invalidate user-level cache entries
+
+Every cached key is tracked in a Redis set (tag) for each ':'-delimited prefix of the key, e.g.
+"language_model:gpt-4o" is tracked by the "language_model:*" tag. Prefix patterns such as
+"language_model:*" are invalidated through their tag at a cost proportional to the number of
+matching keys. Other patterns fall back to an incremental SCAN. Neither blocks Redis like KEYS does.
+Keys written before they were tagged are only found by SCAN, so prefix patterns can also be scanned
+by turning CACHE_INVALIDATION_SCAN_FALLBACK on.
+Caches writing to Redis directly build their keys and tags with `build_platform_key` and `build_tags`
+so the same invalidation reaches them.
+
+And pipelined multi-key access to platform-level entries:
+- get_platform_cache_many / aget_platform_cache_many
+- set_platform_cache_many / aset_platform_cache_many
+
+Environment Variables:
+- CACHE_INVALIDATION_SCAN_FALLBACK: Whether prefix patterns are also invalidated with SCAN, for keys
+  written without tags (default: false). Only needed for one longest TTL (one day) after deploying
+  tagged writes to a Redis that still holds untagged keys.
 """
 
+import os
+import inspect
 import logging
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Dict, List, Optional
 
-from src.clients.redis import RedisClient
+from src.clients.redis import AsyncRedisClient, RedisClient
+from src.core.cache.platform import MISSING, PlatformCache
 from src.core.context.vars import ms_user_object_id_var
 
 logger = logging.getLogger(__name__)
 
 
-def _build_platform_key(key: str) -> str:
+def build_platform_key(key: str) -> str:
     """
     Build a platform-specific cache key.
     
@@ -31,7 +59,72 @@ def _build_platform_key(key: str) -> str:
     Returns:
         str: The formatted platform key
     """
-    return f"lambots:api:platform:{key}"
+    return f"{_PLATFORM_PREFIX}{key}"
+
+
+_KEY_PREFIX = "lambots:api:"
+_PLATFORM_PREFIX = f"{_KEY_PREFIX}platform:"
+_USER_PREFIX = f"{_KEY_PREFIX}user:"
+_GLOB_CHARACTERS = set("*?[]\\")
+
+
+def _scope_prefix(cache_key: str) -> Optional[str]:
+    """
+    Return the scope of a full cache key or pattern: the platform prefix or the prefix of its user.
+    """
+    if cache_key.startswith(_PLATFORM_PREFIX):
+        return _PLATFORM_PREFIX
+    if cache_key.startswith(_USER_PREFIX):
+        user_id_end = cache_key.find(":", len(_USER_PREFIX))
+        if user_id_end != -1:
+            return cache_key[:user_id_end + 1]
+    return None
+
+
+def _build_tag_key(pattern: str) -> str:
+    """
+    Build the key of the tag set tracking the keys matched by a full prefix pattern.
+    Tag sets live outside the platform and user namespaces so patterns never match them.
+    """
+    return f"{_KEY_PREFIX}tags:{pattern[len(_KEY_PREFIX):]}"
+
+
+def build_tags(cache_key: str) -> List[str]:
+    """
+    Build the tags of a full cache key: one for its scope and one per ':'-delimited prefix within it.
+
+    Example: "lambots:api:platform:language_model:gpt-4o" is tracked by the tags of
+    "lambots:api:platform:*" and "lambots:api:platform:language_model:*".
+    """
+    scope = _scope_prefix(cache_key)
+    if scope is None:
+        return []
+    relative_key = cache_key[len(scope):]
+    tags = [_build_tag_key(f"{scope}*")]
+    index = relative_key.find(":")
+    while index != -1:
+        tags.append(_build_tag_key(f"{scope}{relative_key[:index + 1]}*"))
+        index = relative_key.find(":", index + 1)
+    return tags
+
+
+def _split_patterns(patterns: List[str]) -> tuple:
+    """
+    Split full patterns into the tags of prefix patterns ("*" or "<prefix>:*" within the scope)
+    and the remaining patterns, which need a keyspace scan.
+    """
+    tags, scan_patterns = [], []
+    for pattern in patterns:
+        scope = _scope_prefix(pattern)
+        relative_pattern = pattern[len(scope):] if scope else None
+        if relative_pattern is not None and (
+            relative_pattern == "*"
+            or (relative_pattern.endswith(":*") and not _GLOB_CHARACTERS & set(relative_pattern[:-1]))
+        ):
+            tags.append(_build_tag_key(pattern))
+        else:
+            scan_patterns.append(pattern)
+    return tags, scan_patterns
 
 
 def _build_user_key(key: str) -> str:
@@ -50,7 +143,7 @@ def _build_user_key(key: str) -> str:
     user_id = ms_user_object_id_var.get()
     if not user_id:
         raise ValueError("User ID not available in context. Ensure user is authenticated.")
-    return f"lambots:api:user:{user_id}:{key}"
+    return f"{_USER_PREFIX}{user_id}:{key}"
 
 
 def _convert_result_if_needed(result: Any, return_type: type = None) -> Any:
@@ -90,6 +183,152 @@ def _serialize_result_for_cache(result: Any, return_type: type = None) -> Any:
     return result
 
 
+def _cached(func: Callable, build_cache_key: Callable[..., Optional[str]], ttl: int, return_type: type = None) -> Callable:
+    """
+    Wrap a function so its result is cached under the key returned by build_cache_key.
+
+    Coroutine functions get an async wrapper backed by the AsyncRedisClient, other functions a sync
+    wrapper backed by the RedisClient. If build_cache_key returns None, the function runs uncached.
+
+    Args:
+        func (Callable): The function to wrap
+        build_cache_key (Callable): Builds the cache key from the call arguments
+        ttl (int): Time to live in seconds
+        return_type (type, optional): Class type to convert dictionary results to
+    """
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            cache_key = build_cache_key(*args, **kwargs)
+            if cache_key is None:
+                return await func(*args, **kwargs)
+
+            redis_client = AsyncRedisClient.get_instance()
+
+            # Try to get from cache first
+            cached_result = await redis_client.get(cache_key)
+            if cached_result is not None:
+                return _convert_result_if_needed(cached_result, return_type)
+
+            # Execute function and get result
+            result = await func(*args, **kwargs)
+            if result is not None:
+                # Serialize result for caching (convert objects to dicts if needed)
+                serialized_result = _serialize_result_for_cache(result, return_type)
+                await redis_client.set_with_expiry(cache_key, serialized_result, ttl, tags=build_tags(cache_key))
+
+            # Return the original result (no conversion needed as function returns correct type)
+            return result
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        cache_key = build_cache_key(*args, **kwargs)
+        if cache_key is None:
+            return func(*args, **kwargs)
+
+        redis_client = RedisClient.get_instance()
+
+        # Try to get from cache first
+        cached_result = redis_client.get(cache_key)
+        if cached_result is not None:
+            return _convert_result_if_needed(cached_result, return_type)
+
+        # Execute function and get result
+        result = func(*args, **kwargs)
+        if result is not None:
+            # Serialize result for caching (convert objects to dicts if needed)
+            serialized_result = _serialize_result_for_cache(result, return_type)
+            redis_client.set_with_expiry(cache_key, serialized_result, ttl, tags=build_tags(cache_key))
+
+        # Return the original result (no conversion needed as function returns correct type)
+        return result
+    return wrapper
+
+
+def _cached_platform(func: Callable, build_cache_key: Callable[..., Optional[str]], ttl: int, return_type: type = None) -> Callable:
+    """
+    Like _cached, with the per-worker PlatformCache (L1) in front of Redis (L2).
+
+    L1 holds the converted result, so a hit skips JSON decoding and validation. Concurrent misses of a
+    key in the same worker share a single Redis lookup and, if Redis misses too, a single call of func.
+    """
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            cache_key = build_cache_key(*args, **kwargs)
+            if cache_key is None:
+                return await func(*args, **kwargs)
+
+            platform_cache = PlatformCache.get_instance()
+            result = platform_cache.get(cache_key)
+            if result is not MISSING:
+                return result
+
+            async def load() -> Any:
+                # A call for the key may have completed since the lookup above
+                result = platform_cache.get(cache_key, record=False)
+                if result is not MISSING:
+                    return result
+
+                redis_client = AsyncRedisClient.get_instance()
+                cached_result, remaining_ttl = await redis_client.get_with_ttl(cache_key)
+                if cached_result is not None:
+                    platform_cache.record("l2_hits")
+                    result = _convert_result_if_needed(cached_result, return_type)
+                    platform_cache.set(cache_key, result, remaining_ttl)
+                    return result
+
+                platform_cache.record("misses")
+                result = await func(*args, **kwargs)
+                if result is not None:
+                    await redis_client.set_with_expiry(
+                        cache_key, _serialize_result_for_cache(result, return_type), ttl, tags=build_tags(cache_key)
+                    )
+                    platform_cache.set(cache_key, result, ttl)
+                return result
+
+            return await platform_cache.singleflight.ado(cache_key, load)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        cache_key = build_cache_key(*args, **kwargs)
+        if cache_key is None:
+            return func(*args, **kwargs)
+
+        platform_cache = PlatformCache.get_instance()
+        result = platform_cache.get(cache_key)
+        if result is not MISSING:
+            return result
+
+        def load() -> Any:
+            # A call for the key may have completed since the lookup above
+            result = platform_cache.get(cache_key, record=False)
+            if result is not MISSING:
+                return result
+
+            redis_client = RedisClient.get_instance()
+            cached_result, remaining_ttl = redis_client.get_with_ttl(cache_key)
+            if cached_result is not None:
+                platform_cache.record("l2_hits")
+                result = _convert_result_if_needed(cached_result, return_type)
+                platform_cache.set(cache_key, result, remaining_ttl)
+                return result
+
+            platform_cache.record("misses")
+            result = func(*args, **kwargs)
+            if result is not None:
+                redis_client.set_with_expiry(
+                    cache_key, _serialize_result_for_cache(result, return_type), ttl, tags=build_tags(cache_key)
+                )
+                platform_cache.set(cache_key, result, ttl)
+            return result
+
+        return platform_cache.singleflight.do(cache_key, load)
+    return wrapper
+
+
 def cache_platform(key: str, ttl: int = 3600, return_type: type = None):
     """
     Decorator for caching function results at the platform level.
@@ -107,28 +346,15 @@ def cache_platform(key: str, ttl: int = 3600, return_type: type = None):
         @cache_platform("language_model", 3600, LanguageModelConfig)
         def get_language_model():
             return {"name": "model1", "display_name": "Model 1"}
+
+        @cache_platform("azure_ad_token", 3600)
+        async def get_token():
+            return await fetch_token()
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            redis_client = RedisClient.get_instance()
-            cache_key = _build_platform_key(key)
-            
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
-            if cached_result is not None:
-                return _convert_result_if_needed(cached_result, return_type)
-            
-            # Execute function and get result
-            result = func(*args, **kwargs)
-            if result is not None:
-                # Serialize result for caching (convert objects to dicts if needed)
-                serialized_result = _serialize_result_for_cache(result, return_type)
-                redis_client.set_with_expiry(cache_key, serialized_result, ttl)
-            
-            # Return the original result (no conversion needed as function returns correct type)
-            return result
-        return wrapper
+        def build_cache_key(*args, **kwargs) -> str:
+            return build_platform_key(key)
+        return _cached_platform(func, build_cache_key, ttl, return_type)
     return decorator
 
 
@@ -151,32 +377,14 @@ def cache_user(key: str, ttl: int = 900, return_type: type = None):
             return {"setting": "value"}
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            redis_client = RedisClient.get_instance()
-            
-            # Early return if user context is not available
+        def build_cache_key(*args, **kwargs) -> Optional[str]:
+            # Skip caching if user context is not available
             try:
-                cache_key = _build_user_key(key)
+                return _build_user_key(key)
             except ValueError as e:
                 logger.warning(f"Unable to build user cache key: {e}")
-                return func(*args, **kwargs)
-            
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
-            if cached_result is not None:
-                return _convert_result_if_needed(cached_result, return_type)
-            
-            # Execute function and get result
-            result = func(*args, **kwargs)
-            if result is not None:
-                # Serialize result for caching (convert objects to dicts if needed)
-                serialized_result = _serialize_result_for_cache(result, return_type)
-                redis_client.set_with_expiry(cache_key, serialized_result, ttl)
-            
-            # Return the original result (no conversion needed as function returns correct type)
-            return result
-        return wrapper
+                return None
+        return _cached(func, build_cache_key, ttl, return_type)
     return decorator
 
 
@@ -199,47 +407,106 @@ def cache_platform_with_args(key_template: str, ttl: int = 3600, return_type: ty
             return model_data
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            import inspect
-            
-            redis_client = RedisClient.get_instance()
-            
-            # Get function signature to map args to parameter names
-            sig = inspect.signature(func)
+        # Get function signature to map args to parameter names
+        sig = inspect.signature(func)
+
+        def build_cache_key(*args, **kwargs) -> Optional[str]:
             bound_args = sig.bind(*args, **kwargs)
             bound_args.apply_defaults()
-            
+
             # Build cache key by formatting template with arguments
             # Skip 'self' argument if it exists (for instance methods)
             format_args = {k: v for k, v in bound_args.arguments.items() if k != 'self'}
-            
-            # Early return if cache key template is invalid
+
+            # Skip caching if cache key template is invalid
             try:
-                cache_key_suffix = key_template.format(**format_args)
-                cache_key = _build_platform_key(cache_key_suffix)
+                return build_platform_key(key_template.format(**format_args))
             except KeyError as e:
                 logger.warning(f"Cache key template missing argument: {e}. Executing function without caching.")
-                return func(*args, **kwargs)
-            
-            # Try to get from cache first
-            cached_result = redis_client.get(cache_key)
-            if cached_result is not None:
-                return _convert_result_if_needed(cached_result, return_type)
-            
-            # Execute function and get result
-            result = func(*args, **kwargs)
-            if result is not None:
-                # Serialize result for caching (convert objects to dicts if needed)
-                serialized_result = _serialize_result_for_cache(result, return_type)
-                redis_client.set_with_expiry(cache_key, serialized_result, ttl)
-            
-            # Return the original result (no conversion needed as function returns correct type)
-            return result
-        return wrapper
+                return None
+        return _cached_platform(func, build_cache_key, ttl, return_type)
     return decorator
 
 
+def get_platform_cache_many(keys: List[str]) -> List[Any]:
+    """
+    Get several platform-level cache entries in a single pipelined round trip.
+
+    Args:
+        keys (List[str]): The cache keys to get (e.g., ["language_model:gpt-4o", "language_model:o3-mini"])
+
+    Returns:
+        list: The cached values in the order of the keys, None for missing entries
+    """
+    return RedisClient.get_instance().get_many([build_platform_key(key) for key in keys])
+
+
+async def aget_platform_cache_many(keys: List[str]) -> List[Any]:
+    """
+    Asynchronous variant of get_platform_cache_many.
+    """
+    return await AsyncRedisClient.get_instance().get_many([build_platform_key(key) for key in keys])
+
+
+def set_platform_cache_many(mapping: Dict[str, Any], ttl: int = 3600) -> bool:
+    """
+    Set several platform-level cache entries in a single pipelined round trip.
+
+    Args:
+        mapping (Dict[str, Any]): The cache keys and the JSON-serializable values to set
+        ttl (int): Time to live in seconds (default: 1 hour)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    platform_mapping = {build_platform_key(key): value for key, value in mapping.items()}
+    return RedisClient.get_instance().set_many_with_expiry(
+        platform_mapping, ttl, tags={key: build_tags(key) for key in platform_mapping}
+    )
+
+
+async def aset_platform_cache_many(mapping: Dict[str, Any], ttl: int = 3600) -> bool:
+    """
+    Asynchronous variant of set_platform_cache_many.
+    """
+    platform_mapping = {build_platform_key(key): value for key, value in mapping.items()}
+    return await AsyncRedisClient.get_instance().set_many_with_expiry(
+        platform_mapping, ttl, tags={key: build_tags(key) for key in platform_mapping}
+    )
+
+
+def _scan_patterns(patterns: List[str], scan_patterns: List[str]) -> List[str]:
+    """
+    Return the patterns to SCAN for: all of them while untagged keys may remain, otherwise only those
+    not covered by a tag.
+    """
+    if os.getenv("CACHE_INVALIDATION_SCAN_FALLBACK", "false").lower() == "true":
+        return patterns
+    return scan_patterns
+
+
+def _delete(redis_client: RedisClient, keys: List[str], patterns: List[str]) -> None:
+    """
+    Delete full keys and the keys matching full patterns, using tags where possible.
+    """
+    tags, scan_patterns = _split_patterns(patterns)
+    redis_client.delete_many(keys)
+    redis_client.delete_tagged(tags)
+    for pattern in _scan_patterns(patterns, scan_patterns):
+        redis_client.delete_matching(pattern)
+
+
+async def _adelete(redis_client: AsyncRedisClient, keys: List[str], patterns: List[str]) -> None:
+    """
+    Asynchronous variant of _delete.
+    """
+    tags, scan_patterns = _split_patterns(patterns)
+    await redis_client.delete_many(keys)
+    await redis_client.delete_tagged(tags)
+    for pattern in _scan_patterns(patterns, scan_patterns):
+        await redis_client.delete_matching(pattern)
+
+
 def invalidate_platform_cache(patterns: list = None, keys: list = None):
     """
     Invalidate cached entries for platform-level cache.
@@ -262,20 +529,43 @@ def invalidate_platform_cache(patterns: list = None, keys: list = None):
         )
     """
     redis_client = RedisClient.get_instance()
-    
-    # Invalidate specific keys
-    if keys:
-        for key in keys:
-            cache_key = _build_platform_key(key)
-            redis_client.delete(cache_key)
-    
-    # Invalidate by patterns
-    if patterns:
-        for pattern in patterns:
-            full_pattern = _build_platform_key(pattern)
-            matching_keys = redis_client.keys(full_pattern)
-            for key in matching_keys:
-                redis_client.delete(key)
+    platform_keys = [build_platform_key(key) for key in keys or []]
+    platform_patterns = [build_platform_key(pattern) for pattern in patterns or []]
+    _delete(redis_client, platform_keys, platform_patterns)
+
+    # Evict the in-process copies of all workers
+    PlatformCache.get_instance().invalidate(platform_keys, platform_patterns)
+
+
+async def ainvalidate_platform_cache(patterns: list = None, keys: list = None):
+    """
+    Asynchronous variant of invalidate_platform_cache.
+    """
+    redis_client = AsyncRedisClient.get_instance()
+    platform_keys = [build_platform_key(key) for key in keys or []]
+    platform_patterns = [build_platform_key(pattern) for pattern in patterns or []]
+    await _adelete(redis_client, platform_keys, platform_patterns)
+
+    # Evict the in-process copies of all workers
+    await PlatformCache.get_instance().ainvalidate(platform_keys, platform_patterns)
+
+
+def _build_user_keys_to_delete(patterns: Optional[list], keys: Optional[list]) -> tuple:
+    """
+    Build the user-level keys and patterns to invalidate, skipping those without user context.
+    """
+    user_keys, user_patterns = [], []
+    for key in keys or []:
+        try:
+            user_keys.append(_build_user_key(key))
+        except ValueError:
+            logger.warning(f"Unable to build user cache key for: {key}")
+    for pattern in patterns or []:
+        try:
+            user_patterns.append(_build_user_key(pattern))
+        except ValueError:
+            logger.warning(f"Unable to build user cache pattern for: {pattern}")
+    return user_keys, user_patterns
 
 
 def invalidate_user_cache(patterns: list = None, keys: list = None):
@@ -286,24 +576,13 @@ def invalidate_user_cache(patterns: list = None, keys: list = None):
         patterns (list, optional): List of key patterns to match
         keys (list, optional): List of specific cache keys to invalidate
     """
-    redis_client = RedisClient.get_instance()
-    
-    # Invalidate specific keys
-    if keys:
-        for key in keys:
-            try:
-                cache_key = _build_user_key(key)
-                redis_client.delete(cache_key)
-            except ValueError:
-                logger.warning(f"Unable to build user cache key for: {key}")
-    
-    # Invalidate by patterns
-    if patterns:
-        for pattern in patterns:
-            try:
-                full_pattern = _build_user_key(pattern)
-                matching_keys = redis_client.keys(full_pattern)
-                for key in matching_keys:
-                    redis_client.delete(key)
-            except ValueError:
-                logger.warning(f"Unable to build user cache pattern for: {pattern}")
+    user_keys, user_patterns = _build_user_keys_to_delete(patterns, keys)
+    _delete(RedisClient.get_instance(), user_keys, user_patterns)
+
+
+async def ainvalidate_user_cache(patterns: list = None, keys: list = None):
+    """
+    Asynchronous variant of invalidate_user_cache.
+    """
+    user_keys, user_patterns = _build_user_keys_to_delete(patterns, keys)
+    await _adelete(AsyncRedisClient.get_instance(), user_keys, user_patterns)
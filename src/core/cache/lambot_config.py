@@ -0,0 +1,158 @@
+"""
+Per-worker cache of resolved LamBot configurations.
+
+Resolving the LamBot of a chat request takes several Mongo round trips (the LamBot document, its tools,
+all language models and the whole tool collection for the access check) and Pydantic validation of
+every document. The outcome only depends on the LamBot, the user role and the user's security groups,
+so successful resolutions are kept per (lambot_id, role, hash of the security-group set).
+
+Sharepoint tools additionally depend on the user's Copilot license. Entries resolved with such a tool
+remember the license state they were resolved with and are ignored for users whose state differs.
+
+Callers get a deep copy of the cached config, since `LamBot` mutates the default query config it is
+given. Entries are evicted on every worker by the write paths of LamBot, tool and language model configs
+(through the PlatformCache invalidation channel), and expire after their TTL otherwise.
+
+Environment Variables:
+- LAMBOT_CONFIG_CACHE_MAX_ENTRIES: Maximum number of resolved configs kept in memory per worker (default: 4096).
+- LAMBOT_CONFIG_CACHE_TTL_SECONDS: Maximum time a resolved config is kept in memory (default: 300).
+"""
+
+import os
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from src.core.cache.decorators import build_platform_key
+from src.core.cache.lru import TTLCache
+from src.core.cache.platform import PlatformCache
+from src.models.config import LamBotConfig
+
+_KEY_NAMESPACE = "resolved_lambot"
+
+
+class _ResolvedLamBot(NamedTuple):
+    lambot_config: LamBotConfig
+    # None when no tool of the LamBot depends on the user's Copilot license
+    copilot_access: Optional[bool]
+
+
+class LamBotConfigCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of LamBotConfigCache.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = LamBotConfigCache()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self._cache = TTLCache(
+            max_entries=int(os.getenv("LAMBOT_CONFIG_CACHE_MAX_ENTRIES", "4096")),
+            default_ttl=float(os.getenv("LAMBOT_CONFIG_CACHE_TTL_SECONDS", "300")),
+        )
+        PlatformCache.get_instance().register_local_cache(self._cache)
+        self._stats = {"hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+        self._initialized = True
+
+    @staticmethod
+    def build_key(lambot_id: Any, user_role: str, security_groups: List[str]) -> str:
+        """
+        Build the cache key of a resolution.
+
+        Args:
+            lambot_id (Any): The LamBot id.
+            user_role (str): The role of the user.
+            security_groups (List[str]): The security groups of the user, in any order.
+
+        Returns:
+            str: The cache key.
+        """
+        groups_hash = hashlib.sha256("\n".join(sorted(set(security_groups))).encode("utf-8")).hexdigest()
+        return build_platform_key(f"{_KEY_NAMESPACE}:{lambot_id}:{user_role}:{groups_hash}")
+
+    def get(self, key: str, copilot_access: Callable[[], bool]) -> Optional[LamBotConfig]:
+        """
+        Get a resolved config.
+
+        Args:
+            key (str): The cache key.
+            copilot_access (Callable[[], bool]): Returns the Copilot license state of the user. Only
+                called for entries that depend on it.
+
+        Returns:
+            LamBotConfig: A copy of the cached config, or None on a miss.
+        """
+        entry = self._cache.get(key)
+        if entry is None or (entry.copilot_access is not None and entry.copilot_access != copilot_access()):
+            self._record("misses")
+            return None
+        self._record("hits")
+        return entry.lambot_config.model_copy(deep=True)
+
+    async def aget(self, key: str, copilot_access: Callable[[], Awaitable[bool]]) -> Optional[LamBotConfig]:
+        """
+        Asynchronous variant of `get` for a coroutine function returning the Copilot license state.
+        """
+        entry = self._cache.get(key)
+        if entry is None or (entry.copilot_access is not None and entry.copilot_access != await copilot_access()):
+            self._record("misses")
+            return None
+        self._record("hits")
+        return entry.lambot_config.model_copy(deep=True)
+
+    def set(self, key: str, lambot_config: LamBotConfig, copilot_access: Optional[bool] = None) -> None:
+        """
+        Cache a resolved config.
+
+        Args:
+            key (str): The cache key.
+            lambot_config (LamBotConfig): The resolved config. A copy is stored.
+            copilot_access (bool, optional): The Copilot license state the config was resolved with,
+                if any of its tools depends on it.
+        """
+        self._cache.set(key, _ResolvedLamBot(lambot_config.model_copy(deep=True), copilot_access))
+
+    def invalidate(self, lambot_id: Any = None) -> None:
+        """
+        Evict the resolutions of a LamBot, or of every LamBot, on all workers.
+
+        Args:
+            lambot_id (Any, optional): The LamBot to evict. Evicts every LamBot when None, e.g. after a
+                tool or language model change.
+        """
+        scope = "*" if lambot_id is None else f"{lambot_id}:*"
+        PlatformCache.get_instance().invalidate(patterns=[build_platform_key(f"{_KEY_NAMESPACE}:{scope}")])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the hit and miss counters together with the hit rate.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self._cache)
+        return stats
+
+    def _record(self, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+    def clear(self) -> None:
+        """
+        Clear the cache and the counters of this worker.
+        """
+        self._cache.clear()
+        with self._stats_lock:
+            self._stats = {"hits": 0, "misses": 0}
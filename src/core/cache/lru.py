@@ -0,0 +1,90 @@
+"""
+Bounded in-process cache used as the first (L1) tier in front of Redis.
+
+Entries are evicted in least-recently-used order once the cache is full and expire after their TTL.
+The cache is per worker process and thread-safe, so it can be shared between the event loop and the
+threadpool routes.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache with per-entry expiry.
+
+    Args:
+        max_entries (int): Maximum number of entries kept in the cache.
+        default_ttl (float): Default time to live of an entry in seconds.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value from the cache.
+
+        Args:
+            key (Hashable): The key to get
+
+        Returns:
+            any: The value if present and not expired, None otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Set a value in the cache, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The key to set
+            value (any): The value to set
+            ttl (float, optional): Time to live in seconds (default: the cache's default TTL)
+        """
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Delete a key from the cache if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        """
+        Return a snapshot of the keys in the cache, including expired entries not yet evicted.
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,188 @@
+"""
+In-process (L1) tier of the platform-level cache.
+
+Platform-scoped entries (language model configs, AAD tokens, ...) are read on every LamBot construction
+and LLM request. The L1 tier keeps them per worker in a bounded TTL/LRU cache in front of Redis (L2), so
+a hit costs neither a network round trip nor JSON decoding and Pydantic validation. Values are stored
+as returned to callers and shared between requests, so they must be treated as read-only.
+
+Misses are de-duplicated per worker, so a cold key triggers a single fetch however many requests
+miss it at once.
+
+When `invalidate_platform_cache` runs, the invalidation is published on a Redis channel and every
+worker evicts the matching L1 entries. The L1 TTL is bounded, which also caps staleness should a
+notification be lost.
+
+Environment Variables:
+- PLATFORM_CACHE_L1_MAX_ENTRIES: Maximum number of entries kept in memory per worker (default: 2048).
+- PLATFORM_CACHE_L1_TTL_SECONDS: Maximum time an entry is kept in memory (default: 300).
+"""
+
+import os
+import uuid
+import fnmatch
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.clients.redis import AsyncRedisClient, RedisClient
+from src.core.cache.lru import TTLCache
+from src.core.cache.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "lambots:api:platform:invalidations"
+
+# Distinguishes a cached None from a miss
+MISSING = object()
+
+
+class PlatformCache:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of PlatformCache.
+        """
+        if cls._instance is None:
+            # Threadpool requests may race to create the instance; they must share one singleflight
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = PlatformCache()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self.max_ttl = float(os.getenv("PLATFORM_CACHE_L1_TTL_SECONDS", "300"))
+        self._l1 = TTLCache(
+            max_entries=int(os.getenv("PLATFORM_CACHE_L1_MAX_ENTRIES", "2048")),
+            default_ttl=self.max_ttl,
+        )
+        self.singleflight = SingleFlight()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+        self._worker_id = str(uuid.uuid4())
+        self._listener = None
+        self._local_caches: List[TTLCache] = []
+        self._initialized = True
+
+    def get(self, key: str, record: bool = True) -> Any:
+        """
+        Get a value from the in-process tier.
+
+        Args:
+            key (str): The cache key
+            record (bool): Whether to count a hit in the statistics
+
+        Returns:
+            any: The value, or MISSING if it is not cached in this worker.
+        """
+        value = self._l1.get(key)
+        if value is None:
+            return MISSING
+        if record:
+            self.record("l1_hits")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Keep a value in the in-process tier for at most the configured maximum TTL.
+
+        Args:
+            key (str): The cache key
+            value (any): The value as returned to callers
+            ttl (float, optional): The remaining time to live of the entry in Redis
+        """
+        if value is None:
+            return
+        self._l1.set(key, value, min(ttl, self.max_ttl) if ttl else self.max_ttl)
+
+    def record(self, outcome: str) -> None:
+        """
+        Count a lookup outcome: "l1_hits", "l2_hits" or "misses".
+        """
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the lookup counters together with the L1 and overall hit rates.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"]
+        stats["l1_hit_rate"] = stats["l1_hits"] / lookups if lookups else 0.0
+        stats["hit_rate"] = (stats["l1_hits"] + stats["l2_hits"]) / lookups if lookups else 0.0
+        stats["l1_entries"] = len(self._l1)
+        return stats
+
+    def register_local_cache(self, cache: TTLCache) -> None:
+        """
+        Evict entries of another per-worker cache on invalidations. Its keys must be full platform keys.
+        """
+        self._local_caches.append(cache)
+
+    def evict(self, keys: Optional[List[str]] = None, patterns: Optional[List[str]] = None) -> None:
+        """
+        Evict keys and keys matching glob patterns from the in-process tier of this worker.
+        """
+        for cache in [self._l1, *self._local_caches]:
+            for key in keys or []:
+                cache.delete(key)
+            if patterns:
+                for key in cache.keys():
+                    if any(fnmatch.fnmatchcase(key, pattern) for pattern in patterns):
+                        cache.delete(key)
+
+    def _invalidation_message(self, keys: Optional[List[str]], patterns: Optional[List[str]]) -> Dict[str, Any]:
+        return {"origin": self._worker_id, "keys": keys or [], "patterns": patterns or []}
+
+    def invalidate(self, keys: Optional[List[str]] = None, patterns: Optional[List[str]] = None) -> None:
+        """
+        Evict keys and patterns from this worker and notify the other workers.
+        """
+        self.evict(keys, patterns)
+        RedisClient.get_instance().publish(INVALIDATION_CHANNEL, self._invalidation_message(keys, patterns))
+
+    async def ainvalidate(self, keys: Optional[List[str]] = None, patterns: Optional[List[str]] = None) -> None:
+        """
+        Asynchronous variant of `invalidate`.
+        """
+        self.evict(keys, patterns)
+        await AsyncRedisClient.get_instance().publish(INVALIDATION_CHANNEL, self._invalidation_message(keys, patterns))
+
+    def _on_invalidation(self, message: Dict[str, Any]) -> None:
+        if message.get("origin") == self._worker_id:
+            return
+        self.evict(message.get("keys"), message.get("patterns"))
+
+    def start_invalidation_listener(self) -> None:
+        """
+        Subscribe to invalidations published by other workers.
+        """
+        if self._listener is None:
+            self._listener = RedisClient.get_instance().subscribe(INVALIDATION_CHANNEL, self._on_invalidation)
+            if self._listener is None:
+                # Without notifications, entries of this worker go stale for at most the L1 TTL
+                logger.warning(f"Platform cache invalidations are not received; L1 entries may be stale for up to {self.max_ttl}s.")
+
+    def stop_invalidation_listener(self) -> None:
+        """
+        Stop receiving invalidations and log the cache statistics.
+        """
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        logger.info(f"Platform cache statistics: {self.get_stats()}")
+
+    def clear(self) -> None:
+        """
+        Clear the in-process tier and the counters of this worker.
+        """
+        self._l1.clear()
+        with self._stats_lock:
+            self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
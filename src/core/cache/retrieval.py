@@ -0,0 +1,183 @@
+"""
+Two-tier cache of Azure AI Search results.
+
+Retriever tools opt in through `RetrieverToolSpec.result_cache`. Cached entries hold the raw `value`
+payload of the search response (without vector fields), so PII redaction and citation grouping still
+run per request.
+
+Entries are keyed by the index name, the normalized query and the effective search request, which
+includes the merged filter (tool spec, tool kwargs and access control) and top_k. Users with different
+access therefore never share results.
+
+- L1: a per-worker in-process LRU with TTL
+- L2: Redis, shared by all workers
+
+Redis entries are tagged like the entries of the cache decorators, so
+`invalidate_platform_cache(patterns=["retrieval:<index_name>:*"])` drops the results of an index.
+
+Environment Variables:
+- RETRIEVAL_CACHE_L1_MAX_ENTRIES: Maximum number of search results kept in memory per worker (default: 1024).
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from copy import deepcopy
+from typing import Any, Dict, List, Optional
+
+from src.clients.redis import AsyncRedisClient, RedisClient
+from src.core.cache.decorators import build_platform_key, build_tags
+from src.core.cache.lru import TTLCache
+from src.models.retriever_tool import RetrieverCacheConfig
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalResultCache:
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of RetrievalResultCache.
+        """
+        if cls._instance is None:
+            cls._instance = RetrievalResultCache()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self._l1 = TTLCache(max_entries=int(os.getenv("RETRIEVAL_CACHE_L1_MAX_ENTRIES", "1024")))
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"l1_hits": 0, "l2_hits": 0, "misses": 0})
+        self._stats_lock = threading.Lock()
+        self._initialized = True
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase the query and collapse whitespace."""
+        return " ".join(query.lower().split())
+
+    def build_key(self, index_name: str, query: str, payload: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a search request.
+
+        Args:
+            index_name (str): The searched index.
+            query (str): The user query.
+            payload (Dict[str, Any]): The search request body, including the effective filter and top_k.
+
+        Returns:
+            str: The cache key.
+        """
+        normalized_query = self.normalize_query(query)
+        key_payload = deepcopy(payload)
+        if key_payload.get("search") is not None:
+            key_payload["search"] = normalized_query
+        for vector_query in key_payload.get("vectorQueries", []):
+            if "text" in vector_query:
+                vector_query["text"] = normalized_query
+
+        digest = hashlib.sha256(
+            json.dumps({"index": index_name, "payload": key_payload}, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return build_platform_key(f"retrieval:{index_name}:{digest}")
+
+    def _record(self, index_name: str, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[index_name][outcome] += 1
+
+    def get(self, key: str, index_name: str, config: RetrieverCacheConfig) -> Optional[List[dict]]:
+        """
+        Get cached search results, looking in memory first and in Redis second.
+
+        Returns:
+            List[dict]: The cached search results, or None on a miss.
+        """
+        value = self._l1.get(key)
+        if value is not None:
+            self._record(index_name, "l1_hits")
+            return value
+
+        value = RedisClient.get_instance().get(key)
+        if value is not None:
+            self._l1.set(key, value, config.ttl_seconds)
+            self._record(index_name, "l2_hits")
+            return value
+
+        self._record(index_name, "misses")
+        return None
+
+    @staticmethod
+    def _fits(key: str, value: List[dict], config: RetrieverCacheConfig) -> bool:
+        size = len(json.dumps(value).encode("utf-8"))
+        if size > config.max_entry_bytes:
+            logger.debug(f"Not caching search results of {size} bytes for key {key}")
+            return False
+        return True
+
+    def set(self, key: str, value: List[dict], config: RetrieverCacheConfig) -> bool:
+        """
+        Cache search results in memory and in Redis, unless they exceed the configured size.
+
+        Returns:
+            bool: True if the results were cached, False otherwise.
+        """
+        if not self._fits(key, value, config):
+            return False
+
+        self._l1.set(key, value, config.ttl_seconds)
+        RedisClient.get_instance().set_with_expiry(key, value, config.ttl_seconds, tags=build_tags(key))
+        return True
+
+    async def aget(self, key: str, index_name: str, config: RetrieverCacheConfig) -> Optional[List[dict]]:
+        """
+        Asynchronous variant of `get`, looking up Redis through the AsyncRedisClient.
+        """
+        value = self._l1.get(key)
+        if value is not None:
+            self._record(index_name, "l1_hits")
+            return value
+
+        value = await AsyncRedisClient.get_instance().get(key)
+        if value is not None:
+            self._l1.set(key, value, config.ttl_seconds)
+            self._record(index_name, "l2_hits")
+            return value
+
+        self._record(index_name, "misses")
+        return None
+
+    async def aset(self, key: str, value: List[dict], config: RetrieverCacheConfig) -> bool:
+        """
+        Asynchronous variant of `set`, writing to Redis through the AsyncRedisClient.
+        """
+        if not self._fits(key, value, config):
+            return False
+
+        self._l1.set(key, value, config.ttl_seconds)
+        await AsyncRedisClient.get_instance().set_with_expiry(key, value, config.ttl_seconds, tags=build_tags(key))
+        return True
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the hit and miss counters of each index together with its hit rate.
+        """
+        with self._stats_lock:
+            stats = {index_name: dict(counters) for index_name, counters in self._stats.items()}
+        for counters in stats.values():
+            lookups = counters["l1_hits"] + counters["l2_hits"] + counters["misses"]
+            counters["hit_rate"] = (counters["l1_hits"] + counters["l2_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """
+        Clear the in-memory tier and the counters. Redis entries expire on their own.
+        """
+        self._l1.clear()
+        with self._stats_lock:
+            self._stats.clear()
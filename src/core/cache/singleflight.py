@@ -0,0 +1,110 @@
+"""
+Duplicate call suppression ("singleflight") for cache misses.
+
+When a cached key expires, every request that misses it at the same time would otherwise run the
+underlying fetch (Mongo query, AAD token request, ...). SingleFlight lets the first caller for a key
+run the fetch while concurrent callers for the same key wait for and share its result.
+
+Calls are de-duplicated per worker process: threads through `do`, coroutines of the event loop
+through `ado`.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the leading call is cancelled, so the waiters retry the call."""
+
+
+class SingleFlight:
+    """Runs at most one in-flight call per key and shares its outcome with concurrent callers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, asyncio.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn unless a call for the key is already in flight, in which case wait for its result.
+
+        Args:
+            key (Hashable): The key identifying the call.
+            fn (Callable): The function to run.
+
+        Returns:
+            any: The result of fn. Its exception is raised to every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asynchronous variant of `do` for coroutines running on the same event loop.
+
+        Args:
+            key (Hashable): The key identifying the call.
+            fn (Callable): A function returning the awaitable to run.
+
+        Returns:
+            any: The result of the awaitable. Its exception is raised to every waiting caller, except
+            for the cancellation of the leading call, after which the waiters run the call again.
+        """
+        loop = asyncio.get_running_loop()
+        future = self._async_calls.get(key)
+        while future is not None and future.get_loop() is loop:
+            try:
+                # Shield the shared future so a cancelled waiter does not cancel the other callers
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # The leader was cancelled: join the call started by another waiter or lead a new one
+                future = self._async_calls.get(key)
+
+        future = loop.create_future()
+        self._async_calls[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Cancellation belongs to the leader's caller only, the waiters re-run the call
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            if self._async_calls.get(key) is future:
+                del self._async_calls[key]
@@ -0,0 +1,232 @@
+"""
+Per-worker service of the Microsoft Graph profile and identity of the current user.
+
+The profile (name, job title, department, location, manager, ...) enriches the system message of
+every chat, and the identity (on-premises account name and email) is the parameter of the
+access-control functions. Both used to be fetched from Graph while the first LLM call waited. The
+service
+- keeps the profile per user in memory (L1) for USER_PROFILE_L1_TTL_SECONDS, in front of the Redis
+  entry of `get_user_graph_info` (L2, 4 hours),
+- starts the lookup as soon as a request is authenticated (`prefetch`, from the RequestSpanMiddleware),
+  so it runs while the LamBot is being configured,
+- runs one lookup per user at a time, concurrent requests share it,
+- waits at most USER_PROFILE_GRAPH_TIMEOUT_SECONDS for a lookup, then falls back to the profile in the
+  claims of the access token. The lookup keeps running and serves the next requests of the user,
+- keeps the identity per access token in memory, as access-control values are resolved with it.
+
+Environment Variables:
+- USER_PROFILE_CACHE_MAX_ENTRIES: Maximum number of profiles and identities kept in memory (default: 4096).
+- USER_PROFILE_L1_TTL_SECONDS: Maximum time a profile or an identity is kept in memory (default: 900).
+- USER_PROFILE_GRAPH_TIMEOUT_SECONDS: Maximum wait for a profile before falling back to the token claims (default: 1.5).
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Optional
+
+from src.core.cache.lru import TTLCache
+from src.core.cache.singleflight import SingleFlight
+from src.core.context.vars import ms_user_object_id_var, user_claims_var
+from src.core.utils.auth_helpers import get_user_info
+from src.core.utils.ms_graph_utils import get_user_graph_info
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(value: str) -> str:
+    # Keys hold no access tokens
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+
+
+def profile_from_claims(claims: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a partial Graph profile from the claims of an access token.
+
+    Args:
+        claims (Dict[str, Any]): The decoded claims of the access token.
+
+    Returns:
+        Dict[str, Any]: The profile fields available in the claims, empty if there are none.
+    """
+    if not claims:
+        return {}
+    profile = {
+        "id": claims.get("oid"),
+        "displayName": claims.get("name"),
+        "givenName": claims.get("given_name"),
+        "surname": claims.get("family_name"),
+        "userPrincipalName": claims.get("upn") or claims.get("unique_name"),
+        "mail": claims.get("email") or claims.get("upn") or claims.get("unique_name"),
+    }
+    return {field: value for field, value in profile.items() if value}
+
+
+class UserProfileService:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Retrieve the singleton instance of UserProfileService.
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = UserProfileService()
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self.graph_timeout = float(os.getenv("USER_PROFILE_GRAPH_TIMEOUT_SECONDS", "1.5"))
+        self._cache = TTLCache(
+            max_entries=int(os.getenv("USER_PROFILE_CACHE_MAX_ENTRIES", "4096")),
+            default_ttl=float(os.getenv("USER_PROFILE_L1_TTL_SECONDS", "900")),
+        )
+        self._singleflight = SingleFlight()
+        # Profile lookups in flight, per user
+        self._lookups: Dict[str, Future] = {}
+        self._lookups_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="user-profile")
+        self._stats = {"hits": 0, "misses": 0, "fallbacks": 0}
+        self._stats_lock = threading.Lock()
+        self._initialized = True
+
+    def prefetch(self) -> None:
+        """
+        Start the profile lookup of the current user in the background, unless the profile is in memory.
+        """
+        user_id = ms_user_object_id_var.get()
+        if user_id and self._cache.get(f"profile:{user_id}") is None:
+            self._lookup(user_id)
+
+    def get_profile(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get the Graph profile of the current user, or the profile in the claims of their access token
+        if Graph does not answer within the timeout.
+
+        Args:
+            timeout (float, optional): Maximum wait for the lookup. 0 never waits and leaves the lookup
+                running. Defaults to USER_PROFILE_GRAPH_TIMEOUT_SECONDS.
+
+        Returns:
+            Dict[str, Any]: The profile, as returned by `get_user_graph_info`. Empty if it is unknown.
+        """
+        user_id = ms_user_object_id_var.get()
+        profile = self._cached_profile(user_id)
+        if profile is not None:
+            return profile
+        try:
+            return self._lookup(user_id).result(timeout=self.graph_timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            return self._fallback()
+
+    async def aget_profile(self) -> Dict[str, Any]:
+        """
+        Asynchronous variant of `get_profile`, waiting for the lookup without blocking the event loop.
+        """
+        user_id = ms_user_object_id_var.get()
+        profile = self._cached_profile(user_id)
+        if profile is not None:
+            return profile
+        try:
+            # Shielded: a timeout does not cancel the lookup shared with the other requests
+            lookup = asyncio.wrap_future(self._lookup(user_id))
+            return await asyncio.wait_for(asyncio.shield(lookup), timeout=self.graph_timeout)
+        except asyncio.TimeoutError:
+            return self._fallback()
+
+    def _cached_profile(self, user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not user_id:
+            return self._fallback()
+        profile = self._cache.get(f"profile:{user_id}")
+        self._record("hits" if profile is not None else "misses")
+        return profile
+
+    def _lookup(self, user_id: str) -> Future:
+        with self._lookups_lock:
+            lookup = self._lookups.get(user_id)
+            if lookup is not None:
+                return lookup
+            # get_user_graph_info reads the user and the access token from the request context
+            context = contextvars.copy_context()
+            lookup = self._executor.submit(context.run, self._fetch_profile, user_id)
+            self._lookups[user_id] = lookup
+        # Outside of the lock, the callback runs right away if the lookup is already done
+        lookup.add_done_callback(lambda done: self._forget_lookup(user_id, done))
+        return lookup
+
+    def _forget_lookup(self, user_id: str, lookup: Future) -> None:
+        with self._lookups_lock:
+            if self._lookups.get(user_id) is lookup:
+                del self._lookups[user_id]
+
+    def _fetch_profile(self, user_id: str) -> Dict[str, Any]:
+        try:
+            profile = get_user_graph_info()
+        except Exception as e:
+            logger.warning(f"Failed to get the Graph profile of the user: {e}")
+            profile = None
+        if not profile:
+            return self._fallback()
+        self._cache.set(f"profile:{user_id}", profile)
+        return profile
+
+    def _fallback(self) -> Dict[str, Any]:
+        self._record("fallbacks")
+        return profile_from_claims(user_claims_var.get())
+
+    def get_user_info(self, access_token: str) -> Dict[str, Any]:
+        """
+        Get the username, email and access token of the user of an access token, see `get_user_info`.
+
+        Raises:
+            PermissionError: If Microsoft Graph does not return the user.
+        """
+        key = f"user_info:{_hash(access_token)}"
+        user_info = self._cache.get(key)
+        if user_info is None:
+            user_info = self._singleflight.do(key, lambda: get_user_info(access_token))
+            self._cache.set(key, user_info)
+        return user_info
+
+    async def aget_user_info(self, access_token: str) -> Dict[str, Any]:
+        """
+        Asynchronous variant of `get_user_info`, calling Graph off the event loop.
+        """
+        key = f"user_info:{_hash(access_token)}"
+        user_info = self._cache.get(key)
+        if user_info is None:
+            user_info = await self._singleflight.ado(key, lambda: asyncio.to_thread(get_user_info, access_token))
+            self._cache.set(key, user_info)
+        return user_info
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the profile hit, miss and fallback counters.
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _record(self, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += 1
+
+    def clear(self) -> None:
+        """
+        Clear the profiles and identities of this worker.
+        """
+        self._cache.clear()
+
+    def shutdown(self) -> None:
+        """
+        Stop the profile lookups.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,12 @@
+import os
 import json
+import time
+import asyncio
 from src.models import LamBotChatResponse
 from src.core.bots.lambot import LamBot
 from src.core.utils import convert_lambot_documents_to_citations
 from src.core.chat.utils import extract_and_renumber_citations, extract_indexes_queried_by_agent
+from src.core.chat.stream_coalescer import StreamCoalescer
 from src.models.logging import TokenUsageDetails, ResponseInfo
 from src.core.bots.followup_questions_generator_bot import FollowUpQuestionGeneratorBot
 from src.core.utils.log_trace import log_trace_event
@@ -12,7 +16,7 @@ from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-from typing import List, Dict, Any, Union, AsyncGenerator
+from typing import List, Dict, Any, Union, AsyncGenerator, Optional
 
 class ConversationEngine:
     def __init__(self, bot: LamBot):
@@ -23,10 +27,11 @@ class ConversationEngine:
             bot (LamBot): The bot instance to use for handling conversations.
         """
         self._bot = bot
-        self._callback_handler = bot.langfuse_manager.callback_handler
+        self._callback_handler = bot.callback_handler
         self.is_enterprise_lambot = self._bot.bot_config.display_name == "Enterprise LamBot"
         self._accumulated_input_tokens = 0
         self._accumulated_output_tokens = 0
+        self._followup_task: Optional[asyncio.Task] = None
 
     async def _supply_intake_items_to_tools(self, messages):
         """
@@ -46,19 +51,72 @@ class ConversationEngine:
                     if IntakeItem.FILE_ATTACHMENTS in self._bot.intake_flags and IntakeItem.FILE_ATTACHMENTS in tool.allowed_intakes:
                         await tool.set_file_attachments(self._bot.file_attachments)
 
-    async def _generate_streaming_response(self, messages: List[Dict[str, Any]], trace_id: str):
+    def _start_followup_questions(self, messages: List[Dict[str, Any]], agent_executor_output: List[Any], trace_id: str) -> None:
+        """
+        Start generating the follow-up questions in the background, as soon as the final answer is known.
+
+        Args:
+            messages (List[Dict[str, Any]]): The conversation history.
+            agent_executor_output (List[Any]): The messages of the agent run, ending with the final answer.
+            trace_id (str): The trace ID for E2E tracing.
+        """
+        async def generate():
+            # The prompt and the LLM client are cached, but their first lookup blocks
+            followup_question_bot = await asyncio.to_thread(
+                FollowUpQuestionGeneratorBot,
+                lambot_display_name=self._bot.bot_config.display_name,
+                langfuse_manager=self._bot.langfuse_manager,
+                callback_handler=self._bot.callback_handler,
+            )
+            followup_questions = await followup_question_bot.agenerate_followup_questions(messages, agent_executor_output)
+            log_trace_event(
+                trace_id=trace_id,
+                step="followup_questions_created",
+            )
+            return followup_questions, followup_question_bot.usage_metadata
+
+        self._followup_task = asyncio.create_task(generate())
+
+    async def _await_followup_questions(self) -> tuple:
+        """
+        Wait for the follow-up questions, for at most FOLLOWUP_QUESTIONS_TIMEOUT_SECONDS.
+
+        The answer is complete without them, so failures are logged and no questions are suggested.
+
+        Returns:
+            tuple: The follow-up questions and their token usage, or (None, None).
+        """
+        task, self._followup_task = self._followup_task, None
+        if task is None:
+            return None, None
+        try:
+            return await asyncio.wait_for(task, timeout=float(os.getenv("FOLLOWUP_QUESTIONS_TIMEOUT_SECONDS", "15")))
+        except Exception as e:
+            self._bot.logger.warning(f"Follow-up questions were not generated: {e!r}")
+            return None, None
+
+    def _cancel_followup_questions(self) -> None:
+        """Cancel the follow-up questions of a response that is no longer streamed."""
+        if self._followup_task is not None:
+            self._followup_task.cancel()
+            self._followup_task = None
+
+    async def _generate_streaming_response(self, messages: List[Dict[str, Any]], trace_id: str, coalescer: Optional[StreamCoalescer] = None):
         """
         Handle a conversation based on the messages.
 
         Args:
             messages (List[Dict[str, Any]]): The list of messages to use in the conversation.
             trace_id (str): The trace ID for E2E tracing.
+            coalescer (StreamCoalescer, optional): Turns the events into NDJSON lines. Defaults to the configured coalescing.
         """
         first_token_streamed = False
+        coalescer = coalescer or StreamCoalescer()
+        started = time.perf_counter()
 
         # Update the chat history in the bot
         self._bot.chat_history = messages[:-1]
-        self._bot._configure_agent()
+        await self._bot._aconfigure_agent()
         user_question = messages[-1]["content"]
 
         self._bot.metric_api_client.make_async_log_trace_request(
@@ -79,11 +137,16 @@ class ConversationEngine:
         citation_map = {} # Maps citation string (e.g. "[3]") with citation counter (e.g. 1). IMPORTANT for LAMBOT-13 - Explainability drawer
 
         llm_response = ""
-        async for event in agent_executor.astream_events(
+        async for event in coalescer.pace(agent_executor.astream_events(
             agent_executor_input,
             version="v2",
             config=invoke_config,
-        ):
+        )):
+            if event is None:
+                # No event for a while: send the pending text and keep-alives
+                for line in coalescer.idle():
+                    yield line
+                continue
             kind = event["event"]
             # self._bot.logger.debug(f"Event kind: {kind} Event name: {event['name']}")
             if (kind == "on_chat_model_stream") and ('lambot-agent-llm' in event.get("tags", []) or 'supervisor' in event.get("tags", [])):
@@ -102,20 +165,24 @@ class ConversationEngine:
 
                 # Yield any citations, then yield the chunk
                 if citations_to_yield:
-                    yield LamBotChatResponse(chunk="", citations=citations_to_yield).model_dump_json() + "\n"
-                yield LamBotChatResponse(chunk=chunk_to_yield, citations=[]).model_dump_json() + "\n"
+                    for line in coalescer.message(LamBotChatResponse(chunk="", citations=citations_to_yield)):
+                        yield line
+                for line in coalescer.chunk(chunk_to_yield):
+                    yield line
 
             elif kind == "on_custom_event" and event["name"] == "tool_artifact":
                 artifact = event["data"]["artifact"]
-                yield LamBotChatResponse(
+                for line in coalescer.message(LamBotChatResponse(
                         chunk="", citations=[], tool_artifacts=[artifact]
-                ).model_dump_json() + "\n"
+                )):
+                    yield line
 
             elif kind == "on_custom_event" and event["name"] == "intermediate_step":
                 intermediate_step = event["data"]["intermediate"]
-                yield LamBotChatResponse(
+                for line in coalescer.message(LamBotChatResponse(
                     chunk="", citations=[], intermediate_steps=[intermediate_step]
-                ).model_dump_json() + "\n"
+                )):
+                    yield line
 
             # Store documents from the last on_retriever_end event
             elif kind == "on_retriever_end":
@@ -138,18 +205,18 @@ class ConversationEngine:
                         llm_response = (
                             message.content
                         )
+                # The final answer is known, the follow-up questions are generated while the rest of the response is streamed
+                if self._bot.bot_config.suggest_followup_questions and self._followup_task is None:
+                    self._start_followup_questions(messages, agent_executor_output, trace_id)
 
             else:
-                yield LamBotChatResponse(
-                    chunk="", citations=[]
-                ).model_dump_json() + "\n"
+                # Events without content only send pending text and keep-alives
+                for line in coalescer.idle():
+                    yield line
 
         # Rare edge case: Response ends with partial citation.
-        if current_chunk:
-            yield LamBotChatResponse(
-                chunk=current_chunk,
-                citations=[],
-            ).model_dump_json() + "\n"
+        for line in coalescer.chunk(current_chunk) + coalescer.flush():
+            yield line
 
         # After processing all events, yield the documents from the last on_retriever_end event
         # Explanation:
@@ -161,31 +228,38 @@ class ConversationEngine:
             # Only yield unused citations here
             unused_citations = [citation for citation in all_citations if not citation.is_used]
 
-            yield LamBotChatResponse(
+            for line in coalescer.message(LamBotChatResponse(
                 chunk="",
                 citations=unused_citations,
-            ).model_dump_json() + "\n"
+            )):
+                yield line
 
 
-        if self._bot.bot_config.suggest_followup_questions:
-            followup_question_bot = FollowUpQuestionGeneratorBot(
-                lambot_display_name=self._bot.bot_config.display_name,
-                langfuse_manager=self._bot.langfuse_manager
-            )
-            followup_questions = followup_question_bot.generate_followup_questions(messages, agent_executor_output)
+        # The answer is complete, the follow-up questions are sent as a separate line after it
+        for line in coalescer.message(LamBotChatResponse(
+            chunk="",
+            citations=[],
+            done=True,
+        )):
+            yield line
 
-            log_trace_event(
-                trace_id=trace_id,
-                step="followup_questions_created",
-            )
+        time_to_done_ms = (time.perf_counter() - started) * 1000
+        log_trace_event(
+            trace_id=trace_id,
+            step="done_streamed",
+        )
 
-            yield LamBotChatResponse(
+        if self._bot.bot_config.suggest_followup_questions and self._followup_task is None:
+            # The agent output did not end with an AgentExecutor event
+            self._start_followup_questions(messages, agent_executor_output, trace_id)
+        followup_questions, followup_question_token_usage = await self._await_followup_questions()
+        if followup_questions:
+            for line in coalescer.message(LamBotChatResponse(
                 chunk="",
                 citations=[],
                 followup_questions=followup_questions,
-            ).model_dump_json() + "\n"
-            followup_question_token_usage = followup_question_bot.usage_metadata
-
+            )):
+                yield line
 
         # Calculate total token usage details
         total_token_usage_details = TokenUsageDetails(
@@ -225,6 +299,7 @@ class ConversationEngine:
             LamBotId=self._bot.bot_config.id,
             LamBotName=self._bot.bot_config.display_name,
             token_consumption_details=total_token_usage_details,
+            time_to_done_ms=time_to_done_ms,
         )
 
         self._bot.metric_api_client.make_async_log_trace_request(
@@ -232,12 +307,6 @@ class ConversationEngine:
             log_level="Information",
         )
 
-        yield LamBotChatResponse(
-            chunk="",
-            citations=[],
-            done=True,
-        ).model_dump_json() + "\n"
-
         log_trace_event(
             trace_id=trace_id,
             step="full_response_serviced",
@@ -261,7 +330,9 @@ class ConversationEngine:
         accumulated_tool_artifacts = []
         accumulated_intermediate_steps = []
 
-        async for response_json in self._generate_streaming_response(messages, trace_id):
+        # Nothing is sent before the end, so the text is parsed in as few lines as possible
+        coalescer = StreamCoalescer(window_ms=float("inf"), max_bytes=float("inf"), keepalive_seconds=float("inf"))
+        async for response_json in self._generate_streaming_response(messages, trace_id, coalescer):
             # Parse each JSON response back into a LamBotChatResponse object.
             response_dict = json.loads(response_json)
             response_obj = LamBotChatResponse(**response_dict)
@@ -285,9 +356,7 @@ class ConversationEngine:
             if response_obj.intermediate_steps:
                 accumulated_intermediate_steps.extend(response_obj.intermediate_steps)
 
-            # Stop processing once the done flag is encountered.
-            if response_obj.done:
-                break
+            # The follow-up questions are sent after the done flag, the stream ends once they are sent
 
         final_response = LamBotChatResponse(
             chunk=accumulated_chunk,
@@ -313,8 +382,12 @@ class ConversationEngine:
         """
         if streaming:
             # Delegate to the streaming function.
-            async for streamed_response in self._generate_streaming_response(messages, trace_id):
-                yield streamed_response
+            try:
+                async for streamed_response in self._generate_streaming_response(messages, trace_id):
+                    yield streamed_response
+            finally:
+                # The client disconnected before the follow-up questions were sent
+                self._cancel_followup_questions()
         else:
             # Return the fully aggregated response.
             aggregated_response = await self._generate_aggregated_response(messages, trace_id)
@@ -0,0 +1,183 @@
+"""
+Coalescing of the NDJSON lines streamed by the ConversationEngine.
+
+The agent emits one `astream_events` event per token and many events the client has no use for
+(chain, prompt and parser starts and ends, ...). Serializing a `LamBotChatResponse` for each of them
+produced hundreds of lines per answer. The coalescer
+- drops the events without content, except for a keep-alive line once the stream has been idle for
+  STREAM_KEEPALIVE_SECONDS, e.g. during a long tool run,
+- batches token chunks into one line per STREAM_COALESCE_WINDOW_MS, or sooner once the batch reaches
+  STREAM_COALESCE_MAX_BYTES,
+- flushes the pending text before any other line (citations, tool artifacts, intermediate steps, ...),
+  so the order of the stream is unchanged,
+- writes chunk and keep-alive lines from pre-serialized fragments instead of going through Pydantic.
+
+The pending text and the keep-alives are due on a timer, not on the next event: `pace` wraps the event
+stream and also wakes the caller up when they are due, e.g. while a tool runs without emitting events.
+
+A window of 0 streams one line per token, as before.
+
+Environment Variables:
+- STREAM_COALESCE_WINDOW_MS: Maximum time token chunks are held back to be sent together (default: 30).
+- STREAM_COALESCE_MAX_BYTES: Size of the held back text that is sent without waiting for the window (default: 1024).
+- STREAM_KEEPALIVE_SECONDS: Idle time after which an empty line is sent to keep the connection alive (default: 5).
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+import pydantic_core
+
+from src.models import LamBotChatResponse
+
+# Serialized with an empty chunk, the chunk lines are spliced in between
+_EMPTY_LINE = LamBotChatResponse(chunk="", citations=[]).model_dump_json() + "\n"
+_CHUNK_PREFIX, _CHUNK_SUFFIX = _EMPTY_LINE.split('""', 1)
+
+# Queued by the pump of `pace` once the event stream is exhausted
+_END = object()
+
+
+def serialize_chunk(text: str) -> str:
+    """
+    Serialize a text-only LamBotChatResponse line, as `LamBotChatResponse(chunk=text, citations=[]).model_dump_json()` would.
+    """
+    return _CHUNK_PREFIX + pydantic_core.to_json(text).decode("utf-8") + _CHUNK_SUFFIX
+
+
+class StreamCoalescer:
+    """
+    Turns the events of a streamed answer into NDJSON lines. Every method returns the lines to send now.
+
+    Args:
+        window_ms (float, optional): Maximum time token chunks are held back. Defaults to STREAM_COALESCE_WINDOW_MS.
+        max_bytes (int, optional): Held back text size that is sent right away. Defaults to STREAM_COALESCE_MAX_BYTES.
+        keepalive_seconds (float, optional): Idle time before a keep-alive line. Defaults to STREAM_KEEPALIVE_SECONDS.
+        clock (Callable[[], float]): Monotonic clock in seconds.
+    """
+
+    def __init__(
+        self,
+        window_ms: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        keepalive_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = (window_ms if window_ms is not None else float(os.getenv("STREAM_COALESCE_WINDOW_MS", "30"))) / 1000
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("STREAM_COALESCE_MAX_BYTES", "1024"))
+        self.keepalive = keepalive_seconds if keepalive_seconds is not None else float(os.getenv("STREAM_KEEPALIVE_SECONDS", "5"))
+        self._clock = clock
+
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._pending_since = 0.0
+        self._last_sent = clock()
+        self.lines = 0
+        self.bytes = 0
+
+    def chunk(self, text: str) -> List[str]:
+        """
+        Add streamed text, sent once the window has elapsed or the byte budget is reached.
+        """
+        if not text:
+            return []
+        now = self._clock()
+        if not self._pending:
+            self._pending_since = now
+        self._pending.append(text)
+        self._pending_bytes += len(text.encode("utf-8"))
+        if self._pending_bytes >= self.max_bytes or now - self._pending_since >= self.window:
+            return self.flush()
+        return []
+
+    def message(self, response: LamBotChatResponse) -> List[str]:
+        """
+        Send a response other than plain text, after the pending text.
+        """
+        return self.flush() + [self._sent(response.model_dump_json() + "\n")]
+
+    def idle(self) -> List[str]:
+        """
+        Handle an event without content: send the pending text if its window has elapsed, and a keep-alive line if nothing was sent for a while.
+        """
+        now = self._clock()
+        if self._pending and now - self._pending_since >= self.window:
+            return self.flush()
+        if not self._pending and now - self._last_sent >= self.keepalive:
+            return [self._sent(_EMPTY_LINE)]
+        return []
+
+    def next_timeout(self) -> Optional[float]:
+        """
+        Return the seconds until the pending text or a keep-alive is due, None if neither ever is.
+        """
+        now = self._clock()
+        if self._pending:
+            timeout = self.window - (now - self._pending_since)
+        else:
+            timeout = self.keepalive - (now - self._last_sent)
+        if timeout == float("inf"):
+            return None
+        return max(timeout, 0.0)
+
+    async def pace(self, events: AsyncIterator[Any]) -> AsyncIterator[Optional[Any]]:
+        """
+        Yield the events of the stream, and None whenever the pending text or a keep-alive is due before
+        the next event. The caller sends the lines of `idle` on None.
+
+        The stream is consumed by a single task feeding a queue, so waiting for an event with a timeout
+        never cancels the stream itself.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def pump() -> None:
+            try:
+                async for event in events:
+                    await queue.put(event)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(_END)
+            finally:
+                # Close the stream when the caller stops early
+                if hasattr(events, "aclose"):
+                    await events.aclose()
+
+        task = asyncio.create_task(pump())
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=self.next_timeout())
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def flush(self) -> List[str]:
+        """
+        Send the pending text.
+        """
+        if not self._pending:
+            return []
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        return [self._sent(serialize_chunk(text))]
+
+    def _sent(self, line: str) -> str:
+        self._last_sent = self._clock()
+        self.lines += 1
+        self.bytes += len(line.encode("utf-8"))
+        return line
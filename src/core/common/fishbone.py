@@ -1,3 +1,11 @@
+"""
+Rendering of fishbone (Ishikawa) diagrams with matplotlib.
+
+The rendering runs in the tool process pool (see `LamBotTool.run_cpu_bound`), whose spawned workers
+import this module to unpickle `create_fishbone_diagram`. It must therefore stay outside the tool
+packages, whose imports register the tools and create the clients of the app.
+"""
+
 import base64
 from io import BytesIO
 import matplotlib.pyplot as plt
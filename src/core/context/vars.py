@@ -6,3 +6,6 @@ user_email_var = contextvars.ContextVar("user_email", default=None)
 
 # this is the MS Graph Object ID for the user (not the LamBots user id in Mongo)
 ms_user_object_id_var = contextvars.ContextVar("ms_user_object_id", default=None)
+
+# The decoded claims of the access token, the fallback of the Graph profile of the user
+user_claims_var = contextvars.ContextVar("user_claims", default=None)
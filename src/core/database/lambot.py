@@ -1,5 +1,5 @@
 from pymongo.collection import Collection
-from src.clients.mongo import MongoDBClient
+from src.clients.mongo import AsyncMongoDBClient, MongoDBClient
 from src.core.database.lambot_config import LamBotConfigDB
 from src.core.database.tools import ToolConfigDB
 from src.core.database.language_model_config import LanguageModelConfigDB
@@ -25,6 +25,8 @@ class LamBotMongoDB:
         and reusing it to query multiple collections from a given database.
         """
         self.mongo = MongoDBClient.get_instance()
+        # Async collections back the a-prefixed methods used on the request path
+        self.mongo_async = AsyncMongoDBClient.get_instance()
 
         # Initialize MongoDBService instances with provided parameters
         TOOL_CONFIGS_COLLECTION_NAME = "toolConfigs"
@@ -53,12 +55,26 @@ class LamBotMongoDB:
         )
         
         # Initialize services
-        self.lambot_config_db = LamBotConfigDB(collection=lambot_config_collection)
-        self.tool_config_db = ToolConfigDB(collection=tool_config_collection, lambot_config_db=self.lambot_config_db)
-        self.language_model_config_db = LanguageModelConfigDB(collection=language_model_config_collection, lambot_config_db=self.lambot_config_db)
+        self.lambot_config_db = LamBotConfigDB(
+            collection=lambot_config_collection,
+            async_collection=self.mongo_async.database[LAMBOT_CONFIGS_COLLECTION_NAME],
+        )
+        self.tool_config_db = ToolConfigDB(
+            collection=tool_config_collection,
+            lambot_config_db=self.lambot_config_db,
+            async_collection=self.mongo_async.database[TOOL_CONFIGS_COLLECTION_NAME],
+        )
+        self.language_model_config_db = LanguageModelConfigDB(
+            collection=language_model_config_collection,
+            lambot_config_db=self.lambot_config_db,
+            async_collection=self.mongo_async.database[LANGUAGE_MODEL_CONFIGS_COLLECTION_NAME],
+        )
         # Overwrite/update list of llm config as part initialization
         self.language_model_config_db.fetch_all_language_models()
-        self.conversations_external_db = ThreadDB(collection=conversations_external_collection)
+        self.conversations_external_db = ThreadDB(
+            collection=conversations_external_collection,
+            async_collection=self.mongo_async.database[CONVERSATIONS_EXTERNAL_COLLECTION_NAME],
+        )
 
         # Inject ToolConfigService into LamBotConfigService if needed
         self.lambot_config_db.tool_config_service = self.tool_config_db
@@ -5,24 +5,28 @@ from typing import Optional, List, Dict, Any
 import datetime
 from collections import defaultdict
 from pymongo.collection import Collection
+from pymongo.asynchronous.collection import AsyncCollection
 from src.core.database.lambot_config_utils import package_lambot_config_with_tools
 from src.core.utils.access_condition_helper import access_condition_checks
 from src.models.constants import LamBotConfigAccessibiltiy
 from src.core.context.vars import user_email_var
+from src.core.cache.lambot_config import LamBotConfigCache
 from src.core.common.exceptions import *
 
 load_dotenv()
     
 class LamBotConfigDB:
 
-    def __init__(self, collection: Collection):
+    def __init__(self, collection: Collection, async_collection: AsyncCollection = None):
         """
         Initialize the LamBotConfigDB with a MongoDB collection.
 
         Args:
             collection (Collection): MongoDB collection instance to interact with the MongoDB collection.
+            async_collection (AsyncCollection): Asynchronous handle on the same collection, used by the a-prefixed methods.
         """
         self.collection = collection
+        self.async_collection = async_collection
     
     def _prepare_lambot_document(self, lambot_config: LamBotConfig) -> Dict[str, Any]:
         """
@@ -145,6 +149,7 @@ class LamBotConfigDB:
         update_result = self.collection.update_one({"id": str(lambot_id)}, {"$set": result["document"]})
 
         if update_result.modified_count > 0:
+            LamBotConfigCache.get_instance().invalidate(lambot_id)
             # Fetch the updated document from the database to ensure consistency
             updated_document = self.collection.find_one({"id": str(lambot_id)})
             if updated_document:
@@ -187,6 +192,7 @@ class LamBotConfigDB:
         )
 
         if update_result.modified_count > 0:
+            LamBotConfigCache.get_instance().invalidate(lambot_id)
             return {
                 "message": "LamBot ownership successfully transferred.",
                 "lambot_id": str(lambot_id),
@@ -208,6 +214,7 @@ class LamBotConfigDB:
         is_deleted_result = self.collection.delete_one({"id": str(lambot_id)})
         
         if is_deleted_result.deleted_count > 0:
+            LamBotConfigCache.get_instance().invalidate(lambot_id)
             return {"message": "LamBot configuration successfully deleted."}
         else:
             return {"message": "Failed to delete LamBot configuration."}
@@ -317,20 +324,29 @@ class LamBotConfigDB:
         Returns:
             Optional[LamBotConfig]: A LamBotConfig instance if found, otherwise None.
         """
+        query = self._build_fetch_lambot_query(lambot_id, display_name, name)
+        return self._get_document_by_query(query, user_role, security_group_list)
+
+    async def afetch_lambot(self, user_role: str, security_group_list: List[str], lambot_id: Optional[UUID] = None, display_name: Optional[str] = None, name: Optional[str] = None) -> Optional[LamBotConfig]:
+        """
+        Asynchronous variant of `fetch_lambot`.
+        """
+        query = self._build_fetch_lambot_query(lambot_id, display_name, name)
+        return await self._aget_document_by_query(query, user_role, security_group_list)
+
+    @staticmethod
+    def _build_fetch_lambot_query(lambot_id: Optional[UUID], display_name: Optional[str], name: Optional[str]) -> Dict[str, str]:
         provided = [v for v in [lambot_id, display_name, name] if v is not None]
         if len(provided) != 1:
             raise ValueError("You must provide exactly one of lambot_id, display_name, or name.")
 
         if lambot_id:
-            query = {"id": str(lambot_id)}
+            return {"id": str(lambot_id)}
         elif display_name:
-            query = {"display_name": display_name}
+            return {"display_name": display_name}
         elif name:
-            query = {"name": name}
-        else:
-            raise ValueError("One of lambot_id, display_name, or name must be provided.")
-
-        return self._get_document_by_query(query, user_role, security_group_list)
+            return {"name": name}
+        raise ValueError("One of lambot_id, display_name, or name must be provided.")
 
 
     def check_tool_usage(self, tool_names: List[str]) -> dict:
@@ -472,6 +488,23 @@ class LamBotConfigDB:
             return lambot_config
         return None
 
+    async def _aget_document_by_query(self, query, user_role, security_group_list):
+        document = await self.async_collection.find_one(query)
+
+        if document:
+            tool_configs_list = await self.tool_config_service.afetch_tools(
+                tool_names=document.get("tools", []),
+                user_role=user_role,
+                security_group_list=security_group_list
+            )
+            tool_access_list = [tool.name for tool in tool_configs_list if tool.user_has_access]
+            if not access_condition_checks(document, security_group_list, tool_access_list):
+                raise NoAccessError("Forbidden: You do not have access to this LamBot configuration.")
+            document.pop("_id", None)
+            language_model_configs_list = await self.language_model_config_service.afetch_all_language_models()
+            return package_lambot_config_with_tools(document, tool_configs_list, language_model_configs_list)
+        return None
+
     def fetch_lambot_by_query_params(self, user_role: str, security_group_list: List[str], query_params) -> Optional[LamBotConfig]:
         """
         Fetch a single LamBot configuration based on query parameters.
@@ -1,17 +1,20 @@
 from dotenv import load_dotenv
 from typing import List
 from pymongo.collection import Collection
+from pymongo.asynchronous.collection import AsyncCollection
 
 from src.models.config import LanguageModelConfig
 from src.core.database.lambot_config import LamBotConfigDB
 from src.core.cache.decorators import cache_platform, cache_platform_with_args, invalidate_platform_cache
+from src.core.cache.lambot_config import LamBotConfigCache
 
 load_dotenv()
 
 
 class LanguageModelConfigDB:
-    def __init__(self, collection: Collection, lambot_config_db: LamBotConfigDB):
+    def __init__(self, collection: Collection, lambot_config_db: LamBotConfigDB, async_collection: AsyncCollection = None):
         self.collection = collection
+        self.async_collection = async_collection
         self.lambot_config_db = lambot_config_db
 
     def fetch_all_language_models(self) -> List[LanguageModelConfig]:
@@ -38,6 +41,24 @@ class LanguageModelConfigDB:
             language_model_dicts.append(document)
         return language_model_dicts
 
+    async def afetch_all_language_models(self) -> List[LanguageModelConfig]:
+        """
+        Asynchronous variant of `fetch_all_language_models`.
+        """
+        language_model_dicts = await self._afetch_all_language_model_dicts_cached()
+        return [LanguageModelConfig(**doc) for doc in language_model_dicts]
+
+    @cache_platform("all_language_models_dicts", ttl=3600)
+    async def _afetch_all_language_model_dicts_cached(self) -> List[dict]:
+        """
+        Asynchronous variant of `_fetch_all_language_model_dicts_cached`, sharing its cache entry.
+        """
+        language_model_dicts = []
+        async for document in self.async_collection.find():
+            document.pop("_id")
+            language_model_dicts.append(document)
+        return language_model_dicts
+
     def fetch_all_language_model_keys(self) -> List[str]:
         """
         Fetch all LanguageModelConfig keys from the database.
@@ -196,4 +217,6 @@ class LanguageModelConfigDB:
             keys=["all_language_models_dicts"],
             patterns=["language_model:*"]
         )
+        # Resolved LamBots embed their language model configs
+        LamBotConfigCache.get_instance().invalidate()
 
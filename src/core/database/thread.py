@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Optional
 import uuid
 from pymongo.collection import Collection
+from pymongo.asynchronous.collection import AsyncCollection
 from dotenv import load_dotenv
 from src.models.functions import datetime_now
 from src.models.config import ConversationDocumentConfig, MessageConfig
@@ -14,14 +15,16 @@ class ThreadDB:
     Provides functionality to fetch message history, retrieve full conversation threads, and delete records.
     """
 
-    def __init__(self, collection: Collection):
+    def __init__(self, collection: Collection, async_collection: AsyncCollection = None):
         """
         Initialize the ThreadDB with a MongoDBService instance.
 
         Args:
             collection (MongoDBService): A service instance for MongoDB operations on the 'ThreadDB' collection.
+            async_collection (AsyncCollection): Asynchronous handle on the same collection, used by the a-prefixed methods.
         """
         self.collection = collection
+        self.async_collection = async_collection
 
     def fetch_conversation(self, query: dict) -> Dict[str, Any]:
         """
@@ -74,27 +77,40 @@ class ThreadDB:
             List[Dict[str, str]]: A list of messages with role ('user' or 'system') and content.
         """
         try:
-            docs = self.collection.find(query)
-            user_messages = []
-
-            for doc in docs:
-                if "messages" in doc:
-                    sorted_messages = sorted(
-                        doc["messages"],
-                        key=lambda x: x.get("assistant", {}).get("createdAt", ""),
-                        reverse=True
-                    )
-                    for message in sorted_messages:
-                        if "assistant" in message and message["assistant"] and "chunk" in message["assistant"]:
-                            user_messages.append({"role": "system", "content": message["assistant"]["chunk"]})
-                        if "user" in message and message["user"] and "content" in message["user"]:
-                            user_messages.append({"role": "user", "content": message["user"]["content"]})
-
-            return user_messages
+            return self._extract_messages(self.collection.find(query))
 
         except Exception as e:
             raise RuntimeError(f"Failed to fetch conversation messages: {str(e)}")
 
+    async def afetch_n_messages(self, query: dict) -> List:
+        """
+        Asynchronous variant of `fetch_n_messages`.
+        """
+        try:
+            return self._extract_messages(await self.async_collection.find(query).to_list(None))
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch conversation messages: {str(e)}")
+
+    @staticmethod
+    def _extract_messages(docs) -> List:
+        user_messages = []
+
+        for doc in docs:
+            if "messages" in doc:
+                sorted_messages = sorted(
+                    doc["messages"],
+                    key=lambda x: x.get("assistant", {}).get("createdAt", ""),
+                    reverse=True
+                )
+                for message in sorted_messages:
+                    if "assistant" in message and message["assistant"] and "chunk" in message["assistant"]:
+                        user_messages.append({"role": "system", "content": message["assistant"]["chunk"]})
+                    if "user" in message and message["user"] and "content" in message["user"]:
+                        user_messages.append({"role": "user", "content": message["user"]["content"]})
+
+        return user_messages
+
     
     def delete_conversation(self, query: dict) -> Dict[str, Any]:
         """
@@ -155,6 +171,12 @@ class ThreadDB:
 
         return self.collection.find_one({"username": username}) is not None
 
+    async def auser_exists(self, username: str) -> bool:
+        """
+        Asynchronous variant of `user_exists`.
+        """
+        return await self.async_collection.find_one({"username": username}) is not None
+
     def create_new_user_conversation(self, lambot_id: str, thread_id: Optional[str],
                                      new_messages: List[Dict], title: str, username: str) -> str:
         
@@ -173,17 +195,16 @@ class ThreadDB:
             str: Status message confirming creation of the new document.
         """
         final_root_id = thread_id if thread_id else str(uuid.uuid4())
-        validated_messages = [MessageConfig(**msg) for msg in new_messages]
+        self.collection.insert_one(self._build_conversation_document(lambot_id, final_root_id, new_messages, title, username))
+        return f"[New User] Created new document with thread_id: {final_root_id}"
 
-        doc = ConversationDocumentConfig(
-            title=title,
-            thread_id=final_root_id,
-            messages=validated_messages,
-            lambot_id=lambot_id,
-            created_at=datetime_now(),
-            username=username
-        )
-        self.collection.insert_one(doc.model_dump(by_alias=True, exclude_none=True,mode="json"))
+    async def acreate_new_user_conversation(self, lambot_id: str, thread_id: Optional[str],
+                                            new_messages: List[Dict], title: str, username: str) -> str:
+        """
+        Asynchronous variant of `create_new_user_conversation`.
+        """
+        final_root_id = thread_id if thread_id else str(uuid.uuid4())
+        await self.async_collection.insert_one(self._build_conversation_document(lambot_id, final_root_id, new_messages, title, username))
         return f"[New User] Created new document with thread_id: {final_root_id}"
 
     def start_new_thread_for_user(self, lambot_id: str, username: str,
@@ -207,20 +228,36 @@ class ThreadDB:
         if not self.collection.find_one({"username": username}):
             raise ValueError("[Error] Invalid Username: No matching record found in the database.")
       
+        generated_id = str(uuid.uuid4())
+        self.collection.insert_one(self._build_conversation_document(lambot_id, generated_id, new_messages, title, username))
+        return f"[New Thread] Started new conversation with thread_id: {generated_id}."
+
+    async def astart_new_thread_for_user(self, lambot_id: str, username: str,
+                                         new_messages: List[Dict], title: str) -> str:
+        """
+        Asynchronous variant of `start_new_thread_for_user`.
+        """
+        if not await self.async_collection.find_one({"username": username}):
+            raise ValueError("[Error] Invalid Username: No matching record found in the database.")
 
-        validated_messages = [MessageConfig(**msg) for msg in new_messages]
         generated_id = str(uuid.uuid4())
+        await self.async_collection.insert_one(self._build_conversation_document(lambot_id, generated_id, new_messages, title, username))
+        return f"[New Thread] Started new conversation with thread_id: {generated_id}."
+
+    @staticmethod
+    def _build_conversation_document(lambot_id: str, thread_id: str, new_messages: List[Dict],
+                                     title: str, username: str) -> Dict[str, Any]:
+        validated_messages = [MessageConfig(**msg) for msg in new_messages]
 
         doc = ConversationDocumentConfig(
             title=title,
-            thread_id=generated_id,
+            thread_id=thread_id,
             messages=validated_messages,
             lambot_id=lambot_id,
             created_at=datetime_now(),
             username=username
         )
-        self.collection.insert_one(doc.model_dump(by_alias=True, exclude_none=True,mode="json"))
-        return f"[New Thread] Started new conversation with thread_id: {generated_id}."
+        return doc.model_dump(by_alias=True, exclude_none=True,mode="json")
 
     def update_existing_thread(self, lambot_id: str, thread_id: str, username: str,
                                new_messages: List[Dict]) -> str:
@@ -245,6 +282,28 @@ class ThreadDB:
             "username": username
         })
 
+        self.collection.update_one(*self._build_thread_update(existing_doc, lambot_id, thread_id, username, new_messages))
+        return f"[Updated] Appended to thread_id: {thread_id}"
+
+    async def aupdate_existing_thread(self, lambot_id: str, thread_id: str, username: str,
+                                      new_messages: List[Dict]) -> str:
+        """
+        Asynchronous variant of `update_existing_thread`.
+        """
+        existing_doc = await self.async_collection.find_one({
+            "threadId": thread_id,
+            "username": username
+        })
+
+        await self.async_collection.update_one(*self._build_thread_update(existing_doc, lambot_id, thread_id, username, new_messages))
+        return f"[Updated] Appended to thread_id: {thread_id}"
+
+    @staticmethod
+    def _build_thread_update(existing_doc: Optional[Dict], lambot_id: str, thread_id: str, username: str,
+                             new_messages: List[Dict]) -> tuple:
+        """
+        Validate the thread and the messages to append, and build the filter and update of the thread document.
+        """
         if not existing_doc:
             raise ValueError(f"[Error] Invalid thread_id: '{thread_id}'")
 
@@ -256,7 +315,7 @@ class ThreadDB:
         except ValueError:
             raise ValueError("[Validation Error] Assistant message validation failed")
 
-        self.collection.update_one(
+        return (
             {
                 "lambotId": lambot_id,
                 "threadId": thread_id,
@@ -270,4 +329,3 @@ class ThreadDB:
                 }
             }
         )
-        return f"[Updated] Appended to thread_id: {thread_id}"
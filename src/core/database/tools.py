@@ -1,8 +1,10 @@
-from typing import List
+from typing import Callable, List
 from pymongo.collection import Collection
+from pymongo.asynchronous.collection import AsyncCollection
 from src.models.config import ToolConfig
 from src.core.database.lambot_config import LamBotConfigDB
-from src.core.utils.ms_graph_utils import has_copilot_access
+from src.core.cache.lambot_config import LamBotConfigCache
+from src.core.utils.ms_graph_utils import ahas_copilot_access, has_copilot_access
 from dotenv import load_dotenv
 
 CUSTOM_SHAREPOINT_TOOL_NAME = "custom_sharepoint_tool"
@@ -11,8 +13,9 @@ USER_SCOPED_SHAREPOINT_TOOL_NAME = "user_scoped_sharepoint_tool"
 load_dotenv()
 
 class ToolConfigDB:
-    def __init__(self, collection: Collection, lambot_config_db: LamBotConfigDB):
+    def __init__(self, collection: Collection, lambot_config_db: LamBotConfigDB, async_collection: AsyncCollection = None):
         self.collection = collection
+        self.async_collection = async_collection
         self.lambot_config_db = lambot_config_db
 
     def fetch_all_tools(self, user_role: str, security_group_list: List[str]) -> List[ToolConfig]:
@@ -26,30 +29,91 @@ class ToolConfigDB:
         Returns:
             List[ToolConfig]: A list of ToolConfig objects with the user_has_access field set accordingly.
         """
-        tool_configs = []
-
         # Fetch all tools from the collection
         all_tools = list(self.collection.find())
+        return self._build_tool_configs(all_tools, user_role, security_group_list, has_copilot_access)
+
+    async def afetch_all_tools(self, user_role: str, security_group_list: List[str]) -> List[ToolConfig]:
+        """
+        Asynchronous variant of `fetch_all_tools`.
+        """
+        all_tools = await self.async_collection.find().to_list(None)
+        copilot_access = await self._aresolve_copilot_access(all_tools, user_role, security_group_list)
+        return self._build_tool_configs(all_tools, user_role, security_group_list, lambda: copilot_access)
+
+    @staticmethod
+    def _requires_copilot_access(document: dict, security_group_list: List[str]) -> bool:
+        """
+        Check whether a non-admin user passing the security group check of a tool also needs a Copilot license.
+        """
+        return (
+            document["name"] in [CUSTOM_SHAREPOINT_TOOL_NAME, USER_SCOPED_SHAREPOINT_TOOL_NAME]
+            and set(document["security_group_ids"]).issubset(security_group_list)
+        )
+
+    def _build_tool_configs(self, documents: List[dict], user_role: str, security_group_list: List[str], copilot_access: Callable[[], bool]) -> List[ToolConfig]:
+        """
+        Build ToolConfig objects from tool documents and set the user_has_access field based on the user's role and security groups.
+
+        Args:
+            documents (List[dict]): The tool documents.
+            user_role (str): The role of the user (e.g., "admin", "user", "creator").
+            security_group_list (List[str]): The list of security groups the user belongs to.
+            copilot_access (Callable[[], bool]): Returns whether the user has a Copilot license, called for sharepoint tools only.
+
+        Returns:
+            List[ToolConfig]: A list of ToolConfig objects with the user_has_access field set accordingly.
+        """
+        tool_configs = []
 
         if user_role == "admin":
             # Admins have access to all tools
-            for document in all_tools:
+            for document in documents:
                 document.pop("_id")
                 document["user_has_access"] = True
                 tool_configs.append(ToolConfig(**document))
         else:
             # For users and creators, determine access based on security groups
-            for document in all_tools:
+            for document in documents:
                 document.pop("_id")
                 # Check if the user's security groups cover all the tool's security group ids
                 document["user_has_access"] = set(document["security_group_ids"]).issubset(security_group_list)
 
-                if document["name"] in [CUSTOM_SHAREPOINT_TOOL_NAME, USER_SCOPED_SHAREPOINT_TOOL_NAME] and document["user_has_access"]:
-                    document["user_has_access"] = has_copilot_access()
+                if self._requires_copilot_access(document, security_group_list):
+                    document["user_has_access"] = copilot_access()
                 tool_configs.append(ToolConfig(**document))
 
         return tool_configs
 
+    async def _aresolve_copilot_access(self, documents: List[dict], user_role: str, security_group_list: List[str]) -> bool:
+        """
+        Check the user's Copilot license off the event loop, only if one of the tools needs it.
+        """
+        if user_role == "admin" or not any(self._requires_copilot_access(document, security_group_list) for document in documents):
+            return False
+        return await ahas_copilot_access()
+
+    @staticmethod
+    def depends_on_copilot_access(tool_configs: List[ToolConfig], user_role: str, security_group_list: List[str]) -> bool:
+        """
+        Check whether the user's access to any of the tools is decided by their Copilot license.
+
+        Args:
+            tool_configs (List[ToolConfig]): The tools to check.
+            user_role (str): The role of the user (e.g., "admin", "user", "creator").
+            security_group_list (List[str]): The list of security groups the user belongs to.
+
+        Returns:
+            bool: True if `has_copilot_access` decides the access to one of the tools.
+        """
+        if user_role == "admin":
+            return False
+        return any(
+            tool.name in [CUSTOM_SHAREPOINT_TOOL_NAME, USER_SCOPED_SHAREPOINT_TOOL_NAME]
+            and set(tool.security_group_ids or []).issubset(security_group_list)
+            for tool in tool_configs
+        )
+
     def add_tool(self, tool_config: ToolConfig) -> ToolConfig:
 
         # Check if a tool with the same name or display name already exists
@@ -65,6 +129,8 @@ class ToolConfigDB:
         result = self.collection.insert_one(document)
         inserted_document = self.collection.find_one({"_id": result.inserted_id})
         inserted_document.pop("_id")
+        # The access check of every LamBot runs against the whole tool collection
+        LamBotConfigCache.get_instance().invalidate()
         return ToolConfig(**inserted_document)
 
     def fetch_tools(self, tool_names: List[str], user_role: str, security_group_list: List[str]) -> List[ToolConfig]:
@@ -79,28 +145,16 @@ class ToolConfigDB:
         Returns:
             List[ToolConfig]: List of ToolConfig objects.
         """
-        tool_documents = self.collection.find({"name": {"$in": tool_names}})
-        tool_configs = []
+        tool_documents = list(self.collection.find({"name": {"$in": tool_names}}))
+        return self._build_tool_configs(tool_documents, user_role, security_group_list, has_copilot_access)
 
-        if user_role == "admin":
-            # Admins have access to all tools
-            for document in tool_documents:
-                document.pop("_id")
-                document["user_has_access"] = True
-                tool_configs.append(ToolConfig(**document))
-        else:
-            # For users and creators, determine access based on security groups
-            for document in tool_documents:
-                document.pop("_id")
-                # Check if the user's security groups cover all the tool's security group ids
-                document["user_has_access"] = set(document["security_group_ids"]).issubset(security_group_list)
-
-                if document["name"] in [CUSTOM_SHAREPOINT_TOOL_NAME, USER_SCOPED_SHAREPOINT_TOOL_NAME] and document["user_has_access"]:
-                    document["user_has_access"] = has_copilot_access()
-
-                tool_configs.append(ToolConfig(**document))
-
-        return tool_configs
+    async def afetch_tools(self, tool_names: List[str], user_role: str, security_group_list: List[str]) -> List[ToolConfig]:
+        """
+        Asynchronous variant of `fetch_tools`.
+        """
+        tool_documents = await self.async_collection.find({"name": {"$in": tool_names}}).to_list(None)
+        copilot_access = await self._aresolve_copilot_access(tool_documents, user_role, security_group_list)
+        return self._build_tool_configs(tool_documents, user_role, security_group_list, lambda: copilot_access)
     
     def fetch_tool(self, tool_name: str) -> ToolConfig:
         
@@ -137,6 +191,7 @@ class ToolConfigDB:
         is_deleted_result = self.collection.delete_one({"name": tool_name})
         
         if is_deleted_result.deleted_count > 0:
+            LamBotConfigCache.get_instance().invalidate()
             return True
         else:
             return False
@@ -184,6 +239,9 @@ class ToolConfigDB:
         if update_result.modified_count == 0:
             raise ValueError("No changes were made to the tool configuration")
 
+        # Resolved LamBots embed their tool configs
+        LamBotConfigCache.get_instance().invalidate()
+
         updated_document = self.collection.find_one({"name": tool_name})
         updated_document.pop("_id")
         return ToolConfig(**updated_document)
@@ -1,4 +1,5 @@
-from src.core.context.vars import user_email_var, access_token_var, ms_user_object_id_var
+from src.core.context.vars import user_email_var, access_token_var, ms_user_object_id_var, user_claims_var
+from src.core.cache.user_profile import UserProfileService
 from src.core.utils.decoder import decode_jwt
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -69,6 +70,10 @@ class RequestSpanMiddleware(BaseHTTPMiddleware):
             user_id = decoded_token.get("oid")  # Microsoft Object ID
             user_email_var.set(user_email)
             ms_user_object_id_var.set(user_id)
+            user_claims_var.set(decoded_token)
+
+            # Look the Graph profile up while the request is handled
+            UserProfileService.get_instance().prefetch()
 
             response = await call_next(request)
             return response       
@@ -81,3 +86,4 @@ class RequestSpanMiddleware(BaseHTTPMiddleware):
             user_email_var.set(None)
             access_token_var.set(None)
             ms_user_object_id_var.set(None)
+            user_claims_var.set(None)
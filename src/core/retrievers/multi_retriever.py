@@ -1,14 +1,12 @@
 import asyncio
 import warnings
 from typing import List, Optional
-from copy import deepcopy
 from src.core.base import LamBotDocument
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.documents.compressor import BaseDocumentCompressor
 from itertools import chain
-from src.core.retrievers.utils import group_lambot_documents
+from src.core.retrievers.utils import group_lambot_documents, merge_search_filters
 from src.core.base import LamBotTool
-from src.core.tools.common.retriever.utils import merge_search_filters
 
 class MultiRetriever(BaseRetriever):
 
@@ -61,30 +59,39 @@ class MultiRetriever(BaseRetriever):
         return top_k_reranked_grouped_lambot_documents
 
     def _merge_retrievers_by_index_name(self) -> None:
-        """Merge retrievers with the same index name by combining their filters using 'or' logic."""
+        """Merge retrievers with the same index name by combining their filters using 'or' logic.
+
+        The retrievers are configured on the first query and reused by the following ones.
+        """
+        if self.retrievers is not None:
+            return
         unique_index_names = list({tool.tool_spec.index_name for tool in self.retriever_tools})
-        tools_with_same_index_names = []
+        retrievers = []
         for index_name in unique_index_names:
             tools_with_name = [tool for tool in self.retriever_tools if tool.tool_spec.index_name == index_name]
-            base_tool = deepcopy(tools_with_name[0])
-            if len(tools_with_name) > 1:
-                for other_tool in tools_with_name[1:]:
-                    # Check if both tools have the same additional context and tool keyword arguments
-                    if (
-                        base_tool.tool_spec.additional_context != other_tool.tool_spec.additional_context or
-                        base_tool.get_tool_kwargs() != other_tool.get_tool_kwargs()
-                    ):
-                        tools_with_same_index_names.append(other_tool)
-                        # get out of the loop to avoid merging this tool
-                        continue
-                    # Merge filters with 'or' logic
-                    base_filter = base_tool.tool_spec.search_config.get("filter", "")
-                    other_filter = other_tool.tool_spec.search_config.get("filter", "")
-                    merged_filter = merge_search_filters([base_filter, other_filter], "or")
-                    # Update the base tool's search_config
-                    base_tool.tool_spec.search_config["filter"] = merged_filter
-                # Override the retriever tool name to reflect the merged index
-                base_tool.tool_spec.tool_name = f"{index_name}_merged_retriever"
-            tools_with_same_index_names.append(base_tool)
+            base_tool = tools_with_name[0]
+            if len(tools_with_name) == 1:
+                retrievers.append(base_tool.retriever)
+                continue
+            merged_filter = base_tool.tool_spec.search_config.get("filter", "")
+            for other_tool in tools_with_name[1:]:
+                # Check if both tools have the same additional context and tool keyword arguments
+                if (
+                    base_tool.tool_spec.additional_context != other_tool.tool_spec.additional_context or
+                    base_tool.get_tool_kwargs() != other_tool.get_tool_kwargs()
+                ):
+                    retrievers.append(other_tool.retriever)
+                    # get out of the loop to avoid merging this tool
+                    continue
+                # Merge filters with 'or' logic
+                other_filter = other_tool.tool_spec.search_config.get("filter", "")
+                merged_filter = merge_search_filters([merged_filter, other_filter], "or")
+            # Configure the base tool's retriever from a merged copy of its spec, the spec is shared with the registered prototype
+            # and the retriever tool name is overridden to reflect the merged index
+            merged_tool_spec = base_tool.tool_spec.model_copy(update={
+                "search_config": {**base_tool.tool_spec.search_config, "filter": merged_filter},
+                "tool_name": f"{index_name}_merged_retriever",
+            })
+            retrievers.append(base_tool._configure_retriever(merged_tool_spec))
 
-        self.retrievers = [tool.retriever for tool in tools_with_same_index_names]
+        self.retrievers = retrievers
@@ -0,0 +1,200 @@
+"""
+Precompiled multi-pattern PII redaction engine.
+
+The redaction lists hold a few thousand customer names, so rebuilding a flat
+alternation regex on every call is expensive both to compile and to execute:
+at every word start the regex engine tries each name in turn.
+
+PIIRedactor compiles the lists once into a trie-shaped regex. Names sharing a
+prefix are factored into a single branch so a position is rejected after a few
+character comparisons instead of thousands. The factoring preserves the
+semantics of the flat alternation built by `construct_pattern`:
+- a space in a name matches any run of whitespace, underscores or hyphens,
+- a match can neither be preceded nor followed by an ASCII letter,
+- when several names match at the same position, the one listed first wins.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from src.core.retrievers.pii_data import customer_names_case_insensitive, customer_names_case_sensitive
+
+# Atom representing a space in a PII entry, i.e. a run of whitespace, underscores or hyphens.
+_SEPARATOR = object()
+_SEPARATOR_PATTERN = r"[\s_-]+"
+_SEPARATOR_CHAR_RE = re.compile(r"[\s_-]")
+
+# Key used to group entries that are fully consumed at a trie node.
+_END = object()
+
+# Joins a batch of texts so it can be redacted in one pass. A NUL character is not a letter
+# (so word-boundary checks behave as at the start/end of a string) and cannot be matched by
+# the separator class, hence no match can span two texts.
+_BATCH_DELIMITER = "\x00"
+
+
+def _tokenize(word: str) -> Tuple:
+    """Split a PII entry into literal characters and separator atoms."""
+    return tuple(_SEPARATOR if char == " " else char for char in word)
+
+
+def _atom_pattern(atom) -> str:
+    return _SEPARATOR_PATTERN if atom is _SEPARATOR else re.escape(atom)
+
+
+def _atoms_pattern(atoms: Sequence) -> str:
+    return "".join(_atom_pattern(atom) for atom in atoms)
+
+
+class _TriePatternBuilder:
+    """Builds an order-preserving trie regex out of a list of PII entries."""
+
+    def __init__(self, case_insensitive: bool):
+        self.case_insensitive = case_insensitive
+
+    def _key(self, atom):
+        if atom is _SEPARATOR or atom is _END:
+            return atom
+        return atom.lower() if self.case_insensitive else atom
+
+    def _conflicts(self, key_a, key_b) -> bool:
+        """Whether two branch keys can match at the same position of a text."""
+        if key_a is _END or key_b is _END:
+            return True
+        if key_a is _SEPARATOR and key_b is _SEPARATOR:
+            return True
+        if key_a is _SEPARATOR or key_b is _SEPARATOR:
+            literal = key_b if key_a is _SEPARATOR else key_a
+            return bool(_SEPARATOR_CHAR_RE.match(literal))
+        if key_a == key_b:
+            return True
+        # Case folding of non-ASCII characters has exceptions (e.g. "ſ" matches "s"),
+        # so be conservative and keep their relative order.
+        return self.case_insensitive and not (key_a.isascii() and key_b.isascii())
+
+    @staticmethod
+    def _flat(items: List[Tuple[Tuple, int]]) -> str:
+        return "|".join(_atoms_pattern(atoms) for atoms, _ in items)
+
+    def build(self, words: Sequence[str]) -> str:
+        # Duplicates can never win over their first occurrence
+        seen = set()
+        items = []
+        for index, word in enumerate(words):
+            atoms = _tokenize(word)
+            if atoms and atoms not in seen:
+                seen.add(atoms)
+                items.append((atoms, index))
+        return self._emit(items)
+
+    def _emit(self, items: List[Tuple[Tuple, int]]) -> str:
+        """Emit an alternation of the (suffix, index) items that tries them in index order."""
+        if len(items) == 1:
+            return _atoms_pattern(items[0][0])
+
+        groups = {}
+        for atoms, index in items:
+            key = self._key(atoms[0]) if atoms else _END
+            groups.setdefault(key, []).append((atoms, index))
+
+        if len(groups) == 1:
+            key, members = next(iter(groups.items()))
+            if key is _END:
+                return ""
+            rests = [(atoms[1:], index) for atoms, index in members]
+            # Factoring a greedy separator changes the backtracking order unless every branch
+            # continues with a literal that the separator cannot swallow.
+            if key is _SEPARATOR and not all(
+                rest and rest[0] is not _SEPARATOR and not _SEPARATOR_CHAR_RE.match(rest[0])
+                for rest, _ in rests
+            ):
+                return self._flat(items)
+            return f"{_atom_pattern(members[0][0][0])}(?:{self._emit(rests)})"
+
+        # Branches are emitted in order of their first entry. That is only equivalent to the
+        # flat alternation if branches that can match at the same position do not interleave.
+        ordered_groups = list(groups.items())
+        for i, (key_a, members_a) in enumerate(ordered_groups):
+            for key_b, members_b in ordered_groups[i + 1:]:
+                if self._conflicts(key_a, key_b) and members_a[-1][1] > members_b[0][1]:
+                    return self._flat(items)
+
+        return "|".join(self._emit(members) for _, members in ordered_groups)
+
+
+def compile_trie_pattern(pii_list: Sequence[str], case_insensitive: bool = False) -> Optional[re.Pattern]:
+    """
+    Compile a trie-shaped regex matching the same text spans as `construct_pattern`.
+
+    Parameters:
+    pii_list (list): A list of words (PII) to be redacted from the text.
+    case_insensitive (bool): Flag to indicate if the pattern should be case-insensitive.
+
+    Returns:
+    re.Pattern: The compiled regex pattern, or None if the list is empty.
+    """
+    body = _TriePatternBuilder(case_insensitive).build(pii_list)
+    if not body:
+        return None
+    pattern = r"(?<![A-Za-z])(?:" + body + r")(?![A-Za-z])"
+    return re.compile(pattern, re.IGNORECASE) if case_insensitive else re.compile(pattern)
+
+
+class PIIRedactor:
+    """Redacts PII from texts using patterns compiled once at construction."""
+
+    def __init__(
+        self,
+        pii_list_case_insensitive: Sequence[str] = customer_names_case_insensitive,
+        pii_list_case_sensitive: Sequence[str] = customer_names_case_sensitive,
+        redaction_string: str = "<CUSTOMER>",
+    ):
+        self.redaction_string = redaction_string
+        self._patterns = [
+            pattern
+            for pattern in (
+                compile_trie_pattern(pii_list_case_insensitive, case_insensitive=True),
+                compile_trie_pattern(pii_list_case_sensitive),
+            )
+            if pattern is not None
+        ]
+        # Literal replacement, the same way re.sub treats a string without escapes
+        self._replacement = redaction_string.replace("\\", r"\\")
+
+    def redact(self, text: str) -> str:
+        """
+        Replace PII in the text with the redaction string.
+
+        The case-insensitive list is applied first, then the case-sensitive list.
+        """
+        for pattern in self._patterns:
+            text = pattern.sub(self._replacement, text)
+        return text
+
+    def redact_batch(self, texts: Sequence[str]) -> List[str]:
+        """
+        Redact a batch of texts in a single pass over their concatenation.
+
+        Returns:
+        list: The redacted texts, in the same order as the input.
+        """
+        if not texts:
+            return []
+        if _BATCH_DELIMITER in self.redaction_string or any(_BATCH_DELIMITER in text for text in texts):
+            return [self.redact(text) for text in texts]
+        return self.redact(_BATCH_DELIMITER.join(texts)).split(_BATCH_DELIMITER)
+
+
+@lru_cache(maxsize=8)
+def get_pii_redactor(
+    pii_list_case_insensitive: Tuple[str, ...] = tuple(customer_names_case_insensitive),
+    pii_list_case_sensitive: Tuple[str, ...] = tuple(customer_names_case_sensitive),
+    redaction_string: str = "<CUSTOMER>",
+) -> PIIRedactor:
+    """
+    Retrieve a PIIRedactor for the given lists, building it on first use.
+
+    The default redactor covers the customer names in `pii_data`.
+    """
+    return PIIRedactor(pii_list_case_insensitive, pii_list_case_sensitive, redaction_string)
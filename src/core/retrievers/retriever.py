@@ -1,6 +1,4 @@
 import json
-import aiohttp
-import asyncio
 import requests
 from copy import deepcopy
 from typing import Optional, Callable, Dict, Any, List, Union
@@ -8,8 +6,11 @@ from src.core.base import LamBotDocument
 from langchain_core.retrievers import BaseRetriever
 from tenacity import retry, stop_after_attempt, wait_exponential
 from src.core.retrievers.utils import group_lambot_documents
-from src.core.retrievers.utils import redact_pii
+from src.core.retrievers.utils import redact_pii_batch
 from src.models.citation import CitationTagAliasSpec
+from src.models.retriever_tool import RetrieverCacheConfig
+from src.core.cache.retrieval import RetrievalResultCache
+from src.clients import LifespanClients
 
 # Note: The search service is designed to retrieve fields from the index that are marked as "Retrievable" in the index schema.
 # Ideally chunk_vector should not be retrievable because it is a large field and contributes to the size of the response thereby increasing the latency.
@@ -33,6 +34,7 @@ class AzureAISearchRetriever(BaseRetriever):
     rate_limit: int = 5
     top_k: int = 5
     formatter: Optional[Callable[[str], str]]
+    result_cache: Optional[RetrieverCacheConfig] = None
 
     @property
     def _build_search_url(self) -> str:
@@ -62,9 +64,8 @@ class AzureAISearchRetriever(BaseRetriever):
     )
     def _search(self, payload: Dict) -> List[dict]:
         search_url = self._build_search_url
-        response = requests.post(
-            search_url, headers=self._headers, data=json.dumps(payload)
-        )
+        search_client = LifespanClients.get_instance().azure_ai_search
+        response = search_client.post(search_url, headers=self._headers, payload=payload)
         if response.status_code != 200:
             raise requests.exceptions.HTTPError(f"Error in search request: {response}")
 
@@ -76,16 +77,49 @@ class AzureAISearchRetriever(BaseRetriever):
     )
     async def _asearch(self, payload: Dict) -> List[dict]:
         search_url = self._build_search_url
-        async with asyncio.Semaphore(self.rate_limit):
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    search_url, headers=self._headers, data=json.dumps(payload)
-                ) as response:
-                    response_json = await response.json()
-                    if response.status != 200:
-                        raise requests.exceptions.HTTPError(f"Error in search request: {response_json}")
+        # The pooled client reuses warm connections and enforces the global and per-index (rate_limit) concurrency limits
+        search_client = LifespanClients.get_instance().azure_ai_search
+        status, response_json = await search_client.apost(
+            search_url,
+            index_name=self.index_name,
+            headers=self._headers,
+            payload=payload,
+            max_concurrency_per_index=self.rate_limit,
+        )
+        if status != 200:
+            raise requests.exceptions.HTTPError(f"Error in search request: {response_json}")
         return response_json.get("value")
     
+    def _strip_vector_fields(self, search_response: List[dict]) -> List[dict]:
+        return [
+            {key: value for key, value in item.items() if not self.is_vector_field(value)}
+            for item in search_response
+        ]
+
+    def _cached_search(self, query: str, payload: Dict) -> List[dict]:
+        if not self.result_cache:
+            return self._search(payload)
+
+        cache = RetrievalResultCache.get_instance()
+        cache_key = cache.build_key(self.index_name, query, payload)
+        search_response = cache.get(cache_key, self.index_name, self.result_cache)
+        if search_response is None:
+            search_response = self._strip_vector_fields(self._search(payload))
+            cache.set(cache_key, search_response, self.result_cache)
+        return search_response
+
+    async def _acached_search(self, query: str, payload: Dict) -> List[dict]:
+        if not self.result_cache:
+            return await self._asearch(payload)
+
+        cache = RetrievalResultCache.get_instance()
+        cache_key = cache.build_key(self.index_name, query, payload)
+        search_response = await cache.aget(cache_key, self.index_name, self.result_cache)
+        if search_response is None:
+            search_response = self._strip_vector_fields(await self._asearch(payload))
+            await cache.aset(cache_key, search_response, self.result_cache)
+        return search_response
+
     @staticmethod
     def is_vector_field(input_list: list) -> bool:
         """
@@ -105,6 +139,7 @@ class AzureAISearchRetriever(BaseRetriever):
         self, search_response: List[dict], return_grouped_citation: bool = False
     ) -> List[Union[LamBotDocument, List[LamBotDocument]]]:
         lambot_documents = []
+        metadatas = []
         for item in search_response:
             if "chunk" not in item:
                 raise KeyError(
@@ -112,11 +147,17 @@ class AzureAISearchRetriever(BaseRetriever):
                 )
 
             # Ignore the vector fields
-            metadata = {
+            metadatas.append({
                 key: value for key, value in item.items()
                 if not self.is_vector_field(value)
-            }
+            })
+
+        # Redact PII from all chunks in one pass. If no PII is found, the original chunk is returned.
+        # Example: "Samsung has a new product" -> "<CUSTOMER> has a new product"
+        chunks = [metadata["chunk"] for metadata in metadatas]
+        redacted_pii_chunks = redact_pii_batch(chunks) if self.redact_pii else chunks
 
+        for metadata, redacted_pii_chunk in zip(metadatas, redacted_pii_chunks):
             llm_context = ""
 
             # Add additional context fields to the llm_context 
@@ -126,12 +167,8 @@ class AzureAISearchRetriever(BaseRetriever):
                     if value:
                         llm_context += f"{str(field_alias)}: {str(value)}" + "\n"
 
-            # Extract the chunk from metadata
-            chunk = metadata.pop("chunk")
-            
-            # Redact PII from the chunk. If no PII is found, the original chunk is returned.
-            # Example: "Samsung has a new product" -> "Customer has a new product"
-            redacted_pii_chunk = redact_pii(chunk) if self.redact_pii else chunk
+            # Remove the chunk from metadata
+            metadata.pop("chunk")
             llm_context += redacted_pii_chunk
 
             # Create LamBotDocument object and add to the list
@@ -152,7 +189,7 @@ class AzureAISearchRetriever(BaseRetriever):
     def _get_relevant_documents(self, query: str, return_grouped_citation: bool = False) -> List[Union[LamBotDocument, List[LamBotDocument]]]:
 
         payload = self._prepare_payload(query)
-        search_response = self._search(payload)
+        search_response = self._cached_search(query, payload)
         lambot_documents = self._prepare_documents_from_response(search_response, return_grouped_citation)
 
         return lambot_documents
@@ -160,7 +197,7 @@ class AzureAISearchRetriever(BaseRetriever):
     async def _aget_relevant_documents(self, query: str, return_grouped_citation: bool = False) -> List[Union[LamBotDocument, List[LamBotDocument]]]:
 
         payload = self._prepare_payload(query)
-        search_response = await self._asearch(payload)
+        search_response = await self._acached_search(query, payload)
         lambot_documents = self._prepare_documents_from_response(search_response, return_grouped_citation)
 
         return lambot_documents
@@ -1,8 +1,9 @@
 import re
 from src.core.base import LamBotDocument
-from typing import List, Union
+from typing import List, Optional, Union
 from collections import defaultdict
 from src.core.retrievers.pii_data import customer_names_case_insensitive, customer_names_case_sensitive
+from src.core.retrievers.pii_redactor import PIIRedactor, get_pii_redactor
 
 
 def group_lambot_documents(
@@ -76,6 +77,16 @@ def construct_pattern(pii_list: List[str], case_insensitive: bool = False) -> re
     else:
         return re.compile(pattern)
 
+def _get_redactor(pii_list_case_insensitive: List[str], pii_list_case_sensitive: List[str], redaction_string: str) -> PIIRedactor:
+    """Retrieve the cached PIIRedactor for the given lists, building it on first use."""
+    if (
+        pii_list_case_insensitive is customer_names_case_insensitive
+        and pii_list_case_sensitive is customer_names_case_sensitive
+        and redaction_string == "<CUSTOMER>"
+    ):
+        return get_pii_redactor()
+    return get_pii_redactor(tuple(pii_list_case_insensitive), tuple(pii_list_case_sensitive), redaction_string)
+
 def redact_pii(text: str, pii_list_case_insensitive: List[str] = customer_names_case_insensitive, pii_list_case_sensitive: List[str] = customer_names_case_sensitive, redaction_string: str = "<CUSTOMER>") -> str:
     """
     Redacts words in the pii_list_case_insensitive and pii_list_case_sensitive from the given text by replacing them with the redaction_string.
@@ -93,17 +104,56 @@ def redact_pii(text: str, pii_list_case_insensitive: List[str] = customer_names_
     The redaction for pii_list_case_insensitive is case-insensitive and handles variations with spaces, underscores, hyphens, and multiple spaces.
     The redaction for pii_list_case_sensitive is case-sensitive and handles variations with spaces, underscores, hyphens, and multiple spaces.
     It also covers edge cases where numbers or special characters are part of the PII.
+    The patterns are compiled once per distinct set of lists (see PIIRedactor) and reused across calls.
     """
+    return _get_redactor(pii_list_case_insensitive, pii_list_case_sensitive, redaction_string).redact(text)
 
-    # Compile pattern for case-insensitive redaction
-    pattern_case_insensitive = construct_pattern(pii_list_case_insensitive, case_insensitive=True)
+def redact_pii_batch(texts: List[str], pii_list_case_insensitive: List[str] = customer_names_case_insensitive, pii_list_case_sensitive: List[str] = customer_names_case_sensitive, redaction_string: str = "<CUSTOMER>") -> List[str]:
+    """
+    Redacts PII from a batch of texts in a single pass. See redact_pii for the matching rules.
 
-    # Compile pattern for case-sensitive redaction
-    pattern_case_sensitive = construct_pattern(pii_list_case_sensitive)
+    Parameters:
+    texts (list): The input strings containing the text to be redacted.
+    pii_list_case_insensitive (list): A list of words (PII) to be redacted from the text in a case-insensitive manner.
+    pii_list_case_sensitive (list): A list of words (PII) to be redacted from the text in a case-sensitive manner.
+    redaction_string (str): The string to replace the PII with. Default is "<CUSTOMER>".
+
+    Returns:
+    list: The redacted texts, in the same order as the input.
+    """
+    return _get_redactor(pii_list_case_insensitive, pii_list_case_sensitive, redaction_string).redact_batch(texts)
 
-    # Replace matched words with the redaction_string
-    redacted_text = pattern_case_insensitive.sub(redaction_string, text)
-    redacted_text = pattern_case_sensitive.sub(redaction_string, redacted_text)
 
-    return redacted_text
+def merge_search_filters(
+    filter_clauses: list[str], operator: Optional[str] = "and"
+) -> str:
+    """
+    Merge multiple search filter strings with the specified logical operator ("and"/"or").
 
+    Args:
+        filter_clauses (list[str]): List of search filter strings to merge.
+        operator (Optional[str]): The logical operator to use ("and" or "or"). Defaults to "and".
+    Returns:
+        str: The merged search filter string.
+    """
+    op_lower = operator.lower()
+    if op_lower not in ["and", "or"]:
+        raise ValueError("Operator for merging search filters must be 'and' or 'or'.")
+
+    # Filter out empty/None filters
+    cleaned_filters = [f for f in filter_clauses if f]
+    if not cleaned_filters:
+        return ""
+    if len(cleaned_filters) == 1:
+        return cleaned_filters[0]
+
+    def _wrap_parentheses(f: str) -> str:
+        if f.startswith("(") and f.endswith(")"):
+            return f
+        f_lower = f.lower()
+        if " and " in f_lower or " or " in f_lower:
+            return f"({f})"
+        return f
+
+    wrapped_filters = [_wrap_parentheses(f) for f in cleaned_filters]
+    return f" {op_lower} ".join(wrapped_filters)
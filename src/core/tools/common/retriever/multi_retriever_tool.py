@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, List, Optional
 from pydantic.v1 import Field
 from langchain_core.retrievers import BaseRetriever
@@ -54,6 +55,12 @@ class LamBotMultiRetrieverTool(LamBotRetrieverTool):
         self.multi_retriever_top_k = multi_retriever_top_k
         self.display_names = display_names
 
+    def for_request(self) -> "LamBotMultiRetrieverTool":
+        """Create a per-request copy of this tool, including copies of its retriever tools."""
+        tool = super().for_request()
+        tool.retriever_tools = [retriever_tool.for_request() for retriever_tool in self.retriever_tools]
+        return tool
+
     @classmethod
     def from_tools(cls, retriever_tools: List[LamBotRetrieverTool], tool_spec: MultiRetrieverToolSpec, display_names: Optional[List[str]], multi_retriever_top_k: Optional[int] = 25) -> "LamBotMultiRetrieverTool":
         return cls(
@@ -129,11 +136,19 @@ class LamBotMultiRetrieverTool(LamBotRetrieverTool):
         """Get the instruction prompt with fallback."""
         return self._get_prompt(self.tool_spec, "instruction_prompt")
 
-    @property
-    def retriever(self) -> BaseRetriever:
+    def _retriever_plan_key(self) -> tuple:
+        """The per-request inputs of the retriever configuration, including those of the retriever tools."""
+        return (self.multi_retriever_top_k, tuple(tool._retriever_plan_key() for tool in self.retriever_tools))
+
+    def _configure_retriever(self, tool_spec: MultiRetrieverToolSpec, access_types: Optional[List[str]] = None) -> BaseRetriever:
         """Configure and return the MultiRetriever based on the provided tool configuration."""
         return self._configure_multi_retriever()
 
+    async def aget_retriever(self) -> BaseRetriever:
+        """Configure the retrievers of the retriever tools concurrently, then return the MultiRetriever."""
+        await asyncio.gather(*[tool.aget_retriever() for tool in self.retriever_tools])
+        return await super().aget_retriever()
+
     def _configure_multi_retriever(
         self,
     ) -> BaseRetriever:
@@ -155,6 +170,4 @@ class LamBotMultiRetrieverTool(LamBotRetrieverTool):
                 tool.override_top_k(k)
             else:
                 raise TypeError(f"Expected instance of LamBotRetrieverTool, got {type(tool)} instead")
-            
-        # Reconfigure the MultiRetriever instance
-        self._configure_multi_retriever()
\ No newline at end of file
+        # The MultiRetriever is reconfigured on its next use
\ No newline at end of file
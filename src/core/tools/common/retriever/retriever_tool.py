@@ -10,9 +10,9 @@ from src.models import ToolType
 from src.models.retriever_tool import RetrieverInput
 from src.models.intermediate_step import IntermediateStep
 from src.core.context.vars import access_token_var
-from src.core.utils.auth_helpers import get_user_info
+from src.core.cache.access_control import AccessControlCache
 from src.clients import LifespanClients
-from src.models.retriever_tool import AccessControlParam, AccessControl, RetrieverToolSpec, MultiRetrieverToolSpec
+from src.models.retriever_tool import AccessControl, RetrieverToolSpec, MultiRetrieverToolSpec
 from src.core.retrievers.utils import create_llm_context_string
 from src.core.tools.common.retriever.utils import build_search_filter_from_filterable_fields, merge_search_filters
 
@@ -32,6 +32,8 @@ class LamBotRetrieverTool(LamBotTool):
         self.tool_spec = tool_spec
         self.display_names = display_names
         self.access_control_intermediate_step = None
+        self._top_k = None  # Per-request override of the top_k value in the search config
+        self._retriever_plan = None  # Retriever configured for this request, with the inputs it was configured from
 
     @classmethod
     def from_tool_spec(cls, tool_spec: RetrieverToolSpec):
@@ -51,10 +53,38 @@ class LamBotRetrieverTool(LamBotTool):
         ) 
         return tool_description_prompt
 
+    def for_request(self) -> "LamBotRetrieverTool":
+        """Create a per-request copy of this tool, without the retriever configured for another request."""
+        tool = super().for_request()
+        tool._retriever_plan = None
+        return tool
+
+    def _retriever_plan_key(self) -> tuple:
+        """The per-request inputs of the retriever configuration."""
+        access_token = access_token_var.get() if self.access_control else None
+        return (self._top_k, repr(self.get_tool_kwargs()), access_token)
+
     @property
     def retriever(self) -> BaseRetriever:
-        """Configure and return the AzureAISearchRetriever based on the provided tool configuration."""
-        return self._configure_retriever(self.tool_spec)
+        """Configure and return the AzureAISearchRetriever based on the provided tool configuration.
+
+        The retriever is configured once per request and reused by the following tool runs of the
+        agent loop, unless the top_k override or the tool keyword arguments change.
+        """
+        key = self._retriever_plan_key()
+        if self._retriever_plan is None or self._retriever_plan[0] != key:
+            self._retriever_plan = (key, self._configure_retriever(self.tool_spec))
+        return self._retriever_plan[1]
+
+    async def aget_retriever(self) -> BaseRetriever:
+        """Asynchronous variant of `retriever` that resolves the access control without blocking the event loop."""
+        key = self._retriever_plan_key()
+        if self._retriever_plan is None or self._retriever_plan[0] != key:
+            access_types = None
+            if self.access_control:
+                access_types = await AccessControlCache.get_instance().aresolve(self.access_control, access_token_var.get())
+            self._retriever_plan = (key, self._configure_retriever(self.tool_spec, access_types))
+        return self._retriever_plan[1]
 
     @property
     def instruction_prompt(self) -> PromptTemplate:
@@ -70,11 +100,17 @@ class LamBotRetrieverTool(LamBotTool):
     @property
     def top_k(self) -> int:
         """Get the top_k value."""
+        if self._top_k is not None:
+            return self._top_k
         return self.tool_spec.search_config["top"]
 
     def override_top_k(self, k: int):
-        """Override the top_k value in the search config."""
-        self.tool_spec.search_config["top"] = k
+        """Override the top_k value of the search config for this tool instance.
+
+        The tool spec is shared with the registered prototype, so the override is kept on the
+        instance and applied when the retriever is configured.
+        """
+        self._top_k = k
 
     @property
     def access_control(self) -> Optional[AccessControl]:
@@ -89,9 +125,16 @@ class LamBotRetrieverTool(LamBotTool):
         search_filter = build_search_filter_from_filterable_fields(filterable_fields)
         return search_filter or None
 
-    def _configure_retriever(self, tool_spec: RetrieverToolSpec) -> BaseRetriever:
-        """Configure and return the AzureAISearchRetriever based on the provided tool configuration."""
+    def _configure_retriever(self, tool_spec: RetrieverToolSpec, access_types: Optional[List[str]] = None) -> BaseRetriever:
+        """Configure and return the AzureAISearchRetriever based on the provided tool configuration.
+
+        Args:
+            tool_spec (RetrieverToolSpec): The tool spec to configure the retriever from.
+            access_types (List[str], optional): The values the user has access to, resolved when None.
+        """
         azure_search_config = deepcopy(tool_spec.search_config)
+        if self._top_k is not None:
+            azure_search_config["top"] = self._top_k
         
         # Apply the search filter from tool keyword arguments
         original_filter = azure_search_config.get("filter")
@@ -101,27 +144,10 @@ class LamBotRetrieverTool(LamBotTool):
             azure_search_config["filter"] = merged_filter
 
         if self.access_control:
-            # Get user information
-            access_token = access_token_var.get()
-            user_info = get_user_info(access_token)
-            
-            # Determine the parameter to pass to the access control function
-            access_control_param = self.access_control.param
-            param_value = user_info.get(access_control_param.value)
-            if access_control_param == AccessControlParam.USERNAME:
-                param_value = param_value.lower()
-            
-            if not param_value:
-                raise ValueError(f"Invalid access control parameter specified: {access_control_param}")
-            
-            # Get the access types using the access control function
-            access_control_function = self.access_control.function
-            access_types = access_control_function(param_value)
-            
-            # Check if access_types is a list
-            if not isinstance(access_types, list):
-                raise ValueError("The access control function must return a list of strings.")
-            
+            # Get the access types of the user using the access control function, cached per user
+            if access_types is None:
+                access_types = AccessControlCache.get_instance().resolve(self.access_control, access_token_var.get())
+
             # Update the search configuration with the filter conditions
             filter_field = self.access_control.filter_field
             if len(access_types) == 0:
@@ -153,7 +179,8 @@ class LamBotRetrieverTool(LamBotTool):
             search_api_version=os.getenv("SEARCH_API_VERSION"),
             azure_search_config=azure_search_config,
             top_k=azure_search_config.get("top"),
-            formatter=tool_spec.formatter
+            formatter=tool_spec.formatter,
+            result_cache=tool_spec.result_cache,
         )
     
     def _create_intial_tool_intermediate_step(self) -> IntermediateStep:
@@ -179,7 +206,8 @@ class LamBotRetrieverTool(LamBotTool):
 
     async def _retrieve_async(self, query: RetrieverInput):
         """Retrieve documents based on the query asynchronously."""
-        grouped_lambot_documents = await self.retriever.ainvoke(query, return_grouped_citation=True)
+        retriever = await self.aget_retriever()
+        grouped_lambot_documents = await retriever.ainvoke(query, return_grouped_citation=True)
 
         num_documents = sum(
             len(group) if isinstance(group, list) else 1
@@ -1,39 +1,7 @@
 from typing import Any, Optional, Tuple, Union
 
-
-def merge_search_filters(
-    filter_clauses: list[str], operator: Optional[str] = "and"
-) -> str:
-    """
-    Merge multiple search filter strings with the specified logical operator ("and"/"or").
-
-    Args:
-        filter_clauses (list[str]): List of search filter strings to merge.
-        operator (Optional[str]): The logical operator to use ("and" or "or"). Defaults to "and".
-    Returns:
-        str: The merged search filter string.
-    """
-    op_lower = operator.lower()
-    if op_lower not in ["and", "or"]:
-        raise ValueError("Operator for merging search filters must be 'and' or 'or'.")
-
-    # Filter out empty/None filters
-    cleaned_filters = [f for f in filter_clauses if f]
-    if not cleaned_filters:
-        return ""
-    if len(cleaned_filters) == 1:
-        return cleaned_filters[0]
-
-    def _wrap_parentheses(f: str) -> str:
-        if f.startswith("(") and f.endswith(")"):
-            return f
-        f_lower = f.lower()
-        if " and " in f_lower or " or " in f_lower:
-            return f"({f})"
-        return f
-
-    wrapped_filters = [_wrap_parentheses(f) for f in cleaned_filters]
-    return f" {op_lower} ".join(wrapped_filters)
+# Defined with the retrievers, which must not import the tool packages
+from src.core.retrievers.utils import merge_search_filters
 
 
 def _group_by_type(
@@ -9,5 +9,5 @@ def import_submodules(package_name):
         if is_pkg:
             import_submodules(full_module_name)
 
-# Dynamically import all submodules
-import_submodules(__name__)
+# Tool packages are imported on demand by the registry (see src/core/tools/registry.py).
+# Call import_submodules(__name__) to import all of them.
@@ -6,9 +6,10 @@ retriever_tool.py
 - DRY SQL templates
 - context managers for safety
 """
-import os, json, re, logging, struct
+import os, json, re, logging, struct, time, hashlib
 from collections import defaultdict, deque
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
 from typing import List, Dict, Optional, Tuple, Set, Type
 import math
 import pyodbc
@@ -24,6 +25,7 @@ from src.core.base import LamBotTool
 from src.models.constants import ToolType
 from src.models.base import ConfiguredBaseModel
 from src.clients import LifespanClients
+from src.core.cache.decorators import get_platform_cache_many, set_platform_cache_many
 from src.core.tools.community.nce_chatbot_pipeline.openai_config import llm_4o
 from .prompts import prompts
 from collections import defaultdict
@@ -145,7 +147,7 @@ class GraphBuilder:
     # IDs to ignore entirely
     INVALID_IDS = {None, "", "-1"}
 
-    # SQL template with placeholders
+    # SQL template with placeholders, matching every id of a batch
     SQL_FETCH_TEMPLATE = """
     SELECT
       [iqms_id],
@@ -154,8 +156,8 @@ class GraphBuilder:
       '{src}'        AS source
     FROM {view}
     WHERE
-      ( [iqms_id] = ?
-      OR [parent_id] = ?
+      ( [iqms_id] IN ({id_placeholders})
+      OR [parent_id] IN ({id_placeholders})
         {like_clause}
       )
       {date_clause}
@@ -166,6 +168,11 @@ class GraphBuilder:
         self.db = db_client
         # for splitting comma-lists in related_records
         self._related_splitter = re.compile(r"\s*,\s*")
+        # traversal budget, batching and caching of the rows of each node
+        self.max_depth     = int(os.getenv("BFS_MAX_DEPTH", "20"))
+        self.max_nodes     = int(os.getenv("BFS_MAX_NODES", "500"))
+        self.batch_size    = int(os.getenv("BFS_BATCH_SIZE", "300"))
+        self.cache_ttl     = int(os.getenv("BFS_CACHE_TTL_SECONDS", "3600"))
 
     def _to_param(self, val: str):
         """
@@ -190,81 +197,193 @@ class GraphBuilder:
         seeds: List[str],
         start_dt: Optional[datetime]    = None,
         end_dt:   Optional[datetime]    = None,
-        part_revs: Optional[List[str]]  = None
+        part_revs: Optional[List[str]]  = None,
+        max_depth: Optional[int]        = None,
+        max_nodes: Optional[int]        = None
     ) -> Tuple[Dict[str, Set[Tuple[str,str]]], Set[str]]:
         """
-        BFS over IQMS graph, optionally filtering date_opened and—
+        Level-synchronous BFS over IQMS graph, optionally filtering date_opened and—
         for NCe only—part_rev ∈ part_revs.
+
+        Each level is resolved with one query per view and batch of BFS_BATCH_SIZE ids,
+        the views running concurrently on their own connection. The rows of each node are
+        cached for BFS_CACHE_TTL_SECONDS, per filters. The traversal stops after max_depth
+        levels or max_nodes visited nodes (BFS_MAX_DEPTH and BFS_MAX_NODES by default).
         """
-        # prebuild filters
-        date_clause, date_params = self._build_date_filter(start_dt, end_dt)
-        rev_clause,  rev_params  = self._build_rev_filter(part_revs)
+        max_depth = self.max_depth if max_depth is None else max_depth
+        max_nodes = self.max_nodes if max_nodes is None else max_nodes
 
-        adj     = defaultdict(set)
-        visited = set()
-        queue   = deque(seeds)
+        # prebuild filters
+        date_filter = self._build_date_filter(start_dt, end_dt)
+        rev_filter  = self._build_rev_filter(part_revs)
+        filters_key = hashlib.sha1(
+            json.dumps([date_filter[1], rev_filter[1]]).encode("utf-8")
+        ).hexdigest()[:16]
+
+        adj      = defaultdict(set)
+        visited  = set()
+        frontier = {nid for nid in seeds if nid not in self.INVALID_IDS}
+        depth    = 0
+
+        with ExitStack() as stack, ThreadPoolExecutor(
+            max_workers=len(self.VIEWS), thread_name_prefix="bfs-view"
+        ) as pool:
+            connections = []
+            while frontier and depth < max_depth and len(visited) < max_nodes:
+                started = time.perf_counter()
+                level   = sorted(frontier)[: max_nodes - len(visited)]
+                visited.update(level)
+
+                # 1) rows of the nodes resolved by an earlier traversal
+                rows_by_node = self._get_cached_rows(level, filters_key)
+                missing      = [nid for nid in level if nid not in rows_by_node]
+
+                # 2) one query per view and batch for the others, views in parallel
+                if missing:
+                    if not connections:
+                        # one connection per view, opened concurrently on first use
+                        connections = list(pool.map(
+                            lambda _: stack.enter_context(self.db.connect()), self.VIEWS
+                        ))
+                    fetched = self._fetch_level(pool, connections, missing, date_filter, rev_filter)
+                    self._set_cached_rows(fetched, filters_key)
+                    rows_by_node.update(fetched)
+
+                # 3) add edges, next level = neighbors not visited yet
+                rows     = [row for nid in level for row in rows_by_node[nid]]
+                frontier = self._process_db_rows(rows, adj, visited)
+                depth   += 1
+
+                logger.info(
+                    "BFS level %d: %d nodes (%d cached), %d rows, %d next in %.0f ms",
+                    depth, len(level), len(level) - len(missing), len(rows),
+                    len(frontier), (time.perf_counter() - started) * 1000
+                )
 
-        with self.db.connect() as conn, conn.cursor() as cur:
-            while queue:
-                nid = queue.popleft()
-                if nid in self.INVALID_IDS or nid in visited:
-                    continue
-                visited.add(nid)
-
-                eqv, likev = self._to_param(nid), f"%{nid}%"
-
-                for view, src, has_rel in self.VIEWS:
-                    # 1) decide REL columns
-                    rel_col, like_clause = self._rel_clauses(has_rel)
-
-                    # 2) only NCe gets the rev‐clause
-                    rev_src_clause = rev_clause if src == "NCe" else ""
-
-                    # 3) assemble & run
-                    sql = self.SQL_FETCH_TEMPLATE.format(
-                        view        = view,
-                        src         = src,
-                        rel_column  = rel_col,
-                        like_clause = like_clause,
-                        date_clause = date_clause,
-                        rev_clause  = rev_src_clause
-                    ).replace("\n", " ")
-
-                    params = self._view_params(
-                        eqv, likev, has_rel,
-                        date_params, src, rev_params
-                    )
+        if frontier:
+            logger.warning(
+                "BFS stopped at %d levels / %d nodes with %d nodes left unvisited",
+                depth, len(visited), len(frontier)
+            )
+        return adj, visited
 
+    # bfs_traverse Helper: resolve the nodes of one level on every view
+    def _fetch_level(
+        self,
+        pool: ThreadPoolExecutor,
+        connections: List,
+        ids: List[str],
+        date_filter: Tuple[str, List[str]],
+        rev_filter: Tuple[str, List[str]]
+    ) -> Dict[str, List[list]]:
+        """Query every view for the ids, concurrently, and return the rows matching each id."""
+        batches = [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+
+        def _query_view(conn, view_spec) -> List[list]:
+            view, src, has_rel = view_spec
+            rows = []
+            with conn.cursor() as cur:
+                for batch in batches:
+                    sql, params = self._view_query(view, src, has_rel, batch, date_filter, rev_filter)
                     cur.execute(sql, params)
-                    rows = cur.fetchall()
+                    rows.extend(list(row) for row in cur.fetchall())
+            return rows
+
+        rows_by_node = {nid: [] for nid in ids}
+        for rows in pool.map(_query_view, connections, self.VIEWS):
+            for row in rows:
+                for nid in self._matched_ids(row, rows_by_node):
+                    rows_by_node[nid].append(row)
+        return rows_by_node
+
+    # bfs_traverse Helper: assemble the query of one view and batch
+    def _view_query(
+        self,
+        view: str,
+        src: str,
+        has_rel: bool,
+        batch: List[str],
+        date_filter: Tuple[str, List[str]],
+        rev_filter: Tuple[str, List[str]]
+    ) -> Tuple[str, List[str]]:
+        """Return (sql, params) of one view-query."""
+        date_clause, date_params = date_filter
+        rev_clause,  rev_params  = rev_filter
+
+        # 1) decide REL columns
+        rel_col, like_clause = self._rel_clauses(has_rel, len(batch))
+
+        # 2) only NCe gets the rev‐clause
+        rev_src_clause = rev_clause if src == "NCe" else ""
+
+        # 3) assemble
+        sql = self.SQL_FETCH_TEMPLATE.format(
+            view            = view,
+            src             = src,
+            rel_column      = rel_col,
+            id_placeholders = ",".join("?" for _ in batch),
+            like_clause     = like_clause,
+            date_clause     = date_clause,
+            rev_clause      = rev_src_clause
+        ).replace("\n", " ")
+
+        params = self._view_params(
+            [self._to_param(nid) for nid in batch],
+            [f"%{nid}%" for nid in batch],
+            has_rel, date_params, src, rev_params
+        )
+        return sql, params
+
+    # bfs_traverse Helper: the ids of a level a row was returned for
+    def _matched_ids(self, row: list, ids: Dict[str, List[list]]) -> Set[str]:
+        """Ids equal to the row's iqms_id or parent_id, or contained in its related records."""
+        child_id, parent_id, rel_csv, _ = row
+        matched = {nid for nid in (str(child_id).strip(), str(parent_id).strip()) if nid in ids}
+        if rel_csv:
+            matched.update(nid for nid in ids if nid in str(rel_csv))
+        return matched
+
+    # bfs_traverse Helper: rows of each node cached by earlier traversals
+    def _get_cached_rows(self, ids: List[str], filters_key: str) -> Dict[str, List[list]]:
+        try:
+            values = get_platform_cache_many([f"bfs_rows:{filters_key}:{nid}" for nid in ids])
+        except Exception as e:
+            logger.warning("Failed to read cached BFS rows: %s", e)
+            return {}
+        return {nid: rows for nid, rows in zip(ids, values) if rows is not None}
 
-                    # 4) process results
-                    self._process_db_rows(rows, adj, visited, queue)
+    def _set_cached_rows(self, rows_by_node: Dict[str, List[list]], filters_key: str) -> None:
+        try:
+            set_platform_cache_many(
+                {f"bfs_rows:{filters_key}:{nid}": rows for nid, rows in rows_by_node.items()},
+                ttl=self.cache_ttl
+            )
+        except Exception as e:
+            logger.warning("Failed to cache BFS rows: %s", e)
 
-        return adj, visited
     # bfs_traverse Helper: build related records filter clause
-    def _rel_clauses(self, has_rel: bool) -> Tuple[str, str]:
-        """Return (rel_column, like_clause) based on has_rel."""
+    def _rel_clauses(self, has_rel: bool, n_ids: int) -> Tuple[str, str]:
+        """Return (rel_column, like_clause) based on has_rel, one LIKE per id."""
         if has_rel:
             return (
                 "CAST([related_records_8d] AS VARCHAR(100))",
-                "OR [related_records_8d] LIKE ?"
+                " ".join("OR [related_records_8d] LIKE ?" for _ in range(n_ids))
             )
         return "NULL", ""
     # bfs_traverse Helper: builds parameter set for query
     def _view_params(
         self,
-        eqv: str,
-        likev: str,
+        eqvs: List[str],
+        likevs: List[str],
         has_rel: bool,
         date_params: List[str],
         src: str,
         rev_params: List[str]
     ) -> List[str]:
         """Builds the parameter list for one view-query."""
-        params = [eqv, eqv]
+        params = [*eqvs, *eqvs]
         if has_rel:
-            params.append(likev)
+            params.extend(likevs)
         params.extend(date_params)
         if src == "NCe":
             params.extend(rev_params)
@@ -274,10 +393,10 @@ class GraphBuilder:
         self,
         rows,
         adj: Dict[str, Set[Tuple[str,str]]],
-        visited: Set[str],
-        queue: deque
-    ) -> None:
-        """Add edges & enqueue new nodes for all fetched rows."""
+        visited: Set[str]
+    ) -> Set[str]:
+        """Add edges for all fetched rows and return the new nodes to visit."""
+        discovered = set()
         for child_id, parent_id, rel_csv, _ in rows:
             child = str(child_id).strip()
             if child in self.INVALID_IDS:
@@ -300,7 +419,7 @@ class GraphBuilder:
                 adj[child].add((r, "related"))
                 adj[r].add((child, "related"))
 
-            # enqueue new neighbors
+            # collect new neighbors
             neighbors = {child}
             if parent:
                 neighbors.add(parent)
@@ -308,7 +427,8 @@ class GraphBuilder:
 
             for nbr in neighbors:
                 if nbr not in visited and nbr not in self.INVALID_IDS:
-                    queue.append(nbr)
+                    discovered.add(nbr)
+        return discovered
     # ──────────────────────────────
     # bfs_traverse Helper: build the date filter clause + its params
     def _build_date_filter(
@@ -29,14 +29,14 @@ def get_wbt_access_types(user_login):
     if not wbt_table_name:
         raise ValueError("OPENAI_SYNAPSE_WBT_TABLE must be provided in environment variables.")
     
-    # Define your SQL query
+    # Define your SQL query, the user login is passed as a parameter
     sql_query = f"""
         SELECT Course_id
         FROM {wbt_table_name} 
-        WHERE user_login = '{user_login}'
+        WHERE user_login = ?
     """
     # Execute the query using SynapseClient
-    results = synapse_client.execute_query(sql_query)    
+    results = synapse_client.execute_query(sql_query, (user_login,))
 
     # Process the results
     access_types = []
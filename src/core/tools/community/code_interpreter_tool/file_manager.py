@@ -20,6 +20,10 @@ class AssistantFileManager:
         self.client = (
             LifespanClients.get_instance().azure_openai.azure_use2_region_client
         )
+        # The methods of the manager are awaited from the event loop
+        self.async_client = (
+            LifespanClients.get_instance().azure_openai.async_azure_use2_region_client
+        )
 
     async def upload_files_to_assistant(
         self, message_files: List[MessageFile]
@@ -40,7 +44,7 @@ class AssistantFileManager:
                     file_bytes = base64.b64decode(message_file.value)
                     file_obj = io.BytesIO(file_bytes)
                     file_obj.name = message_file.name
-                    file = self.client.files.create(file=file_obj, purpose="assistants")
+                    file = await self.async_client.files.create(file=file_obj, purpose="assistants")
                     logging.info(f"File uploaded successfully. File ID: {file.id}")
                     _file_mappings[message_file.name] = (
                         file.id
@@ -59,7 +63,7 @@ class AssistantFileManager:
         """
         for _, file_id in file_mappings.items():
             try:
-                self.client.files.delete(file_id)
+                await self.async_client.files.delete(file_id)
                 logging.info(f"File deleted successfully. File ID: {file_id}")
             except Exception as e:
                 logging.error(f"Failed to delete file {file_id}: {str(e)}")
@@ -75,9 +79,9 @@ class AssistantFileManager:
             List[AssistantFile]: A list of AssistantFile objects.
         """
         files = []
-        messages = self.client.beta.threads.messages.list(thread_id=thread_id)
+        messages = self.async_client.beta.threads.messages.list(thread_id=thread_id)
 
-        for message in messages:
+        async for message in messages:
             if not message.content:
                 continue
 
@@ -94,10 +98,10 @@ class AssistantFileManager:
                         continue
 
                     try:
-                        file_response = self.client.files.content(
+                        file_response = await self.async_client.files.content(
                             file_id=annotation.file_path.file_id
                         )
-                        file_bytes = file_response.read()
+                        file_bytes = await file_response.aread()
 
                         raw_file_name = (
                             annotation.text
@@ -13,9 +13,8 @@ from src.models.tool import ToolArtifact
 from src.models.constants import ToolType
 from src.models.base import ConfiguredBaseModel
 from pydantic import BaseModel, Field, PrivateAttr
-import os
 from src.core.tools.community.nce_chatbot_pipeline.openai_config import llm_4o, llm_o3_mini, llm_o3_mini_low
-from src.core.tools.community.nce_chatbot_pipeline.langchain_classes import SQLDatabase, LazyReflectMetadata
+from src.core.tools.community.nce_chatbot_pipeline.langchain_classes import SQLDatabase
 from typing import Optional, Tuple
 import logging
 from concurrent.futures import ThreadPoolExecutor
@@ -277,23 +276,11 @@ class ETSChatBotTool(LamBotTool):
     def _setup_sql_database(self):
             """
             Initialize the SQL database connection.
+
+            The database and its connection pool are shared by the requests of the worker.
             """
             logging.info("Connecting to SQL db")
-            synpase_driver = "{ODBC Driver 17 for SQL Server}"
-
-            # Keyvault Secrets
-            username = os.environ.get("OPENAI_SYNAPSE_READER_USERNAME")
-            synapse_server = os.environ.get("OPENAI_SYNAPSE_READER_SERVER") 
-            synapse_database = os.environ.get("OPENAI_SYNAPSE_READER_DATABASE")
-            synapse_password = os.environ.get("OPENAI_SYNAPSE_READER_SECRET")
-
-            authentication = "ActiveDirectoryPassword"
-            params = f"DRIVER={synpase_driver};SERVER={synapse_server};DATABASE={synapse_database};UID={username};PWD={synapse_password};AUTHENTICATION={authentication};Connection Timeout=60"
-            conn_str = f"mssql+pyodbc:///?odbc_connect={params}&timeout=30"
-
-            self.db = SQLDatabase.from_uri(
-                conn_str, engine_args={"pool_recycle": 3600}, metadata=LazyReflectMetadata()
-            )
+            self.db = SQLDatabase.for_profile("synapse_reader")
 
     def _construct_pipeline(self, user_input: str) -> tuple:
             """
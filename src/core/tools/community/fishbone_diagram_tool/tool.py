@@ -4,14 +4,11 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Type, Dict
 
 from src.core.base import LamBotTool
-from src.core.tools.community.fishbone_diagram_tool.utils import (
-    create_fishbone_diagram,
-    format_image_for_chat,
-)
+from src.core.common.fishbone import create_fishbone_diagram, format_image_for_chat
 from src.models import ToolType
 from src.models.intermediate_step import IntermediateStep
 from src.models.tool import ToolArtifact
-from src.models.constants import MimeType
+from src.models.constants import MimeType, ToolExecutionMode
 from src.core.tools.community.fishbone_diagram_tool.prompts import (
     FISHBONE_DIAGRAM_TOOL_DESCRIPTION_PROMPT,
 )
@@ -37,6 +34,8 @@ class FishboneToolArgsSchema(BaseModel):
 
 class FishboneDiagramTool(LamBotTool):
     args_schema: Type[BaseModel] = FishboneToolArgsSchema
+    # The diagram is rendered by matplotlib at 300 dpi, in the tool process pool
+    execution_mode: ToolExecutionMode = ToolExecutionMode.CPU_BOUND
 
     def __init__(self):
         super().__init__(
@@ -66,13 +65,13 @@ class FishboneDiagramTool(LamBotTool):
             input_data = tool_input.categories
             logger.info(f"Fishbone tool input data: {input_data}")
             # Create the fishbone diagram
-            img_bytes = create_fishbone_diagram(categories=input_data)
+            img_bytes = await self.run_cpu_bound(create_fishbone_diagram, categories=input_data)
             self.dispatch_intermediate_step(
                 intermediate_step=IntermediateStep(
                     message="Almost there. Making some final adjustments...."
                 )
             )
-            markdown_image = format_image_for_chat(img_bytes)
+            markdown_image = await self.run_blocking(format_image_for_chat, img_bytes)
 
             # Dispatch as tool artifact
             artifact = ToolArtifact(
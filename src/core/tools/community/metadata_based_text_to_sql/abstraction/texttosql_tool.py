@@ -1,9 +1,10 @@
 import os
-import pyodbc
+import re
 import asyncio
+import logging
 import pandas as pd
 
-from typing import Type, Optional, List
+from typing import Type, Optional, List, Tuple
 from pydantic import BaseModel
 from src.core.base import LamBotDocument
 from src.core.base import LamBotTool
@@ -23,6 +24,12 @@ from src.clients.azure import openai_token_provider
 
 load_dotenv(override=True)
 llm_config_service = LamBotMongoDB.get_instance().language_model_config_db
+logger = logging.getLogger(__name__)
+
+# The start of a SELECT query without a TOP clause, up to where the clause goes
+_SELECT_WITHOUT_TOP = re.compile(r"^\s*SELECT\s+(?!\s*(?:(?:DISTINCT|ALL)\s+)?TOP\b)(?:(?:DISTINCT|ALL)\s+)?", re.IGNORECASE)
+# Queries a leading TOP would break (OFFSET/FETCH paging) or only partly limit (set operations)
+_NOT_LIMITABLE = re.compile(r"\b(?:OFFSET|FETCH|UNION|EXCEPT|INTERSECT)\b", re.IGNORECASE)
 
 class LamBotTextToSQLTool(LamBotTool):
     """Retriever tool."""
@@ -154,60 +161,65 @@ class LamBotTextToSQLTool(LamBotTool):
         return response.sql_query
 
     @staticmethod
-    def execute_query_in_synapse(llm_generated_query):
-        
-        server = os.getenv("OPENAI_SYNAPSE_READER_SERVER")
-        database = os.getenv("OPENAI_SYNAPSE_READER_DATABASE")
-        username = os.getenv("OPENAI_SYNAPSE_READER_USERNAME")
-        password = os.getenv("OPENAI_SYNAPSE_READER_SECRET")
+    def limit_rows(llm_generated_query: str, max_rows: int) -> str:
+        """
+        Add a TOP clause to a SELECT query without one, so Synapse stops after max_rows rows.
 
-        # Connection string
-        connection_string = f"""
-            DRIVER={{ODBC Driver 17 for SQL Server}};
-            SERVER={server};
-            DATABASE={database};
-            UID={username};
-            PWD={password};
-            Authentication=ActiveDirectoryPassword;
+        Queries paging with OFFSET/FETCH (which SQL Server rejects together with TOP), set operations and
+        CTEs are left unchanged: the fetch of `execute_query_in_synapse` still stops after max_rows rows.
         """
+        if _NOT_LIMITABLE.search(llm_generated_query):
+            return llm_generated_query
+        return _SELECT_WITHOUT_TOP.sub(lambda match: f"{match.group(0)}TOP ({max_rows}) ", llm_generated_query, count=1)
 
-        # Establishing the connection
-        connection = pyodbc.connect(connection_string)
-        cursor = connection.cursor()
-        results = None
-        columns = None
+    @classmethod
+    def execute_query_in_synapse(cls, llm_generated_query: str) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        Execute the generated query on a pooled connection of the synapse_reader profile.
 
-        try:
-            # Executing the LLM-generated query
-            cursor.execute(llm_generated_query)
-        
-            columns = [column[0] for column in cursor.description]
+        The rows are fetched in chunks of TEXT_TO_SQL_FETCH_SIZE and appended column by column, and the
+        fetch stops after TEXT_TO_SQL_MAX_ROWS rows, so the memory used does not grow with the result.
+
+        Args:
+            llm_generated_query (str): The SQL query generated by the LLM.
 
-            # Fetching the results
-            results = cursor.fetchall()
+        Returns:
+            Tuple[Optional[pd.DataFrame], bool]: The results, None if the query failed, and whether they were cut off at the maximum number of rows.
+        """
+        max_rows = int(os.getenv("TEXT_TO_SQL_MAX_ROWS", "50000"))
+        fetch_size = int(os.getenv("TEXT_TO_SQL_FETCH_SIZE", "5000"))
+        engine = LifespanClients.get_instance().sql_engines.get_engine("synapse_reader")
+
+        # One row more than the maximum tells whether the results were cut off
+        query = cls.limit_rows(llm_generated_query, max_rows + 1)
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                columns = [column[0] for column in cursor.description]
+                values = [[] for _ in columns]
+                row_count = 0
+                while row_count <= max_rows:
+                    rows = cursor.fetchmany(min(fetch_size, max_rows + 1 - row_count))
+                    if not rows:
+                        break
+                    for column_values, chunk_values in zip(values, zip(*rows)):
+                        column_values.extend(chunk_values)
+                    row_count += len(rows)
+            finally:
+                cursor.close()
         except Exception as e:
-            print(f"An error occurred: {e}")
+            logger.error(f"An error occurred: {e}")
+            return None, False
         finally:
-            # Close the connection
-            cursor.close()
+            # Returns the connection to the pool
             connection.close()
-            
-        return results, columns
-    
-    @staticmethod
-    def create_dataframe(query_results, columns):
-        result_dict = {column: [] for column in columns}
-    
-        # Iterate over each tuple
-        for row in query_results:
-            
-            tuple_row = tuple(row)
-            # Iterate over each column and corresponding value in the tuple
-            for column, value in zip(columns, tuple_row):
-                result_dict[column].append(value)
-        
-        df = pd.DataFrame(result_dict)
-        return df
+
+        truncated = row_count > max_rows
+        if truncated:
+            values = [column_values[:max_rows] for column_values in values]
+        return pd.DataFrame(dict(zip(columns, values))), truncated
 
     @staticmethod
     def convert_llm_contexts_to_string(lambot_documents: List[LamBotDocument]) -> str:
@@ -229,11 +241,10 @@ class LamBotTextToSQLTool(LamBotTool):
         self.explainer.results.user_question = query
         self.explainer.results.llm_generated_query = llm_generated_sql_query
         
-        query_results, columns = self.execute_query_in_synapse(
+        dataframe, truncated = self.execute_query_in_synapse(
             llm_generated_query=llm_generated_sql_query
         )
-        if isinstance(query_results, list) and len(query_results)>0: 
-            dataframe = self.create_dataframe(query_results, columns)
+        if dataframe is not None and len(dataframe) > 0:
             blob_url = self.upload_dataframe_to_adls(dataframe=dataframe)
             sample_size = 10
             sample_data = dataframe.head(sample_size)
@@ -242,10 +253,13 @@ class LamBotTextToSQLTool(LamBotTool):
             self.explainer.results.query_results_df_sample = sample_data
             self.explainer.results.query_results_blob_url = blob_url
             
-            if len(query_results) > sample_size:
-                
+            if truncated:
+                query_results = f"The data has more than {dataframe.shape[0]} rows, which is too large to process. Here's a sample of the data: {sample_data.to_dict(orient='list')}"
+            elif len(dataframe) > sample_size:
                 query_results = f"The data has {dataframe.shape[0]} rows, which is too large to process. Here's a sample of the data: {sample_data.to_dict(orient='list')}"
-                  
+            else:
+                query_results = list(dataframe.itertuples(index=False, name=None))
+
         else:       
             query_results = "The generated query could not yeild any results. Please ask a different question."
             
@@ -276,8 +290,8 @@ class LamBotTextToSQLTool(LamBotTool):
     async def _arun(self, query: ToolInput) -> str:
         """Run the retriever tool asynchronously."""
         lambot_documents = await self._retrieve_async(query)
-        summarized_results = self._run_text_to_sql_workflow_from_documents(
-            query, lambot_documents
+        summarized_results = await self.run_blocking(
+            self._run_text_to_sql_workflow_from_documents, query, lambot_documents
         )
         tool_output = f"{self.instruction_prompt} {str(self.explainer.results.query_remedies)} {str(summarized_results)}"
         self.explain()
@@ -26,14 +26,14 @@ import re
 import traceback
 from src.core.base import LamBotTool
 from src.models.tool import ToolArtifact
-from src.models.constants import ToolType
+from src.models.constants import ToolType, ToolExecutionMode
 from src.models.base import ConfiguredBaseModel
 from pydantic import BaseModel, Field
 import os
 import requests
 import json
 from .openai_config import llm_4o
-from .langchain_classes import SQLDatabase, LazyReflectMetadata
+from .langchain_classes import SQLDatabase
 from typing import Optional
 from .constants import IQMS_NCE_LIVE, RPT_IQMS_8D_GRID, VW_IPLM_PROBLEM_REPORT, VW_OAI_ESCALATION_TICKETS
 import logging
@@ -64,6 +64,8 @@ class NceChatBotTool(LamBotTool):
     """NceChatBotTool contains all the functions for the nce chatbot project"""
 
     args_schema: Type[BaseModel] = ToolInput
+    # The pipeline chains synchronous LLM calls, ODBC queries and HTTP requests, run in the tool thread pool
+    execution_mode: ToolExecutionMode = ToolExecutionMode.IO_BLOCKING
 
     db: Optional[SQLDatabase] = None
 
@@ -548,21 +550,8 @@ class NceChatBotTool(LamBotTool):
             return "SQL"
 
     def _initialize_sql_database(self):
-        synpase_driver = "{ODBC Driver 17 for SQL Server}"
-
-        # Keyvault Secrets
-        username = os.environ.get("OPENAI_SYNAPSE_READER_USERNAME")
-        synapse_server = os.environ.get("OPENAI_SYNAPSE_READER_SERVER") 
-        synapse_database = os.environ.get("OPENAI_SYNAPSE_READER_DATABASE")
-        synapse_password = os.environ.get("OPENAI_SYNAPSE_READER_SECRET")
-
-        authentication = "ActiveDirectoryPassword"
-        params = f"DRIVER={synpase_driver};SERVER={synapse_server};DATABASE={synapse_database};UID={username};PWD={synapse_password};AUTHENTICATION={authentication};Connection Timeout=60"
-        conn_str = f"mssql+pyodbc:///?odbc_connect={params}&timeout=30"
-
-        self.db = SQLDatabase.from_uri(
-            conn_str, engine_args={"pool_recycle": 3600}, metadata=LazyReflectMetadata()
-        )
+        # The database and its connection pool are shared by the requests of the worker
+        self.db = SQLDatabase.for_profile("synapse_reader")
 
     def _complete_chain_function(self, query: str):
 
@@ -637,9 +626,6 @@ class NceChatBotTool(LamBotTool):
     def _run(self, query: ToolInput) -> str:
         return self._complete_chain_function(query)
 
-    async def _arun(self, query: ToolInput) -> str:
-        return self._complete_chain_function(query)
-
 
 # create an instance of NceChatBotTool
 nce_tool = NceChatBotTool.from_tool_spec(tool_spec)
@@ -1,6 +1,11 @@
 from langchain_community.utilities import SQLDatabase as BaseSQLDatabase
-from typing import Optional, List
+from typing import Dict, Optional, List
+import os
 import logging
+import threading
+from sqlalchemy import MetaData
+from src.clients import LifespanClients
+from src.core.cache.decorators import get_platform_cache_many, set_platform_cache_many
 from langchain.memory import ConversationBufferMemory as BaseConversationBufferMemory
 from langchain_core.messages import HumanMessage, AIMessage
 
@@ -9,30 +14,75 @@ class SQLDatabase(BaseSQLDatabase):
     """
     This class takes the Langchain SQLDatabase class and overrides the
     get_table_info method to allow lazy loading of metadata tables.
+
+    The databases returned by `for_profile` are shared by the requests of the worker. They use the
+    pooled engine of their connection profile, and the table info of each table (definition and
+    sample rows) is kept in the platform cache, shared with the other workers, for
+    SQL_TABLE_INFO_TTL_SECONDS (default: 86400).
     """
 
+    _shared: Dict[str, "SQLDatabase"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(self, *args, **kwargs):
         super(SQLDatabase, self).__init__(*args, **kwargs)
+        self._profile = None
+        # Requests reflect into the shared metadata concurrently
+        self._reflect_lock = threading.Lock()
+
+    @classmethod
+    def for_profile(cls, profile: str) -> "SQLDatabase":
+        """
+        Get the database of a connection profile of the SQLEngineRegistry, created on first use.
+        """
+        db = cls._shared.get(profile)
+        if db is None:
+            with cls._shared_lock:
+                db = cls._shared.get(profile)
+                if db is None:
+                    engine = LifespanClients.get_instance().sql_engines.get_engine(profile)
+                    db = cls(engine, metadata=LazyReflectMetadata())
+                    db._profile = profile
+                    cls._shared[profile] = db
+        return db
 
     def get_table_info(self, table_names: Optional[List[str]] = None) -> str:
         if table_names is None:
             return ""
 
-        loaded_tables = self._metadata.tables
+        if self._profile is None:
+            return self._reflect_table_info(table_names)
+
+        keys = [f"sql_table_info:{self._profile}:{table_name}" for table_name in table_names]
+        table_infos = {
+            key: table_info for key, table_info in zip(keys, get_platform_cache_many(keys)) if table_info is not None
+        }
+        missing_tables = {key: table_name for key, table_name in zip(keys, table_names) if key not in table_infos}
+        if missing_tables:
+            reflected = {key: self._reflect_table_info([table_name]) for key, table_name in missing_tables.items()}
+            set_platform_cache_many(reflected, int(os.getenv("SQL_TABLE_INFO_TTL_SECONDS", "86400")))
+            table_infos.update(reflected)
+
+        # Sorted and joined as the table info of several tables
+        return "\n\n".join(sorted(table_infos.values()))
+
+    def _reflect_table_info(self, table_names: List[str]) -> str:
+        with self._reflect_lock:
+            loaded_tables = self._metadata.tables
 
-        tables_to_load = []
+            tables_to_load = []
 
-        for table_name in table_names:
-            if table_name not in loaded_tables:
-                tables_to_load.append(table_name)
+            for table_name in table_names:
+                if table_name not in loaded_tables:
+                    tables_to_load.append(table_name)
 
-        if len(tables_to_load) > 0:
-            self._metadata.reflect(bind=self._engine, only=tables_to_load)
+            if len(tables_to_load) > 0:
+                self._metadata.reflect(bind=self._engine, only=tables_to_load)
 
         return super().get_table_info(table_names)
 
 
-class LazyReflectMetadata:
+class LazyReflectMetadata(MetaData):
     def __init__(self):
         super().__init__()
         self._initial_reflect = True
@@ -40,7 +90,7 @@ class LazyReflectMetadata:
     def reflect(
         self,
         bind=None,
-        schema=True,
+        schema=None,
         views=False,
         only=None,
         extend_existing=False,
@@ -55,12 +105,12 @@ class LazyReflectMetadata:
             logging.debug("Calling reflect with tables=%s", only)
             return super().reflect(
                 bind,
-                schema,
-                views,
-                only,
-                extend_existing,
-                autoload_replace,
-                resolve_fks,
+                schema=schema,
+                views=views,
+                only=only,
+                extend_existing=extend_existing,
+                autoload_replace=autoload_replace,
+                resolve_fks=resolve_fks,
                 **dialect_kwargs,
             )
 
@@ -1,4 +1,4 @@
-from src.models import RetrieverToolSpec
+from src.models import RetrieverCacheConfig, RetrieverToolSpec
 from .prompts import (
     SERVICEDESKKB_INSTRUCTION_PROMPT,
     SERVICEDESKKB_TOOL_DESCRIPTION_PROMPT,
@@ -30,6 +30,7 @@ tool_spec = RetrieverToolSpec(
         "queryLanguage": "en-US",
         "top": 5,
     },
+    result_cache=RetrieverCacheConfig(),
     citation_field_mappings={
         "row": CitationTagAliasSpec(
             default="ROW",
@@ -1,6 +1,6 @@
 from .prompts import TECHMEMO_INSTRUCTION_PROMPT, TECHMEMO_TOOL_DESCRIPTION_PROMPT
 from src.core.tools.common.retriever import LamBotRetrieverTool
-from src.models.retriever_tool import RetrieverToolSpec
+from src.models.retriever_tool import RetrieverCacheConfig, RetrieverToolSpec
 
 tool_spec = RetrieverToolSpec(
     tool_name="techmemo_retriever",
@@ -25,6 +25,7 @@ tool_spec = RetrieverToolSpec(
         "queryLanguage": "en-US",
         "top": 5,
     },
+    result_cache=RetrieverCacheConfig(),
     citation_field_mappings={},
 )
 
@@ -1,8 +1,43 @@
-from typing import Dict
+"""
+Registry of the LamBot tools.
+
+Tool packages under `src.core.tools.community` register their tools when imported. Importing all of
+them is slow (Langfuse prompt fetches, pandas, matplotlib, pyodbc, ...), so they are imported on
+demand: `tool_manifest.json`, generated at build time by `src.scripts.build_tool_manifest`, maps each
+tool name to its package, and `get_tool_by_name` imports that package on first use. Tools missing
+from the manifest fall back to importing every package.
+
+Environment Variables:
+- TOOL_WARMUP: Comma-separated tool names imported at startup by `warm_up_tools`, or "*" for all tools (default: none).
+"""
+
+import os
+import json
+import time
+import logging
+import importlib
+import pkgutil
+import threading
+from typing import Dict, List, Optional
 from langchain_core.tools import Tool
+from src.core.base import LamBotTool
+
+logger = logging.getLogger(__name__)
+
+COMMUNITY_PACKAGE = "src.core.tools.community"
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "tool_manifest.json")
 
+# Registered tools are prototypes shared by all requests and must not be mutated.
+# Use get_tool_by_name to obtain a per-request instance.
 _tool_registry = {}
 
+_manifest: Optional[Dict[str, str]] = None
+# Seconds spent on the first import of each tool package, in import order
+_import_times: Dict[str, float] = {}
+_all_tools_loaded = False
+# Reentrant, since importing a tool package may import other tool packages
+_import_lock = threading.RLock()
+
 def register_tool(tool: Tool) -> None:
     """
     Registers a tool in the tool registry.
@@ -18,21 +53,78 @@ def register_tool(tool: Tool) -> None:
 
     if tool_name in _tool_registry:
         raise ValueError(f"Tool {tool_name} is already registered")
-    
+
     _tool_registry[tool_name] = tool
 
+def _get_manifest() -> Dict[str, str]:
+    """
+    Load the tool name to package mapping once. A missing manifest makes every lookup load all tools.
+    """
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, encoding="utf-8") as f:
+                _manifest = json.load(f)["tools"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Tool manifest {MANIFEST_PATH} could not be read, all tools will be imported on first use: {e}")
+            _manifest = {}
+    return _manifest
+
+def _import_tool_package(module_name: str) -> None:
+    """
+    Import a tool package, recording the time of its first import.
+    """
+    with _import_lock:
+        if module_name in _import_times:
+            return
+        start = time.perf_counter()
+        importlib.import_module(module_name)
+        _import_times[module_name] = time.perf_counter() - start
+
+def load_all_tools() -> None:
+    """
+    Import every tool package, depth first, as the application did at startup before the manifest.
+    """
+    global _all_tools_loaded
+    with _import_lock:
+        if _all_tools_loaded:
+            return
+        package = importlib.import_module(COMMUNITY_PACKAGE)
+        for module_info in pkgutil.walk_packages(package.__path__, prefix=f"{COMMUNITY_PACKAGE}."):
+            _import_tool_package(module_info.name)
+        _all_tools_loaded = True
+
+def _load_tool(tool_name: str) -> None:
+    """
+    Import the package registering a tool, or every package if the manifest does not know the tool.
+    """
+    module_name = _get_manifest().get(tool_name)
+    if module_name is not None:
+        _import_tool_package(module_name)
+    if tool_name not in _tool_registry:
+        if module_name is not None:
+            logger.warning(f"Tool {tool_name} is not registered by {module_name}, the tool manifest may be stale.")
+        load_all_tools()
+
 def get_tools() -> Dict[str, Tool]:
     """
-    Retrieves all registered tools.
+    Retrieves all registered tool prototypes. The returned tools are shared and must be treated as read-only.
+
+    Imports every tool package on first call.
 
     Returns:
         Dict[str, Tool]: A dictionary of all registered tools with their names as keys.
     """
+    load_all_tools()
     return _tool_registry
-    
+
 def get_tool_by_name(tool_name: str) -> Tool:
     """
-    Retrieves a tool by its name.
+    Retrieves a per-request instance of a tool by its name.
+
+    The package of the tool is imported on first use. LamBotTools are copied from their registered
+    prototype (see LamBotTool.for_request), so the caller can configure the returned tool without
+    affecting concurrent requests.
 
     Args:
         tool_name (str): The name of the tool to retrieve.
@@ -40,4 +132,53 @@ def get_tool_by_name(tool_name: str) -> Tool:
     Returns:
         Tool: The tool associated with the given name, or None if the tool is not found.
     """
-    return _tool_registry.get(tool_name)
\ No newline at end of file
+    if tool_name not in _tool_registry:
+        _load_tool(tool_name)
+    tool = _tool_registry.get(tool_name)
+    if isinstance(tool, LamBotTool):
+        return tool.for_request()
+    return tool
+
+def warm_up_tools(tool_names: Optional[List[str]] = None) -> None:
+    """
+    Import tools ahead of their first request, e.g. at worker startup. Tools that fail to load are logged and skipped.
+
+    Args:
+        tool_names (List[str], optional): The tools to import, or ["*"] for all tools. Defaults to the TOOL_WARMUP environment variable.
+    """
+    if tool_names is None:
+        tool_names = [name.strip() for name in os.getenv("TOOL_WARMUP", "").split(",") if name.strip()]
+    if "*" in tool_names:
+        load_all_tools()
+        return
+    for tool_name in tool_names:
+        try:
+            if tool_name not in _tool_registry:
+                _load_tool(tool_name)
+        except Exception as e:
+            logger.warning(f"Failed to warm up tool {tool_name}: {e}")
+
+def get_import_report() -> List[Dict]:
+    """
+    Break the import cost of the tool packages loaded so far down per package, slowest first.
+
+    The time of a package includes the packages it imports that were not loaded yet.
+
+    Returns:
+        List[Dict]: The "module" and its import "seconds".
+    """
+    with _import_lock:
+        report = [{"module": module_name, "seconds": seconds} for module_name, seconds in _import_times.items()]
+    return sorted(report, key=lambda entry: entry["seconds"], reverse=True)
+
+def log_import_report(limit: int = 20) -> None:
+    """
+    Log the total tool import time and the slowest tool packages.
+    """
+    report = get_import_report()
+    total = sum(entry["seconds"] for entry in report)
+    lines = [f"{entry['seconds'] * 1000:9.1f} ms  {entry['module']}" for entry in report[:limit]]
+    logger.info(
+        f"Imported {len(report)} tool packages ({len(_tool_registry)} tools) in {total:.2f} s"
+        + ("; slowest:\n" + "\n".join(lines) if lines else "")
+    )
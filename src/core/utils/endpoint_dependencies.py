@@ -11,6 +11,8 @@ from src.core.utils.log_trace import log_trace_event
 from typing import List
 from src.models.functions import datetime_now
 from src.core.context.vars import user_email_var
+from src.core.cache.lambot_config import LamBotConfigCache
+from src.core.utils.ms_graph_utils import ahas_copilot_access
 from uuid import uuid4
 
 security = HTTPBearer()
@@ -90,7 +92,7 @@ def fetch_security_data(bearer_token: HTTPAuthorizationCredentials ,
         bearer_token=bearer_token,  # Pass token through for other dependencies that might need it
     )
 
-def verify_api_access(
+async def verify_api_access(
     request: Request,
     lambot_chat_request: LamBotChatRequest,
     security_data: SecurityData = Depends(get_security_data)
@@ -109,11 +111,11 @@ def verify_api_access(
             - 403 : If the user does not have access to a personal LamBot configuration.
     """
 
-    lambot = fetch_lambot_config(request, lambot_chat_request, security_data)
+    lambot = await fetch_lambot_config(request, lambot_chat_request, security_data)
     verify_personal_lambot_access(lambot)
     return lambot
 
-def verify_api_access_external(
+async def verify_api_access_external(
     request: Request,
     lambot_chat_request: LamBotChatRequest,
     security_data: SecurityData = Depends(get_security_data_external)
@@ -131,11 +133,11 @@ def verify_api_access_external(
             - 403 : If the user does not have access to a personal LamBot configuration.
     """
 
-    lambot = fetch_lambot_config(request, lambot_chat_request, security_data)
+    lambot = await fetch_lambot_config(request, lambot_chat_request, security_data)
     verify_personal_lambot_access(lambot)
     return lambot
 
-def fetch_lambot_config(request: Request,
+async def fetch_lambot_config(request: Request,
     lambot_chat_request: LamBotChatRequest,
     security_data: SecurityData )-> LamBotConfig:
     """
@@ -150,13 +152,49 @@ def fetch_lambot_config(request: Request,
             - 404: If the requested LamBot configuration is not found.
             - 401: If the user does not have access to the required tools.
     """
-    lambot_db = LamBotMongoDB.get_instance()
-
     user_role = security_data.user_role
     security_group_memberships_list = security_data.security_groups
 
-    lambot_config = lambot_db.lambot_config_db.fetch_lambot(
-        lambot_id=lambot_chat_request.lambot_id, 
+    # Resolutions only depend on the LamBot, the role and the security groups, see LamBotConfigCache
+    lambot_config_cache = LamBotConfigCache.get_instance()
+    cache_key = lambot_config_cache.build_key(lambot_chat_request.lambot_id, user_role, security_group_memberships_list)
+    lambot_config = await lambot_config_cache.aget(cache_key, copilot_access=ahas_copilot_access)
+
+    if lambot_config is None:
+        lambot_db = LamBotMongoDB.get_instance()
+        lambot_config = await resolve_lambot_config(lambot_db, lambot_chat_request.lambot_id, user_role, security_group_memberships_list)
+
+        copilot_access = None
+        if lambot_db.tool_config_db.depends_on_copilot_access(lambot_config.tools, user_role, security_group_memberships_list):
+            copilot_access = await ahas_copilot_access()
+        lambot_config_cache.set(cache_key, lambot_config, copilot_access)
+
+    trace_id = request.headers.get("x-trace-id")
+    
+    log_trace_event(
+        trace_id=trace_id,
+        step="security_check_passed",
+    )
+
+    return lambot_config
+
+async def resolve_lambot_config(lambot_db: LamBotMongoDB, lambot_id, user_role: str, security_group_memberships_list: List[str]) -> LamBotConfig:
+    """
+    Fetches a LamBot configuration from MongoDB and checks that the user has access to its tools.
+    Args:
+        lambot_db (LamBotMongoDB): The LamBot database.
+        lambot_id: The ID of the requested LamBot.
+        user_role (str): The role of the user.
+        security_group_memberships_list (List[str]): The security groups of the user.
+    Returns:
+        LamBotConfig: The configuration of the requested LamBot.
+    Raises:
+        HTTPException:
+            - 404: If the requested LamBot configuration is not found.
+            - 401: If the user does not have access to the required tools.
+    """
+    lambot_config = await lambot_db.lambot_config_db.afetch_lambot(
+        lambot_id=lambot_id, 
         user_role=user_role, 
         security_group_list=security_group_memberships_list
     )
@@ -168,7 +206,7 @@ def fetch_lambot_config(request: Request,
     
     lambot_tool_names_list = [tool.name for tool in lambot_config.tools]
     if lambot_tool_names_list:
-        accessible_tools_list = lambot_db.tool_config_db.fetch_all_tools(
+        accessible_tools_list = await lambot_db.tool_config_db.afetch_all_tools(
             user_role, security_group_memberships_list
         )
 
@@ -179,17 +217,10 @@ def fetch_lambot_config(request: Request,
                 status_code=401,
                 detail=f"The user does not have access to {set(lambot_tool_names_list) - set(tool_names_list)}",
             )
-        
-    trace_id = request.headers.get("x-trace-id")
-    
-    log_trace_event(
-        trace_id=trace_id,
-        step="security_check_passed",
-    )
 
     return lambot_config
 
-def fetch_all_tools_security_check(
+async def fetch_all_tools_security_check(
     security_data: SecurityData = Depends(get_security_data)
 ) -> List[ToolConfig]:
     """
@@ -206,7 +237,7 @@ def fetch_all_tools_security_check(
     user_role = security_data.user_role
     security_group_memberships_list = security_data.security_groups
 
-    accessible_tools_configs_list = lambot_db.tool_config_db.fetch_all_tools(user_role, security_group_memberships_list)
+    accessible_tools_configs_list = await lambot_db.tool_config_db.afetch_all_tools(user_role, security_group_memberships_list)
     
     return accessible_tools_configs_list
 
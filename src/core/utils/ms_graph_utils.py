@@ -1,4 +1,5 @@
 from src.core.context.vars import user_email_var, access_token_var
+import asyncio
 import requests
 import logging
 from src.core.cache.decorators import cache_user
@@ -41,6 +42,13 @@ def has_copilot_access() -> bool:
     return has_copilot
 
 
+async def ahas_copilot_access() -> bool:
+    """
+    Asynchronous variant of `has_copilot_access`, running the check off the event loop.
+    """
+    return await asyncio.to_thread(has_copilot_access)
+
+
 def is_valid_graph_email_address(email: str) -> bool:
     """
     Check if an email address is valid within the Active Directory.
@@ -12,7 +12,7 @@ from .functions import datetime_now
 from .request import LamBotChatRequest, LamBotChatRequestExternal
 from .response import LamBotChatResponse
 from .base import ConfiguredBaseModel
-from .retriever_tool import AccessControlParam, RetrieverInput, AccessControl, RetrieverToolSpec, MultiRetrieverToolSpec
+from .retriever_tool import AccessControlParam, RetrieverInput, AccessControl, RetrieverCacheConfig, RetrieverToolSpec, MultiRetrieverToolSpec
 from .security_data import SecurityData
 
 __all__ = [
@@ -37,6 +37,7 @@ __all__ = [
     "AccessControlParam",
     "RetrieverInput",
     "AccessControl",
+    "RetrieverCacheConfig",
     "RetrieverToolSpec",
     "MultiRetrieverToolSpec",
     "SecurityData",
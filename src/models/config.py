@@ -168,6 +168,9 @@ class LamBotConfig(ConfiguredBaseModel):
     audience: Optional[str] = Field(None, description="Intended audience for the LamBot.")
     tool_customize: Optional[List[LamBotToolCustomize]] = Field(None, description="Custom changes for the tool.")
     logo_file: Optional[LogoFile] = Field(None, description="Avatar file configuration for the LamBot.")
+    trace_sample_rate: Optional[float] = Field(
+        None, ge=0, le=1, description="Fraction of the requests of this LamBot traced in Langfuse. Defaults to LANGFUSE_TRACE_SAMPLE_RATE."
+    )
 
     @field_validator("default_query_config")
     def validate_default_query_config(cls, v):
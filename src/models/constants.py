@@ -4,6 +4,11 @@ class ToolType(IntEnum):
     retriever_tool = 1
     non_retriever_tool = 2
 
+class ToolExecutionMode(StrEnum):
+    NATIVE_ASYNC = "native_async"  # The coroutine of the tool does not block the event loop
+    IO_BLOCKING = "io_blocking"  # The tool waits on blocking clients (sync SDKs, ODBC, requests, ...)
+    CPU_BOUND = "cpu_bound"  # The tool computes in Python (rendering, parsing, ...)
+
 class CitationType(IntEnum):
     structured = 1
     unstructured = 2
@@ -72,3 +72,9 @@ class DeepResearchConfig(ConfiguredBaseModel):
     refiner: Optional[RefinerConfig] = Field(
         RefinerConfig(), description="Configuration for the refiner."
     )
+    max_concurrent_researchers: int = Field(
+        3, description="Maximum number of research topics researched or reviewed at the same time."
+    )
+    token_budget: Optional[int] = Field(
+        None, description="Token budget of a research run, checked before each research and review step. No limit if not set."
+    )
@@ -1,6 +1,6 @@
 from pydantic import Field
 from src.models.base import ConfiguredBaseModel
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 class TokenUsageDetails(ConfiguredBaseModel):
@@ -19,4 +19,5 @@ class ResponseInfo(ConfiguredBaseModel):
     follow_up_questions: List[str] = Field(..., description="The follow-up questions generated by the FollowUpQuestionGeneratorBot")
     LamBotId: UUID = Field(..., description="The id of the LamBot") 
     LamBotName: str = Field(..., description="The display_name of the LamBot")
-    token_consumption_details: TokenUsageDetails = Field(..., description="Token Consumption Details")
\ No newline at end of file
+    token_consumption_details: TokenUsageDetails = Field(..., description="Token Consumption Details")
+    time_to_done_ms: Optional[float] = Field(None, description="Time from the start of the conversation to the done message")
\ No newline at end of file
@@ -29,6 +29,15 @@ class AccessControl(ConfiguredBaseModel):
     )
 
 
+class RetrieverCacheConfig(ConfiguredBaseModel):
+    ttl_seconds: int = Field(
+        default=900, description="Time to live of cached search results in seconds."
+    )
+    max_entry_bytes: int = Field(
+        default=512_000, description="Search results larger than this (serialized) are not cached."
+    )
+
+
 class RetrieverToolSpec(BaseToolSpec):
     index_name: str = Field(..., description="Name of the index.")
     redact_pii: bool = Field(
@@ -46,6 +55,9 @@ class RetrieverToolSpec(BaseToolSpec):
     formatter: Optional[Any] = Field(
         default=None, description="Optional formatter for the tool."
     )
+    result_cache: Optional[RetrieverCacheConfig] = Field(
+        default=None, description="Opt-in cache of search results. Results are keyed by index, normalized query, effective filter and top_k."
+    )
 
 class MultiRetrieverToolSpec(BaseModel):
     tool_name: str = Field(..., description="Name of the tool.")
@@ -11,7 +11,7 @@ chat_router_external = APIRouter(prefix="/chat_external")
     "/chat_completion_external/",
     responses={503: {"detail": "503 error"}},
 )
-def post_chat_completion_external(
+async def post_chat_completion_external(
     request: Request,
     lambot_chat_request: LamBotChatRequestExternal,
     lambot_config: LamBotConfig = Depends(verify_api_access_external),
@@ -57,7 +57,7 @@ def post_chat_completion_external(
         step="user_query_received",
     )
 
-    results=process_chat_completion_external(
+    results=await process_chat_completion_external(
         trace_id,
         request=request,
         lambot_chat_request=lambot_chat_request,
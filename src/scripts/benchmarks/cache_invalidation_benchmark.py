@@ -0,0 +1,147 @@
+"""
+Benchmark of cache invalidation strategies on a large Redis keyspace.
+
+Fills a Redis database with per-user filler keys plus a small namespace of platform keys (written
+with their tags, as the cache decorators do), then invalidates the namespace with:
+- KEYS + one DELETE per key (the previous invalidate_platform_cache),
+- SCAN + batched UNLINK (RedisClient.delete_matching, used for non-prefix patterns),
+- tag sets (RedisClient.delete_tagged, used for prefix patterns such as "language_model:*").
+
+While an invalidation runs, a second connection issues GETs and records their latency, which shows
+how long Redis is blocked for other clients.
+
+Never point this at a shared Redis: it flushes the selected database.
+
+Usage:
+    python -m src.scripts.benchmarks.cache_invalidation_benchmark --url redis://localhost:6379/15 --keys 1000000
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from typing import Callable, Dict, List
+
+import redis
+
+from src.clients.redis import RedisClient, _TAG_KEY_SCRIPT
+from src.core.cache.decorators import build_platform_key, build_tags, _split_patterns
+
+
+def _client_for(url: str) -> RedisClient:
+    """Create a RedisClient on the given URL, bypassing the environment-based singleton."""
+    client = RedisClient.__new__(RedisClient)
+    client._redis = redis.Redis.from_url(url, decode_responses=True)
+    client._tag_key = client._redis.register_script(_TAG_KEY_SCRIPT)
+    client._using_mock = False
+    client._initialized = True
+    return client
+
+
+def populate_filler(connection: redis.Redis, num_keys: int, batch_size: int = 10_000) -> None:
+    """Write per-user cache keys that the invalidation must not touch."""
+    pipeline = connection.pipeline(transaction=False)
+    for index in range(num_keys):
+        pipeline.set(f"lambots:api:user:{index % 5000}:entry:{index}", '{"value": 1}', ex=3600)
+        if (index + 1) % batch_size == 0:
+            pipeline.execute()
+    pipeline.execute()
+
+
+def populate_namespace(client: RedisClient, namespace: str, num_keys: int) -> List[str]:
+    """Write the platform keys of a namespace with their tags, as the cache decorators do."""
+    mapping = {build_platform_key(f"{namespace}:model-{index}"): {"name": f"model-{index}"} for index in range(num_keys)}
+    client.set_many_with_expiry(mapping, 3600, tags={key: build_tags(key) for key in mapping})
+    return list(mapping)
+
+
+def legacy_invalidate(client: RedisClient, pattern: str) -> int:
+    """The invalidation prior to tag sets: KEYS, then one DELETE round trip per key."""
+    deleted = 0
+    for key in client._redis.keys(pattern):
+        deleted += client._redis.delete(key)
+    return deleted
+
+
+class LatencyProbe:
+    """Measures GET latency on a separate connection while an invalidation runs."""
+
+    def __init__(self, url: str, keys: List[str]):
+        self.connection = redis.Redis.from_url(url, decode_responses=True)
+        self.keys = keys
+        self.latencies: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        rng = random.Random(0)
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            self.connection.get(rng.choice(self.keys))
+            self.latencies.append(time.perf_counter() - start)
+
+    def __enter__(self) -> "LatencyProbe":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run(client: RedisClient, url: str, name: str, invalidate: Callable[[], int], expected: int, probe_keys: List[str]) -> Dict:
+    with LatencyProbe(url, probe_keys) as probe:
+        start = time.perf_counter()
+        deleted = invalidate()
+        seconds = time.perf_counter() - start
+    if deleted != expected:
+        raise AssertionError(f"{name} deleted {deleted} keys, expected {expected}.")
+    latencies = sorted(probe.latencies) or [0.0]
+    return {
+        "name": name,
+        "seconds": seconds,
+        "probe_p50_ms": statistics.median(latencies) * 1000,
+        "probe_max_ms": latencies[-1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="redis://localhost:6379/15", help="Redis database to flush and fill.")
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Number of filler keys in the keyspace.")
+    parser.add_argument("--namespace-keys", type=int, default=50, help="Number of keys in the invalidated namespace.")
+    parser.add_argument("--batch-size", type=int, default=500, help="SCAN count and UNLINK batch size.")
+    args = parser.parse_args()
+
+    client = _client_for(args.url)
+    client._redis.flushdb()
+    start = time.perf_counter()
+    populate_filler(client._redis, args.keys)
+    print(f"Filled {args.keys} keys in {time.perf_counter() - start:.1f} s")
+
+    namespace = "language_model"
+    pattern = build_platform_key(f"{namespace}:*")
+    (tag,), _ = _split_patterns([pattern])
+    probe_keys = [f"lambots:api:user:{index % 5000}:entry:{index}" for index in range(0, args.keys, max(1, args.keys // 1000))]
+
+    strategies = [
+        ("KEYS + DELETE per key", lambda: legacy_invalidate(client, pattern)),
+        ("SCAN + batched UNLINK", lambda: client.delete_matching(pattern, args.batch_size)),
+        ("tag set ZPOPMIN + UNLINK", lambda: client.delete_tagged([tag], args.batch_size)),
+    ]
+    results = []
+    for name, invalidate in strategies:
+        populate_namespace(client, namespace, args.namespace_keys)
+        results.append(run(client, args.url, name, invalidate, args.namespace_keys, probe_keys))
+
+    print(f"Invalidating {args.namespace_keys} keys among {args.keys}:")
+    for result in results:
+        print(
+            f"{result['name']:<24} {result['seconds'] * 1000:10.2f} ms"
+            f"   concurrent GET p50 {result['probe_p50_ms']:6.2f} ms, max {result['probe_max_ms']:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of the per-request setup of the deep research agent.
+
+Compares, per request:
+- building and compiling the deep research and researcher graphs, as every LamBot with deep research
+  enabled did, with the graphs compiled once per process (DeepResearchAgentV2()),
+- creating the AzureChatOpenAI clients of the research delegator, the researchers, the reviewers and
+  the refiner in each node call, with the clients shared per model and options.
+
+No LLM is called, the clients are only created. The model configs are read once up front, so the
+numbers do not include Mongo or Redis.
+
+Usage:
+    python -m src.scripts.benchmarks.deep_research_setup_benchmark --requests 200 --researchers 5
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+# The app imports the tool registry before the agents; do the same to avoid a circular import.
+import src.core.tools  # noqa: F401
+from src.core.agents import utils as agent_utils
+from src.core.agents.common.deep_research_v2 import DeepResearchAgentV2, Researcher
+from src.models.deep_research import DeepResearchConfig
+
+
+def legacy_agent() -> None:
+    """The agent setup prior to the compiled graph cache: both graphs built and compiled per request."""
+    Researcher.__new__(Researcher).build_graph().compile()
+    DeepResearchAgentV2.__new__(DeepResearchAgentV2).build_graph().compile()
+
+
+def node_llms(config: DeepResearchConfig, researchers: int, get_llm: Callable) -> None:
+    """Create the clients of the nodes of one research run, with the options the nodes pass."""
+    get_llm(config.research_delegator.language_model_name, tags=["research-delegator"], streaming=False,
+            max_completion_tokens=config.research_delegator.token_budget)
+    for _ in range(researchers):
+        get_llm(config.researcher.language_model_name, tags=["researcher"], streaming=False,
+                max_completion_tokens=config.researcher.token_budget)
+        get_llm(config.reviewer.language_model_name, tags=["reviewer"], streaming=False,
+                max_completion_tokens=config.reviewer.token_budget)
+    get_llm(config.refiner.language_model_name, tags=["lambot-agent-llm"], streaming=True,
+            max_completion_tokens=config.refiner.token_budget)
+
+
+def measure(setup: Callable[[], None], requests: int) -> List[float]:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        setup()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(name: str, timings: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings)
+    summary = {
+        "mean_ms": statistics.mean(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+    print(f"{name:<28} mean {summary['mean_ms']:8.3f} ms   p50 {summary['p50_ms']:8.3f} ms   p95 {summary['p95_ms']:8.3f} ms")
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Number of simulated requests.")
+    parser.add_argument("--researchers", type=int, default=5, help="Research topics per request.")
+    args = parser.parse_args()
+
+    config = DeepResearchConfig()
+    model_names = {config.research_delegator.language_model_name, config.researcher.language_model_name,
+                   config.reviewer.language_model_name, config.refiner.language_model_name}
+    model_configs = {name: agent_utils.llm_config_service.fetch_language_model(name) for name in model_names}
+
+    with patch.object(agent_utils.llm_config_service, "fetch_language_model", side_effect=model_configs.get):
+        # Warm up the imports and the process-wide caches, as the first request of a worker does
+        DeepResearchAgentV2()
+        node_llms(config, args.researchers, agent_utils.get_azure_llm_from_model_name)
+
+        graph_before = summarize("graphs, per request", measure(legacy_agent, args.requests))
+        graph_after = summarize("graphs, compiled once", measure(DeepResearchAgentV2, args.requests))
+        llm_before = summarize("LLM clients, per call", measure(
+            lambda: node_llms(config, args.researchers, agent_utils.initialize_azure_llm_from_model_name), args.requests))
+        llm_after = summarize("LLM clients, shared", measure(
+            lambda: node_llms(config, args.researchers, agent_utils.get_azure_llm_from_model_name), args.requests))
+
+    before = graph_before["mean_ms"] + llm_before["mean_ms"]
+    after = graph_after["mean_ms"] + llm_after["mean_ms"]
+    print(f"\nSetup per request: {before:.2f} ms -> {after:.2f} ms ({before / after:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Microbenchmark comparing the precompiled PIIRedactor with the previous redact_pii implementation,
+which rebuilt the alternation regexes from the PII lists on every call.
+
+Usage:
+    python -m src.scripts.benchmarks.pii_redaction_benchmark --chunks 25 --chunk-chars 2000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from src.core.retrievers.pii_data import customer_names_case_insensitive, customer_names_case_sensitive
+from src.core.retrievers.pii_redactor import PIIRedactor
+from src.core.retrievers.utils import construct_pattern
+
+FILLER_WORDS = (
+    "the etch chamber showed particle drift after preventive maintenance on the wafer handler "
+    "and the process engineer escalated the issue to the field service team for root cause analysis"
+).split()
+
+
+def legacy_redact_pii(text: str, redaction_string: str = "<CUSTOMER>") -> str:
+    """The redact_pii implementation prior to PIIRedactor, compiling both patterns per call."""
+    pattern_case_insensitive = construct_pattern(customer_names_case_insensitive, case_insensitive=True)
+    pattern_case_sensitive = construct_pattern(customer_names_case_sensitive)
+    redacted_text = pattern_case_insensitive.sub(redaction_string, text)
+    return pattern_case_sensitive.sub(redaction_string, redacted_text)
+
+
+def make_chunks(num_chunks: int, chunk_chars: int, pii_ratio: float, seed: int = 42) -> List[str]:
+    """Generate search-result-like chunks with a sprinkling of customer names."""
+    rng = random.Random(seed)
+    names = customer_names_case_insensitive + customer_names_case_sensitive
+    chunks = []
+    for _ in range(num_chunks):
+        words = []
+        length = 0
+        while length < chunk_chars:
+            word = rng.choice(names) if rng.random() < pii_ratio else rng.choice(FILLER_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        chunks.append(" ".join(words))
+    return chunks
+
+
+def _time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=25, help="Number of chunks per retrieval.")
+    parser.add_argument("--chunk-chars", type=int, default=2000, help="Approximate size of each chunk.")
+    parser.add_argument("--pii-ratio", type=float, default=0.02, help="Fraction of words that are customer names.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed repetitions (best is reported).")
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks, args.chunk_chars, args.pii_ratio)
+
+    start = time.perf_counter()
+    redactor = PIIRedactor()
+    build_seconds = time.perf_counter() - start
+
+    expected = [legacy_redact_pii(chunk) for chunk in chunks]
+    if redactor.redact_batch(chunks) != expected or [redactor.redact(chunk) for chunk in chunks] != expected:
+        raise AssertionError("PIIRedactor output differs from the legacy implementation.")
+
+    legacy_seconds = _time(lambda: [legacy_redact_pii(chunk) for chunk in chunks], args.repeat)
+    per_chunk_seconds = _time(lambda: [redactor.redact(chunk) for chunk in chunks], args.repeat)
+    batch_seconds = _time(lambda: redactor.redact_batch(chunks), args.repeat)
+
+    print(f"{args.chunks} chunks x ~{args.chunk_chars} chars, PII ratio {args.pii_ratio}")
+    print(f"PIIRedactor build (one-off):   {build_seconds * 1000:9.2f} ms")
+    print(f"legacy redact_pii per chunk:   {legacy_seconds * 1000:9.2f} ms")
+    print(f"PIIRedactor.redact per chunk:  {per_chunk_seconds * 1000:9.2f} ms ({legacy_seconds / per_chunk_seconds:.1f}x)")
+    print(f"PIIRedactor.redact_batch:      {batch_seconds * 1000:9.2f} ms ({legacy_seconds / batch_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
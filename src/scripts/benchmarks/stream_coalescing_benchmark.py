@@ -0,0 +1,110 @@
+"""
+Benchmark of the NDJSON lines streamed per chat answer.
+
+Replays a synthetic `astream_events` trace of an agent answer (a tool run with citations and
+intermediate steps, then token chunks interleaved with the chain, prompt and parser events the agent
+emits around them) through:
+- the previous emitter, one serialized LamBotChatResponse per event,
+- the StreamCoalescer used by the ConversationEngine.
+
+Prints the number of lines, the bytes sent and the serialization time per answer.
+
+Usage:
+    python -m src.scripts.benchmarks.stream_coalescing_benchmark --tokens 600 --token-interval-ms 5
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+
+from src.core.chat.stream_coalescer import StreamCoalescer
+from src.models import LamBotChatResponse
+from src.models.intermediate_step import IntermediateStep
+
+# (offset in seconds, kind, payload) with kind in "noop", "chunk", "step" and "done"
+Event = Tuple[float, str, str]
+
+
+def build_trace(num_tokens: int, token_interval: float, noop_per_token: int) -> List[Event]:
+    """Build the events of an answer: a tool run, then the tokens of the final answer."""
+    events: List[Event] = [(0.0, "noop", "")] * 20
+    events.append((0.0, "step", "Searching 3 data sources for relevant documents..."))
+    events.append((0.4, "step", "Found 25 relevant documents..."))
+    offset = 0.5
+    for index in range(num_tokens):
+        offset += token_interval
+        events.extend([(offset, "noop", "")] * noop_per_token)
+        events.append((offset, "chunk", f" token{index % 50}"))
+    events.append((offset, "done", ""))
+    return events
+
+
+def legacy_emit(events: List[Event]) -> List[str]:
+    """One line per event, as before the coalescing."""
+    lines = []
+    for _, kind, payload in events:
+        if kind == "step":
+            response = LamBotChatResponse(chunk="", citations=[], intermediate_step=IntermediateStep(message=payload))
+        else:
+            response = LamBotChatResponse(chunk=payload, citations=[], done=kind == "done")
+        lines.append(response.model_dump_json() + "\n")
+    return lines
+
+
+def coalesced_emit(events: List[Event], window_ms: float, max_bytes: int) -> List[str]:
+    """The lines sent by the StreamCoalescer, replaying the offsets of the events."""
+    clock = {"now": 0.0}
+    coalescer = StreamCoalescer(window_ms=window_ms, max_bytes=max_bytes, keepalive_seconds=5, clock=lambda: clock["now"])
+    lines = []
+    for offset, kind, payload in events:
+        clock["now"] = offset
+        if kind == "chunk":
+            lines += coalescer.chunk(payload)
+        elif kind == "step":
+            lines += coalescer.message(LamBotChatResponse(chunk="", citations=[], intermediate_step=IntermediateStep(message=payload)))
+        elif kind == "done":
+            lines += coalescer.message(LamBotChatResponse(chunk="", citations=[], done=True))
+        else:
+            lines += coalescer.idle()
+    return lines
+
+
+def measure(name: str, emit: Callable[[], List[str]], repeat: int) -> Dict:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        lines = emit()
+    seconds = (time.perf_counter() - start) / repeat
+    return {
+        "name": name,
+        "lines": len(lines),
+        "bytes": sum(len(line.encode("utf-8")) for line in lines),
+        "ms": seconds * 1000,
+        "text": "".join(LamBotChatResponse.model_validate_json(line).chunk for line in lines),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=600, help="Number of tokens in the answer.")
+    parser.add_argument("--token-interval-ms", type=float, default=5, help="Time between two tokens.")
+    parser.add_argument("--noop-per-token", type=int, default=2, help="Events without content per token.")
+    parser.add_argument("--window-ms", type=float, default=30, help="Coalescing window.")
+    parser.add_argument("--max-bytes", type=int, default=1024, help="Coalescing byte budget.")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of replays to average the time over.")
+    args = parser.parse_args()
+
+    events = build_trace(args.tokens, args.token_interval_ms / 1000, args.noop_per_token)
+    results = [
+        measure("one line per event", lambda: legacy_emit(events), args.repeat),
+        measure(f"coalesced ({args.window_ms:g} ms)", lambda: coalesced_emit(events, args.window_ms, args.max_bytes), args.repeat),
+    ]
+    if results[0]["text"] != results[1]["text"]:
+        raise AssertionError("The coalesced stream does not carry the same text.")
+
+    print(f"{len(events)} events, {args.tokens} tokens:")
+    for result in results:
+        print(f"{result['name']:<22} {result['lines']:6d} lines {result['bytes']:9d} bytes {result['ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
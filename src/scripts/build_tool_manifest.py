@@ -0,0 +1,233 @@
+"""
+Build the manifest of the lazy tool registry (src/core/tools/tool_manifest.json).
+
+The manifest maps every tool name to the community package that registers it, so
+`get_tool_by_name` imports a single package on first use instead of every package at startup.
+
+Tool packages are not imported: their source is parsed to follow each `register_tool(...)` call
+to the name of the registered tool, which is taken from
+- a `name=` keyword of the tool constructor,
+- the `tool_name` of the RetrieverToolSpec passed to `from_tool_spec`,
+- or the `name` default or constructor argument of the tool class,
+including `tool_name`/`name` attributes assigned after the fact (e.g. on a copied tool spec).
+
+This keeps the build free of the tools' dependencies and of network calls (Langfuse prompts). Packages
+whose tool names cannot be determined are listed as unresolved; the registry imports them whenever
+a tool is missing from the manifest.
+
+Run at build time (see Dockerfile), and with --check in CI to fail on a stale manifest:
+    python -m src.scripts.build_tool_manifest [--check]
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(SRC_ROOT)
+COMMUNITY_PACKAGE = "src.core.tools.community"
+MANIFEST_PATH = os.path.join(SRC_ROOT, "core", "tools", "tool_manifest.json")
+
+
+def _module_path(module_name: str) -> Optional[str]:
+    """Return the source file of a module of this repository, or None if it is not part of it."""
+    base = os.path.join(REPO_ROOT, *module_name.split("."))
+    for path in (os.path.join(base, "__init__.py"), f"{base}.py"):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _resolve_relative(module_name: str, is_package: bool, node: ast.ImportFrom) -> str:
+    if not node.level:
+        return node.module
+    parts = module_name.split(".")
+    if not is_package:
+        parts = parts[:-1]
+    parts = parts[:len(parts) - node.level + 1]
+    return ".".join(parts + ([node.module] if node.module else []))
+
+
+class _Module:
+    _cache: Dict[str, "_Module"] = {}
+
+    def __init__(self, module_name: str, path: str):
+        self.name = module_name
+        self.is_package = path.endswith("__init__.py")
+        with open(path, encoding="utf-8") as f:
+            self.tree = ast.parse(f.read(), filename=path)
+
+    @classmethod
+    def load(cls, module_name: str) -> Optional["_Module"]:
+        if module_name not in cls._cache:
+            path = _module_path(module_name)
+            cls._cache[module_name] = cls(module_name, path) if path else None
+        return cls._cache[module_name]
+
+    def binding(self, name: str) -> Optional[Tuple["_Module", ast.AST]]:
+        """Find the last top-level binding of a name: an assignment, a class or an import."""
+        found = None
+        for node in self.tree.body:
+            if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == name for t in node.targets):
+                found = (self, node.value)
+            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.target.id == name and node.value:
+                found = (self, node.value)
+            elif isinstance(node, ast.ClassDef) and node.name == name:
+                found = (self, node)
+            elif isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    if (alias.asname or alias.name) == name:
+                        source = _Module.load(_resolve_relative(self.name, self.is_package, node))
+                        if source is not None:
+                            found = source.binding(alias.name) or found
+        return found
+
+    def name_override(self, name: str) -> Optional[str]:
+        """Find a later `<name>.tool_name = "..."` or `<name>.name = "..."` assignment, e.g. on a copied tool spec."""
+        override = None
+        for node in self.tree.body:
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                for target in node.targets:
+                    if (
+                        isinstance(target, ast.Attribute)
+                        and target.attr in ("tool_name", "name")
+                        and isinstance(target.value, ast.Name)
+                        and target.value.id == name
+                    ):
+                        override = node.value.value
+        return override
+
+
+def _string_keyword(module: _Module, call: ast.Call, keyword: str) -> Optional[str]:
+    """Return the string value of a keyword argument, given as a literal or as a module-level constant."""
+    for kw in call.keywords:
+        if kw.arg != keyword:
+            continue
+        value = kw.value
+        if isinstance(value, ast.Name):
+            bound = module.binding(value.id)
+            value = bound[1] if bound else None
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            return value.value
+    return None
+
+
+def _class_default_name(module: _Module, class_def: ast.ClassDef) -> Optional[str]:
+    for node in class_def.body:
+        target = node.target if isinstance(node, ast.AnnAssign) else (node.targets[0] if isinstance(node, ast.Assign) else None)
+        if isinstance(target, ast.Name) and target.id == "name" and isinstance(node.value, ast.Constant):
+            return node.value.value
+        # super().__init__(name="...") in the constructor
+        if isinstance(node, ast.FunctionDef) and node.name == "__init__":
+            for call in ast.walk(node):
+                if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr == "__init__":
+                    name = _string_keyword(module, call, "name")
+                    if name:
+                        return name
+    # Fall back to the base classes defined in this repository
+    for base in class_def.bases:
+        if isinstance(base, ast.Name):
+            bound = module.binding(base.id)
+            if bound and isinstance(bound[1], ast.ClassDef):
+                name = _class_default_name(*bound)
+                if name:
+                    return name
+    return None
+
+
+def _tool_name(module: _Module, expr: ast.AST, depth: int = 0) -> Optional[str]:
+    """Follow an expression to the name of the tool it evaluates to."""
+    if depth > 10:
+        return None
+    if isinstance(expr, ast.Name):
+        override = module.name_override(expr.id)
+        if override:
+            return override
+        bound = module.binding(expr.id)
+        return _tool_name(*bound, depth + 1) if bound else None
+    if isinstance(expr, ast.ClassDef):
+        return _class_default_name(module, expr)
+    if not isinstance(expr, ast.Call):
+        return None
+
+    name = _string_keyword(module, expr, "name") or _string_keyword(module, expr, "tool_name")
+    if name:
+        return name
+    # Tool.from_tool_spec(tool_spec, ...) or Tool.from_tool_spec(tool_spec=...)
+    spec_args = list(expr.args[:1]) + [kw.value for kw in expr.keywords if kw.arg in ("tool_spec", "spec")]
+    for spec in spec_args:
+        name = _tool_name(module, spec, depth + 1)
+        if name:
+            return name
+    # Tool(...) with the class default name
+    if isinstance(expr.func, ast.Name):
+        bound = module.binding(expr.func.id)
+        if bound and isinstance(bound[1], ast.ClassDef):
+            return _class_default_name(*bound)
+    return None
+
+
+def _registrations(module: _Module) -> List[ast.AST]:
+    return [
+        node.value.args[0]
+        for node in module.tree.body
+        if isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Call)
+        and isinstance(node.value.func, ast.Name)
+        and node.value.func.id == "register_tool"
+        and node.value.args
+    ]
+
+
+def _tool_packages(package_name: str) -> List[str]:
+    """List the packages below the community package, depth first, like the eager import did."""
+    packages = []
+    directory = os.path.join(REPO_ROOT, *package_name.split("."))
+    for entry in sorted(os.listdir(directory)):
+        if os.path.isfile(os.path.join(directory, entry, "__init__.py")):
+            packages.append(f"{package_name}.{entry}")
+            packages.extend(_tool_packages(f"{package_name}.{entry}"))
+    return packages
+
+
+def build_manifest() -> Dict:
+    tools: Dict[str, str] = {}
+    unresolved: List[str] = []
+    for package_name in _tool_packages(COMMUNITY_PACKAGE):
+        module = _Module.load(package_name)
+        for registration in _registrations(module):
+            name = _tool_name(module, registration)
+            if name is None:
+                unresolved.append(package_name)
+            elif name in tools:
+                raise ValueError(f"Tool {name} is registered by both {tools[name]} and {package_name}")
+            else:
+                tools[name] = package_name
+    return {"tools": dict(sorted(tools.items())), "unresolved": sorted(set(unresolved))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Fail if the committed manifest is out of date.")
+    args = parser.parse_args()
+
+    manifest = build_manifest()
+    content = json.dumps(manifest, indent=2) + "\n"
+    if args.check:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            if f.read() != content:
+                sys.exit(f"{MANIFEST_PATH} is out of date, run python -m src.scripts.build_tool_manifest")
+        return
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        f.write(content)
+    print(f"Wrote {len(manifest['tools'])} tools to {MANIFEST_PATH}")
+    for package_name in manifest["unresolved"]:
+        print(f"Could not resolve the tool names of {package_name}; it is imported when a tool is missing from the manifest")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,7 +65,7 @@ async def chat_completion_non_streaming(
         if isinstance(e, ValueError):
             raise HTTPException(422, f"422 error: {e}")
        
-def fetch_history_context(
+async def fetch_history_context(
     lambot_id: str,
     thread_id: str,
     username: str,
@@ -88,7 +88,7 @@ def fetch_history_context(
         "username": username,
     }
     try:
-        messages = LamBotMongoDB.get_instance().conversations_external_db.fetch_n_messages(query)
+        messages = await LamBotMongoDB.get_instance().conversations_external_db.afetch_n_messages(query)
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
     return messages
@@ -3,7 +3,7 @@ import os
 from src.clients import LifespanClients
 from src.core.database import LamBotMongoDB
 from fastapi import HTTPException
-from src.core.utils.auth_helpers import get_user_info
+from src.core.cache.user_profile import UserProfileService
 from src.services.chat_completion.external import (
     chat_completion_non_streaming,
     fetch_history_context,
@@ -14,7 +14,7 @@ from src.core.common.constants import AuthScheme
 import asyncio
 
 
-def validate_and_update_conversation(
+async def validate_and_update_conversation(
     lambot_id: str,
     thread_id: Optional[str],
     new_messages: List[Dict],
@@ -23,20 +23,20 @@ def validate_and_update_conversation(
 ) -> str:
     """
     Orchestrates the creation or update of a LamBot conversation document in MongoDB.
-    Uses ThreadService for actual operations.
+    Uses the asynchronous ThreadService operations.
     """
 
-    if not LamBotMongoDB.get_instance().conversations_external_db.user_exists(username):
-        return LamBotMongoDB.get_instance().conversations_external_db.create_new_user_conversation(
+    if not await LamBotMongoDB.get_instance().conversations_external_db.auser_exists(username):
+        return await LamBotMongoDB.get_instance().conversations_external_db.acreate_new_user_conversation(
             lambot_id, thread_id, new_messages, title, username
         )
 
     if not thread_id:
-        return LamBotMongoDB.get_instance().conversations_external_db.start_new_thread_for_user(
+        return await LamBotMongoDB.get_instance().conversations_external_db.astart_new_thread_for_user(
             lambot_id, username, new_messages, title
         )
 
-    return LamBotMongoDB.get_instance().conversations_external_db.update_existing_thread(
+    return await LamBotMongoDB.get_instance().conversations_external_db.aupdate_existing_thread(
         lambot_id, thread_id, username, new_messages
     )
 
@@ -83,7 +83,7 @@ def get_message_title(message_content: str) -> str:
         raise ValueError(f"Error generating title: {str(e)}")
 
 
-def process_chat_completion_external(
+async def process_chat_completion_external(
     trace_id: str,
     request,
     lambot_chat_request,
@@ -120,32 +120,33 @@ def process_chat_completion_external(
     thread_id: str = lambot_chat_request.thread_id
     history_context_messages: List[Dict[str, str]] = []
     # Step 1: Retrieve User name
-    username = get_user_info(security_data.bearer_token.credentials.split(AuthScheme.BEARER)[-1]).get("email")
+    # Graph and title generation calls are blocking, keep them off the event loop
+    user_info = await UserProfileService.get_instance().aget_user_info(security_data.bearer_token.credentials.split(AuthScheme.BEARER)[-1])
+    username = user_info.get("email")
     # Step 2: Generate title from latest user message
     try:
         user_messages = [msg for msg in lambot_chat_request.messages if msg.get('role') == 'user']
         if not user_messages:
             raise ValueError("No user message found in the request.")
         message_content: str = user_messages[-1]['content']
-        title: str = get_message_title(message_content)
+        title: str = await asyncio.to_thread(get_message_title, message_content)
     except (ValueError, IndexError, KeyError) as e:
         return {"error": f"Message title extraction failed: {str(e)}"}
     # Step 3: Fetch context history
     if thread_id and str(thread_id).strip():
-        history_context_messages = fetch_history_context(lambotid, thread_id, username)
+        history_context_messages = await fetch_history_context(lambotid, thread_id, username)
     # Step 4: Generate chat completion
-    if asyncio.iscoroutinefunction(chat_completion_non_streaming):
-        completion = asyncio.run(chat_completion_non_streaming(
-            lambot_chat_request,
-            lambot_config,
-            trace_id,
-            history_context_messages
-        ))
+    completion = await chat_completion_non_streaming(
+        lambot_chat_request,
+        lambot_config,
+        trace_id,
+        history_context_messages
+    )
     # Step 5: Process into message schema
     new_messages = handle_chat_completion(message_content, completion)
     # Step 6: Save to MongoDB
     try:
-        operation_summary = validate_and_update_conversation(
+        operation_summary = await validate_and_update_conversation(
             lambotid,
             thread_id,
             new_messages,
@@ -0,0 +1,87 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+import logging
+from unittest.mock import patch
+from langchain_core.agents import AgentFinish
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.prompt_values import ChatPromptValue
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+
+
+@pytest.fixture
+def langfuse_module(mocker):
+    with patch.dict('sys.modules', {
+        'src.clients.lifespan': mocker.MagicMock(),
+        'src.clients.metrics_api': mocker.MagicMock(),
+        'src.clients.mongo': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+        'src.clients.synapse': mocker.MagicMock(),
+    }):
+        from src.clients.langfuse import manager, utils
+        yield manager, utils
+
+
+@pytest.fixture
+def langfuse_manager(langfuse_module, mocker):
+    manager, _ = langfuse_module
+    langfuse_manager = manager.LangfuseManager("pk-test", "sk-test", "http://langfuse.test", logging.getLogger(__name__))
+    # Keep the traced events of the tests in memory
+    langfuse_manager.client.task_manager.add_task = mocker.MagicMock()
+    yield langfuse_manager
+    langfuse_manager.client.task_manager.shutdown()
+
+
+class TestLangfuseManager:
+
+    def test_request_handlers_share_the_client_but_not_the_trace(self, langfuse_manager):
+        alice = langfuse_manager.create_callback_handler(user_email="alice@example.com", tags=["Bot A"])
+        bob = langfuse_manager.create_callback_handler(user_email="bob@example.com", tags=["Bot B"], metadata={"top_k": 3})
+
+        GenericFakeChatModel(messages=iter([AIMessage(content="hi")])).invoke("hello", config={"callbacks": [alice]})
+        GenericFakeChatModel(messages=iter([AIMessage(content="hi")])).invoke("hello", config={"callbacks": [bob]})
+
+        assert alice.langfuse is bob.langfuse is langfuse_manager.client
+        assert alice.trace.id != bob.trace.id
+        assert (alice.user_id, alice.tags, bob.user_id, bob.tags) == ("alice@example.com", ["Bot A"], "bob@example.com", ["Bot B"])
+        events = [call.args[0] for call in langfuse_manager.client.task_manager.add_task.call_args_list]
+        # The trace is created with the user and the tags, then updated with its output
+        traces = [event["body"] for event in events if event["type"] == "trace-create" and event["body"].user_id]
+        assert {(trace.user_id, tuple(trace.tags)) for trace in traces} == {("alice@example.com", ("Bot A",)), ("bob@example.com", ("Bot B",))}
+        # The shared handler is not modified
+        assert langfuse_manager.callback_handler.user_id is None and langfuse_manager.callback_handler.trace is None
+
+    def test_requests_are_sampled(self, langfuse_module, langfuse_manager):
+        manager, _ = langfuse_module
+        assert not isinstance(langfuse_manager.create_callback_handler(sample_rate=0), manager.LangFuseCallbackHandler)
+        assert isinstance(langfuse_manager.create_callback_handler(sample_rate=1), manager.LangFuseCallbackHandler)
+
+
+class TestTraceSanitizer:
+
+    def test_masking_does_not_modify_the_traced_data(self, langfuse_module):
+        _, utils = langfuse_module
+        sanitizer = utils.TraceSanitizer()
+        system = SystemMessage(content="You are a helpful assistant.")
+        answer = AIMessage(content="The revenue is 12M.")
+        inputs = {"input": "What is the revenue?", "messages": [system, answer]}
+
+        masked = sanitizer.mask(inputs)
+        assert masked["input"] == "Masked" and masked["messages"][1].content == "Masked"
+        assert masked["messages"][0] is system
+        assert inputs == {"input": "What is the revenue?", "messages": [system, answer]} and answer.content == "The revenue is 12M."
+
+        prompt = ChatPromptValue(messages=[system, HumanMessage(content="What is the revenue?")])
+        assert [message.content for message in sanitizer.mask(prompt).messages] == ["You are a helpful assistant.", "Masked"]
+        assert prompt.messages[1].content == "What is the revenue?"
+
+        finish = AgentFinish(return_values={"output": "12M", "messages": [answer]}, log="Final answer: 12M")
+        masked_finish = sanitizer.mask(finish)
+        assert masked_finish.log == "Masked" and masked_finish.return_values["output"] == "Masked"
+        assert finish.return_values == {"output": "12M", "messages": [answer]} and finish.log == "Final answer: 12M"
+
+        history = [{"role": "system", "content": "rules"}, {"role": "user", "content": "secret"}]
+        assert sanitizer.mask(history) == [{"role": "system", "content": "rules"}, {"role": "user", "content": "Masked"}]
+        assert history[1]["content"] == "secret"
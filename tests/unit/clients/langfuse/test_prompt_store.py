@@ -0,0 +1,140 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import time
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def prompt_store_module(mocker):
+    with patch.dict('sys.modules', {
+        'src.clients.lifespan': mocker.MagicMock(),
+        'src.clients.metrics_api': mocker.MagicMock(),
+        'src.clients.mongo': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+        'src.clients.synapse': mocker.MagicMock(),
+    }):
+        from src.clients.langfuse import prompt_store
+        yield prompt_store
+
+
+def make_client(mocker, prompts: dict):
+    client = mocker.MagicMock()
+
+    def get_prompt(name, label, cache_ttl_seconds):
+        if name not in prompts:
+            raise ConnectionError("Langfuse is unreachable")
+        return mocker.MagicMock(prompt=prompts[name])
+
+    client.get_prompt.side_effect = get_prompt
+    return client
+
+
+def make_store(prompt_store_module, mocker, client, **kwargs):
+    store = prompt_store_module.PromptStore(client, mocker.MagicMock(), **kwargs)
+    # The tests fetch in the foreground with `fetch_pending` and `refresh`
+    store.start = mocker.MagicMock()
+    return store
+
+
+class TestPromptStore:
+
+    def test_fetches_once_then_serves_from_memory(self, prompt_store_module, mocker):
+        prompts = {"tool_description": "v1"}
+        client = make_client(mocker, prompts)
+        store = make_store(prompt_store_module, mocker, client, refresh_interval=0)
+
+        # The first read does not wait on Langfuse
+        assert store.get("tool_description", "fallback", "dev") == "fallback"
+        client.get_prompt.assert_not_called()
+        store.start.assert_called_once()
+
+        store.fetch_pending()
+        assert store.get("tool_description", "fallback", "dev") == "v1"
+        assert store.get("tool_description", "fallback", "dev") == "v1"
+        assert client.get_prompt.call_count == 1
+
+        prompts["tool_description"] = "v2"
+        store.refresh()
+        assert store.get("tool_description", "fallback", "dev") == "v2"
+
+    def test_fallback_is_replaced_by_next_successful_refresh(self, prompt_store_module, mocker):
+        prompts = {}
+        store = make_store(prompt_store_module, mocker, make_client(mocker, prompts), refresh_interval=0)
+
+        assert store.get("instruction", "fallback", "dev") == "fallback"
+        store.fetch_pending()
+        assert store.get("instruction", "fallback", "dev") == "fallback"
+        assert store.get_stats()["fallbacks"] == 1
+
+        store.refresh()
+        # A prompt never fetched is not a refresh failure, nor stale
+        assert store.get_stats()["refresh_failures"] == 0
+        assert store.get_stats()["max_staleness_seconds"] == 0.0
+
+        prompts["instruction"] = "from langfuse"
+        store.refresh()
+        assert store.get("instruction", "fallback", "dev") == "from langfuse"
+        assert store.get_stats()["fallbacks"] == 0
+
+    def test_prompts_never_fetched_are_retried_with_backoff(self, prompt_store_module, mocker):
+        client = make_client(mocker, {"instruction": "from langfuse"})
+        store = make_store(prompt_store_module, mocker, client, refresh_interval=60)
+        clock = mocker.patch.object(prompt_store_module.time, "monotonic", return_value=1000.0)
+
+        store.get("instruction", "fallback", "dev")
+        store.get("missing", "fallback", "dev")
+        store.fetch_pending()
+        assert client.get_prompt.call_count == 2
+
+        # Retried after 60s, then 120s, while fetched prompts are refreshed every time
+        fetches = []
+        for now in (1030.0, 1060.0, 1120.0, 1180.0):
+            clock.return_value = now
+            client.get_prompt.reset_mock()
+            store.refresh()
+            fetches.append(sorted(call.kwargs["name"] for call in client.get_prompt.call_args_list))
+        assert fetches == [["instruction"], ["instruction", "missing"], ["instruction"], ["instruction", "missing"]]
+        assert store.get_stats()["refresh_failures"] == 0
+
+    def test_snapshot_warms_new_store(self, prompt_store_module, mocker, tmp_path):
+        snapshot_path = str(tmp_path / "prompts.json")
+        client = make_client(mocker, {"instruction": "from langfuse"})
+        store = make_store(prompt_store_module, mocker, client, refresh_interval=0, snapshot_path=snapshot_path)
+        store.get("instruction", "fallback", "dev")
+        store.get("missing", "fallback", "dev")
+        store.fetch_pending()
+        store.stop()
+
+        unreachable = make_client(mocker, {})
+        warm_store = make_store(prompt_store_module, mocker, unreachable, refresh_interval=0, snapshot_path=snapshot_path)
+        assert warm_store.get("instruction", "fallback", "dev") == "from langfuse"
+        unreachable.get_prompt.assert_not_called()
+        # Fallback prompts are not persisted
+        assert warm_store.get_stats()["prompts"] == 1
+
+    def test_preloaded_prompts_are_served_on_first_read(self, prompt_store_module, mocker):
+        client = make_client(mocker, {"instruction": "from langfuse"})
+        store = make_store(prompt_store_module, mocker, client, refresh_interval=0)
+
+        store.preload([("instruction", "dev"), ("missing", "dev")])
+        store.fetch_pending()
+        assert client.get_prompt.call_count == 2
+        assert store.get("instruction", "fallback", "dev") == "from langfuse"
+        # A preloaded prompt that cannot be fetched is left to its first read
+        assert store.get_stats() == {"prompts": 1, "fallbacks": 0, "refresh_failures": 0, "max_staleness_seconds": mocker.ANY}
+        assert store.get("missing", "fallback", "dev") == "fallback"
+
+    def test_background_thread_fetches_first_reads(self, prompt_store_module, mocker):
+        client = make_client(mocker, {"instruction": "from langfuse"})
+        store = prompt_store_module.PromptStore(client, mocker.MagicMock(), refresh_interval=0)
+
+        assert store.get("instruction", "fallback", "dev") == "fallback"
+        for _ in range(100):
+            if store.get("instruction", "fallback", "dev") != "fallback":
+                break
+            time.sleep(0.01)
+        store.stop()
+        assert store.get("instruction", "fallback", "dev") == "from langfuse"
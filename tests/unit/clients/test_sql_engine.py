@@ -0,0 +1,48 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "src"))
+import pytest
+from unittest.mock import patch
+from sqlalchemy import text
+
+
+@pytest.fixture
+def sql_engine_module(mocker, tmp_path):
+    with patch.dict('sys.modules', {
+        'src.clients.lifespan': mocker.MagicMock(),
+        'src.clients.metrics_api': mocker.MagicMock(),
+        'src.clients.mongo': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+        'src.clients.synapse': mocker.MagicMock(),
+    }):
+        from src.clients import sql_engine
+        mocker.patch.dict(sql_engine.PROFILES, {"local": lambda: f"sqlite:///{tmp_path / 'local.db'}"})
+        yield sql_engine
+
+
+class TestSQLEngineRegistry:
+
+    def test_engines_are_pooled_per_profile_and_warmed_up(self, sql_engine_module, monkeypatch):
+        monkeypatch.setenv("SQL_ENGINE_WARMUP", "local, unknown")
+        registry = sql_engine_module.SQLEngineRegistry()
+
+        registry.warm_up()
+        engine = registry.get_engine("local")
+        assert registry.get_engine("local") is engine
+        assert engine.pool.size() == registry.pool_size
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 2")).scalar() == 2
+
+        stats = registry.get_stats()["local"]
+        assert stats["acquires"] == 2
+        assert stats["max_ms"] >= stats["p95_ms"] >= 0
+
+        registry.shutdown()
+        assert registry.get_stats() == {}
+
+    def test_missing_credentials_raise(self, sql_engine_module, monkeypatch):
+        monkeypatch.delenv("OPENAI_SYNAPSE_READER_SECRET", raising=False)
+        with pytest.raises(ValueError):
+            sql_engine_module.SQLEngineRegistry().get_engine("synapse_reader")
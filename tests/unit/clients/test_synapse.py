@@ -0,0 +1,125 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "src"))
+import types
+import pytest
+import asyncio
+import threading
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+class FakeConnection:
+    def __init__(self, pyodbc):
+        self.pyodbc = pyodbc
+        self.closed = False
+        self.timeout = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, *params):
+        pyodbc = self.connection.pyodbc
+        if pyodbc.failures:
+            raise pyodbc.failures.pop(0)
+        pyodbc.queries.append((id(self.connection), query, params))
+        self.rows = [params] if params else [(1,)]
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def synapse_client(mocker, monkeypatch):
+    pyodbc = types.ModuleType("pyodbc")
+    pyodbc.Error = type("Error", (Exception,), {})
+    pyodbc.OperationalError = type("OperationalError", (pyodbc.Error,), {})
+    pyodbc.InterfaceError = type("InterfaceError", (pyodbc.Error,), {})
+    pyodbc.ProgrammingError = type("ProgrammingError", (pyodbc.Error,), {})
+    pyodbc.connections, pyodbc.queries, pyodbc.failures = [], [], []
+
+    def connect(params):
+        pyodbc.connections.append(FakeConnection(pyodbc))
+        return pyodbc.connections[-1]
+
+    pyodbc.connect = connect
+    for name in ["SERVER", "DATABASE", "USERNAME", "SECRET"]:
+        monkeypatch.setenv(f"OPENAI_SYNAPSE_{name}", "value")
+    monkeypatch.setenv("SYNAPSE_POOL_SIZE", "2")
+    monkeypatch.setenv("SYNAPSE_POOL_TIMEOUT_SECONDS", "0.05")
+
+    with patch.dict('sys.modules', {
+        'pyodbc': pyodbc,
+        'src.clients.lifespan': mocker.MagicMock(),
+        'src.clients.metrics_api': mocker.MagicMock(),
+        'src.clients.mongo': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+    }):
+        sys.modules.pop('src.clients.synapse', None)
+        from src.clients.synapse import SynapseClient
+        client = SynapseClient()
+        yield client, pyodbc
+        client.shutdown()
+        sys.modules.pop('src.clients.synapse', None)
+
+
+class TestSynapseClient:
+
+    def test_parameterized_queries_and_reconnect(self, synapse_client):
+        client, pyodbc = synapse_client
+
+        assert client.execute_query("SELECT id FROM t WHERE login = ?", ("o'brien",)) == [("o'brien",)]
+        assert pyodbc.queries[-1][1:] == ("SELECT id FROM t WHERE login = ?", ("o'brien",))
+        assert pyodbc.connections[0].timeout == client.query_timeout
+
+        # A connection error discards the connection and retries on a new one
+        pyodbc.failures.append(pyodbc.OperationalError("link failure"))
+        assert client.execute_query("SELECT 1") == [(1,)]
+        assert pyodbc.connections[0].closed and len(pyodbc.connections) == 2
+
+        # Other errors are raised, the connection stays in the pool
+        pyodbc.failures.append(pyodbc.ProgrammingError("syntax"))
+        with pytest.raises(pyodbc.ProgrammingError):
+            client.execute_query("SELEC 1")
+        assert not pyodbc.connections[1].closed
+
+    @pytest.mark.asyncio
+    async def test_connections_are_not_shared_and_bounded(self, synapse_client):
+        client, pyodbc = synapse_client
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with client.connection():
+                held.set()
+                release.wait(1)
+
+        holders = [threading.Thread(target=hold) for _ in range(2)]
+        for holder in holders:
+            holder.start()
+        held.wait(1)
+        while len(pyodbc.connections) < 2:
+            await asyncio.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            client.execute_query("SELECT 1")
+
+        release.set()
+        for holder in holders:
+            holder.join()
+        results = await asyncio.gather(*[client.aexecute_query("SELECT ?", (i,)) for i in range(6)])
+        assert results == [[(i,)] for i in range(6)]
+        assert len(pyodbc.connections) == 2
@@ -0,0 +1,80 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), "src"))
+import pytest
+import threading
+from unittest.mock import patch
+
+
+@pytest.fixture
+def telemetry_shipper(mocker, monkeypatch):
+    monkeypatch.setenv("BASE_LOG_URL", "http://metrics/insights/v1/")
+    monkeypatch.setenv("TELEMETRY_FLUSH_INTERVAL_SECONDS", "0.05")
+
+    with patch.dict('sys.modules', {
+        'src.clients.lifespan': mocker.MagicMock(),
+        'src.clients.metrics_api': mocker.MagicMock(),
+        'src.clients.mongo': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+        'src.clients.synapse': mocker.MagicMock(),
+    }):
+        from src.clients.telemetry import TelemetryShipper
+        shippers = []
+
+        def create():
+            shipper = TelemetryShipper()
+            shipper._session = mocker.MagicMock()
+            shippers.append(shipper)
+            return shipper
+
+        yield create
+        for shipper in shippers:
+            shipper.shutdown()
+
+
+class TestTelemetryShipper:
+
+    def test_logs_are_sent_in_batches_on_one_session(self, telemetry_shipper, monkeypatch):
+        monkeypatch.setenv("TELEMETRY_BATCH_SIZE", "3")
+        shipper = telemetry_shipper()
+
+        for i in range(5):
+            assert shipper.log_trace("feature", "user@example.com", f"message {i}", "Information")
+        shipper.log_exception("feature", "user@example.com", "boom")
+        assert shipper.flush(timeout=2)
+
+        urls = [call.args[0] for call in shipper._session.post.call_args_list]
+        assert urls.count("http://metrics/insights/v1/logs") == 5
+        assert urls.count("http://metrics/insights/v1/exceptions") == 1
+        assert shipper._session.post.call_args_list[0].kwargs["json"]["logMessage"] == "message 0"
+        stats = shipper.get_stats()
+        assert stats["sent"] == 6 and stats["batches"] == 2 and stats["pending"] == 0
+
+    def test_full_queue_drops_and_shutdown_flushes(self, telemetry_shipper, monkeypatch):
+        monkeypatch.setenv("TELEMETRY_QUEUE_SIZE", "2")
+        monkeypatch.setenv("TELEMETRY_BATCH_POSTS", "true")
+        shipper = telemetry_shipper()
+        sending = threading.Event()
+        release = threading.Event()
+        response = shipper._session.post.return_value
+
+        def post(*args, **kwargs):
+            sending.set()
+            release.wait(1)
+            return response
+
+        shipper._session.post.side_effect = post
+
+        shipper.log_trace("feature", "user@example.com", "first", "Information")
+        assert sending.wait(1)
+        # The sender is busy: the queue takes two logs and drops the others
+        results = [shipper.log_trace("feature", "user@example.com", f"message {i}", "Information") for i in range(3)]
+        assert results == [True, True, False]
+
+        release.set()
+        shipper.shutdown()
+        assert not shipper.log_trace("feature", "user@example.com", "late", "Information")
+        bodies = [call.kwargs["json"] for call in shipper._session.post.call_args_list]
+        assert [[log["logMessage"] for log in body] for body in bodies] == [["first"], ["message 0", "message 1"]]
+        assert shipper.get_stats()["sent"] == 3 and shipper.get_stats()["dropped"] == 2
@@ -0,0 +1,119 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))), "src"))
+import asyncio
+import pytest
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.fixture
+def scheduler(mocker):
+    # The graphs of the package are not needed by the scheduler
+    with patch.dict('sys.modules', {
+        'src.core.agents.common.deep_research_v2.deep_research_graph': mocker.MagicMock(),
+        'src.core.agents.common.deep_research_v2.researcher_graph': mocker.MagicMock(),
+    }):
+        from src.core.agents.common.deep_research_v2 import scheduler
+        yield scheduler
+
+
+def make_tool(name: str, tool_type, calls: list):
+    from typing import Any, Type
+    from pydantic import BaseModel
+    from langchain_core.tools import BaseTool
+
+    class Input(BaseModel):
+        query: str
+
+    class SearchTool(BaseTool):
+        args_schema: Type[BaseModel] = Input
+        tool_type: Any
+
+        def _run(self, query: str) -> str:
+            raise NotImplementedError
+
+        async def _arun(self, query: str) -> str:
+            calls.append(query)
+            await asyncio.sleep(0.01)
+            return f"results of {query}"
+
+    return SearchTool(name=name, description=name, tool_type=tool_type)
+
+
+class TestEvidenceStore:
+
+    @pytest.mark.parametrize("first, second", [
+        ({"code": "print(2+3)"}, {"code": "print(2*3)"}),
+        ({"query": "C++ memory model"}, {"query": "C# memory model"}),
+        ({"sql": "revenue > 100"}, {"sql": "revenue < 100"}),
+        ({"query": "Revenue"}, {"query": "revenue"}),
+    ])
+    def test_keys_are_exact(self, scheduler, first, second):
+        key = scheduler.EvidenceStore.key
+        assert key("tool", first) != key("tool", second)
+        assert key("tool", first) == key("tool", dict(first))
+
+    def test_retriever_queries_match_up_to_casing_and_whitespace(self, scheduler):
+        key = scheduler.EvidenceStore.key
+        assert key("search", {"query": " Revenue  2024\n", "top": 5}, ("query",)) == key("search", {"query": "revenue 2024", "top": 5}, ("query",))
+        assert key("search", {"query": "C++ memory", "top": 5}, ("query",)) != key("search", {"query": "C# memory", "top": 5}, ("query",))
+        assert key("search", {"query": "revenue", "top": 5}, ("query",)) != key("search", {"query": "revenue", "top": 6}, ("query",))
+
+    @pytest.mark.asyncio
+    async def test_tools_share_results_within_the_run(self, scheduler):
+        from src.models.constants import ToolType
+        retriever_calls, interpreter_calls = [], []
+        run = scheduler.ResearchRun()
+        retriever, interpreter = run.tools([
+            make_tool("search", ToolType.retriever_tool, retriever_calls),
+            make_tool("interpreter", ToolType.non_retriever_tool, interpreter_calls),
+        ])
+
+        results = await asyncio.gather(
+            retriever.ainvoke({"query": "Revenue 2024"}),
+            retriever.ainvoke({"query": "revenue  2024"}),
+            interpreter.ainvoke({"query": "print(2+3)"}),
+            interpreter.ainvoke({"query": "print(2*3)"}),
+        )
+        await retriever.ainvoke({"query": "REVENUE 2024"})
+
+        assert results[0] == results[1] == "results of Revenue 2024"
+        assert retriever_calls == ["Revenue 2024"]
+        assert sorted(interpreter_calls) == ["print(2*3)", "print(2+3)"]
+        assert (run.evidence.hits, run.evidence.misses) == (2, 3)
+
+
+class TestResearchRun:
+
+    @pytest.mark.asyncio
+    async def test_slot_caps_concurrent_steps(self, scheduler):
+        run = scheduler.ResearchRun(max_concurrent_researchers=2)
+        running, peak = 0, 0
+
+        async def step(section: str):
+            nonlocal running, peak
+            async with run.slot(section):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.02)
+                running -= 1
+
+        await asyncio.gather(*(step(f"section {i}") for i in range(6)))
+
+        assert peak == 2
+        report = run.report()
+        assert sum(stage["steps"] for stage in report["stages"].values()) == 6
+        # Four of the steps waited for a slot
+        assert sum(stage["queue_ms"] > 10 for stage in report["stages"].values()) == 4
+
+    def test_budget_exhausted(self, scheduler):
+        run = scheduler.ResearchRun(token_budget=1000)
+        run.add_tokens("section 1", 600)
+        assert not run.budget_exhausted()
+        run.add_tokens("section 2", 400)
+        assert run.budget_exhausted()
+        assert run.report()["tokens"] == 1000
+        assert not scheduler.ResearchRun().budget_exhausted()
@@ -0,0 +1,95 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import math
+import time
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+request_var = contextvars.ContextVar("request_var", default=None)
+
+
+@pytest.fixture
+def execution(mocker):
+    with patch.dict('sys.modules', {'src.clients': mocker.MagicMock()}):
+        from src.core.base._tool import LamBotTool
+        from src.core.base._execution import ToolExecutor, EventLoopLagMonitor
+        from src.models.constants import ToolType, ToolExecutionMode
+
+        class BlockingTool(LamBotTool):
+            execution_mode: ToolExecutionMode = ToolExecutionMode.IO_BLOCKING
+
+            def _run(self, query: str) -> str:
+                time.sleep(0.3)
+                return f"{query} {request_var.get()} {threading.current_thread().name}"
+
+        class StallingTool(LamBotTool):
+            async def _arun(self, query: str) -> str:
+                time.sleep(0.4)
+                return query
+
+            def _run(self, query: str) -> str:
+                return query
+
+        executor = ToolExecutor()
+        yield (
+            executor,
+            EventLoopLagMonitor(interval_ms=20, threshold_ms=100),
+            BlockingTool(name="blocking_tool", description="Blocks", tool_type=ToolType.non_retriever_tool),
+            StallingTool(name="stalling_tool", description="Stalls", tool_type=ToolType.non_retriever_tool),
+        )
+        executor.shutdown()
+
+
+class TestToolExecution:
+
+    @pytest.mark.asyncio
+    async def test_blocking_tools_run_in_the_thread_pool_with_the_request_context(self, execution):
+        _, monitor, blocking_tool, stalling_tool = execution
+        request_var.set("request-1")
+        monitor.start()
+        try:
+            result = await blocking_tool.ainvoke({"query": "done"})
+            assert result.startswith("done request-1 lambot-tool")
+            assert monitor.get_stats()["stalls"] == 0
+
+            await stalling_tool.ainvoke({"query": "done"})
+            await asyncio.sleep(0.05)
+        finally:
+            monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["stalls_by_tool"] == {"stalling_tool": 1}
+        assert stats["max_lag_ms"] >= 300
+
+    @pytest.mark.asyncio
+    async def test_cpu_bound_work_runs_in_the_process_pool(self, execution):
+        executor, *_ = execution
+        executor.process_pool_size = 1
+        assert await executor.run_cpu_bound(math.factorial, 20) == math.factorial(20)
+        assert isinstance(executor._process_pool, ProcessPoolExecutor)
+
+    def test_execution_mode_is_inferred_and_checked(self, execution):
+        _, _, blocking_tool, stalling_tool = execution
+        from src.core.base._tool import LamBotTool
+        from src.models.constants import ToolType, ToolExecutionMode
+
+        class SyncTool(LamBotTool):
+            def _run(self, query: str) -> str:
+                return query
+
+        class MislabeledTool(SyncTool):
+            execution_mode: ToolExecutionMode = ToolExecutionMode.NATIVE_ASYNC
+
+        assert SyncTool(name="sync_tool", description="Sync", tool_type=ToolType.non_retriever_tool).execution_mode == ToolExecutionMode.IO_BLOCKING
+        assert stalling_tool.execution_mode == ToolExecutionMode.NATIVE_ASYNC
+        assert blocking_tool.execution_mode == ToolExecutionMode.IO_BLOCKING
+        with pytest.raises(TypeError, match="does not implement _arun"):
+            MislabeledTool(name="mislabeled_tool", description="Sync", tool_type=ToolType.non_retriever_tool)
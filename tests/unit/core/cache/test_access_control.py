@@ -0,0 +1,77 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+import asyncio
+from unittest.mock import patch
+from src.models.retriever_tool import AccessControl, AccessControlParam
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.fixture
+def access_control_cache(mocker):
+    auth_helpers = mocker.MagicMock()
+    auth_helpers.get_user_info.return_value = {AccessControlParam.USERNAME: "Alice", AccessControlParam.EMAIL: None}
+    # Keep the cache modules imported by this test out of the other tests
+    with patch.dict('sys.modules', {'src.core.utils.auth_helpers': auth_helpers, 'src.core.utils.ms_graph_utils': mocker.MagicMock()}):
+        from src.core.cache.access_control import AccessControlCache
+        yield AccessControlCache(), auth_helpers.get_user_info
+
+
+def make_access_control(function, param: AccessControlParam = AccessControlParam.USERNAME) -> AccessControl:
+    return AccessControl(function=function, param=param, filter_field="account")
+
+
+class TestAccessControlCache:
+
+    def test_resolves_once_per_user(self, access_control_cache, mocker):
+        cache, get_user_info = access_control_cache
+        function = mocker.Mock(side_effect=lambda username: [f"{username}-account"], __module__=__name__, __qualname__="accounts")
+        access_control = make_access_control(function)
+
+        assert cache.resolve(access_control, "token-1") == ["alice-account"]
+        assert cache.resolve(access_control, "token-1") == ["alice-account"]
+        function.assert_called_once_with("alice")
+        get_user_info.assert_called_once_with("token-1")
+
+        # Access tokens are passed as they are, without a Graph lookup
+        assert cache.resolve(make_access_control(function, AccessControlParam.ACCESS_TOKEN), "token-2") == ["token-2-account"]
+        get_user_info.assert_called_once()
+        assert cache.get_stats()["hits"] == 1
+
+    def test_invalid_results_raise_and_empty_results_expire_early(self, access_control_cache, mocker):
+        cache, _ = access_control_cache
+        invalid = make_access_control(mocker.Mock(return_value="not a list", __module__=__name__, __qualname__="invalid"))
+        with pytest.raises(ValueError):
+            cache.resolve(invalid, "token")
+
+        no_access = mocker.Mock(return_value=[], __module__=__name__, __qualname__="no_access")
+        cache.negative_ttl = 0
+        assert cache.resolve(make_access_control(no_access), "token") == []
+        assert cache.resolve(make_access_control(no_access), "token") == []
+        assert no_access.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_and_prefetch_share_one_call(self, access_control_cache, mocker):
+        cache, _ = access_control_cache
+        calls = []
+
+        async def get_functional_locations(username: str) -> list:
+            calls.append(username)
+            await asyncio.sleep(0.01)
+            return ["site-a", "site-b"]
+
+        access_control = make_access_control(get_functional_locations)
+        tool = mocker.MagicMock(retriever_tools=None)
+        tool.tool_spec.access_control = access_control
+        mocker.patch("src.core.cache.access_control.access_token_var").get.return_value = "token"
+
+        prefetch = cache.prefetch([tool, mocker.MagicMock(tool_spec=None, retriever_tools=None)])
+        results = await asyncio.gather(*[cache.aresolve(access_control, "token") for _ in range(5)])
+        await prefetch
+
+        assert results == [["site-a", "site-b"]] * 5
+        assert calls == ["alice"]
+        assert cache.resolve(access_control, "token") == ["site-a", "site-b"]
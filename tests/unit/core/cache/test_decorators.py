@@ -0,0 +1,234 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+import asyncio
+import fnmatch
+import threading
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+CACHE_MODULES = ['src.core.cache.decorators', 'src.core.cache.platform']
+
+
+@pytest.fixture
+def decorators(mocker):
+    redis_module = mocker.MagicMock()
+    redis_store = {}
+    sync_client = redis_module.RedisClient.get_instance.return_value
+    sync_client.get.side_effect = redis_store.get
+    sync_client.get_with_ttl.side_effect = lambda key: (redis_store.get(key), 60 if key in redis_store else None)
+    tag_sets = {}
+
+    def set_with_expiry(key, value, ttl, tags=None):
+        redis_store[key] = value
+        for tag in tags or []:
+            tag_sets.setdefault(tag, set()).add(key)
+
+    def delete_tagged(tags):
+        for tag in tags:
+            for key in tag_sets.pop(tag, set()):
+                redis_store.pop(key, None)
+
+    def delete_matching(pattern):
+        for key in [key for key in redis_store if fnmatch.fnmatchcase(key, pattern)]:
+            redis_store.pop(key)
+
+    sync_client.set_with_expiry.side_effect = set_with_expiry
+    sync_client.delete_many.side_effect = lambda keys: [redis_store.pop(key, None) for key in keys]
+    sync_client.delete_tagged.side_effect = delete_tagged
+    sync_client.delete_matching.side_effect = delete_matching
+    async_client = redis_module.AsyncRedisClient.get_instance.return_value
+    async_client.get = mocker.AsyncMock(side_effect=redis_store.get)
+    async_client.get_with_ttl = mocker.AsyncMock(side_effect=sync_client.get_with_ttl.side_effect)
+    async_client.set_with_expiry = mocker.AsyncMock(side_effect=sync_client.set_with_expiry.side_effect)
+    with patch.dict('sys.modules', {
+        'src.clients.redis': redis_module,
+        'src.core.context.vars': mocker.MagicMock(),
+    }):
+        for module in CACHE_MODULES:
+            sys.modules.pop(module, None)
+        from src.core.cache import decorators
+        yield decorators, sync_client, async_client, redis_store
+        for module in CACHE_MODULES:
+            sys.modules.pop(module, None)
+
+
+class TestCachePlatformWithArgs:
+
+    @pytest.mark.asyncio
+    async def test_coroutine_uses_async_client(self, decorators, mocker):
+        decorators, sync_client, async_client, redis_store = decorators
+        fetch = mocker.AsyncMock(return_value={"name": "model"})
+
+        @decorators.cache_platform_with_args("language_model:{name}", ttl=60)
+        async def fetch_language_model(name: str):
+            return await fetch(name)
+
+        assert await fetch_language_model("model") == {"name": "model"}
+        assert await fetch_language_model(name="model") == {"name": "model"}
+
+        fetch.assert_awaited_once_with("model")
+        assert redis_store == {"lambots:api:platform:language_model:model": {"name": "model"}}
+        sync_client.get_with_ttl.assert_not_called()
+        # The second call is served from the in-process tier
+        assert async_client.get_with_ttl.await_count == 1
+
+    def test_sync_function_uses_sync_client(self, decorators, mocker):
+        decorators, sync_client, async_client, redis_store = decorators
+        fetch = mocker.MagicMock(return_value={"name": "model"})
+
+        @decorators.cache_platform_with_args("language_model:{name}", ttl=60)
+        def fetch_language_model(name: str):
+            return fetch(name)
+
+        assert fetch_language_model("model") == {"name": "model"}
+        assert fetch_language_model("model") == {"name": "model"}
+
+        fetch.assert_called_once_with("model")
+        assert "lambots:api:platform:language_model:model" in redis_store
+        async_client.get_with_ttl.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sync_and_async_share_entries(self, decorators):
+        decorators, _, _, _ = decorators
+
+        @decorators.cache_platform("shared", ttl=60)
+        def sync_fetch():
+            return "value"
+
+        @decorators.cache_platform("shared", ttl=60)
+        async def async_fetch():
+            raise AssertionError("Should be served from the cache")
+
+        assert sync_fetch() == "value"
+        assert await async_fetch() == "value"
+
+
+class TestPlatformCacheTiers:
+
+    def test_l2_hit_is_converted_once_and_kept_in_l1(self, decorators):
+        decorators, sync_client, _, redis_store = decorators
+        class Model(dict):
+            pass
+
+        redis_store["lambots:api:platform:model:a"] = {"name": "a"}
+
+        @decorators.cache_platform_with_args("model:{name}", ttl=60, return_type=Model)
+        def fetch_model(name: str):
+            raise AssertionError("Should be served from the cache")
+
+        first = fetch_model("a")
+        assert isinstance(first, Model)
+        assert fetch_model("a") is first
+        assert sync_client.get_with_ttl.call_count == 1
+
+        stats = decorators.PlatformCache.get_instance().get_stats()
+        assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 0)
+        assert stats["hit_rate"] == 1.0
+
+    def test_prefix_patterns_use_tags_and_others_scan(self, decorators, monkeypatch):
+        decorators, sync_client, _, redis_store = decorators
+        monkeypatch.delenv("CACHE_INVALIDATION_SCAN_FALLBACK", raising=False)
+
+        @decorators.cache_platform_with_args("model:{name}", ttl=60)
+        def fetch_model(name: str):
+            return {"name": name}
+
+        fetch_model("a")
+        fetch_model("b")
+        sync_client.keys.assert_not_called()
+
+        decorators.invalidate_platform_cache(patterns=["model:*"])
+        sync_client.delete_tagged.assert_called_once_with(["lambots:api:tags:platform:model:*"])
+        sync_client.delete_matching.assert_not_called()
+        assert redis_store == {}
+
+        decorators.invalidate_platform_cache(patterns=["model:a*"])
+        sync_client.delete_matching.assert_called_once_with("lambots:api:platform:model:a*")
+        sync_client.keys.assert_not_called()
+
+    def test_prefix_patterns_scan_for_untagged_keys(self, decorators, monkeypatch):
+        decorators, sync_client, _, redis_store = decorators
+        monkeypatch.setenv("CACHE_INVALIDATION_SCAN_FALLBACK", "true")
+
+        @decorators.cache_platform_with_args("model:{name}", ttl=60)
+        def fetch_model(name: str):
+            return {"name": name}
+
+        fetch_model("a")
+        # Written before keys were tagged
+        redis_store["lambots:api:platform:model:legacy"] = {"name": "legacy"}
+
+        decorators.invalidate_platform_cache(patterns=["model:*"])
+        sync_client.delete_tagged.assert_called_once_with(["lambots:api:tags:platform:model:*"])
+        sync_client.delete_matching.assert_called_once_with("lambots:api:platform:model:*")
+        assert redis_store == {}
+
+    def test_invalidation_evicts_l1_and_notifies_workers(self, decorators):
+        decorators, sync_client, _, redis_store = decorators
+        calls = []
+
+        @decorators.cache_platform_with_args("model:{name}", ttl=60)
+        def fetch_model(name: str):
+            calls.append(name)
+            return {"name": name}
+
+        fetch_model("a")
+        decorators.invalidate_platform_cache(patterns=["model:*"])
+        fetch_model("a")
+
+        assert calls == ["a", "a"]
+        sync_client.publish.assert_called_once()
+        channel, message = sync_client.publish.call_args.args
+        assert message["patterns"] == ["lambots:api:platform:model:*"]
+
+        # Another worker's invalidation evicts the local copy as well
+        platform_cache = decorators.PlatformCache.get_instance()
+        platform_cache._on_invalidation({"origin": "other-worker", "keys": ["lambots:api:platform:model:a"], "patterns": []})
+        redis_store.clear()
+        fetch_model("a")
+        assert calls == ["a", "a", "a"]
+
+
+class TestSingleFlight:
+
+    def test_concurrent_threads_share_one_fetch(self, decorators):
+        decorators, _, _, _ = decorators
+        release = threading.Event()
+        calls = []
+
+        @decorators.cache_platform("token", ttl=60)
+        def get_token():
+            calls.append(1)
+            release.wait(5)
+            return "token"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_token())) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        # Let the waiting threads pile up behind the first one
+        threading.Event().wait(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["token"] * 10
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_coroutines_share_one_fetch(self, decorators):
+        decorators, _, _, _ = decorators
+        calls = []
+
+        @decorators.cache_platform("token", ttl=60)
+        async def get_token():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "token"
+
+        assert await asyncio.gather(*[get_token() for _ in range(10)]) == ["token"] * 10
+        assert len(calls) == 1
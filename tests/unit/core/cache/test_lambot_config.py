@@ -0,0 +1,78 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+from uuid import uuid4
+from unittest.mock import patch
+from src.models import LamBotConfig, QueryConfig
+
+CACHE_MODULES = ['src.core.cache.decorators', 'src.core.cache.platform', 'src.core.cache.lambot_config']
+
+
+@pytest.fixture
+def lambot_config_cache(mocker):
+    redis_module = mocker.MagicMock()
+    with patch.dict('sys.modules', {
+        'src.clients.redis': redis_module,
+        'src.core.context.vars': mocker.MagicMock(),
+    }):
+        for module in CACHE_MODULES:
+            sys.modules.pop(module, None)
+        from src.core.cache.lambot_config import LamBotConfigCache
+        yield LamBotConfigCache(), redis_module.RedisClient.get_instance.return_value
+        for module in CACHE_MODULES:
+            sys.modules.pop(module, None)
+
+
+def make_lambot_config() -> LamBotConfig:
+    # Resolved configs are validated when fetched from Mongo; the cache only copies them
+    return LamBotConfig.model_construct(
+        id=uuid4(),
+        display_name="Test Bot",
+        tools=[],
+        default_query_config=QueryConfig.model_construct(system_message="You are a helpful assistant."),
+    )
+
+
+class TestLamBotConfigCache:
+
+    def test_hit_returns_independent_copy(self, lambot_config_cache):
+        cache, _ = lambot_config_cache
+        lambot_config = make_lambot_config()
+        key = cache.build_key(lambot_config.id, "user", ["group-b", "group-a"])
+        assert key == cache.build_key(lambot_config.id, "user", ["group-a", "group-b", "group-a"])
+        assert key != cache.build_key(lambot_config.id, "admin", ["group-a", "group-b"])
+
+        assert cache.get(key, copilot_access=lambda: False) is None
+        cache.set(key, lambot_config)
+        first = cache.get(key, copilot_access=lambda: False)
+        first.default_query_config.system_message = "Formatting re-enabled"
+
+        second = cache.get(key, copilot_access=lambda: False)
+        assert second.default_query_config.system_message == "You are a helpful assistant."
+        assert cache.get_stats()["hit_rate"] == 2 / 3
+
+    def test_copilot_dependent_entry_requires_matching_license(self, lambot_config_cache):
+        cache, _ = lambot_config_cache
+        key = cache.build_key("bot", "user", ["group-a"])
+        cache.set(key, make_lambot_config(), copilot_access=True)
+
+        assert cache.get(key, copilot_access=lambda: True) is not None
+        assert cache.get(key, copilot_access=lambda: False) is None
+
+    def test_invalidate_evicts_one_lambot_and_notifies_workers(self, lambot_config_cache):
+        cache, redis_client = lambot_config_cache
+        key_a = cache.build_key("bot-a", "user", ["group-a"])
+        key_b = cache.build_key("bot-b", "user", ["group-a"])
+        cache.set(key_a, make_lambot_config())
+        cache.set(key_b, make_lambot_config())
+
+        cache.invalidate("bot-a")
+        assert cache.get(key_a, copilot_access=lambda: False) is None
+        assert cache.get(key_b, copilot_access=lambda: False) is not None
+        channel, message = redis_client.publish.call_args.args
+        assert message["patterns"] == ["lambots:api:platform:resolved_lambot:bot-a:*"]
+
+        cache.invalidate()
+        assert cache.get(key_b, copilot_access=lambda: False) is None
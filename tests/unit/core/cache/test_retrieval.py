@@ -0,0 +1,99 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def retrieval_cache(mocker):
+    redis_module = mocker.MagicMock()
+    redis_store = {}
+    redis_client = redis_module.RedisClient.get_instance.return_value
+    redis_client.get.side_effect = redis_store.get
+    redis_client.set_with_expiry.side_effect = lambda key, value, expiry_seconds, tags=None: redis_store.__setitem__(key, value)
+    async_redis_client = redis_module.AsyncRedisClient.get_instance.return_value
+    async_redis_client.get = mocker.AsyncMock(side_effect=redis_store.get)
+    async_redis_client.set_with_expiry = mocker.AsyncMock(side_effect=redis_client.set_with_expiry.side_effect)
+    with patch.dict('sys.modules', {
+        'src.clients.redis': redis_module,
+        'src.core.context.vars': mocker.MagicMock(),
+    }):
+        sys.modules.pop('src.core.cache.decorators', None)
+        sys.modules.pop('src.core.cache.retrieval', None)
+        from src.core.cache.retrieval import RetrievalResultCache
+        from src.models.retriever_tool import RetrieverCacheConfig
+        yield RetrievalResultCache(), RetrieverCacheConfig(), redis_store, redis_module
+        sys.modules.pop('src.core.cache.decorators', None)
+        sys.modules.pop('src.core.cache.retrieval', None)
+
+
+def make_payload(query: str, search_filter: str, top: int = 5) -> dict:
+    return {
+        "search": query,
+        "vectorQueries": [{"kind": "text", "k": top, "fields": "chunk_vector", "text": query}],
+        "filter": search_filter,
+        "top": top,
+    }
+
+
+class TestBuildKey:
+
+    def test_normalizes_query(self, retrieval_cache):
+        cache, _, _, _ = retrieval_cache
+        key_a = cache.build_key("index", "How do I  reset\tmy password?", make_payload("How do I  reset\tmy password?", "a eq 1"))
+        key_b = cache.build_key("index", "how do i reset my password?", make_payload("how do i reset my password?", "a eq 1"))
+        assert key_a == key_b
+
+    def test_differs_by_filter_top_k_and_index(self, retrieval_cache):
+        cache, _, _, _ = retrieval_cache
+        key = cache.build_key("index", "query", make_payload("query", "search.in(groups, 'A', ',')"))
+        assert key != cache.build_key("index", "query", make_payload("query", "search.in(groups, 'B', ',')"))
+        assert key != cache.build_key("index", "query", make_payload("query", "search.in(groups, 'A', ',')", top=10))
+        assert key != cache.build_key("other_index", "query", make_payload("query", "search.in(groups, 'A', ',')"))
+
+
+class TestGetSet:
+
+    def test_miss_then_l1_then_l2_hit(self, retrieval_cache):
+        cache, config, redis_store, _ = retrieval_cache
+        results = [{"chunk": "text", "title": "doc"}]
+
+        assert cache.get("key", "index", config) is None
+        assert cache.set("key", results, config)
+        assert cache.get("key", "index", config) == results
+
+        # A fresh worker only finds the results in Redis and promotes them to memory
+        cache._l1.clear()
+        assert cache.get("key", "index", config) == results
+        assert cache.get("key", "index", config) == results
+        assert "key" in redis_store
+
+        stats = cache.get_stats()["index"]
+        assert (stats["misses"], stats["l1_hits"], stats["l2_hits"]) == (1, 2, 1)
+        assert stats["hit_rate"] == 0.75
+
+    def test_skips_entries_over_size_limit(self, retrieval_cache):
+        cache, config, redis_store, _ = retrieval_cache
+        config.max_entry_bytes = 100
+        assert not cache.set("key", [{"chunk": "x" * 200}], config)
+        assert cache.get("key", "index", config) is None
+        assert redis_store == {}
+
+    @pytest.mark.asyncio
+    async def test_async_path_uses_async_client_and_tags_entries(self, retrieval_cache):
+        cache, config, redis_store, redis_module = retrieval_cache
+        key = cache.build_key("index", "query", make_payload("query", "a eq 1"))
+        results = [{"chunk": "text", "title": "doc"}]
+
+        assert await cache.aget(key, "index", config) is None
+        assert await cache.aset(key, results, config)
+        cache._l1.clear()
+        assert await cache.aget(key, "index", config) == results
+
+        async_redis_client = redis_module.AsyncRedisClient.get_instance.return_value
+        # Invalidating the results of the index goes through its tag set
+        tags = async_redis_client.set_with_expiry.call_args.kwargs["tags"]
+        assert "lambots:api:tags:platform:retrieval:index:*" in tags
+        assert not redis_module.RedisClient.get_instance.return_value.get.called
@@ -0,0 +1,80 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+import asyncio
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.fixture
+def single_flight():
+    # Keep the cache modules imported by this test out of the other tests
+    with patch.dict('sys.modules'):
+        from src.core.cache.singleflight import SingleFlight
+        yield SingleFlight()
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_result(self, single_flight):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*[single_flight.ado("key", fetch) for _ in range(5)])
+
+        assert results == ["value"] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_waiter_retries_when_leader_is_cancelled(self, single_flight):
+        started = asyncio.Event()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.sleep(10)
+            return "value"
+
+        leader = asyncio.create_task(single_flight.ado("key", fetch))
+        await started.wait()
+        waiter = asyncio.create_task(single_flight.ado("key", fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await waiter == "value"
+        assert calls == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_the_call(self, single_flight):
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "value"
+
+        leader = asyncio.create_task(single_flight.ado("key", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(single_flight.ado("key", fetch))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        release.set()
+
+        assert await leader == "value"
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
@@ -0,0 +1,73 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+import asyncio
+import threading
+from unittest.mock import patch
+from src.core.context.vars import ms_user_object_id_var, user_claims_var
+
+pytest_plugins = ('pytest_asyncio',)
+
+CLAIMS = {"oid": "user-1", "name": "Alice Doe", "unique_name": "alice@example.com"}
+
+
+@pytest.fixture
+def user_profile(mocker, monkeypatch):
+    monkeypatch.setenv("USER_PROFILE_GRAPH_TIMEOUT_SECONDS", "0.2")
+    ms_graph_utils = mocker.MagicMock()
+    # Keep the cache modules imported by this test out of the other tests
+    with patch.dict('sys.modules', {
+        'src.core.utils.auth_helpers': mocker.MagicMock(),
+        'src.core.utils.ms_graph_utils': ms_graph_utils,
+    }):
+        from src.core.cache.user_profile import UserProfileService
+        service = UserProfileService()
+        user_id_token = ms_user_object_id_var.set("user-1")
+        claims_token = user_claims_var.set(CLAIMS)
+        yield service, ms_graph_utils.get_user_graph_info
+        ms_user_object_id_var.reset(user_id_token)
+        user_claims_var.reset(claims_token)
+        service.shutdown()
+
+
+class TestUserProfileService:
+
+    def test_prefetched_profile_is_fetched_once(self, user_profile):
+        service, get_user_graph_info = user_profile
+        get_user_graph_info.return_value = {"displayName": "Alice Doe", "jobTitle": "Engineer"}
+
+        service.prefetch()
+        assert service.get_profile() == {"displayName": "Alice Doe", "jobTitle": "Engineer"}
+        assert service.get_profile()["jobTitle"] == "Engineer"
+        get_user_graph_info.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_slow_graph_falls_back_to_claims(self, user_profile):
+        service, get_user_graph_info = user_profile
+        release = threading.Event()
+        get_user_graph_info.side_effect = lambda: release.wait(1) and {"displayName": "Alice Doe", "jobTitle": "Engineer"}
+
+        profiles = await asyncio.gather(*[service.aget_profile() for _ in range(3)])
+        assert profiles == [{"id": "user-1", "displayName": "Alice Doe", "userPrincipalName": "alice@example.com", "mail": "alice@example.com"}] * 3
+        assert service.get_stats()["fallbacks"] == 3
+
+        # The lookup kept running and serves the next requests
+        release.set()
+        await asyncio.sleep(0.05)
+        assert (await service.aget_profile())["jobTitle"] == "Engineer"
+        get_user_graph_info.assert_called_once()
+
+    def test_zero_timeout_never_waits_for_graph(self, user_profile):
+        service, get_user_graph_info = user_profile
+        release = threading.Event()
+        get_user_graph_info.side_effect = lambda: release.wait(1) and {"displayName": "Alice Doe", "jobTitle": "Engineer"}
+
+        assert service.get_profile(timeout=0)["displayName"] == "Alice Doe"
+        assert "jobTitle" not in service.get_profile(timeout=0)
+
+        # The lookup started by the first call serves the next ones
+        release.set()
+        assert service.get_profile()["jobTitle"] == "Engineer"
+        get_user_graph_info.assert_called_once()
@@ -0,0 +1,104 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import json
+import uuid
+import asyncio
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.fixture
+def conversation_engine(mocker):
+    with patch.dict('sys.modules', {
+        'src.core.utils': mocker.MagicMock(),
+        'src.core.bots': mocker.MagicMock(),
+        'src.core.bots.lambot': mocker.MagicMock(),
+        'src.core.bots.followup_questions_generator_bot': mocker.MagicMock(),
+        'src.core.tools.common': mocker.MagicMock(),
+        'src.core.utils.log_trace': mocker.MagicMock(),
+    }):
+        from src.core.chat import conversation_engine
+        from src.models.logging import TokenUsageDetails
+        mocker.patch.object(conversation_engine, "extract_indexes_queried_by_agent", return_value=[])
+        yield conversation_engine, TokenUsageDetails
+
+
+def make_bot(mocker, events):
+    bot = mocker.MagicMock()
+    bot.bot_config.display_name = "Test LamBot"
+    bot.bot_config.id = uuid.uuid4()
+    bot.bot_config.suggest_followup_questions = True
+    bot._query_config.language_model.name = "gpt-4o"
+    bot._query_config.temperature = 0.0
+    bot._query_config.selected_tools = []
+    bot.metric_api_client.user_email = "user@example.com"
+    bot.intake_flags = None
+    bot._prepare_agent_execution.return_value = ({}, {})
+    bot._aconfigure_agent = mocker.AsyncMock()
+
+    async def astream_events(*args, **kwargs):
+        for event in events:
+            yield event
+            await asyncio.sleep(0)
+
+    bot.agent_executor.astream_events = astream_events
+    return bot
+
+
+class TestFollowUpQuestions:
+
+    @pytest.mark.asyncio
+    async def test_followup_questions_start_with_the_final_answer_and_follow_done(self, conversation_engine, mocker):
+        module, TokenUsageDetails = conversation_engine
+        started = asyncio.Event()
+
+        async def agenerate_followup_questions(messages, agent_executor_output):
+            started.set()
+            assert agent_executor_output[-1].content == "Hello"
+            return ["What next?"]
+
+        followup_bot = module.FollowUpQuestionGeneratorBot.return_value
+        followup_bot.agenerate_followup_questions = agenerate_followup_questions
+        followup_bot.usage_metadata = TokenUsageDetails(prompt_tokens=3, completion_tokens=2, total_tokens_used=5)
+
+        events = [
+            {"event": "on_chat_model_stream", "name": "llm", "tags": ["lambot-agent-llm"], "data": {"chunk": AIMessageChunk(content="Hello")}},
+            {"event": "on_chain_end", "name": "AgentExecutor", "data": {"output": {"messages": [AIMessage(content="Hello")]}}},
+            {"event": "on_chain_end", "name": "RunnableSequence", "data": {}},
+            {"event": "on_chain_end", "name": "LangGraph", "data": {}},
+        ]
+        bot = make_bot(mocker, events)
+        engine = module.ConversationEngine(bot)
+
+        lines = []
+        async for line in engine.generate_response([{"role": "user", "content": "Hi"}], "trace", streaming=True):
+            lines.append(json.loads(line))
+            if len(lines) == 1:
+                # Generated while the rest of the events are streamed
+                await asyncio.wait_for(started.wait(), timeout=1)
+
+        assert [line["chunk"] for line in lines] == ["Hello", "", ""]
+        assert lines[1]["done"] is True
+        assert lines[2]["followup_questions"] == ["What next?"]
+
+        log_message = bot.metric_api_client.make_async_log_trace_request.call_args.kwargs["log_message"]
+        assert '"follow_up_questions":["What next?"]' in log_message
+        assert '"time_to_done_ms":' in log_message
+
+    @pytest.mark.asyncio
+    async def test_failed_followup_questions_do_not_fail_the_response(self, conversation_engine, mocker):
+        module, _ = conversation_engine
+        module.FollowUpQuestionGeneratorBot.return_value.agenerate_followup_questions = mocker.AsyncMock(side_effect=RuntimeError("timeout"))
+
+        events = [{"event": "on_chain_end", "name": "AgentExecutor", "data": {"output": {"messages": [AIMessage(content="Hi")]}}}]
+        response = None
+        async for response in module.ConversationEngine(make_bot(mocker, events)).generate_response([{"role": "user", "content": "Hi"}], "trace"):
+            pass
+
+        assert response.done is True
+        assert response.followup_questions is None
@@ -0,0 +1,86 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import json
+import asyncio
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def stream_coalescer(mocker):
+    with patch.dict('sys.modules', {
+        'src.core.chat.conversation_engine': mocker.MagicMock(),
+    }):
+        from src.core.chat.stream_coalescer import StreamCoalescer, serialize_chunk
+        from src.models import LamBotChatResponse
+        yield StreamCoalescer, serialize_chunk, LamBotChatResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestStreamCoalescer:
+
+    def test_serialized_chunk_matches_pydantic(self, stream_coalescer):
+        _, serialize_chunk, LamBotChatResponse = stream_coalescer
+        text = 'Quote "this"\nüñí 😀 \\   \x07'
+        assert serialize_chunk(text) == LamBotChatResponse(chunk=text, citations=[]).model_dump_json() + "\n"
+
+    def test_batches_tokens_and_keeps_order(self, stream_coalescer):
+        StreamCoalescer, _, LamBotChatResponse = stream_coalescer
+        clock = FakeClock()
+        coalescer = StreamCoalescer(window_ms=30, max_bytes=1024, keepalive_seconds=5, clock=clock)
+
+        lines = coalescer.chunk("Hello") + coalescer.chunk(" world") + coalescer.idle()
+        clock.now = 0.031
+        lines += coalescer.chunk("!") + coalescer.chunk(" More")
+        lines += coalescer.message(LamBotChatResponse(chunk="", citations=[], done=True))
+
+        chunks = [json.loads(line)["chunk"] for line in lines]
+        assert chunks == ["Hello world!", " More", ""]
+        assert json.loads(lines[-1])["done"] is True
+        assert coalescer.lines == 3
+
+    def test_keepalive_only_when_idle(self, stream_coalescer):
+        StreamCoalescer, _, _ = stream_coalescer
+        clock = FakeClock()
+        coalescer = StreamCoalescer(window_ms=30, max_bytes=4, keepalive_seconds=5, clock=clock)
+
+        assert len(coalescer.chunk("12345")) == 1
+        assert coalescer.idle() == []
+        clock.now = 5
+        assert json.loads(coalescer.idle()[0])["chunk"] == ""
+        assert coalescer.idle() == []
+
+    @pytest.mark.asyncio
+    async def test_pace_flushes_and_keeps_alive_during_silent_tool_run(self, stream_coalescer):
+        StreamCoalescer, _, _ = stream_coalescer
+        coalescer = StreamCoalescer(window_ms=10, max_bytes=1024, keepalive_seconds=0.05)
+
+        async def events():
+            yield "Let me check"
+            # A long tool run without any event
+            await asyncio.sleep(0.2)
+            yield "Done"
+
+        lines, received = [], []
+        async for event in coalescer.pace(events()):
+            if event is None:
+                lines += coalescer.idle()
+            else:
+                received.append(event)
+                lines += coalescer.chunk(event)
+        lines += coalescer.flush()
+
+        assert received == ["Let me check", "Done"]
+        chunks = [json.loads(line)["chunk"] for line in lines]
+        # The text before the tool run is not held back, keep-alives are sent while it runs
+        assert chunks[0] == "Let me check" and chunks[-1] == "Done"
+        assert 2 <= chunks.count("") <= 4
@@ -0,0 +1,65 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import copy
+import pytest
+import mongomock
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+TOOL_DOCUMENTS = [
+    {"name": "techmemo_retriever", "display_name": "TechMemo", "description": "TechMemo", "security_group_ids": ["group-a"]},
+    {"name": "custom_sharepoint_tool", "display_name": "SharePoint", "description": "SharePoint", "security_group_ids": ["group-a"]},
+    {"name": "restricted_tool", "display_name": "Restricted", "description": "Restricted", "security_group_ids": ["group-b"]},
+]
+
+
+@pytest.fixture
+def tool_config_db(mocker):
+    ms_graph_utils = mocker.MagicMock()
+    ms_graph_utils.has_copilot_access.return_value = True
+    ms_graph_utils.ahas_copilot_access = mocker.AsyncMock(return_value=True)
+    with patch.dict('sys.modules', {
+        'src.clients': mocker.MagicMock(),
+        'src.clients.mongo': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+        'src.core.context.vars': mocker.MagicMock(),
+        'src.core.utils.ms_graph_utils': ms_graph_utils,
+    }):
+        sys.modules.pop('src.core.database.tools', None)
+        from src.core.database.tools import ToolConfigDB
+        collection = mongomock.MongoClient().db.toolConfigs
+        collection.insert_many(copy.deepcopy(TOOL_DOCUMENTS))
+        async_collection = mocker.MagicMock()
+        async_collection.find.return_value.to_list = mocker.AsyncMock(side_effect=lambda length: list(collection.find()))
+        yield ToolConfigDB(collection, mocker.MagicMock(), async_collection=async_collection), ms_graph_utils
+        sys.modules.pop('src.core.database.tools', None)
+
+
+class TestFetchAllTools:
+
+    @pytest.mark.asyncio
+    async def test_async_variant_matches_sync(self, tool_config_db):
+        tool_config_db, _ = tool_config_db
+        for user_role in ["user", "admin"]:
+            sync_tools = tool_config_db.fetch_all_tools(user_role, ["group-a"])
+            async_tools = await tool_config_db.afetch_all_tools(user_role, ["group-a"])
+            assert [tool.model_dump() for tool in async_tools] == [tool.model_dump() for tool in sync_tools]
+
+    @pytest.mark.asyncio
+    async def test_copilot_access_only_checked_when_needed(self, tool_config_db):
+        tool_config_db, ms_graph_utils = tool_config_db
+
+        tools = await tool_config_db.afetch_all_tools("user", ["group-b"])
+        assert {tool.name: tool.user_has_access for tool in tools} == {
+            "techmemo_retriever": False,
+            "custom_sharepoint_tool": False,
+            "restricted_tool": True,
+        }
+        ms_graph_utils.ahas_copilot_access.assert_not_awaited()
+
+        tools = await tool_config_db.afetch_all_tools("user", ["group-a"])
+        assert {tool.name for tool in tools if tool.user_has_access} == {"techmemo_retriever", "custom_sharepoint_tool"}
+        ms_graph_utils.ahas_copilot_access.assert_awaited_once()
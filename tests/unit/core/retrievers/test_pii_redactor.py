@@ -0,0 +1,69 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def mock_inits_and_import_redactor(mocker):
+    with patch.dict('sys.modules', {
+        'src.core.base': mocker.MagicMock(),
+        'src.core.retrievers.retriever': mocker.MagicMock(),
+        'src.core.retrievers.multi_retriever': mocker.MagicMock(),
+    }):
+        from src.core.retrievers.pii_redactor import PIIRedactor, compile_trie_pattern
+        from src.core.retrievers.utils import construct_pattern, redact_pii, redact_pii_batch
+        yield PIIRedactor, compile_trie_pattern, construct_pattern, redact_pii, redact_pii_batch
+
+
+class TestPIIRedactor:
+    texts = [
+        "Samsung has a new product",
+        "samsung_has a new product",
+        "The SK   hynix fab and SK-hynix and SK_hynix",
+        "Tech Semi, Singapore reported drift at TSMC, Fab 12",
+        "Micron (Boise) and Micron(Boise) and MicronBoise",
+        "Intel (OR) vs Intelligent vs XIntel vs Intel1",
+        "No customer names here.",
+        "",
+    ]
+
+    def test_redact_matches_flat_alternation(self, mock_inits_and_import_redactor):
+        PIIRedactor, _, construct_pattern, _, _ = mock_inits_and_import_redactor
+        from src.core.retrievers.pii_data import customer_names_case_insensitive, customer_names_case_sensitive
+
+        pattern_case_insensitive = construct_pattern(customer_names_case_insensitive, case_insensitive=True)
+        pattern_case_sensitive = construct_pattern(customer_names_case_sensitive)
+        redactor = PIIRedactor()
+
+        for text in self.texts:
+            expected = pattern_case_sensitive.sub("<CUSTOMER>", pattern_case_insensitive.sub("<CUSTOMER>", text))
+            assert redactor.redact(text) == expected
+
+    @pytest.mark.parametrize("pii_list, case_insensitive, text", [
+        (["SK", "SK hynix"], True, "sk hynix and SK-hynix"),
+        (["SK hynix", "SK"], True, "sk hynix and SK-hynix"),
+        (["a b", "a -b", "a"], False, "a -b a_b a- b"),
+        (["ab", "Ab", "a"], False, "ab Ab AB a"),
+        (["s", "ſ"], True, "S ſ s"),
+    ])
+    def test_trie_pattern_preserves_alternation_order(self, mock_inits_and_import_redactor, pii_list, case_insensitive, text):
+        _, compile_trie_pattern, construct_pattern, _, _ = mock_inits_and_import_redactor
+
+        expected = construct_pattern(pii_list, case_insensitive).sub("<C>", text)
+        assert compile_trie_pattern(pii_list, case_insensitive).sub("<C>", text) == expected
+
+    def test_redact_batch(self, mock_inits_and_import_redactor):
+        _, _, _, redact_pii, redact_pii_batch = mock_inits_and_import_redactor
+
+        assert redact_pii_batch(self.texts) == [redact_pii(text) for text in self.texts]
+        assert redact_pii_batch(["Samsung\x00Sony"]) == [redact_pii("Samsung\x00Sony")]
+        assert redact_pii_batch([]) == []
+
+    def test_redact_pii_custom_lists(self, mock_inits_and_import_redactor):
+        _, _, _, redact_pii, _ = mock_inits_and_import_redactor
+
+        assert redact_pii("Acme Corp and acme_corp", ["Acme Corp"], [], "[X]") == "[X] and [X]"
+        assert redact_pii("ACME and Acme", [], ["ACME"]) == "<CUSTOMER> and Acme"
@@ -0,0 +1,168 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))), "src"))
+import json
+import random
+import sqlite3
+import pytest
+from collections import defaultdict, deque
+from contextlib import closing, contextmanager
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+
+# Imported once: importing the tool package takes a while
+@pytest.fixture(scope="module")
+def retriever_tool():
+    clients = MagicMock()
+    # The package builds its tool on import, with the fallback prompts
+    clients.LifespanClients.get_instance.return_value.langfuse_manager.get_prompt.side_effect = (
+        lambda prompt_name, fallback_prompt, label="dev": fallback_prompt
+    )
+    with patch.dict(os.environ, {"SEARCH_API_BASE": "search", "SEARCH_API_KEY": "key"}), patch.dict('sys.modules', {
+        'pyodbc': MagicMock(),
+        'src.clients': clients,
+        'src.clients.redis': MagicMock(),
+        'src.core.tools.community.nce_chatbot_pipeline.openai_config': MagicMock(),
+        'src.core.utils.auth_helpers': MagicMock(),
+    }):
+        from src.core.tools.community.bfs_retriever import retriever_tool
+        yield retriever_tool
+
+
+class SqliteConnection:
+    """A sqlite connection with pyodbc-like cursors, usable from the view threads."""
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+    def cursor(self):
+        return closing(self._connection.cursor())
+
+    def close(self):
+        self._connection.close()
+
+
+class SqliteClient:
+    def __init__(self, path: str):
+        self.path = path
+        self.connects = 0
+
+    @contextmanager
+    def connect(self):
+        self.connects += 1
+        connection = SqliteConnection(self.path)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+
+def make_graph(path: str, num_nodes: int, seed: int = 7) -> None:
+    """A random IQMS graph: parents, 8D related records, open dates and NCe part revisions."""
+    rng = random.Random(seed)
+    ids = [str(1000 + i) for i in range(num_nodes)]
+    with closing(sqlite3.connect(path)) as connection:
+        connection.execute("CREATE TABLE rpt_nce_legacy (iqms_id TEXT, parent_id TEXT, date_opened TEXT, part_cur_rev TEXT)")
+        connection.execute("CREATE TABLE rpt_mrbe_legacy (iqms_id TEXT, parent_id TEXT, date_opened TEXT)")
+        connection.execute("CREATE TABLE rpt_8d_legacy (iqms_id TEXT, parent_id TEXT, related_records_8d TEXT, date_opened TEXT)")
+        for index, nid in enumerate(ids):
+            parent = rng.choice(ids[:index]) if index and rng.random() < 0.8 else "-1"
+            opened = f"2024-{rng.randint(1, 12):02d}-15"
+            view = rng.choice(("nce", "mrbe", "8d"))
+            if view == "nce":
+                connection.execute("INSERT INTO rpt_nce_legacy VALUES (?, ?, ?, ?)", (nid, parent, opened, rng.choice("ABC")))
+            elif view == "mrbe":
+                connection.execute("INSERT INTO rpt_mrbe_legacy VALUES (?, ?, ?)", (nid, parent, opened))
+            else:
+                related = ", ".join(rng.sample(ids, rng.randint(0, 2)))
+                connection.execute("INSERT INTO rpt_8d_legacy VALUES (?, ?, ?, ?)", (nid, parent, related or None, opened))
+        connection.commit()
+
+
+@pytest.fixture
+def graph_builder(retriever_tool, tmp_path, monkeypatch):
+    path = str(tmp_path / "iqms.db")
+    make_graph(path, num_nodes=120)
+    cache = {}
+    # The platform cache stores JSON
+    monkeypatch.setattr(retriever_tool, "get_platform_cache_many", lambda keys: [
+        json.loads(cache[key]) if key in cache else None for key in keys
+    ])
+    monkeypatch.setattr(retriever_tool, "set_platform_cache_many", lambda mapping, ttl: cache.update(
+        {key: json.dumps(value) for key, value in mapping.items()}
+    ))
+
+    class SqliteGraphBuilder(retriever_tool.GraphBuilder):
+        VIEWS = [
+            ("[rpt_nce_legacy]", "NCe", False),
+            ("[rpt_mrbe_legacy]", "MRBe", False),
+            ("[rpt_8d_legacy]", "8D", True),
+        ]
+
+    builder = SqliteGraphBuilder(SqliteClient(path))
+    builder.batch_size = 7
+    return builder, cache
+
+
+def per_node_traversal(builder, seeds, start_dt=None, end_dt=None, part_revs=None):
+    """The traversal before batching: one query per visited node and per view."""
+    date_filter = builder._build_date_filter(start_dt, end_dt)
+    rev_filter = builder._build_rev_filter(part_revs)
+    adj, visited, queue = defaultdict(set), set(), deque(seeds)
+    with builder.db.connect() as connection:
+        while queue:
+            nid = queue.popleft()
+            if nid in builder.INVALID_IDS or nid in visited:
+                continue
+            visited.add(nid)
+            for view, src, has_rel in builder.VIEWS:
+                sql, params = builder._view_query(view, src, has_rel, [nid], date_filter, rev_filter)
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    rows = cursor.fetchall()
+                queue.extend(builder._process_db_rows(rows, adj, visited))
+    return adj, visited
+
+
+class TestBfsTraverse:
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"start_dt": datetime(2024, 3, 1), "end_dt": datetime(2024, 10, 31), "part_revs": ["A", "B"]},
+    ])
+    def test_matches_per_node_traversal(self, graph_builder, filters):
+        builder, _ = graph_builder
+        seeds = ["1000", "1050", "-1"]
+
+        adj, visited = builder.bfs_traverse(seeds, **filters)
+        expected_adj, expected_visited = per_node_traversal(builder, seeds, **filters)
+
+        assert len(visited) > 10
+        assert visited == expected_visited
+        assert dict(adj) == dict(expected_adj)
+
+    def test_levels_are_served_from_cache(self, graph_builder):
+        builder, cache = graph_builder
+        adj, visited = builder.bfs_traverse(["1000"])
+        assert len(cache) == len(visited)
+        connects = builder.db.connects
+
+        # Every node is cached: no connection is opened
+        assert builder.bfs_traverse(["1000"]) == (adj, visited)
+        assert builder.db.connects == connects
+
+        # Other filters use other entries
+        builder.bfs_traverse(["1000"], part_revs=["A"])
+        assert builder.db.connects > connects
+
+    def test_stops_at_max_depth_and_max_nodes(self, graph_builder):
+        builder, _ = graph_builder
+        _, all_visited = builder.bfs_traverse(["1000"])
+
+        _, visited = builder.bfs_traverse(["1000"], max_depth=1)
+        assert visited == {"1000"}
+
+        _, visited = builder.bfs_traverse(["1000"], max_nodes=5)
+        assert len(visited) == 5 and visited < all_visited
@@ -0,0 +1,48 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))), "src"))
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+# Imported once: importing the tool package takes a while
+@pytest.fixture(scope="module")
+def limit_rows():
+    clients = MagicMock()
+    # The package builds its tool on import, with the fallback prompts
+    clients.LifespanClients.get_instance.return_value.langfuse_manager.get_prompt.side_effect = (
+        lambda prompt_name, fallback_prompt, label="dev": fallback_prompt
+    )
+    with patch.dict('sys.modules', {
+        'src.clients': clients,
+        'src.clients.azure': MagicMock(),
+        'src.clients.redis': MagicMock(),
+        'src.core.database.lambot': MagicMock(),
+        'src.core.utils.auth_helpers': MagicMock(),
+    }):
+        from src.core.tools.community.metadata_based_text_to_sql.abstraction.texttosql_tool import LamBotTextToSQLTool
+        yield LamBotTextToSQLTool.limit_rows
+
+
+class TestLimitRows:
+
+    @pytest.mark.parametrize("query, expected", [
+        ("SELECT a, b FROM t", "SELECT TOP (11) a, b FROM t"),
+        ("  select distinct a FROM t", "  select distinct TOP (11) a FROM t"),
+        ("SELECT ALL a FROM t", "SELECT ALL TOP (11) a FROM t"),
+        ("SELECT * FROM t WHERE a IN (SELECT b FROM u)", "SELECT TOP (11) * FROM t WHERE a IN (SELECT b FROM u)"),
+    ])
+    def test_adds_top_to_plain_selects(self, limit_rows, query, expected):
+        assert limit_rows(query, 11) == expected
+
+    @pytest.mark.parametrize("query", [
+        "SELECT TOP 5 a FROM t",
+        "SELECT DISTINCT TOP (5) a FROM t",
+        "WITH recent AS (SELECT a FROM t) SELECT a FROM recent",
+        "SELECT a FROM t UNION ALL SELECT a FROM u",
+        "SELECT a FROM t ORDER BY a OFFSET 10 ROWS FETCH NEXT 20 ROWS ONLY",
+        "select a from t order by a offset 0 rows",
+    ])
+    def test_leaves_other_queries_unchanged(self, limit_rows, query):
+        assert limit_rows(query, 11) == query
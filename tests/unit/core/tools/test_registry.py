@@ -0,0 +1,214 @@
+import os
+import sys
+# Adjust the path to include the parent directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), "src"))
+import pytest
+import random
+import asyncio
+from unittest.mock import patch
+
+pytest_plugins = ('pytest_asyncio',)
+
+
+@pytest.fixture
+def mock_inits_and_import_registry(mocker):
+    with patch.dict('sys.modules', {
+        'src.clients': mocker.MagicMock(),
+        'src.clients.redis': mocker.MagicMock(),
+        'src.core.tools.community': mocker.MagicMock(),
+        'src.core.utils.auth_helpers': mocker.MagicMock(),
+    }):
+        from src.core.tools import registry
+        from src.core.tools.common.retriever import LamBotRetrieverTool, LamBotMultiRetrieverTool
+        from src.models import ToolType
+        from src.models.retriever_tool import RetrieverToolSpec, MultiRetrieverToolSpec
+
+        def make_retriever_tool(name: str) -> LamBotRetrieverTool:
+            tool_spec = RetrieverToolSpec(
+                tool_name=name,
+                index_name=f"{name}_index",
+                prompts={"instruction_prompt": ("INSTRUCTION", "instruction")},
+                search_config={"top": 5, "search": "", "filter": "is_active eq true"},
+            )
+            return LamBotRetrieverTool(
+                name=name, description="description", tool_spec=tool_spec, tool_type=ToolType.retriever_tool
+            )
+
+        # The tool packages are mocked out: consider them imported
+        with patch.dict(registry._tool_registry, clear=True), \
+                patch.object(registry, "_manifest", {}), \
+                patch.object(registry, "_all_tools_loaded", True):
+            yield registry, make_retriever_tool, LamBotMultiRetrieverTool, MultiRetrieverToolSpec, ToolType
+
+
+class TestGetToolByName:
+
+    def test_returns_per_request_instance(self, mock_inits_and_import_registry):
+        registry, make_retriever_tool, _, _, _ = mock_inits_and_import_registry
+        prototype = make_retriever_tool("test_retriever")
+        registry.register_tool(prototype)
+
+        tool = registry.get_tool_by_name("test_retriever")
+        tool.override_top_k(k=20)
+        tool.set_tool_kwargs({"filterableFields": {"region": ["EU"]}})
+        tool.set_display_names(["Test Retriever"])
+
+        assert tool is not prototype
+        assert tool.top_k == 20
+        assert prototype.top_k == 5
+        assert prototype.tool_spec.search_config["top"] == 5
+        assert prototype.get_tool_kwargs() is None
+        assert prototype.display_names is None
+
+    def test_returns_none_for_unknown_tool(self, mock_inits_and_import_registry):
+        registry, _, _, _, _ = mock_inits_and_import_registry
+        assert registry.get_tool_by_name("does_not_exist") is None
+
+    def test_multi_retriever_copies_sub_tools(self, mock_inits_and_import_registry, mocker):
+        registry, make_retriever_tool, LamBotMultiRetrieverTool, MultiRetrieverToolSpec, ToolType = mock_inits_and_import_registry
+        mocker.patch.object(LamBotMultiRetrieverTool, "_get_tool_description", return_value="description")
+        sub_tools = [make_retriever_tool("test_sub_retriever_1"), make_retriever_tool("test_sub_retriever_2")]
+        prototype = LamBotMultiRetrieverTool(
+            tool_spec=MultiRetrieverToolSpec(tool_name="test_multiretriever", prompts={}),
+            tool_type=ToolType.retriever_tool,
+            retriever_tools=sub_tools,
+            display_names=[],
+        )
+        registry.register_tool(prototype)
+
+        tool = registry.get_tool_by_name("test_multiretriever")
+        tool.override_top_k(k=12)
+
+        assert tool.multi_retriever_top_k == 12
+        assert [sub_tool.top_k for sub_tool in tool.retriever_tools] == [12, 12]
+        assert prototype.multi_retriever_top_k == 25
+        assert [sub_tool.top_k for sub_tool in prototype.retriever_tools] == [5, 5]
+        assert all(sub_tool is not prototype_sub_tool for sub_tool, prototype_sub_tool in zip(tool.retriever_tools, sub_tools))
+
+    @pytest.mark.asyncio
+    async def test_overlapping_chats_with_different_top_k(self, mock_inits_and_import_registry, mocker):
+        registry, make_retriever_tool, _, _, _ = mock_inits_and_import_registry
+        mocker.patch.dict(os.environ, {
+            "SEARCH_API_KEY": "test-key",
+            "SEARCH_API_BASE": "https://search.example.com",
+            "SEARCH_API_VERSION": "2024-07-01",
+        })
+        registry.register_tool(make_retriever_tool("test_retriever"))
+
+        async def chat(top_k: int, chat_history: list) -> tuple:
+            tool = registry.get_tool_by_name("test_retriever")
+            tool.override_top_k(k=top_k)
+            await tool.set_conversation_history(chat_history)
+            # Yield to the other chats between configuring the tool and using it
+            await asyncio.sleep(random.random() / 100)
+            retriever = tool.retriever
+            return retriever.top_k, retriever.azure_search_config["top"], await tool.get_conversation_history()
+
+        top_k_values = [random.randint(1, 50) for _ in range(200)]
+        results = await asyncio.gather(*[
+            chat(top_k, [{"role": "user", "content": str(top_k)}]) for top_k in top_k_values
+        ])
+
+        for top_k, (retriever_top_k, payload_top, chat_history) in zip(top_k_values, results):
+            assert retriever_top_k == top_k
+            assert payload_top == top_k
+            assert chat_history == [{"role": "user", "content": str(top_k)}]
+        assert registry.get_tools()["test_retriever"].top_k == 5
+
+
+class TestLazyLoading:
+
+    @pytest.fixture
+    def lazy_registry(self, mock_inits_and_import_registry, mocker):
+        registry, make_retriever_tool, _, _, _ = mock_inits_and_import_registry
+        mocker.patch.object(registry, "_manifest", {"test_retriever": "src.core.tools.community.test_retriever"})
+        mocker.patch.object(registry, "_import_times", {})
+        mocker.patch.object(registry, "_all_tools_loaded", False)
+        packages = {
+            "src.core.tools.community.test_retriever": "test_retriever",
+            "src.core.tools.community.other_retriever": "other_retriever",
+        }
+
+        def import_module(module_name):
+            # Importing a tool package registers its tools
+            if module_name in packages:
+                registry.register_tool(make_retriever_tool(packages[module_name]))
+            return mocker.MagicMock(__path__=[])
+
+        import_module = mocker.patch.object(registry.importlib, "import_module", side_effect=import_module)
+        mocker.patch.object(registry.pkgutil, "walk_packages", return_value=[mocker.MagicMock(name=name) for name in packages])
+        for module_info, name in zip(registry.pkgutil.walk_packages.return_value, packages):
+            module_info.name = name
+        return registry, import_module
+
+    def test_imports_only_the_package_of_the_tool(self, lazy_registry):
+        registry, import_module = lazy_registry
+
+        assert registry.get_tool_by_name("test_retriever").name == "test_retriever"
+        assert registry.get_tool_by_name("test_retriever").name == "test_retriever"
+
+        import_module.assert_called_once_with("src.core.tools.community.test_retriever")
+        assert [entry["module"] for entry in registry.get_import_report()] == ["src.core.tools.community.test_retriever"]
+
+    def test_tool_missing_from_manifest_imports_all_packages(self, lazy_registry):
+        registry, import_module = lazy_registry
+
+        assert registry.get_tool_by_name("other_retriever").name == "other_retriever"
+        assert registry.get_tool_by_name("does_not_exist") is None
+
+        assert set(registry.get_tools()) == {"test_retriever", "other_retriever"}
+        assert len(registry.get_import_report()) == 2
+
+
+class TestRetrieverPlan:
+
+    def test_retriever_is_configured_once_per_request(self, mock_inits_and_import_registry, mocker):
+        registry, make_retriever_tool, _, _, _ = mock_inits_and_import_registry
+        mocker.patch.dict(os.environ, {
+            "SEARCH_API_KEY": "test-key",
+            "SEARCH_API_BASE": "https://search.example.com",
+            "SEARCH_API_VERSION": "2024-07-01",
+        })
+        registry.register_tool(make_retriever_tool("test_retriever"))
+        tool = registry.get_tool_by_name("test_retriever")
+        configure = mocker.spy(type(tool), "_configure_retriever")
+
+        retriever = tool.retriever
+        assert tool.retriever is retriever
+        assert configure.call_count == 1
+
+        tool.override_top_k(k=12)
+        assert tool.retriever.top_k == 12
+        tool.set_tool_kwargs({"filterableFields": {"region": ["EU"]}})
+        assert tool.retriever is not retriever
+        assert configure.call_count == 3
+
+        # A new request does not reuse the retriever of the previous one
+        assert registry.get_tool_by_name("test_retriever").retriever.top_k == 5
+
+    def test_multi_retriever_merges_without_mutating_tool_specs(self, mock_inits_and_import_registry, mocker):
+        registry, make_retriever_tool, LamBotMultiRetrieverTool, MultiRetrieverToolSpec, ToolType = mock_inits_and_import_registry
+        mocker.patch.dict(os.environ, {
+            "SEARCH_API_KEY": "test-key",
+            "SEARCH_API_BASE": "https://search.example.com",
+            "SEARCH_API_VERSION": "2024-07-01",
+        })
+        mocker.patch.object(LamBotMultiRetrieverTool, "_get_tool_description", return_value="description")
+        sub_tools = [make_retriever_tool("test_sub_retriever_1"), make_retriever_tool("test_sub_retriever_2")]
+        sub_tools[1].tool_spec.index_name = sub_tools[0].tool_spec.index_name
+        tool = LamBotMultiRetrieverTool(
+            tool_spec=MultiRetrieverToolSpec(tool_name="test_multiretriever", prompts={}),
+            tool_type=ToolType.retriever_tool,
+            retriever_tools=sub_tools,
+            display_names=[],
+        )
+
+        multi_retriever = tool.retriever
+        multi_retriever._merge_retrievers_by_index_name()
+
+        assert tool.retriever is multi_retriever
+        (merged_retriever,) = multi_retriever.retrievers
+        assert merged_retriever.tool_name == "test_sub_retriever_1_index_merged_retriever"
+        assert merged_retriever.azure_search_config["filter"] == "is_active eq true or is_active eq true"
+        assert [sub_tool.tool_spec.tool_name for sub_tool in sub_tools] == ["test_sub_retriever_1", "test_sub_retriever_2"]
+        assert sub_tools[0].tool_spec.search_config["filter"] == "is_active eq true"